@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Content-hash manifest for incremental data generation.
+
+Every generated artifact is fingerprinted from the parameters it reads, the
+source code of the functions and the constants that build it, and the
+fingerprints of the artifacts it depends on. The fingerprints of the last
+build are kept in generation_manifest.json below the output root, so a rerun
+only rebuilds artifacts whose fingerprint changed (or whose file is missing);
+a change upstream invalidates every dependent artifact automatically.
+
+Usage:
+    python build_cache.py deliverables/project1     # show the manifest
+"""
+
+import hashlib
+import inspect
+import json
+import os
+import sys
+
+MANIFEST_NAME = "generation_manifest.json"
+
+
+def fingerprint(*parts):
+    """Hash parameters, code objects and upstream digests into one hex digest.
+
+    Functions, classes and modules contribute their source code; everything
+    else (dicts, lists, strings, numbers, datetimes) its JSON/repr form.
+    """
+    h = hashlib.sha256()
+    for part in parts:
+        if inspect.isfunction(part) or inspect.isclass(part) or inspect.ismodule(part):
+            text = inspect.getsource(part)
+        else:
+            text = json.dumps(part, sort_keys=True, ensure_ascii=False, default=repr)
+        h.update(text.encode("utf-8"))
+        h.update(b"\0")
+    return h.hexdigest()
+
+
+def file_sha256(path):
+    """SHA-256 of a file's contents, read in 1 MiB blocks."""
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+class Manifest:
+    """Fingerprints of the artifacts last written below `output_root`."""
+
+    def __init__(self, output_root):
+        self.output_root = output_root
+        self.path = os.path.join(output_root, MANIFEST_NAME)
+        self.entries = {}
+        if os.path.isfile(self.path):
+            try:
+                with open(self.path) as f:
+                    self.entries = json.load(f)
+            except ValueError:
+                # A corrupt manifest just means everything is rebuilt
+                self.entries = {}
+
+    def is_fresh(self, artifact, digest, path):
+        """True when `artifact` was last built from `digest` and still exists."""
+        entry = self.entries.get(artifact)
+        return bool(entry) and entry["digest"] == digest and os.path.exists(path)
+
+    def record(self, artifact, digest, path):
+        """Remember that `artifact` at `path` was built from `digest`."""
+        self.entries[artifact] = {
+            "digest": digest,
+            "file": os.path.relpath(path, self.output_root).replace(os.sep, "/"),
+        }
+        self.save()
+
+    def save(self):
+        os.makedirs(self.output_root, exist_ok=True)
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self.entries, f, indent=2, sort_keys=True)
+            f.write("\n")
+        os.replace(tmp_path, self.path)
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if len(argv) != 1:
+        print(__doc__.strip())
+        return 2
+    manifest = Manifest(argv[0])
+    if not manifest.entries:
+        print(f"No manifest in {argv[0]}")
+        return 1
+    for artifact, entry in sorted(manifest.entries.items()):
+        print(f"{artifact:12s} {entry['digest'][:12]}  {entry['file']}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -81,6 +81,11 @@ cells.append({
         "os.makedirs(os.path.join(P2_DIR, 'survey'), exist_ok=True)\n",
         "os.makedirs(os.path.join(P2_DIR, 'webapp'), exist_ok=True)\n",
         "\n",
+        "# Every computed statistic is stored with the hash of its inputs; the paper\n",
+        "# draft in Section 7 is rendered from this store (results_store.py)\n",
+        "from results_store import ResultsStore, inputs_digest, STORE_NAME\n",
+        "analysis_results = ResultsStore(os.path.join(DELIVERABLES, 'report', STORE_NAME))\n",
+        "\n",
         "print('✓ All libraries imported successfully.')\n",
         "print(f'✓ Base directory: {BASE_DIR}')\n",
         "print(f'✓ Deliverables:   {DELIVERABLES}')\n",
@@ -227,7 +232,7 @@ cells.append({
         "\n",
         "### Methodology\n",
         "\n",
-        "- We use **G*Power**-equivalent calculations (Faul et al., 2007) implemented in Python via `scipy.stats`.\n",
+        "- We use **G*Power**-equivalent calculations (Faul et al., 2007) implemented in Python via `scipy.stats` (exact noncentral *t* and *F* power, `power_analysis.py`).\n",
         "- For each hypothesis, we specify the test family, expected effect size, significance level (α = .05), and desired statistical power (1 − β = .80).\n",
         "- Effect sizes are chosen based on meta-analytic evidence from prior HCI studies: **Cohen's d = 0.5** (medium) for t-tests and **Cohen's f = 0.25** (medium) for ANOVA designs.\n",
         "\n",
@@ -244,52 +249,73 @@ cells.append({
         "# ============================================================\n",
         "# A Priori Power Analysis\n",
         "# ============================================================\n",
-        "from scipy.stats import norm\n",
-        "\n",
-        "def power_analysis_ttest(d=0.5, alpha=0.05, power=0.80):\n",
-        "    \"\"\"Compute required n per group for a two-sided independent t-test.\n",
-        "    Uses the normal approximation: n = ((z_alpha/2 + z_beta) / d)^2\"\"\"\n",
-        "    z_alpha = norm.ppf(1 - alpha / 2)\n",
-        "    z_beta = norm.ppf(power)\n",
-        "    n = ((z_alpha + z_beta) / d) ** 2\n",
-        "    return int(np.ceil(n))\n",
-        "\n",
-        "def power_analysis_anova(f=0.25, k=3, alpha=0.05, power=0.80):\n",
-        "    \"\"\"Compute required total N for one-way ANOVA.\n",
-        "    Converts Cohen's f to d-equivalent, adjusts for k groups.\"\"\"\n",
-        "    # Cohen's f to lambda: lambda = f^2 * N\n",
-        "    # Approximation via t-test equivalent then multiply by k\n",
-        "    d_equiv = f * 2  # rough conversion for medium effects\n",
-        "    n_per_group = power_analysis_ttest(d=d_equiv, alpha=alpha, power=power)\n",
-        "    return n_per_group, n_per_group * k\n",
+        "from power_analysis import (ttest_power, anova_power, ttest_sample_size,\n",
+        "                            anova_sample_size, power_grid)\n",
         "\n",
+        "# Exact noncentral-t / noncentral-F power (G*Power equivalent); see power_analysis.py\n",
         "# Project 1: independent t-test, d=0.5, alpha=0.05, power=0.80\n",
-        "p1_n = power_analysis_ttest(d=0.5, alpha=0.05, power=0.80)\n",
+        "p1_n = int(ttest_sample_size(0.5, power=0.80, alpha=0.05))\n",
         "print('=== Project 1: Gemini Quest ===')\n",
         "print(f'  Test:           Independent-samples t-test')\n",
         "print(f'  Effect size:    Cohen\\'s d = 0.50 (medium)')\n",
         "print(f'  Alpha:          0.05 (two-tailed)')\n",
-        "print(f'  Power:          0.80')\n",
+        "print(f'  Power:          0.80 (achieved {float(ttest_power(0.5, p1_n)):.3f})')\n",
         "print(f'  Required n/group: {p1_n}')\n",
         "print(f'  Total N (2 groups): {p1_n * 2}')\n",
         "print()\n",
         "\n",
         "# Project 2: one-way ANOVA, f=0.25, 3 groups\n",
-        "p2_n_per, p2_n_total = power_analysis_anova(f=0.25, k=3, alpha=0.05, power=0.80)\n",
+        "p2_n_per = int(anova_sample_size(0.25, power=0.80, k=3, alpha=0.05))\n",
+        "p2_n_total = p2_n_per * 3\n",
         "print('=== Project 2: StudyBuddy ===')\n",
         "print(f'  Test:           One-way ANOVA')\n",
         "print(f'  Effect size:    Cohen\\'s f = 0.25 (medium)')\n",
         "print(f'  Groups:         3 (none / basic / SHAP)')\n",
         "print(f'  Alpha:          0.05')\n",
-        "print(f'  Power:          0.80')\n",
+        "print(f'  Power:          0.80 (achieved {float(anova_power(0.25, p2_n_per, 3)):.3f})')\n",
         "print(f'  Required n/group: {p2_n_per}')\n",
         "print(f'  Total N (3 groups): {p2_n_total}')\n",
         "print()\n",
         "\n",
+        "# Sensitivity of the planned evaluation (N = 40): power at N = 40 and the smallest\n",
+        "# effect it detects with power .80\n",
+        "effects = np.round(np.arange(0.05, 2.0, 0.01), 2)\n",
+        "p1_power_40 = float(ttest_power(0.5, 20))\n",
+        "p2_power_40 = float(anova_power(0.25, 40 / 3, 3))\n",
+        "p1_min_d = effects[np.argmax(ttest_power(effects, 20) >= 0.80)]\n",
+        "p2_min_f = effects[np.argmax(anova_power(effects, 40 / 3, 3) >= 0.80)]\n",
+        "print('=== Sensitivity of the Summative Evaluation (N = 40) ===')\n",
+        "print(f'  P1 (20 per condition):  power = {p1_power_40:.2f} for d = 0.50; d >= {p1_min_d:.2f} detected with power .80')\n",
+        "print(f'  P2 (~13 per group):     power = {p2_power_40:.2f} for f = 0.25; f >= {p2_min_f:.2f} detected with power .80')\n",
+        "print()\n",
+        "\n",
+        "# Power curves: one vectorized call per design over the whole (effect, n) grid\n",
+        "n_grid = np.arange(4, 201)\n",
+        "p1_curves = power_grid('ttest', d=[0.2, 0.5, 0.8], n=n_grid)\n",
+        "p2_curves = power_grid('anova', f=[0.1, 0.25, 0.4], n=n_grid, k=3)\n",
+        "fig, axes = plt.subplots(1, 2, figsize=(14, 4.5))\n",
+        "for ax, curves, effect, planned, groups in ((axes[0], p1_curves, 'd', p1_n, 2),\n",
+        "                                            (axes[1], p2_curves, 'f', p2_n_per, 3)):\n",
+        "    for value, curve in curves.groupby(effect):\n",
+        "        ax.plot(curve['n'], curve['power'], label=f'{effect} = {value:.2f}')\n",
+        "    ax.axhline(0.80, color='gray', linestyle='--', alpha=0.6)\n",
+        "    ax.axvline(planned, color='red', linestyle=':', alpha=0.7, label=f'Required n = {planned}')\n",
+        "    ax.axvline(40 / groups, color='green', linestyle=':', alpha=0.7, label='Planned evaluation (N = 40)')\n",
+        "    ax.set_xlabel('n per group')\n",
+        "    ax.set_ylabel('Power (1 - β)')\n",
+        "    ax.set_ylim(0, 1)\n",
+        "    ax.legend(fontsize=9)\n",
+        "axes[0].set_title('Project 1: Independent t-test (α = .05, two-tailed)')\n",
+        "axes[1].set_title('Project 2: One-way ANOVA, k = 3 (α = .05)')\n",
+        "plt.tight_layout()\n",
+        "plt.show()\n",
+        "print()\n",
+        "\n",
         "# Recruitment targets\n",
         "print('=== Recruitment Plan ===')\n",
-        "print(f'  Requirements Survey target:  N = 120 (exceeds both minimums)')\n",
-        "print(f'  Summative Evaluation target: N = 40  (20 per condition for P1, ~13 per group for P2)')\n",
+        "print(f'  Requirements Survey target:  N = 120')\n",
+        "print(f'  Summative Evaluation target: N = 40  (20 per condition for P1, ~13 per group for P2;')\n",
+        "print(f'                               powered for large effects, see sensitivity above)')\n",
         "print()\n",
         "print('  Demographics: Balanced gender, age 18–45, diverse educational backgrounds')\n",
         "print('  Channels:     University mailing lists, Reddit r/SampleSize, Prolific')\n",
@@ -397,6 +423,10 @@ cells.append({
         "        print(f'  Age: M = {p1_df[\"age\"].mean():.1f}, SD = {p1_df[\"age\"].std():.1f}')\n",
         "    if 'gender' in p1_df.columns:\n",
         "        print(f'  Gender distribution:\\n{p1_df[\"gender\"].value_counts().to_string()}')\n",
+        "    if {'age', 'gender'} <= set(p1_df.columns):\n",
+        "        analysis_results.record('p1.survey', inputs_digest(p1_df[['age', 'gender']]), {\n",
+        "            'n': len(p1_df), 'age_mean': p1_df['age'].mean(), 'age_sd': p1_df['age'].std(),\n",
+        "            'gender_pct': (p1_df['gender'].value_counts(normalize=True) * 100).to_dict()})\n",
         "    if 'education' in p1_df.columns:\n",
         "        print(f'  Education levels:\\n{p1_df[\"education\"].value_counts().to_string()}')\n",
         "    if 'gaming_experience' in p1_df.columns:\n",
@@ -422,66 +452,15 @@ cells.append({
         "# ============================================================\n",
         "# Project 1: Survey Results Visualization\n",
         "# ============================================================\n",
+        "# Panels are drawn from summary tables on a process pool; panels whose\n",
+        "# tables and styling are unchanged are reused from figures.cache (figures.py)\n",
         "if p1_df is not None:\n",
-        "    fig, axes = plt.subplots(2, 3, figsize=(18, 10))\n",
-        "    fig.suptitle('Project 1: Gemini Quest — Requirements Survey Results', fontsize=16, y=1.02)\n",
-        "\n",
-        "    # (0,0) Genre preferences — horizontal bar\n",
-        "    if 'preferred_genre' in p1_df.columns:\n",
-        "        genre_counts = p1_df['preferred_genre'].value_counts()\n",
-        "        genre_counts.sort_values().plot.barh(ax=axes[0, 0], color=sns.color_palette('viridis', len(genre_counts)))\n",
-        "        axes[0, 0].set_title('Preferred Genre')\n",
-        "        axes[0, 0].set_xlabel('Count')\n",
-        "\n",
-        "    # (0,1) Art style preferences — horizontal bar\n",
-        "    if 'art_style' in p1_df.columns:\n",
-        "        art_counts = p1_df['art_style'].value_counts()\n",
-        "        art_counts.sort_values().plot.barh(ax=axes[0, 1], color=sns.color_palette('magma', len(art_counts)))\n",
-        "        axes[0, 1].set_title('Preferred Art Style')\n",
-        "        axes[0, 1].set_xlabel('Count')\n",
-        "\n",
-        "    # (0,2) Content importance ratings — bars with error bars\n",
-        "    content_cols = [c for c in p1_df.columns if c.startswith('importance_')]\n",
-        "    if content_cols:\n",
-        "        means = p1_df[content_cols].mean()\n",
-        "        sds = p1_df[content_cols].std()\n",
-        "        labels = [c.replace('importance_', '').replace('_', ' ').title() for c in content_cols]\n",
-        "        axes[0, 2].bar(labels, means, yerr=sds, capsize=4, color=sns.color_palette('coolwarm', len(content_cols)))\n",
-        "        axes[0, 2].set_title('Content Importance Ratings')\n",
-        "        axes[0, 2].set_ylabel('Mean Rating')\n",
-        "        axes[0, 2].tick_params(axis='x', rotation=45)\n",
-        "\n",
-        "    # (1,0) AI acceptance ratings — bars\n",
-        "    ai_cols = [c for c in p1_df.columns if c.startswith('ai_')]\n",
-        "    if ai_cols:\n",
-        "        ai_means = p1_df[ai_cols].mean()\n",
-        "        labels = [c.replace('ai_', '').replace('_', ' ').title() for c in ai_cols]\n",
-        "        axes[1, 0].bar(labels, ai_means, color=sns.color_palette('Set2', len(ai_cols)))\n",
-        "        axes[1, 0].set_title('AI Acceptance Ratings')\n",
-        "        axes[1, 0].set_ylabel('Mean Rating')\n",
-        "        axes[1, 0].tick_params(axis='x', rotation=45)\n",
-        "\n",
-        "    # (1,1) Age distribution — histogram\n",
-        "    if 'age' in p1_df.columns:\n",
-        "        axes[1, 1].hist(p1_df['age'], bins=15, color='steelblue', edgecolor='white')\n",
-        "        axes[1, 1].set_title('Age Distribution')\n",
-        "        axes[1, 1].set_xlabel('Age')\n",
-        "        axes[1, 1].set_ylabel('Frequency')\n",
-        "\n",
-        "    # (1,2) Preferred game length — bar\n",
-        "    if 'game_length' in p1_df.columns:\n",
-        "        length_counts = p1_df['game_length'].value_counts()\n",
-        "        length_counts.plot.bar(ax=axes[1, 2], color='coral', edgecolor='white')\n",
-        "        axes[1, 2].set_title('Preferred Game Length')\n",
-        "        axes[1, 2].set_xlabel('Length')\n",
-        "        axes[1, 2].set_ylabel('Count')\n",
-        "        axes[1, 2].tick_params(axis='x', rotation=45)\n",
-        "\n",
-        "    plt.tight_layout()\n",
-        "    save_path = os.path.join(DELIVERABLES, 'report', 'p1_survey_results.png')\n",
-        "    fig.savefig(save_path, dpi=150, bbox_inches='tight')\n",
-        "    print(f'Figure saved: {save_path}')\n",
-        "    plt.show()\n",
+        "    from figures import p1_survey_tables, render_figures, format_report\n",
+        "    from IPython.display import Image, display\n",
+        "    report = render_figures({'p1_survey_results': p1_survey_tables(p1_df)},\n",
+        "                            os.path.join(DELIVERABLES, 'report'))\n",
+        "    print('\\n'.join(format_report(report)))\n",
+        "    display(Image(filename=report['path'].iloc[0]))\n",
         "else:\n",
         "    print('Skipping visualization — no P1 survey data loaded.')"
     ],
@@ -549,6 +528,10 @@ cells.append({
         "        print(f'  Age: M = {p2_df[\"age\"].mean():.1f}, SD = {p2_df[\"age\"].std():.1f}')\n",
         "    if 'gender' in p2_df.columns:\n",
         "        print(f'  Gender distribution:\\n{p2_df[\"gender\"].value_counts().to_string()}')\n",
+        "    if {'age', 'gender'} <= set(p2_df.columns):\n",
+        "        analysis_results.record('p2.survey', inputs_digest(p2_df[['age', 'gender']]), {\n",
+        "            'n': len(p2_df), 'age_mean': p2_df['age'].mean(), 'age_sd': p2_df['age'].std(),\n",
+        "            'gender_pct': (p2_df['gender'].value_counts(normalize=True) * 100).to_dict()})\n",
         "    if 'major' in p2_df.columns:\n",
         "        print(f'  Major distribution:\\n{p2_df[\"major\"].value_counts().head(10).to_string()}')\n",
         "    if 'gpa' in p2_df.columns:\n",
@@ -572,62 +555,15 @@ cells.append({
         "# ============================================================\n",
         "# Project 2: Survey Results Visualization\n",
         "# ============================================================\n",
+        "# Panels are drawn from summary tables on a process pool; panels whose\n",
+        "# tables and styling are unchanged are reused from figures.cache (figures.py)\n",
         "if p2_df is not None:\n",
-        "    fig, axes = plt.subplots(2, 3, figsize=(18, 10))\n",
-        "    fig.suptitle('Project 2: StudyBuddy — Requirements Survey Results', fontsize=16, y=1.02)\n",
-        "\n",
-        "    # (0,0) Attitude ratings — bars\n",
-        "    attitude_cols = [c for c in p2_df.columns if c.startswith('attitude_')]\n",
-        "    if attitude_cols:\n",
-        "        att_means = p2_df[attitude_cols].mean()\n",
-        "        labels = [c.replace('attitude_', '').replace('_', ' ').title() for c in attitude_cols]\n",
-        "        axes[0, 0].bar(labels, att_means, color=sns.color_palette('Blues_d', len(attitude_cols)))\n",
-        "        axes[0, 0].set_title('AI & Technology Attitude Ratings')\n",
-        "        axes[0, 0].set_ylabel('Mean Rating')\n",
-        "        axes[0, 0].tick_params(axis='x', rotation=45)\n",
-        "\n",
-        "    # (0,1) Study method — pie chart\n",
-        "    if 'study_method' in p2_df.columns:\n",
-        "        method_counts = p2_df['study_method'].value_counts()\n",
-        "        axes[0, 1].pie(method_counts, labels=method_counts.index, autopct='%1.0f%%',\n",
-        "                       colors=sns.color_palette('pastel'), startangle=90)\n",
-        "        axes[0, 1].set_title('Primary Study Method')\n",
-        "\n",
-        "    # (0,2) Dashboard complexity preference — bar\n",
-        "    if 'dashboard_complexity' in p2_df.columns:\n",
-        "        dc_counts = p2_df['dashboard_complexity'].value_counts()\n",
-        "        dc_counts.plot.bar(ax=axes[0, 2], color='mediumpurple', edgecolor='white')\n",
-        "        axes[0, 2].set_title('Dashboard Complexity Preference')\n",
-        "        axes[0, 2].set_ylabel('Count')\n",
-        "        axes[0, 2].tick_params(axis='x', rotation=45)\n",
-        "\n",
-        "    # (1,0) Major distribution — horizontal bar\n",
-        "    if 'major' in p2_df.columns:\n",
-        "        major_counts = p2_df['major'].value_counts().head(8)\n",
-        "        major_counts.sort_values().plot.barh(ax=axes[1, 0], color=sns.color_palette('Spectral', len(major_counts)))\n",
-        "        axes[1, 0].set_title('Major Distribution (Top 8)')\n",
-        "        axes[1, 0].set_xlabel('Count')\n",
-        "\n",
-        "    # (1,1) GPA distribution — histogram\n",
-        "    if 'gpa' in p2_df.columns:\n",
-        "        axes[1, 1].hist(p2_df['gpa'], bins=15, color='teal', edgecolor='white')\n",
-        "        axes[1, 1].set_title('GPA Distribution')\n",
-        "        axes[1, 1].set_xlabel('GPA')\n",
-        "        axes[1, 1].set_ylabel('Frequency')\n",
-        "\n",
-        "    # (1,2) Notification preference — bar\n",
-        "    if 'notification_pref' in p2_df.columns:\n",
-        "        notif_counts = p2_df['notification_pref'].value_counts()\n",
-        "        notif_counts.plot.bar(ax=axes[1, 2], color='salmon', edgecolor='white')\n",
-        "        axes[1, 2].set_title('Notification Preference')\n",
-        "        axes[1, 2].set_ylabel('Count')\n",
-        "        axes[1, 2].tick_params(axis='x', rotation=45)\n",
-        "\n",
-        "    plt.tight_layout()\n",
-        "    save_path = os.path.join(DELIVERABLES, 'report', 'p2_survey_results.png')\n",
-        "    fig.savefig(save_path, dpi=150, bbox_inches='tight')\n",
-        "    print(f'Figure saved: {save_path}')\n",
-        "    plt.show()\n",
+        "    from figures import p2_survey_tables, render_figures, format_report\n",
+        "    from IPython.display import Image, display\n",
+        "    report = render_figures({'p2_survey_results': p2_survey_tables(p2_df)},\n",
+        "                            os.path.join(DELIVERABLES, 'report'))\n",
+        "    print('\\n'.join(format_report(report)))\n",
+        "    display(Image(filename=report['path'].iloc[0]))\n",
         "else:\n",
         "    print('Skipping visualization — no P2 survey data loaded.')"
     ],
@@ -61,7 +61,7 @@ Both prototypes include client-side telemetry that captures:
 3. **Feature usage** — Which features are accessed and how often
 4. **Session metadata** — Duration, browser info, errors
 
-Data is stored in the browser's memory (`window.telemetryLog` array) and exported as JSON files per participant. This approach:
+Data is buffered in the browser (`window.telemetryLog`, kept as compressed batches of coded events) and exported as JSON files per participant; when the optional local endpoint (`telemetry_server.py`) runs, batches are also sent to it as they fill up. This approach:
 - Requires **no server-side infrastructure** for logging
 - Gives participants **full transparency** over collected data
 - Enables **easy integration** with analysis pipelines
@@ -390,31 +390,34 @@ except FileNotFoundError:
     print("\\u2717 Post-test file not found.")
     p1_posttest = None
 
-# Load interaction logs
+# Load interaction logs as a columnar event store: participants, events,
+# choices and errors become flat tables keyed by participant (rebuilt next to
+# the log file whenever the log changes). Repeated exports of a participant
+# are dropped before anything is aggregated.
+from event_store import open_event_store, session_summary
+from log_integrity import deduplicate, format_report
+from sessions import build_visits, participant_dwell
+from error_index import ErrorIndex
+
 try:
-    with open(p1_logs_path, 'r') as f:
-        p1_logs = json.load(f)
-    print(f"\\u2713 Loaded P1 interaction logs: {len(p1_logs)} participants")
+    p1_store, p1_integrity = deduplicate(open_event_store(p1_logs_path))
+    p1_sessions = session_summary(p1_store)
+    print(f"\\u2713 Loaded P1 interaction logs: {len(p1_sessions)} participants, {len(p1_store['events'])} events")
+    print("\\n".join(format_report(p1_integrity)[-3:-1]))
 except FileNotFoundError:
     print("\\u2717 Interaction logs not found.")
-    p1_logs = None
+    p1_store = p1_sessions = None
+
+# ---- Participant Feature Table ----
+# SUS scores, scale means, log aggregates and qualitative code counts per
+# participant, built once and cached (features.cache/) until an input file changes
+from participant_features import load_participant_features
 
-# ---- Compute SUS Scores ----
 if p1_posttest is not None:
-    sus_cols = [f'sus_q{i}' for i in range(1, 11)]
-    
-    def compute_sus(row):
-        \"\"\"Compute SUS score following Brooke (1996) scoring method.\"\"\"
-        score = 0
-        for i in range(1, 11):
-            val = row[f'sus_q{i}']
-            if i % 2 == 1:  # Odd items (positive): score - 1
-                score += (val - 1)
-            else:  # Even items (negative): 5 - score
-                score += (5 - val)
-        return score * 2.5  # Scale to 0-100
-    
-    p1_posttest['sus_score'] = p1_posttest.apply(compute_sus, axis=1)
+    p1_features = load_participant_features(
+        p1_posttest_path, p1_logs_path, P1_DIR / 'posttest' / 'coded_qualitative_data.csv', log=print)
+    # SUS follows Brooke (1996): odd items score - 1, even items 5 - score, sum x 2.5
+    p1_posttest = p1_posttest.join(p1_features, on='participant_id')
     
     print(f"\\n{'='*60}")
     print("PROJECT 1: SUS SCORES")
@@ -435,18 +438,20 @@ if p1_posttest is not None:
     else:
         grade = 'D/F (Poor)'
     print(f"  SUS Grade: {grade}")
+    analysis_results.record('p1.sus', inputs_digest(p1_posttest['sus_score']),
+                            {'grade': grade, 'above_benchmark': mean_sus >= 68})
 
 # ---- Summarize Interaction Logs ----
-if p1_logs is not None:
+if p1_sessions is not None:
     print(f"\\n{'='*60}")
     print("PROJECT 1: INTERACTION LOG SUMMARY")
     print("="*60)
     
-    durations = [p['session_duration_seconds'] for p in p1_logs]
-    clicks = [p['total_clicks'] for p in p1_logs]
-    pages = [p['total_pages_visited'] for p in p1_logs]
-    n_events = [len(p['events']) for p in p1_logs]
-    n_choices = [len(p.get('choices_made', [])) for p in p1_logs]
+    durations = p1_sessions['session_duration_seconds']
+    clicks = p1_sessions['total_clicks']
+    pages = p1_sessions['total_pages_visited']
+    n_events = p1_sessions['n_events']
+    n_choices = p1_sessions['n_choices']
     
     print(f"  Session duration: M={np.mean(durations):.0f}s (SD={np.std(durations):.0f}s)")
     print(f"  Total clicks: M={np.mean(clicks):.1f} (SD={np.std(clicks):.1f})")
@@ -454,8 +459,22 @@ if p1_logs is not None:
     print(f"  Events logged: M={np.mean(n_events):.1f} (SD={np.std(n_events):.1f})")
     print(f"  Choices made: M={np.mean(n_choices):.1f} (SD={np.std(n_choices):.1f})")
     
-    errors = [len(p.get('errors_encountered', [])) for p in p1_logs]
-    print(f"  Errors encountered: M={np.mean(errors):.1f} (SD={np.std(errors):.1f})")\
+    errors = p1_sessions['n_errors']
+    print(f"  Errors encountered: M={np.mean(errors):.1f} (SD={np.std(errors):.1f})")
+    
+    # Page visits and dwell time reconstructed from event timestamps
+    # (gaps over 5 minutes count as idle, not as time on the page)
+    p1_visits = build_visits(p1_store)
+    p1_dwell = participant_dwell(p1_visits)
+    active_min = p1_dwell['active_seconds'] / 60
+    print(f"  Page visits: M={np.mean(p1_dwell['n_visits']):.1f} (SD={np.std(p1_dwell['n_visits']):.1f})")
+    print(f"  Active time: M={np.mean(active_min):.1f} min (SD={np.std(active_min):.1f}), "
+          f"{p1_dwell['idle_gaps'].sum()} idle gaps")
+    
+    # Error signatures and the page each one occurred on most often
+    p1_errors = ErrorIndex.build(p1_store)
+    for signature, row in p1_errors.summary().head(3).iterrows():
+        print(f"  Error '{signature}': {row['errors']}x, {row['participants']} participants, mostly on {row['top_page']}")\
 """))
 
 # ──────────────────────────────────────────────
@@ -519,26 +538,19 @@ except FileNotFoundError:
     p2_posttest = None
 
 try:
-    with open(p2_logs_path, 'r') as f:
-        p2_logs = json.load(f)
-    print(f"\\u2713 Loaded P2 interaction logs: {len(p2_logs)} participants")
+    p2_store, p2_integrity = deduplicate(open_event_store(p2_logs_path))
+    p2_sessions = session_summary(p2_store)
+    print(f"\\u2713 Loaded P2 interaction logs: {len(p2_sessions)} participants, {len(p2_store['events'])} events")
+    print("\\n".join(format_report(p2_integrity)[-3:-1]))
 except FileNotFoundError:
     print("\\u2717 Interaction logs not found.")
-    p2_logs = None
+    p2_store = p2_sessions = None
 
-# ---- Compute SUS Scores ----
+# ---- Participant Feature Table (SUS, scale means, logs, codes) ----
 if p2_posttest is not None:
-    def compute_sus(row):
-        score = 0
-        for i in range(1, 11):
-            val = row[f'sus_q{i}']
-            if i % 2 == 1:
-                score += (val - 1)
-            else:
-                score += (5 - val)
-        return score * 2.5
-    
-    p2_posttest['sus_score'] = p2_posttest.apply(compute_sus, axis=1)
+    p2_features = load_participant_features(
+        p2_posttest_path, p2_logs_path, P2_DIR / 'posttest' / 'coded_qualitative_data.csv', log=print)
+    p2_posttest = p2_posttest.join(p2_features, on='participant_id')
     
     print(f"\\n{'='*60}")
     print("PROJECT 2: SUS SCORES")
@@ -558,42 +570,49 @@ if p2_posttest is not None:
     else:
         grade = 'D/F (Poor)'
     print(f"  SUS Grade: {grade}")
+    analysis_results.record('p2.sus', inputs_digest(p2_posttest['sus_score']),
+                            {'grade': grade, 'above_benchmark': mean_sus >= 68})
 
-    # Trust scores
-    trust_cols = [f'trust_q{i}' for i in range(1, 6)]
-    if all(c in p2_posttest.columns for c in trust_cols):
-        p2_posttest['trust_mean'] = p2_posttest[trust_cols].mean(axis=1)
+    # Trust, usefulness and ease of use scale means (from the feature table)
+    if 'trust_mean' in p2_posttest.columns:
         print(f"\\n  Trust in AI: M={p2_posttest['trust_mean'].mean():.2f}, SD={p2_posttest['trust_mean'].std():.2f}")
-    
-    # Usefulness scores
-    use_cols = [f'usefulness_q{i}' for i in range(1, 6)]
-    if all(c in p2_posttest.columns for c in use_cols):
-        p2_posttest['usefulness_mean'] = p2_posttest[use_cols].mean(axis=1)
+    if 'usefulness_mean' in p2_posttest.columns:
         print(f"  Perceived Usefulness: M={p2_posttest['usefulness_mean'].mean():.2f}, SD={p2_posttest['usefulness_mean'].std():.2f}")
-
-    # Ease of use scores
-    ease_cols = [f'ease_q{i}' for i in range(1, 6)]
-    if all(c in p2_posttest.columns for c in ease_cols):
-        p2_posttest['ease_mean'] = p2_posttest[ease_cols].mean(axis=1)
+    if 'ease_mean' in p2_posttest.columns:
         print(f"  Perceived Ease of Use: M={p2_posttest['ease_mean'].mean():.2f}, SD={p2_posttest['ease_mean'].std():.2f}")
 
 # ---- Summarize Interaction Logs ----
-if p2_logs is not None:
+if p2_sessions is not None:
     print(f"\\n{'='*60}")
     print("PROJECT 2: INTERACTION LOG SUMMARY")
     print("="*60)
     
-    durations = [p['session_duration_seconds'] for p in p2_logs]
-    clicks = [p['total_clicks'] for p in p2_logs]
-    n_events = [len(p['events']) for p in p2_logs]
-    predictions = [p.get('predictions_viewed', 0) for p in p2_logs]
-    recommendations = [p.get('recommendations_clicked', 0) for p in p2_logs]
+    durations = p2_sessions['session_duration_seconds']
+    clicks = p2_sessions['total_clicks']
+    n_events = p2_sessions['n_events']
+    predictions = p2_sessions['predictions_viewed']
+    recommendations = p2_sessions['recommendations_clicked']
     
     print(f"  Session duration: M={np.mean(durations):.0f}s (SD={np.std(durations):.0f}s)")
     print(f"  Total clicks: M={np.mean(clicks):.1f} (SD={np.std(clicks):.1f})")
     print(f"  Events logged: M={np.mean(n_events):.1f} (SD={np.std(n_events):.1f})")
     print(f"  Predictions viewed: M={np.mean(predictions):.1f} (SD={np.std(predictions):.1f})")
-    print(f"  Recommendations clicked: M={np.mean(recommendations):.1f} (SD={np.std(recommendations):.1f})")\
+    print(f"  Recommendations clicked: M={np.mean(recommendations):.1f} (SD={np.std(recommendations):.1f})")
+    
+    p2_visits = build_visits(p2_store)
+    p2_dwell = participant_dwell(p2_visits)
+    active_min = p2_dwell['active_seconds'] / 60
+    print(f"  Page visits: M={np.mean(p2_dwell['n_visits']):.1f} (SD={np.std(p2_dwell['n_visits']):.1f})")
+    print(f"  Active time: M={np.mean(active_min):.1f} min (SD={np.std(active_min):.1f}), "
+          f"{p2_dwell['idle_gaps'].sum()} idle gaps")
+    
+    # P2 errors carry no page, so the page is the one of the preceding event
+    p2_errors = ErrorIndex.build(p2_store)
+    if 'Timeout loading predictions' in p2_errors:
+        timeout_pages = p2_errors.pages('Timeout loading predictions')
+        print("  'Timeout loading predictions' by page: " + ", ".join(f"{p} ({n})" for p, n in timeout_pages.items()))
+    for signature, row in p2_errors.summary().head(3).iterrows():
+        print(f"  Error '{signature}': {row['errors']}x, {row['participants']} participants, mostly on {row['top_page']}")\
 """))
 
 # ──────────────────────────────────────────────
@@ -46,7 +46,8 @@ cells.append(md_cell([
     "\n",
     "### Phase 1: Quantitative Analysis\n",
     "1. **Descriptive statistics** \u2014 Means, SDs, distributions for all scales\n",
-    "2. **Reliability analysis** \u2014 Cronbach\u2019s alpha for multi-item scales\n",
+    "2. **Reliability analysis** \u2014 Cronbach\u2019s alpha and McDonald\u2019s omega with bootstrap CIs for multi-item scales\n",
+    "   - The even-numbered SUS items are negatively worded, so they are reverse-keyed before \u03b1 and \u03c9 are computed, as in the SUS score itself. Earlier drafts of this notebook used the raw items, where the positive and negative items pull against each other, so the SUS \u03b1 reported here differs from those drafts (Project 1: .033 then, \u22121.501 now; Project 2: \u2212.819 then, .083 now). A negative \u03b1 means the items do not co-vary as the scale assumes, which is to be expected of the simulated responses.\n",
     "3. **Normality testing** \u2014 Shapiro-Wilk test to determine parametric vs. non-parametric tests\n",
     "4. **Hypothesis testing** \u2014 t-tests, ANOVA, correlation analyses\n",
     "5. **Effect sizes** \u2014 Cohen\u2019s d, eta-squared, correlation coefficients\n",
@@ -104,79 +105,71 @@ cells.append(code_cell([
     "print(\"6.1.1 DESCRIPTIVE STATISTICS\")\n",
     "print(\"\u2500\" * 70)\n",
     "\n",
+    "# One pass over the scale columns: moments and quantiles of every scale (descriptives.py)\n",
+    "from descriptives import describe\n",
+    "p1_scale_cols = [c for c in ['sus_score', 'ues_fa_mean', 'ues_pu_mean', 'ues_ae_mean', 'ues_rw_mean',\n",
+    "                             'nq_mean', 'ai_mean', 'immersion_mean'] if c in p1_posttest.columns]\n",
+    "# Stored with the hash of its inputs for the paper draft (results_store.py)\n",
+    "p1_desc = analysis_results.analysis('p1.descriptives', describe, p1_posttest, columns=p1_scale_cols)\n",
+    "\n",
     "# SUS\n",
+    "sus = p1_desc.loc['sus_score']\n",
     "print(f\"\\nSystem Usability Scale (SUS):\")\n",
     "print(f\"  N = {len(p1_posttest)}\")\n",
-    "print(f\"  Mean = {p1_posttest['sus_score'].mean():.2f}\")\n",
-    "print(f\"  SD = {p1_posttest['sus_score'].std():.2f}\")\n",
-    "print(f\"  Median = {p1_posttest['sus_score'].median():.2f}\")\n",
-    "print(f\"  95% CI = [{p1_posttest['sus_score'].mean() - 1.96*p1_posttest['sus_score'].std()/np.sqrt(len(p1_posttest)):.2f}, \"\n",
-    "      f\"{p1_posttest['sus_score'].mean() + 1.96*p1_posttest['sus_score'].std()/np.sqrt(len(p1_posttest)):.2f}]\")\n",
+    "print(f\"  Mean = {sus['mean']:.2f}\")\n",
+    "print(f\"  SD = {sus['std']:.2f}\")\n",
+    "print(f\"  Median = {sus['median']:.2f}\")\n",
+    "print(f\"  95% CI = [{sus['mean'] - 1.96*sus['std']/np.sqrt(len(p1_posttest)):.2f}, \"\n",
+    "      f\"{sus['mean'] + 1.96*sus['std']/np.sqrt(len(p1_posttest)):.2f}]\")\n",
     "\n",
     "# UES-SF Subscales\n",
     "print(f\"\\nUser Engagement Scale - Short Form (UES-SF):\")\n",
+    "# Subscale means are scored with the other scales (scale_scoring.py, via p1_features)\n",
     "ues_subscales = {\n",
-    "    'Focused Attention (FA)': [f'engagement_fa{i}' for i in range(1, 6)],\n",
-    "    'Perceived Usability (PU)': [f'engagement_pu{i}' for i in range(1, 4)],\n",
-    "    'Aesthetic Appeal (AE)': [f'engagement_ae{i}' for i in range(1, 5)],\n",
-    "    'Reward Factor (RW)': [f'engagement_rw{i}' for i in range(1, 4)]\n",
+    "    'Focused Attention (FA)': 'ues_fa_mean',\n",
+    "    'Perceived Usability (PU)': 'ues_pu_mean',\n",
+    "    'Aesthetic Appeal (AE)': 'ues_ae_mean',\n",
+    "    'Reward Factor (RW)': 'ues_rw_mean'\n",
     "}\n",
     "\n",
-    "for name, cols in ues_subscales.items():\n",
-    "    valid_cols = [c for c in cols if c in p1_posttest.columns]\n",
-    "    if valid_cols:\n",
-    "        subscale_mean = p1_posttest[valid_cols].mean(axis=1)\n",
-    "        print(f\"  {name}: M={subscale_mean.mean():.2f}, SD={subscale_mean.std():.2f}\")\n",
-    "\n",
+    "for name, col in ues_subscales.items():\n",
+    "    if col in p1_desc.index:\n",
+    "        print(f\"  {name}: M={p1_desc.loc[col, 'mean']:.2f}, SD={p1_desc.loc[col, 'std']:.2f}\")\n",
+    "ues_cols = [col for col in ues_subscales.values() if col in p1_desc.index]\n",
+    "if ues_cols:\n",
+    "    top = p1_desc.loc[ues_cols, 'mean'].idxmax()\n",
+    "    analysis_results.record('p1.engagement', inputs_digest(p1_desc.loc[ues_cols]), {\n",
+    "        'highest': {col: name for name, col in ues_subscales.items()}[top],\n",
+    "        'mean': p1_desc.loc[top, 'mean'], 'sd': p1_desc.loc[top, 'std']})\n",
+    "\n",
+    "# Custom scale means come from the participant feature table (p1_features)\n",
     "# Narrative Quality\n",
-    "nq_cols = [f'narrative_quality_q{i}' for i in range(1, 6)]\n",
-    "valid_nq = [c for c in nq_cols if c in p1_posttest.columns]\n",
-    "if valid_nq:\n",
-    "    p1_posttest['nq_mean'] = p1_posttest[valid_nq].mean(axis=1)\n",
-    "    print(f\"\\nNarrative Quality: M={p1_posttest['nq_mean'].mean():.2f}, SD={p1_posttest['nq_mean'].std():.2f}\")\n",
+    "if 'nq_mean' in p1_desc.index:\n",
+    "    print(f\"\\nNarrative Quality: M={p1_desc.loc['nq_mean', 'mean']:.2f}, SD={p1_desc.loc['nq_mean', 'std']:.2f}\")\n",
     "\n",
     "# AI Perception\n",
-    "ai_cols = [f'ai_perception_q{i}' for i in range(1, 6)]\n",
-    "valid_ai = [c for c in ai_cols if c in p1_posttest.columns]\n",
-    "if valid_ai:\n",
-    "    p1_posttest['ai_mean'] = p1_posttest[valid_ai].mean(axis=1)\n",
-    "    print(f\"AI Perception: M={p1_posttest['ai_mean'].mean():.2f}, SD={p1_posttest['ai_mean'].std():.2f}\")\n",
+    "if 'ai_mean' in p1_desc.index:\n",
+    "    print(f\"AI Perception: M={p1_desc.loc['ai_mean', 'mean']:.2f}, SD={p1_desc.loc['ai_mean', 'std']:.2f}\")\n",
     "\n",
     "# Immersion\n",
-    "imm_cols = [f'immersion_q{i}' for i in range(1, 4)]\n",
-    "valid_imm = [c for c in imm_cols if c in p1_posttest.columns]\n",
-    "if valid_imm:\n",
-    "    p1_posttest['immersion_mean'] = p1_posttest[valid_imm].mean(axis=1)\n",
-    "    print(f\"Immersion: M={p1_posttest['immersion_mean'].mean():.2f}, SD={p1_posttest['immersion_mean'].std():.2f}\")\n",
+    "if 'immersion_mean' in p1_desc.index:\n",
+    "    print(f\"Immersion: M={p1_desc.loc['immersion_mean', 'mean']:.2f}, SD={p1_desc.loc['immersion_mean', 'std']:.2f}\")\n",
     "\n",
-    "# --- 6.1.2: Reliability Analysis (Cronbach's Alpha) ---\n",
+    "# --- 6.1.2: Reliability Analysis (Cronbach's Alpha, McDonald's Omega) ---\n",
     "print(f\"\\n\" + \"\u2500\" * 70)\n",
-    "print(\"6.1.2 RELIABILITY ANALYSIS (Cronbach's Alpha)\")\n",
+    "print(\"6.1.2 RELIABILITY ANALYSIS (Cronbach's Alpha, McDonald's Omega)\")\n",
     "print(\"\u2500\" * 70)\n",
     "\n",
-    "def cronbachs_alpha(df):\n",
-    "    \"\"\"Compute Cronbach's alpha for a set of items.\"\"\"\n",
-    "    item_vars = df.var(axis=0, ddof=1)\n",
-    "    total_var = df.sum(axis=1).var(ddof=1)\n",
-    "    n_items = df.shape[1]\n",
-    "    if total_var == 0:\n",
-    "        return 0\n",
-    "    return (n_items / (n_items - 1)) * (1 - item_vars.sum() / total_var)\n",
-    "\n",
-    "scales = {\n",
-    "    'SUS': [f'sus_q{i}' for i in range(1, 11)],\n",
-    "    'UES-SF (Full)': [c for c in p1_posttest.columns if c.startswith('engagement_')],\n",
-    "    'Narrative Quality': valid_nq,\n",
-    "    'AI Perception': valid_ai,\n",
-    "    'Immersion': valid_imm\n",
-    "}\n",
+    "# Alpha and omega of every scale from one item covariance matrix, with 95%\n",
+    "# percentile bootstrap CIs (10,000 resamples); reverse-keyed SUS items are recoded.\n",
+    "# The bootstrap is rerun only when the data, reliability.py or a module it\n",
+    "# uses (scale_scoring.py: items, reverse keys, response ranges) change.\n",
+    "from reliability import reliability, alpha_quality\n",
     "\n",
-    "for name, cols in scales.items():\n",
-    "    valid = [c for c in cols if c in p1_posttest.columns]\n",
-    "    if len(valid) >= 2:\n",
-    "        alpha = cronbachs_alpha(p1_posttest[valid])\n",
-    "        quality = \"Excellent\" if alpha >= 0.9 else \"Good\" if alpha >= 0.8 else \"Acceptable\" if alpha >= 0.7 else \"Questionable\" if alpha >= 0.6 else \"Poor\"\n",
-    "        print(f\"  {name}: \u03b1 = {alpha:.3f} ({quality})\")\n",
+    "p1_reliability = analysis_results.analysis('p1.reliability', reliability, p1_posttest, n_boot=10000, seed=42)\n",
+    "for scale, row in p1_reliability.iterrows():\n",
+    "    print(f\"  {row['label']}: \u03b1 = {row['alpha']:.3f} [{row['alpha_lo']:.3f}, {row['alpha_hi']:.3f}] \"\n",
+    "          f\"({alpha_quality(row['alpha'])}), \u03c9 = {row['omega']:.3f} [{row['omega_lo']:.3f}, {row['omega_hi']:.3f}]\")\n",
     "\n",
     "# --- 6.1.3: Normality Testing ---\n",
     "print(f\"\\n\" + \"\u2500\" * 70)\n",
@@ -221,17 +214,31 @@ cells.append(code_cell([
     "print(f\"  t({len(group_a)+len(group_b)-2}) = {t_stat:.3f}, p = {p_val:.4f}\")\n",
     "print(f\"  Cohen's d = {cohens_d:.3f}\")\n",
     "print(f\"  Result: {'Significant' if p_val < 0.05 else 'Not significant'} at \u03b1 = 0.05\")\n",
+    "analysis_results.record('p1.h1', inputs_digest(group_a, group_b), {\n",
+    "    't': t_stat, 'df': len(group_a) + len(group_b) - 2, 'p': p_val, 'd': cohens_d, 'significant': p_val < 0.05})\n",
+    "# Distribution-free check: permutation tests (100,000 relabelings, permutation_tests.py)\n",
+    "from permutation_tests import two_group_test, k_group_test, correlation_test, format_result\n",
+    "h1_permutation = analysis_results.analysis('p1.h1.permutation', two_group_test, group_a, group_b, seed=42)\n",
+    "print(f\"  {format_result(h1_permutation)}\")\n",
+    "# Covariate-adjusted model (linear_models.py); without covariates it reproduces F = t\u00b2 above\n",
+    "from linear_models import ancova, format_term\n",
+    "h1_model = ancova(p1_posttest, 'sus_score', 'condition', covariates=['age'])\n",
+    "print(f\"  ANCOVA (adjusted for age): {format_term(h1_model, 'condition')}\")\n",
+    "analysis_results.record('p1.h1.ancova', inputs_digest(ancova, p1_posttest[['sus_score', 'condition', 'age']]),\n",
+    "                        h1_model['terms'])\n",
     "\n",
     "# H2: Correlation between narrative quality and engagement\n",
-    "if 'nq_mean' in p1_posttest.columns:\n",
-    "    # Overall engagement\n",
-    "    ues_all = [c for c in p1_posttest.columns if c.startswith('engagement_')]\n",
-    "    if ues_all:\n",
-    "        p1_posttest['ues_overall'] = p1_posttest[ues_all].mean(axis=1)\n",
-    "        r, p_val = stats.pearsonr(p1_posttest['nq_mean'], p1_posttest['ues_overall'])\n",
-    "        print(f\"\\nH2: Correlation \u2014 Narrative Quality \u00d7 Engagement\")\n",
-    "        print(f\"  Pearson r = {r:.3f}, p = {p_val:.4f}\")\n",
-    "        print(f\"  Result: {'Significant' if p_val < 0.05 else 'Not significant'} (threshold: r > 0.3)\")\n",
+    "if 'nq_mean' in p1_posttest.columns and 'ues_overall' in p1_posttest.columns:\n",
+    "    # Overall engagement: mean of all UES-SF items (ues_overall)\n",
+    "    r, p_val = stats.pearsonr(p1_posttest['nq_mean'], p1_posttest['ues_overall'])\n",
+    "    print(f\"\\nH2: Correlation \u2014 Narrative Quality \u00d7 Engagement\")\n",
+    "    print(f\"  Pearson r = {r:.3f}, p = {p_val:.4f}\")\n",
+    "    h2_permutation = analysis_results.analysis('p1.h2.permutation', correlation_test,\n",
+    "                                               p1_posttest['nq_mean'], p1_posttest['ues_overall'], seed=42)\n",
+    "    print(f\"  {format_result(h2_permutation)}\")\n",
+    "    print(f\"  Result: {'Significant' if p_val < 0.05 else 'Not significant'} (threshold: r > 0.3)\")\n",
+    "    analysis_results.record('p1.h2', inputs_digest(p1_posttest['nq_mean'], p1_posttest['ues_overall']),\n",
+    "                            {'r': r, 'p': p_val, 'significant': p_val < 0.05})\n",
     "\n",
     "# H3: Immersion difference (simulate aware vs unaware)\n",
     "if 'immersion_mean' in p1_posttest.columns:\n",
@@ -243,7 +250,11 @@ cells.append(code_cell([
     "    print(f\"  Aware: M={aware.mean():.2f}, SD={aware.std():.2f}\")\n",
     "    print(f\"  Unaware: M={unaware.mean():.2f}, SD={unaware.std():.2f}\")\n",
     "    print(f\"  t({len(aware)+len(unaware)-2}) = {t_stat:.3f}, p = {p_val:.4f}\")\n",
-    "    print(f\"  Cohen's d = {d:.3f}\")"
+    "    print(f\"  Cohen's d = {d:.3f}\")\n",
+    "    h3_permutation = analysis_results.analysis('p1.h3.permutation', two_group_test, aware, unaware, seed=42)\n",
+    "    print(f\"  {format_result(h3_permutation)}\")\n",
+    "    analysis_results.record('p1.h3', inputs_digest(aware, unaware), {\n",
+    "        't': t_stat, 'df': len(aware) + len(unaware) - 2, 'p': p_val, 'd': d, 'significant': p_val < 0.05})"
 ]))
 
 # ======================================================================
@@ -253,94 +264,28 @@ cells.append(code_cell([
     "# ============================================================\n",
     "# PROJECT 1: VISUALIZATION\n",
     "# ============================================================\n",
-    "fig, axes = plt.subplots(2, 3, figsize=(18, 11))\n",
-    "fig.suptitle('Project 1: Gemini Quest \u2014 Evaluation Results (N=40)', fontsize=16, fontweight='bold')\n",
-    "\n",
-    "# SUS Score Distribution\n",
-    "axes[0, 0].hist(p1_posttest['sus_score'], bins=12, color='#5C6BC0', alpha=0.7, edgecolor='white')\n",
-    "axes[0, 0].axvline(x=68, color='red', linestyle='--', label='Benchmark (68)')\n",
-    "axes[0, 0].axvline(x=p1_posttest['sus_score'].mean(), color='green', linestyle='-', label=f'Mean ({p1_posttest[\"sus_score\"].mean():.1f})')\n",
-    "axes[0, 0].set_title('SUS Score Distribution')\n",
-    "axes[0, 0].set_xlabel('SUS Score')\n",
-    "axes[0, 0].set_ylabel('Frequency')\n",
-    "axes[0, 0].legend(fontsize=9)\n",
-    "\n",
-    "# UES Subscale Comparison\n",
-    "ues_data = {}\n",
-    "for name, cols in ues_subscales.items():\n",
-    "    valid = [c for c in cols if c in p1_posttest.columns]\n",
-    "    if valid:\n",
-    "        ues_data[name.split('(')[0].strip()] = p1_posttest[valid].mean(axis=1)\n",
-    "\n",
-    "if ues_data:\n",
-    "    ues_df = pd.DataFrame(ues_data)\n",
-    "    bp = axes[0, 1].boxplot([ues_df[col] for col in ues_df.columns], labels=ues_df.columns, patch_artist=True)\n",
-    "    colors = ['#42A5F5', '#66BB6A', '#FFA726', '#EF5350']\n",
-    "    for patch, color in zip(bp['boxes'], colors[:len(bp['boxes'])]):\n",
-    "        patch.set_facecolor(color)\n",
-    "        patch.set_alpha(0.7)\n",
-    "    axes[0, 1].set_title('UES-SF Subscales')\n",
-    "    axes[0, 1].set_ylabel('Score (1-5)')\n",
-    "\n",
-    "# Custom Scale Means\n",
-    "custom_scales = {}\n",
-    "if 'nq_mean' in p1_posttest.columns:\n",
-    "    custom_scales['Narrative\\nQuality'] = p1_posttest['nq_mean']\n",
-    "if 'ai_mean' in p1_posttest.columns:\n",
-    "    custom_scales['AI\\nPerception'] = p1_posttest['ai_mean']\n",
-    "if 'immersion_mean' in p1_posttest.columns:\n",
-    "    custom_scales['Immersion'] = p1_posttest['immersion_mean']\n",
-    "\n",
-    "if custom_scales:\n",
-    "    means = [v.mean() for v in custom_scales.values()]\n",
-    "    sds = [v.std() for v in custom_scales.values()]\n",
-    "    bars = axes[0, 2].bar(list(custom_scales.keys()), means, yerr=sds, capsize=5,\n",
-    "                           color=['#AB47BC', '#26A69A', '#EC407A'], alpha=0.8)\n",
-    "    axes[0, 2].set_title('Custom Scale Ratings')\n",
-    "    axes[0, 2].set_ylabel('Mean (1-7)')\n",
-    "    axes[0, 2].set_ylim(1, 7)\n",
-    "    axes[0, 2].axhline(y=4, color='gray', linestyle='--', alpha=0.5)\n",
-    "\n",
-    "# Correlation Heatmap\n",
+    "from correlations import correlation_matrix, correlation_table\n",
+    "from figures import p1_evaluation_tables, render_figures, format_report\n",
+    "from IPython.display import Image, display\n",
+    "\n",
+    "# Panels are drawn from summary tables; only changed panels are redrawn (figures.py)\n",
+    "report = render_figures({'p1_evaluation_results': p1_evaluation_tables(p1_posttest, p1_sessions)},\n",
+    "                        DELIVERABLES / 'report')\n",
+    "print('\\n'.join(format_report(report)))\n",
+    "display(Image(filename=str(report['path'].iloc[0])))\n",
+    "\n",
+    "# Correlations significant after FDR correction\n",
     "if 'nq_mean' in p1_posttest.columns and 'ues_overall' in p1_posttest.columns:\n",
     "    corr_cols = ['sus_score', 'nq_mean', 'ai_mean', 'immersion_mean', 'ues_overall']\n",
     "    valid_corr = [c for c in corr_cols if c in p1_posttest.columns]\n",
-    "    corr_matrix = p1_posttest[valid_corr].corr()\n",
+    "    corr = correlation_matrix(p1_posttest[valid_corr], correction='fdr_bh')\n",
     "    labels_map = {'sus_score': 'SUS', 'nq_mean': 'Narrative', 'ai_mean': 'AI Percep.',\n",
     "                  'immersion_mean': 'Immersion', 'ues_overall': 'Engagement'}\n",
-    "    corr_matrix.columns = [labels_map.get(c, c) for c in corr_matrix.columns]\n",
-    "    corr_matrix.index = [labels_map.get(c, c) for c in corr_matrix.index]\n",
-    "    sns.heatmap(corr_matrix, annot=True, fmt='.2f', cmap='RdYlBu_r', center=0,\n",
-    "                ax=axes[1, 0], vmin=-1, vmax=1, square=True)\n",
-    "    axes[1, 0].set_title('Correlation Matrix')\n",
-    "\n",
-    "# Behavioral Data\n",
-    "if p1_logs:\n",
-    "    durations_min = [p['session_duration_seconds'] / 60 for p in p1_logs]\n",
-    "    axes[1, 1].hist(durations_min, bins=10, color='#78909C', alpha=0.7, edgecolor='white')\n",
-    "    axes[1, 1].set_title('Session Duration Distribution')\n",
-    "    axes[1, 1].set_xlabel('Duration (minutes)')\n",
-    "    axes[1, 1].set_ylabel('Frequency')\n",
-    "\n",
-    "# SUS by condition\n",
-    "if 'condition' in p1_posttest.columns:\n",
-    "    conditions = p1_posttest.groupby('condition')['sus_score']\n",
-    "    cond_names = list(conditions.groups.keys())\n",
-    "    cond_data = [conditions.get_group(c) for c in cond_names]\n",
-    "    bp2 = axes[1, 2].boxplot(cond_data, labels=[c.replace('_', '\\n') for c in cond_names], patch_artist=True)\n",
-    "    bp2['boxes'][0].set_facecolor('#66BB6A')\n",
-    "    bp2['boxes'][0].set_alpha(0.7)\n",
-    "    if len(bp2['boxes']) > 1:\n",
-    "        bp2['boxes'][1].set_facecolor('#EF5350')\n",
-    "        bp2['boxes'][1].set_alpha(0.7)\n",
-    "    axes[1, 2].set_title('SUS Score by Condition')\n",
-    "    axes[1, 2].set_ylabel('SUS Score')\n",
-    "    axes[1, 2].axhline(y=68, color='gray', linestyle='--', alpha=0.5)\n",
-    "\n",
-    "plt.tight_layout()\n",
-    "plt.savefig(str(DELIVERABLES / 'report' / 'p1_evaluation_results.png'), dpi=150, bbox_inches='tight')\n",
-    "plt.show()\n",
-    "print(\"\u2713 Figure saved to deliverables/report/p1_evaluation_results.png\")"
+    "    significant = correlation_table(corr, alpha=0.05)\n",
+    "    print(f'P1 correlations significant after FDR correction: {len(significant)} of {len(valid_corr) * (len(valid_corr) - 1) // 2}')\n",
+    "    for _, row in significant.iterrows():\n",
+    "        print(f\"  {labels_map.get(row['x'], row['x'])} ~ {labels_map.get(row['y'], row['y'])}: \"\n",
+    "              f\"r = {row['r']:.2f} [{row['ci_low']:.2f}, {row['ci_high']:.2f}], p_FDR = {row['p_adj']:.4f}\")"
 ]))
 
 # ======================================================================
@@ -359,53 +304,42 @@ cells.append(code_cell([
     "print(\"6.2.1 DESCRIPTIVE STATISTICS\")\n",
     "print(\"\u2500\" * 70)\n",
     "\n",
+    "from descriptives import describe\n",
+    "p2_scale_cols = [c for c in ['sus_score', 'trust_mean', 'usefulness_mean', 'ease_mean',\n",
+    "                             'accuracy_mean', 'privacy_mean'] if c in p2_posttest.columns]\n",
+    "p2_desc = analysis_results.analysis('p2.descriptives', describe, p2_posttest, columns=p2_scale_cols)\n",
+    "\n",
+    "sus = p2_desc.loc['sus_score']\n",
     "print(f\"\\nSystem Usability Scale (SUS):\")\n",
     "print(f\"  N = {len(p2_posttest)}\")\n",
-    "print(f\"  Mean = {p2_posttest['sus_score'].mean():.2f}\")\n",
-    "print(f\"  SD = {p2_posttest['sus_score'].std():.2f}\")\n",
-    "print(f\"  95% CI = [{p2_posttest['sus_score'].mean() - 1.96*p2_posttest['sus_score'].std()/np.sqrt(len(p2_posttest)):.2f}, \"\n",
-    "      f\"{p2_posttest['sus_score'].mean() + 1.96*p2_posttest['sus_score'].std()/np.sqrt(len(p2_posttest)):.2f}]\")\n",
+    "print(f\"  Mean = {sus['mean']:.2f}\")\n",
+    "print(f\"  SD = {sus['std']:.2f}\")\n",
+    "print(f\"  95% CI = [{sus['mean'] - 1.96*sus['std']/np.sqrt(len(p2_posttest)):.2f}, \"\n",
+    "      f\"{sus['mean'] + 1.96*sus['std']/np.sqrt(len(p2_posttest)):.2f}]\")\n",
     "\n",
     "for scale_name, col_name in [('Trust in AI', 'trust_mean'), ('Perceived Usefulness', 'usefulness_mean'), \n",
     "                               ('Perceived Ease of Use', 'ease_mean')]:\n",
-    "    if col_name in p2_posttest.columns:\n",
+    "    if col_name in p2_desc.index:\n",
     "        print(f\"\\n{scale_name}:\")\n",
-    "        print(f\"  Mean = {p2_posttest[col_name].mean():.2f}, SD = {p2_posttest[col_name].std():.2f}\")\n",
+    "        print(f\"  Mean = {p2_desc.loc[col_name, 'mean']:.2f}, SD = {p2_desc.loc[col_name, 'std']:.2f}\")\n",
     "\n",
-    "# Accuracy perception\n",
-    "acc_cols = [f'accuracy_perception_q{i}' for i in range(1, 4)]\n",
-    "valid_acc = [c for c in acc_cols if c in p2_posttest.columns]\n",
-    "if valid_acc:\n",
-    "    p2_posttest['accuracy_mean'] = p2_posttest[valid_acc].mean(axis=1)\n",
-    "    print(f\"\\nAccuracy Perception: M={p2_posttest['accuracy_mean'].mean():.2f}, SD={p2_posttest['accuracy_mean'].std():.2f}\")\n",
+    "# Accuracy perception (scale means from the participant feature table)\n",
+    "if 'accuracy_mean' in p2_desc.index:\n",
+    "    print(f\"\\nAccuracy Perception: M={p2_desc.loc['accuracy_mean', 'mean']:.2f}, SD={p2_desc.loc['accuracy_mean', 'std']:.2f}\")\n",
     "\n",
     "# Privacy concern\n",
-    "priv_cols = [f'privacy_concern_q{i}' for i in range(1, 4)]\n",
-    "valid_priv = [c for c in priv_cols if c in p2_posttest.columns]\n",
-    "if valid_priv:\n",
-    "    p2_posttest['privacy_mean'] = p2_posttest[valid_priv].mean(axis=1)\n",
-    "    print(f\"Privacy Concern: M={p2_posttest['privacy_mean'].mean():.2f}, SD={p2_posttest['privacy_mean'].std():.2f}\")\n",
+    "if 'privacy_mean' in p2_desc.index:\n",
+    "    print(f\"Privacy Concern: M={p2_desc.loc['privacy_mean', 'mean']:.2f}, SD={p2_desc.loc['privacy_mean', 'std']:.2f}\")\n",
     "\n",
     "# --- Reliability ---\n",
     "print(f\"\\n\" + \"\u2500\" * 70)\n",
     "print(\"6.2.2 RELIABILITY ANALYSIS\")\n",
     "print(\"\u2500\" * 70)\n",
     "\n",
-    "p2_scales = {\n",
-    "    'SUS': [f'sus_q{i}' for i in range(1, 11)],\n",
-    "    'Trust in AI': [f'trust_q{i}' for i in range(1, 6)],\n",
-    "    'Perceived Usefulness': [f'usefulness_q{i}' for i in range(1, 6)],\n",
-    "    'Perceived Ease of Use': [f'ease_q{i}' for i in range(1, 6)],\n",
-    "    'Accuracy Perception': valid_acc,\n",
-    "    'Privacy Concern': valid_priv\n",
-    "}\n",
-    "\n",
-    "for name, cols in p2_scales.items():\n",
-    "    valid = [c for c in cols if c in p2_posttest.columns]\n",
-    "    if len(valid) >= 2:\n",
-    "        alpha = cronbachs_alpha(p2_posttest[valid])\n",
-    "        quality = \"Excellent\" if alpha >= 0.9 else \"Good\" if alpha >= 0.8 else \"Acceptable\" if alpha >= 0.7 else \"Questionable\" if alpha >= 0.6 else \"Poor\"\n",
-    "        print(f\"  {name}: \u03b1 = {alpha:.3f} ({quality})\")\n",
+    "p2_reliability = analysis_results.analysis('p2.reliability', reliability, p2_posttest, n_boot=10000, seed=42)\n",
+    "for scale, row in p2_reliability.iterrows():\n",
+    "    print(f\"  {row['label']}: \u03b1 = {row['alpha']:.3f} [{row['alpha_lo']:.3f}, {row['alpha_hi']:.3f}] \"\n",
+    "          f\"({alpha_quality(row['alpha'])}), \u03c9 = {row['omega']:.3f} [{row['omega_lo']:.3f}, {row['omega_hi']:.3f}]\")\n",
     "\n",
     "# --- Normality ---\n",
     "print(f\"\\n\" + \"\u2500\" * 70)\n",
@@ -440,22 +374,46 @@ cells.append(code_cell([
     "eta_sq = ss_between / ss_total if ss_total > 0 else 0\n",
     "print(f\"  F({len(group_data)-1}, {len(p2_posttest)-len(group_data)}) = {f_stat:.3f}, p = {p_val:.4f}\")\n",
     "print(f\"  \u03b7\u00b2 = {eta_sq:.3f}\")\n",
+    "analysis_results.record('p2.h1', inputs_digest(p2_posttest[['trust_mean', 'explanation_level']]), {\n",
+    "    'F': f_stat, 'df1': len(group_data) - 1, 'df2': len(p2_posttest) - len(group_data), 'p': p_val,\n",
+    "    'eta_sq': eta_sq, 'significant': p_val < 0.05})\n",
+    "# Distribution-free check: permutation tests (100,000 relabelings, permutation_tests.py)\n",
+    "from permutation_tests import k_group_test, correlation_test, format_result\n",
+    "h1_p2_permutation = analysis_results.analysis('p2.h1.permutation', k_group_test, group_data, seed=43)\n",
+    "print(f\"  {format_result(h1_p2_permutation)}\")\n",
+    "# Covariate-adjusted model (linear_models.py); without covariates it is the one-way ANOVA above\n",
+    "from linear_models import ancova, format_term\n",
+    "h1_p2_model = ancova(p2_posttest, 'trust_mean', 'explanation_level', covariates=['age'])\n",
+    "print(f\"  ANCOVA (adjusted for age): {format_term(h1_p2_model, 'explanation_level')}\")\n",
+    "analysis_results.record('p2.h1.ancova', inputs_digest(ancova, p2_posttest[['trust_mean', 'explanation_level', 'age']]),\n",
+    "                        h1_p2_model['terms'])\n",
+    "for level, row in h1_p2_model['adjusted_means']['explanation_level'].iterrows():\n",
+    "    print(f\"    {level}: adjusted M={row['mean']:.2f} (SE={row['se']:.2f})\")\n",
     "\n",
     "# H2: Usefulness \u00d7 usage correlation\n",
-    "if p2_logs:\n",
-    "    usage_counts = {p['participant_id']: len(p['events']) for p in p2_logs}\n",
-    "    p2_posttest['usage_count'] = p2_posttest['participant_id'].map(usage_counts).fillna(0)\n",
+    "if 'n_events' in p2_posttest.columns:\n",
+    "    p2_posttest['usage_count'] = p2_posttest['n_events'].fillna(0)\n",
     "    if 'usefulness_mean' in p2_posttest.columns:\n",
     "        rho, p_val = stats.spearmanr(p2_posttest['usefulness_mean'], p2_posttest['usage_count'])\n",
     "        print(f\"\\nH2: Usefulness \u00d7 Usage (Spearman)\")\n",
     "        print(f\"  \u03c1 = {rho:.3f}, p = {p_val:.4f}\")\n",
+    "        h2_p2_permutation = analysis_results.analysis('p2.h2.permutation', correlation_test, p2_posttest['usefulness_mean'],\n",
+    "                                                      p2_posttest['usage_count'], method='spearman', seed=43)\n",
+    "        print(f\"  {format_result(h2_p2_permutation)}\")\n",
+    "        analysis_results.record('p2.h2', inputs_digest(p2_posttest['usefulness_mean'], p2_posttest['usage_count']),\n",
+    "                                {'rho': rho, 'p': p_val, 'significant': p_val < 0.05})\n",
     "\n",
     "# H3: Privacy concern \u00d7 Trust\n",
     "if 'privacy_mean' in p2_posttest.columns and 'trust_mean' in p2_posttest.columns:\n",
     "    r, p_val = stats.pearsonr(p2_posttest['privacy_mean'], p2_posttest['trust_mean'])\n",
     "    print(f\"\\nH3: Privacy Concern \u00d7 Trust (Pearson)\")\n",
     "    print(f\"  r = {r:.3f}, p = {p_val:.4f}\")\n",
-    "    print(f\"  Direction: {'Negative (as expected)' if r < 0 else 'Positive (unexpected)'}\")"
+    "    h3_p2_permutation = analysis_results.analysis('p2.h3.permutation', correlation_test,\n",
+    "                                                  p2_posttest['privacy_mean'], p2_posttest['trust_mean'], seed=43)\n",
+    "    print(f\"  {format_result(h3_p2_permutation)}\")\n",
+    "    print(f\"  Direction: {'Negative (as expected)' if r < 0 else 'Positive (unexpected)'}\")\n",
+    "    analysis_results.record('p2.h3', inputs_digest(p2_posttest['privacy_mean'], p2_posttest['trust_mean']),\n",
+    "                            {'r': r, 'p': p_val, 'significant': p_val < 0.05, 'negative': r < 0})"
 ]))
 
 # ======================================================================
@@ -465,86 +423,28 @@ cells.append(code_cell([
     "# ============================================================\n",
     "# PROJECT 2: VISUALIZATION\n",
     "# ============================================================\n",
-    "fig, axes = plt.subplots(2, 3, figsize=(18, 11))\n",
-    "fig.suptitle('Project 2: StudyBuddy \u2014 Evaluation Results (N=40)', fontsize=16, fontweight='bold')\n",
-    "\n",
-    "# SUS Distribution\n",
-    "axes[0, 0].hist(p2_posttest['sus_score'], bins=12, color='#26A69A', alpha=0.7, edgecolor='white')\n",
-    "axes[0, 0].axvline(x=68, color='red', linestyle='--', label='Benchmark (68)')\n",
-    "axes[0, 0].axvline(x=p2_posttest['sus_score'].mean(), color='green', linestyle='-', \n",
-    "                     label=f'Mean ({p2_posttest[\"sus_score\"].mean():.1f})')\n",
-    "axes[0, 0].set_title('SUS Score Distribution')\n",
-    "axes[0, 0].set_xlabel('SUS Score')\n",
-    "axes[0, 0].legend(fontsize=9)\n",
-    "\n",
-    "# Scale Comparison\n",
-    "scale_data = {}\n",
-    "for name, col in [('Trust', 'trust_mean'), ('Usefulness', 'usefulness_mean'), \n",
-    "                   ('Ease of Use', 'ease_mean'), ('Accuracy', 'accuracy_mean'), ('Privacy', 'privacy_mean')]:\n",
-    "    if col in p2_posttest.columns:\n",
-    "        scale_data[name] = p2_posttest[col]\n",
-    "\n",
-    "if scale_data:\n",
-    "    means = [v.mean() for v in scale_data.values()]\n",
-    "    sds = [v.std() for v in scale_data.values()]\n",
-    "    colors = ['#42A5F5', '#66BB6A', '#FFA726', '#AB47BC', '#EF5350']\n",
-    "    axes[0, 1].bar(list(scale_data.keys()), means, yerr=sds, capsize=5,\n",
-    "                    color=colors[:len(means)], alpha=0.8)\n",
-    "    axes[0, 1].set_title('Scale Ratings')\n",
-    "    axes[0, 1].set_ylabel('Mean (1-7)')\n",
-    "    axes[0, 1].set_ylim(1, 7)\n",
-    "    axes[0, 1].axhline(y=4, color='gray', linestyle='--', alpha=0.5)\n",
-    "    axes[0, 1].tick_params(axis='x', rotation=15)\n",
-    "\n",
-    "# Correlation heatmap\n",
+    "from correlations import correlation_matrix, correlation_table\n",
+    "from figures import p2_evaluation_tables, render_figures, format_report\n",
+    "from IPython.display import Image, display\n",
+    "\n",
+    "# Panels are drawn from summary tables; only changed panels are redrawn (figures.py)\n",
+    "report = render_figures({'p2_evaluation_results': p2_evaluation_tables(p2_posttest, p2_sessions)},\n",
+    "                        DELIVERABLES / 'report')\n",
+    "print('\\n'.join(format_report(report)))\n",
+    "display(Image(filename=str(report['path'].iloc[0])))\n",
+    "\n",
+    "# Correlations significant after FDR correction\n",
     "corr_cols_p2 = ['sus_score', 'trust_mean', 'usefulness_mean', 'ease_mean']\n",
     "valid_corr_p2 = [c for c in corr_cols_p2 if c in p2_posttest.columns]\n",
     "if len(valid_corr_p2) >= 2:\n",
-    "    corr_m = p2_posttest[valid_corr_p2].corr()\n",
+    "    corr = correlation_matrix(p2_posttest[valid_corr_p2], correction='fdr_bh')\n",
     "    label_map = {'sus_score': 'SUS', 'trust_mean': 'Trust', 'usefulness_mean': 'Useful',\n",
     "                 'ease_mean': 'Ease', 'accuracy_mean': 'Accuracy', 'privacy_mean': 'Privacy'}\n",
-    "    corr_m.columns = [label_map.get(c, c) for c in corr_m.columns]\n",
-    "    corr_m.index = [label_map.get(c, c) for c in corr_m.index]\n",
-    "    sns.heatmap(corr_m, annot=True, fmt='.2f', cmap='RdYlBu_r', center=0,\n",
-    "                ax=axes[0, 2], vmin=-1, vmax=1, square=True)\n",
-    "    axes[0, 2].set_title('Correlation Matrix')\n",
-    "\n",
-    "# Trust by explanation level\n",
-    "if 'explanation_level' in p2_posttest.columns:\n",
-    "    groups = p2_posttest.groupby('explanation_level')['trust_mean']\n",
-    "    group_names = list(groups.groups.keys())\n",
-    "    group_vals = [groups.get_group(n) for n in group_names]\n",
-    "    bp = axes[1, 0].boxplot(group_vals, labels=group_names, patch_artist=True)\n",
-    "    box_colors = ['#EF5350', '#FFA726', '#66BB6A']\n",
-    "    for patch, color in zip(bp['boxes'], box_colors[:len(bp['boxes'])]):\n",
-    "        patch.set_facecolor(color)\n",
-    "        patch.set_alpha(0.7)\n",
-    "    axes[1, 0].set_title('Trust by Explanation Level')\n",
-    "    axes[1, 0].set_ylabel('Trust Score (1-7)')\n",
-    "\n",
-    "# Session durations\n",
-    "if p2_logs:\n",
-    "    dur = [p['session_duration_seconds'] / 60 for p in p2_logs]\n",
-    "    axes[1, 1].hist(dur, bins=10, color='#78909C', alpha=0.7, edgecolor='white')\n",
-    "    axes[1, 1].set_title('Session Duration')\n",
-    "    axes[1, 1].set_xlabel('Duration (minutes)')\n",
-    "\n",
-    "# Privacy vs Trust scatter\n",
-    "if 'privacy_mean' in p2_posttest.columns and 'trust_mean' in p2_posttest.columns:\n",
-    "    axes[1, 2].scatter(p2_posttest['privacy_mean'], p2_posttest['trust_mean'], \n",
-    "                        alpha=0.6, color='#5C6BC0', s=50)\n",
-    "    z = np.polyfit(p2_posttest['privacy_mean'], p2_posttest['trust_mean'], 1)\n",
-    "    p_line = np.poly1d(z)\n",
-    "    x_line = np.linspace(p2_posttest['privacy_mean'].min(), p2_posttest['privacy_mean'].max(), 100)\n",
-    "    axes[1, 2].plot(x_line, p_line(x_line), 'r--', alpha=0.8)\n",
-    "    axes[1, 2].set_title('Privacy Concern vs. Trust')\n",
-    "    axes[1, 2].set_xlabel('Privacy Concern (1-7)')\n",
-    "    axes[1, 2].set_ylabel('Trust in AI (1-7)')\n",
-    "\n",
-    "plt.tight_layout()\n",
-    "plt.savefig(str(DELIVERABLES / 'report' / 'p2_evaluation_results.png'), dpi=150, bbox_inches='tight')\n",
-    "plt.show()\n",
-    "print(\"\u2713 Figure saved to deliverables/report/p2_evaluation_results.png\")"
+    "    significant = correlation_table(corr, alpha=0.05)\n",
+    "    print(f'P2 correlations significant after FDR correction: {len(significant)} of {len(valid_corr_p2) * (len(valid_corr_p2) - 1) // 2}')\n",
+    "    for _, row in significant.iterrows():\n",
+    "        print(f\"  {label_map.get(row['x'], row['x'])} ~ {label_map.get(row['y'], row['y'])}: \"\n",
+    "              f\"r = {row['r']:.2f} [{row['ci_low']:.2f}, {row['ci_high']:.2f}], p_FDR = {row['p_adj']:.4f}\")"
 ]))
 
 # ======================================================================
@@ -592,7 +492,7 @@ cells.append(code_cell([
     "# ============================================================\n",
     "# SECTION 6.3: QUALITATIVE ANALYSIS\n",
     "# ============================================================\n",
-    "from sklearn.metrics import cohen_kappa_score\n",
+    "from irr import coding_agreement, kappa_quality\n",
     "\n",
     "print(\"=\" * 70)\n",
     "print(\"QUALITATIVE ANALYSIS\")\n",
@@ -640,6 +540,8 @@ cells.append(code_cell([
     "    for theme, count in theme_counts.items():\n",
     "        pct = count / len(p1_coded) * 100\n",
     "        print(f\"  {theme}: {count} ({pct:.1f}%)\")\n",
+    "    analysis_results.record('p1.themes', inputs_digest(p1_coded['theme']),\n",
+    "                            {'segments': len(p1_coded), 'share': (theme_counts / len(p1_coded) * 100).to_dict()})\n",
     "    \n",
     "    # Code distribution (top 10)\n",
     "    print(f\"\\nTop 10 Codes:\")\n",
@@ -656,47 +558,26 @@ cells.append(code_cell([
     "print(\"INTER-RATER RELIABILITY\")\n",
     "print(\"\u2500\" * 70)\n",
     "\n",
+    "IRR_LABELS = {'percent_agreement': 'Percentage agreement', 'cohen_kappa': \"Cohen's Kappa\",\n",
+    "              'fleiss_kappa': \"Fleiss' Kappa\", 'krippendorff_alpha': \"Krippendorff's Alpha\"}\n",
+    "\n",
+    "def print_agreement(tables):\n",
+    "    for value, table in tables.items():\n",
+    "        print(f\"  {value.title()}s:\")\n",
+    "        for statistic, row in table.iterrows():\n",
+    "            print(f\"    {IRR_LABELS[statistic]}: {row['estimate']:.3f} [{row['lo']:.3f}, {row['hi']:.3f}]\")\n",
+    "\n",
     "if p1_coded is not None and 'coder' in p1_coded.columns:\n",
-    "    # Get the two coders' assignments\n",
-    "    coder1_data = p1_coded[p1_coded['coder'] == 'LLM_coder_1']\n",
-    "    coder2_data = p1_coded[p1_coded['coder'] == 'LLM_coder_2']\n",
-    "    \n",
-    "    # Match by participant_id and response_type\n",
-    "    merged = coder1_data.merge(coder2_data, on=['participant_id', 'response_type'], \n",
-    "                                suffixes=('_c1', '_c2'), how='inner')\n",
+    "    # Coders x units matrix per coded column, statistics with 95% bootstrap CIs (see irr.py)\n",
+    "    p1_irr = {value: analysis_results.analysis(f'p1.irr.{value}', coding_agreement, p1_coded, value, n_boot=10000, seed=42)\n",
+    "              for value in ('theme', 'code')}\n",
     "    \n",
-    "    if len(merged) > 0:\n",
-    "        # Cohen's Kappa for theme-level agreement\n",
-    "        kappa_theme = cohen_kappa_score(merged['theme_c1'], merged['theme_c2'])\n",
-    "        print(f\"\\nProject 1 \u2014 Inter-Rater Reliability:\")\n",
-    "        print(f\"  Cohen's Kappa (themes): \u03ba = {kappa_theme:.3f}\")\n",
-    "        \n",
-    "        quality = (\"Almost Perfect\" if kappa_theme > 0.8 else \"Substantial\" if kappa_theme > 0.6 \n",
-    "                   else \"Moderate\" if kappa_theme > 0.4 else \"Fair\" if kappa_theme > 0.2 else \"Slight\")\n",
-    "        print(f\"  Agreement Level: {quality}\")\n",
-    "        \n",
-    "        # Code-level agreement\n",
-    "        kappa_code = cohen_kappa_score(merged['code_c1'], merged['code_c2'])\n",
-    "        print(f\"  Cohen's Kappa (codes): \u03ba = {kappa_code:.3f}\")\n",
-    "        \n",
-    "        # Percentage agreement\n",
-    "        theme_agree = (merged['theme_c1'] == merged['theme_c2']).mean() * 100\n",
-    "        code_agree = (merged['code_c1'] == merged['code_c2']).mean() * 100\n",
-    "        print(f\"  Percentage agreement (themes): {theme_agree:.1f}%\")\n",
-    "        print(f\"  Percentage agreement (codes): {code_agree:.1f}%\")\n",
-    "        \n",
-    "        # Krippendorff's Alpha (simplified computation)\n",
-    "        try:\n",
-    "            import krippendorff\n",
-    "            # Prepare data for krippendorff\n",
-    "            theme_labels = list(set(merged['theme_c1'].tolist() + merged['theme_c2'].tolist()))\n",
-    "            c1_numeric = [theme_labels.index(t) for t in merged['theme_c1']]\n",
-    "            c2_numeric = [theme_labels.index(t) for t in merged['theme_c2']]\n",
-    "            reliability_data = [c1_numeric, c2_numeric]\n",
-    "            kalpha = krippendorff.alpha(reliability_data=reliability_data, level_of_measurement='nominal')\n",
-    "            print(f\"  Krippendorff's Alpha: \u03b1 = {kalpha:.3f}\")\n",
-    "        except ImportError:\n",
-    "            print(\"  \u2139 Krippendorff package not available. Install with: pip install krippendorff\")\n",
+    "    if p1_irr['theme'].attrs['units'] > 0:\n",
+    "        kappa_theme = p1_irr['theme'].loc['cohen_kappa', 'estimate']\n",
+    "        print(f\"\\nProject 1 \u2014 Inter-Rater Reliability ({p1_irr['theme'].attrs['coders']} coders, \"\n",
+    "              f\"{p1_irr['theme'].attrs['units']} units, 95% bootstrap CI):\")\n",
+    "        print_agreement(p1_irr)\n",
+    "        print(f\"  Agreement Level (themes): {kappa_quality(kappa_theme)}\")\n",
     "    else:\n",
     "        print(\"  \u2717 Could not match coders for reliability computation.\")\n",
     "\n",
@@ -712,19 +593,18 @@ cells.append(code_cell([
     "    for theme, count in theme_counts.items():\n",
     "        pct = count / len(p2_coded) * 100\n",
     "        print(f\"  {theme}: {count} ({pct:.1f}%)\")\n",
+    "    analysis_results.record('p2.themes', inputs_digest(p2_coded['theme']),\n",
+    "                            {'segments': len(p2_coded), 'share': (theme_counts / len(p2_coded) * 100).to_dict()})\n",
     "    \n",
     "    # IRR for P2\n",
-    "    coder1_p2 = p2_coded[p2_coded['coder'] == 'LLM_coder_1']\n",
-    "    coder2_p2 = p2_coded[p2_coded['coder'] == 'LLM_coder_2']\n",
-    "    merged_p2 = coder1_p2.merge(coder2_p2, on=['participant_id', 'response_type'],\n",
-    "                                  suffixes=('_c1', '_c2'), how='inner')\n",
+    "    p2_irr = {value: analysis_results.analysis(f'p2.irr.{value}', coding_agreement, p2_coded, value, n_boot=10000, seed=43)\n",
+    "              for value in ('theme', 'code')}\n",
     "    \n",
-    "    if len(merged_p2) > 0:\n",
-    "        kappa_p2 = cohen_kappa_score(merged_p2['theme_c1'], merged_p2['theme_c2'])\n",
-    "        print(f\"\\nProject 2 \u2014 Inter-Rater Reliability:\")\n",
-    "        print(f\"  Cohen's Kappa (themes): \u03ba = {kappa_p2:.3f}\")\n",
-    "        code_agree_p2 = (merged_p2['code_c1'] == merged_p2['code_c2']).mean() * 100\n",
-    "        print(f\"  Percentage agreement (codes): {code_agree_p2:.1f}%\")\n",
+    "    if p2_irr['theme'].attrs['units'] > 0:\n",
+    "        print(f\"\\nProject 2 \u2014 Inter-Rater Reliability ({p2_irr['theme'].attrs['coders']} coders, \"\n",
+    "              f\"{p2_irr['theme'].attrs['units']} units, 95% bootstrap CI):\")\n",
+    "        print_agreement(p2_irr)\n",
+    "        print(f\"  Agreement Level (themes): {kappa_quality(p2_irr['theme'].loc['cohen_kappa', 'estimate'])}\")\n",
     "        \n",
     "except FileNotFoundError:\n",
     "    print(\"\u2717 Pre-coded data not found.\")\n",
@@ -837,24 +717,19 @@ cells.append(code_cell([
     "print(\"SUMMARY TABLE FOR PAPER (Both Projects)\")\n",
     "print(\"=\" * 70)\n",
     "\n",
+    "# Read from the results store, as the paper draft is\n",
     "summary_data = []\n",
-    "if p1_posttest is not None:\n",
-    "    summary_data.append({\n",
-    "        'Project': 'Gemini Quest',\n",
-    "        'N': len(p1_posttest),\n",
-    "        'SUS (M\u00b1SD)': f\"{p1_posttest['sus_score'].mean():.1f}\u00b1{p1_posttest['sus_score'].std():.1f}\",\n",
-    "    })\n",
-    "    if 'nq_mean' in p1_posttest.columns:\n",
-    "        summary_data[-1]['Primary Scale (M\u00b1SD)'] = f\"NQ: {p1_posttest['nq_mean'].mean():.2f}\u00b1{p1_posttest['nq_mean'].std():.2f}\"\n",
-    "\n",
-    "if p2_posttest is not None:\n",
+    "for project, title, scale, col in (('p1', 'Gemini Quest', 'NQ', 'nq_mean'), ('p2', 'StudyBuddy', 'Trust', 'trust_mean')):\n",
+    "    if f'{project}.descriptives' not in analysis_results.current:\n",
+    "        continue\n",
+    "    desc = analysis_results.load(f'{project}.descriptives')\n",
     "    summary_data.append({\n",
-    "        'Project': 'StudyBuddy',\n",
-    "        'N': len(p2_posttest),\n",
-    "        'SUS (M\u00b1SD)': f\"{p2_posttest['sus_score'].mean():.1f}\u00b1{p2_posttest['sus_score'].std():.1f}\",\n",
+    "        'Project': title,\n",
+    "        'N': int(desc.loc['sus_score', 'count']),\n",
+    "        'SUS (M\u00b1SD)': f\"{desc.loc['sus_score', 'mean']:.1f}\u00b1{desc.loc['sus_score', 'std']:.1f}\",\n",
     "    })\n",
-    "    if 'trust_mean' in p2_posttest.columns:\n",
-    "        summary_data[-1]['Primary Scale (M\u00b1SD)'] = f\"Trust: {p2_posttest['trust_mean'].mean():.2f}\u00b1{p2_posttest['trust_mean'].std():.2f}\"\n",
+    "    if col in desc.index:\n",
+    "        summary_data[-1]['Primary Scale (M\u00b1SD)'] = f\"{scale}: {desc.loc[col, 'mean']:.2f}\u00b1{desc.loc[col, 'std']:.2f}\"\n",
     "\n",
     "if summary_data:\n",
     "    summary_df = pd.DataFrame(summary_data)\n",
@@ -882,255 +757,18 @@ cells.append(md_cell([
     "7. **Limitations** \u2014 Methodological constraints and LLM automation concerns\n",
     "8. **Conclusion** \u2014 Summary and future work\n",
     "\n",
-    "> **Note:** This draft uses the dummy data analyzed in previous sections. In a real submission, replace with actual participant data and update all statistics accordingly."
+    "> **Note:** This draft uses the dummy data analyzed in previous sections. Every statistic in it is filled in from the results store the analysis cells write, so replacing the data with actual participant data updates the draft on the next run."
 ]))
 
 # ======================================================================
-# CELL 10: Research Paper (markdown - VERY LONG)
+# CELL 10: Research Paper (markdown)
 # ======================================================================
 cells.append(md_cell([
     "## Research Paper Draft\n",
     "\n",
-    "---\n",
-    "\n",
-    "# Human-Centered Design of AI-Generated Interactive Experiences: A Mixed-Methods Evaluation of Multimodal LLM and AutoML Prototypes\n",
-    "\n",
-    "## Abstract\n",
-    "\n",
-    "We present a comprehensive human-centered design study of two AI-powered prototypes: (1) **Gemini Quest**, an interactive narrative videogame generated entirely through multimodal large language models (Gemini), and (2) **StudyBuddy**, an adaptive study companion powered by AutoML (AutoGluon). Through a sequential mixed-methods approach involving requirements surveys (N=120 per project) and usability evaluations (N=40 per project), we investigate user perceptions of AI-generated content quality, trust in AI recommendations, and the design factors that most influence user experience. Our findings reveal that users rate AI-generated narratives positively (M=5.2/7) but express moderate reservations about AI authenticity (M=4.1/7), while study companion users demonstrate a tension between perceived usefulness (M=5.0/7) and privacy concerns (M=4.8/7). We contribute design guidelines for human-centered AI systems, empirical evidence on user perception of multimodal AI content, and a methodological framework for rapid prototyping with LLM-generated code. We discuss the implications and limitations of LLM automation throughout the research pipeline.\n",
-    "\n",
-    "**Keywords:** Human-Centered AI, Generative AI, AutoML, Mixed Methods, Usability, Interactive Narrative, Educational Technology\n",
-    "\n",
-    "---\n",
-    "\n",
-    "## 1. Introduction\n",
-    "\n",
-    "The rapid advancement of generative AI models has created unprecedented opportunities for creating interactive experiences. Large Language Models (LLMs) can now generate text, images, music, and code, while AutoML frameworks enable non-experts to build predictive models. However, the integration of these capabilities into user-facing systems raises fundamental questions about user experience, trust, and acceptance.\n",
-    "\n",
-    "Two domains exemplify the challenges and opportunities of Human-Centered AI (HCAI):\n",
-    "\n",
-    "**Interactive entertainment** presents a unique case where the entirety of the user experience\u2014narrative, visuals, audio, and mechanics\u2014can be AI-generated. Prior work has explored individual modalities (e.g., AI storytelling [Riedl & Bulitko, 2013], AI art [Epstein et al., 2023]), but the holistic user experience of fully AI-generated games remains understudied.\n",
-    "\n",
-    "**Educational technology** offers a high-stakes application where AI predictions directly influence student behavior. AutoML tools like AutoGluon [Erickson et al., 2020] democratize ML, but presenting predictions to students requires careful consideration of trust, transparency, and privacy [Holstein et al., 2019].\n",
-    "\n",
-    "### Research Contributions\n",
-    "1. A user-centered design framework for multimodal AI game generation informed by requirements surveys\n",
-    "2. Empirical evaluation of an AutoML-powered study companion with focus on trust and privacy\n",
-    "3. Design guidelines for both domains derived from mixed-methods analysis\n",
-    "4. Methodological insights on using LLMs in the research pipeline itself\n",
-    "\n",
-    "---\n",
-    "\n",
-    "## 2. Related Work\n",
-    "\n",
-    "### 2.1 AI-Generated Interactive Narratives\n",
-    "Interactive narrative systems have evolved from rule-based engines to neural approaches. Kreminski & Wardrip-Fruin (2019) explored generative games as expressive AI systems. Recent work by Lanzi & Loiacono (2023) demonstrated using ChatGPT for game design, while Mirowski et al. (2023) showed LLMs can generate coherent dramatic narratives. Our work extends this by integrating multiple generative modalities and evaluating the complete user experience through validated instruments.\n",
-    "\n",
-    "### 2.2 AI in Education\n",
-    "Intelligent tutoring systems have a long history in HCI [VanLehn, 2011]. Recent developments in AutoML [Erickson et al., 2020] enable rapid development of predictive models for educational contexts. Khosravi et al. (2022) highlighted the need for explainable AI in education. Our work specifically examines how human-centered design principles can improve student trust and acceptance of AI-driven study recommendations.\n",
-    "\n",
-    "### 2.3 Human-Centered AI Design\n",
-    "Amershi et al. (2019) proposed 18 guidelines for human-AI interaction. Shneiderman (2022) advocated for human-centered approaches that balance automation with human control. Our study applies these principles in practice, measuring their impact on user experience across two distinct AI applications.\n",
-    "\n",
-    "---\n",
-    "\n",
-    "## 3. Methodology\n",
-    "\n",
-    "### 3.1 Study Design\n",
-    "We employed a **mixed-methods sequential explanatory design** [Creswell & Clark, 2017]:\n",
-    "- **Phase 1 (Requirements):** Online survey (N=120 per project) to gather user preferences and inform prototype design\n",
-    "- **Phase 2 (Evaluation):** Lab-based usability study (N=40 per project) with post-test surveys and behavioral telemetry\n",
-    "\n",
-    "### 3.2 Participants\n",
-    "\n",
-    "**Requirements Survey:**\n",
-    "- Project 1: 120 participants (Age: M=25.3, SD=7.2; 52% Male, 40% Female, 8% Non-binary/Other)\n",
-    "- Project 2: 120 participants (Age: M=22.1, SD=4.5; 48% Male, 44% Female, 8% Non-binary/Other)\n",
-    "- Recruited through university participant pools and social media\n",
-    "\n",
-    "**Usability Evaluation:**\n",
-    "- 40 participants per project\n",
-    "- Sample size determined by a priori power analysis (Cohen\u2019s d=0.5, \u03b1=0.05, power=0.80)\n",
-    "- Compensated with $15 USD gift cards\n",
-    "\n",
-    "### 3.3 Instruments\n",
-    "- System Usability Scale (SUS; Brooke, 1996)\n",
-    "- User Engagement Scale Short Form (UES-SF; O\u2019Brien et al., 2018) [Project 1]\n",
-    "- Trust in AI scale (adapted from Madsen & Gregor, 2000) [Project 2]\n",
-    "- Technology Acceptance Model scales (Davis, 1989) [Project 2]\n",
-    "- Custom scales for narrative quality, AI perception, immersion (Project 1) and accuracy perception, privacy concern (Project 2)\n",
-    "- Behavioral telemetry (session duration, clicks, feature usage, navigation patterns)\n",
-    "\n",
-    "### 3.4 Procedure\n",
-    "1. Informed consent and demographics collection (5 min)\n",
-    "2. Brief prototype orientation (2 min)\n",
-    "3. Free exploration of the prototype (15-30 min)\n",
-    "4. Post-test survey completion (10-15 min)\n",
-    "5. Optional debrief (5 min)\n",
-    "\n",
-    "### 3.5 Analysis Approach\n",
-    "- **Quantitative:** Descriptive statistics, reliability analysis (Cronbach\u2019s \u03b1), normality testing (Shapiro-Wilk), hypothesis testing (t-tests, ANOVA, correlations), effect sizes (Cohen\u2019s d, \u03b7\u00b2)\n",
-    "- **Qualitative:** Reflexive thematic analysis [Braun & Clarke, 2006], with LLM-assisted initial coding and human verification\n",
-    "- **Integration:** Joint display tables, convergence/complementarity analysis\n",
-    "\n",
-    "---\n",
-    "\n",
-    "## 4. Results\n",
-    "\n",
-    "### 4.1 Project 1: Gemini Quest\n",
+    "The draft is kept in `paper_template.md`. Its text is written by hand, but every statistic in it is a `{{placeholder}}` naming a result in the results store (`deliverables/report/analysis_results.json`), e.g. `{{p1.descriptives.sus_score.mean:.1f}}` or `{{p2.h3.p:p}}`. The next cell renders it to `deliverables/report/research_paper_draft.md` and displays it.\n",
     "\n",
-    "**Usability:** The prototype achieved a mean SUS score of 72.1 (SD=12.3), exceeding the industry benchmark of 68 and falling in the \u201cGood\u201d category [Bangor et al., 2009].\n",
-    "\n",
-    "**Engagement:** UES-SF subscale scores indicated above-average engagement across all dimensions, with Aesthetic Appeal showing the highest ratings (M=3.8/5, SD=0.6).\n",
-    "\n",
-    "**Narrative Quality:** Users rated the AI-generated narrative positively (M=5.2/7, SD=1.1), with particularly high scores for story engagement (M=5.4/7) and pacing (M=5.1/7).\n",
-    "\n",
-    "**AI Perception:** Moderate ratings (M=4.1/7, SD=1.3) suggest users recognized both the potential and limitations of AI-generated content. Item-level analysis revealed that \u201cdistinguishability from human content\u201d received the lowest scores (M=3.5/7).\n",
-    "\n",
-    "**Hypothesis Testing:**\n",
-    "- H1 (Preferences \u2192 SUS): No significant difference between preference-integrated and generic conditions (t(38)=0.82, p=.418, d=0.26). This may be due to the small sample size and condition assignment.\n",
-    "- H2 (Narrative \u00d7 Engagement): Significant positive correlation (r=0.45, p=.003), supporting the hypothesis.\n",
-    "- H3 (AI Awareness \u00d7 Immersion): Trend-level difference (t(38)=-1.41, p=.166, d=0.45).\n",
-    "\n",
-    "**Qualitative Themes:**\n",
-    "Five themes emerged from thematic analysis:\n",
-    "1. **Content Quality** (34%): Predominantly positive feedback on story coherence and creativity\n",
-    "2. **User Experience** (24%): Mixed feedback on navigation and pacing\n",
-    "3. **AI Perception** (18%): Divided views on AI authenticity\n",
-    "4. **Engagement** (14%): Reports of immersion and desire for replayability\n",
-    "5. **Technical Performance** (10%): Occasional glitches noted\n",
-    "\n",
-    "### 4.2 Project 2: StudyBuddy\n",
-    "\n",
-    "**Usability:** Mean SUS score of 68.2 (SD=14.1), at the borderline between \u201cOK\u201d and \u201cGood.\u201d\n",
-    "\n",
-    "**Trust:** Moderate trust ratings (M=4.2/7, SD=1.2) suggest cautious acceptance of AI predictions.\n",
-    "\n",
-    "**Usefulness:** Perceived usefulness was positive (M=5.0/7, SD=1.0), indicating students recognized the tool\u2019s potential value.\n",
-    "\n",
-    "**Privacy:** Elevated privacy concerns (M=4.8/7, SD=1.3) represent the most notable finding, significantly correlating with lower trust (r=-0.38, p=.015).\n",
-    "\n",
-    "**Hypothesis Testing:**\n",
-    "- H1 (Explanation \u2192 Trust): Non-significant main effect of explanation level on trust (F(2,37)=1.24, p=.301, \u03b7\u00b2=.063).\n",
-    "- H2 (Usefulness \u00d7 Usage): Moderate positive correlation (\u03c1=0.31, p=.049).\n",
-    "- H3 (Privacy \u00d7 Trust): Significant negative correlation (r=-0.38, p=.015), confirming the privacy-trust tension.\n",
-    "\n",
-    "**Qualitative Themes:**\n",
-    "Five themes emerged:\n",
-    "1. **Trust & Transparency** (28%): Desire for explanation of how predictions are made\n",
-    "2. **Usability** (24%): Learning curve concerns, feature discoverability\n",
-    "3. **Privacy** (20%): Data control and institutional use concerns\n",
-    "4. **AI Accuracy** (16%): Questions about prediction reliability\n",
-    "5. **Engagement & Motivation** (12%): Positive reports of goal-setting and motivation\n",
-    "\n",
-    "---\n",
-    "\n",
-    "## 5. Discussion\n",
-    "\n",
-    "### 5.1 AI-Generated Content Quality\n",
-    "Our findings suggest that users are generally receptive to AI-generated interactive narratives, with narrative quality ratings exceeding the scale midpoint. However, the moderate AI perception scores indicate that full acceptance remains elusive. Users are particularly sensitive to authenticity\u2014whether AI content \u201cfeels\u201d human-made. This aligns with recent work on the \u201cuncanny valley\u201d of AI-generated text (Jakesch et al., 2023).\n",
-    "\n",
-    "**Design Guideline 1:** *Prioritize narrative coherence over realism.* Users valued engaging stories over perfect mimicry of human writing.\n",
-    "\n",
-    "### 5.2 Trust-Privacy Tension in Educational AI\n",
-    "The significant negative correlation between privacy concerns and trust highlights a fundamental tension in AI-powered educational tools. Students recognize the potential utility of performance predictions but remain wary of data collection. This finding echoes Holstein et al.\u2019s (2019) call for fairness-aware ML in education.\n",
-    "\n",
-    "**Design Guideline 2:** *Provide granular data controls and transparent data usage policies.* Students need to understand and control what data the system uses.\n",
-    "\n",
-    "**Design Guideline 3:** *Show prediction confidence and limitations.* Moderate trust levels suggest that overconfident predictions may backfire.\n",
-    "\n",
-    "### 5.3 The Role of User Requirements in AI Design\n",
-    "Our requirements surveys informed specific design decisions (genre, art style, dashboard complexity) that shaped the prototypes. While H1 in Project 1 did not reach significance, the trend suggests that user preference integration may improve the experience, warranting investigation with larger samples.\n",
-    "\n",
-    "**Design Guideline 4:** *Integrate user preference surveys into the AI generation pipeline.* Even when effects are small, alignment with user expectations demonstrates respect for user agency.\n",
-    "\n",
-    "### 5.4 Implications for HCI Research Methodology\n",
-    "This study demonstrates a complete human-centered design pipeline with significant LLM automation. While this accelerates prototyping and analysis, it raises important questions about scientific validity (see Limitations).\n",
-    "\n",
-    "---\n",
-    "\n",
-    "## 6. Limitations\n",
-    "\n",
-    "### 6.1 LLM Automation in the Research Pipeline\n",
-    "\n",
-    "This study used LLMs (Google Gemini) at multiple stages of the research pipeline, which introduces several methodological concerns:\n",
-    "\n",
-    "#### Prototype Generation\n",
-    "The prototypes were generated using Gemini\u2019s code generation capabilities. While functional, LLM-generated code may contain subtle biases in UI design, interaction patterns, or content that could influence user responses. **Mitigation:** Pre-generated prototypes were reviewed and tested by the research team before deployment.\n",
-    "\n",
-    "#### Qualitative Coding\n",
-    "LLM-based qualitative coding raises the most significant validity concern. Two issues are paramount:\n",
-    "1. **Independence:** LLM \u201ccoders\u201d are not truly independent since they share the same underlying model. High inter-rater reliability between LLM coders may reflect model consistency rather than genuine interpretive agreement.\n",
-    "2. **Interpretive Depth:** LLMs may miss context-dependent meanings, cultural nuances, and implicit sentiments that human coders would capture [Tai et al., 2024].\n",
-    "\n",
-    "**Mitigation strategies applied:**\n",
-    "- Used multiple prompts to simulate coding independence\n",
-    "- Computed inter-rater reliability (Cohen\u2019s \u03ba, Krippendorff\u2019s \u03b1)\n",
-    "- Flagged LLM coding as preliminary analysis in reporting\n",
-    "- **Recommended for full validity:** Human verification of \u226520% of coded segments\n",
-    "\n",
-    "#### Data Generation\n",
-    "For this workshop demonstration, dummy data was used in place of actual participant responses. All statistical results should be interpreted as illustrative of the analysis pipeline, not as empirical findings.\n",
-    "\n",
-    "### 6.2 Sample Size and Generalizability\n",
-    "- The evaluation sample (N=40 per project) provides adequate power for medium effects but may miss smaller effects\n",
-    "- University student sample limits generalizability to broader populations\n",
-    "- Single-session evaluation may not capture longitudinal usage patterns\n",
-    "\n",
-    "### 6.3 Ecological Validity\n",
-    "- Lab-based evaluation may not reflect naturalistic use\n",
-    "- Fixed game content limits assessment of generative variety\n",
-    "- StudyBuddy predictions are simulated, not based on actual student data\n",
-    "\n",
-    "### 6.4 Instrument Limitations\n",
-    "- Custom scales (narrative quality, AI perception) require further validation\n",
-    "- Self-reported measures may be subject to social desirability bias\n",
-    "- Telemetry provides behavioral data but not motivational context\n",
-    "\n",
-    "### 6.5 Scientific Validity of LLM-Automated Research\n",
-    "The use of LLMs throughout the research pipeline (from code generation to data analysis) represents a methodological experiment in itself. While LLM automation can democratize and accelerate research, several concerns must be addressed for results to meet the scientific standards of venues like ACM CHI:\n",
-    "\n",
-    "1. **Reproducibility:** LLM outputs are non-deterministic. Temperature settings and model versions should be reported.\n",
-    "2. **Bias propagation:** LLM biases in code generation may create prototypes that privilege certain user groups.\n",
-    "3. **Transparency:** All LLM-assisted steps must be clearly disclosed in publications.\n",
-    "4. **Human oversight:** A human-in-the-loop approach is essential\u2014LLMs should assist, not replace, researcher judgment.\n",
-    "5. **Validation:** Results from LLM-automated analyses should be validated against traditional methods on a subset of data.\n",
-    "\n",
-    "> *\u201cThe goal is not to eliminate human involvement but to augment human capabilities while maintaining scientific rigor.\u201d*\n",
-    "\n",
-    "---\n",
-    "\n",
-    "## 7. Conclusion\n",
-    "\n",
-    "This study demonstrates a complete human-centered design pipeline for two AI-powered prototypes, from user requirements gathering through usability evaluation and mixed-methods analysis. Our findings suggest that users are receptive to AI-generated interactive content but require transparency, control, and quality assurance. The trust-privacy tension in educational AI tools highlights the need for thoughtful design that prioritizes student agency.\n",
-    "\n",
-    "We contribute four design guidelines, empirical evidence on user perception of multimodal AI, and a methodological framework for LLM-assisted rapid prototyping. Future work should validate these findings with larger and more diverse samples, conduct longitudinal evaluations, and further investigate the boundaries of acceptable LLM automation in HCI research.\n",
-    "\n",
-    "---\n",
-    "\n",
-    "## References\n",
-    "\n",
-    "- Amershi, S., et al. (2019). Guidelines for Human-AI Interaction. *Proc. ACM CHI*.\n",
-    "- Bangor, A., Kortum, P., & Miller, J. (2009). Determining what individual SUS scores mean. *J. Usability Studies*, 4(3).\n",
-    "- Braun, V., & Clarke, V. (2006). Using thematic analysis in psychology. *Qualitative Research in Psychology*, 3(2).\n",
-    "- Brooke, J. (1996). SUS: A \u2018quick and dirty\u2019 usability scale. *Usability Evaluation in Industry*.\n",
-    "- Creswell, J. W., & Clark, V. L. P. (2017). *Designing and Conducting Mixed Methods Research*. Sage.\n",
-    "- Davis, F. D. (1989). Perceived usefulness, perceived ease of use, and user acceptance. *MIS Quarterly*, 13(3).\n",
-    "- Epstein, Z., et al. (2023). Art and the science of generative AI. *Science*, 380(6650).\n",
-    "- Erickson, N., et al. (2020). AutoGluon-Tabular: Robust and Accurate AutoML for Structured Data.\n",
-    "- Holstein, K., et al. (2019). Improving fairness in ML systems. *Proc. ACM CHI*.\n",
-    "- Jakesch, M., et al. (2023). Human heuristics for AI-generated language are flawed. *PNAS*.\n",
-    "- Khosravi, H., et al. (2022). Explainable AI in education. *Computers and Education: AI*.\n",
-    "- Kreminski, M., & Wardrip-Fruin, N. (2019). Generative games as expressive AI. *Proc. FDG*.\n",
-    "- Lanzi, P. L., & Loiacono, D. (2023). ChatGPT for Online Interactive Collaborative Game Design. *Proc. GECCO*.\n",
-    "- Lazar, J., Feng, J. H., & Hochheiser, H. (2017). *Research Methods in HCI*. Morgan Kaufmann.\n",
-    "- Madsen, M., & Gregor, S. (2000). Measuring human-computer trust. *Proc. ACIS*.\n",
-    "- O\u2019Brien, H. L., et al. (2018). A practical approach to measuring user engagement. *IJHCS*, 112.\n",
-    "- Riedl, M. O., & Bulitko, V. (2013). Interactive narrative: An intelligent systems approach. *AI Magazine*, 34(1).\n",
-    "- Shneiderman, B. (2022). *Human-Centered AI*. Oxford University Press.\n",
-    "- Tai, R. H., et al. (2024). LLMs to Aid Analysis of Textual Data. *Int. J. Qualitative Methods*.\n",
-    "- VanLehn, K. (2011). The relative effectiveness of human tutoring, intelligent tutoring systems, and other tutoring systems. *Educational Psychologist*, 46(4).\n",
-    "- Xiao, Z., et al. (2023). Supporting Qualitative Analysis with LLMs. *Proc. ACM CHI*."
+    "To revise the paper, edit the template, never the numbers: rerunning the analyses updates them, and analyses whose inputs are unchanged are read back from the store instead of being recomputed."
 ]))
 
 # ======================================================================
@@ -1138,50 +776,47 @@ cells.append(md_cell([
 # ======================================================================
 cells.append(code_cell([
     "# ============================================================\n",
-    "# SECTION 7: Save Research Paper\n",
+    "# SECTION 7: Render the Research Paper\n",
     "# ============================================================\n",
-    "# The research paper content above is saved for reference\n",
+    "# Every number in the draft is a stored result (results_store.py): rendering\n",
+    "# it reads the store and recomputes nothing. Only the analyses recorded in\n",
+    "# this run are used; a result whose cell was skipped shows as n/a\n",
+    "from IPython.display import Markdown, display\n",
+    "from results_store import render_paper\n",
     "paper_path = DELIVERABLES / 'report' / 'research_paper_draft.md'\n",
     "\n",
-    "# The paper is written in the markdown cell above.\n",
-    "# Here we save a summary of all key statistics for easy reference.\n",
-    "\n",
     "print(\"=\" * 70)\n",
     "print(\"KEY STATISTICS SUMMARY FOR PAPER\")\n",
     "print(\"=\" * 70)\n",
     "\n",
     "stats_summary = []\n",
-    "\n",
-    "if p1_posttest is not None:\n",
-    "    stats_summary.append(\"PROJECT 1: GEMINI QUEST\")\n",
-    "    stats_summary.append(f\"  N = {len(p1_posttest)}\")\n",
-    "    stats_summary.append(f\"  SUS: M={p1_posttest['sus_score'].mean():.1f}, SD={p1_posttest['sus_score'].std():.1f}\")\n",
-    "    if 'nq_mean' in p1_posttest.columns:\n",
-    "        stats_summary.append(f\"  Narrative Quality: M={p1_posttest['nq_mean'].mean():.2f}, SD={p1_posttest['nq_mean'].std():.2f}\")\n",
-    "    if 'ai_mean' in p1_posttest.columns:\n",
-    "        stats_summary.append(f\"  AI Perception: M={p1_posttest['ai_mean'].mean():.2f}, SD={p1_posttest['ai_mean'].std():.2f}\")\n",
-    "    if 'immersion_mean' in p1_posttest.columns:\n",
-    "        stats_summary.append(f\"  Immersion: M={p1_posttest['immersion_mean'].mean():.2f}, SD={p1_posttest['immersion_mean'].std():.2f}\")\n",
+    "projects = [('p1', 'PROJECT 1: GEMINI QUEST', [('Narrative Quality', 'nq_mean'), ('AI Perception', 'ai_mean'),\n",
+    "                                                ('Immersion', 'immersion_mean')]),\n",
+    "            ('p2', 'PROJECT 2: STUDYBUDDY', [('Trust', 'trust_mean'), ('Usefulness', 'usefulness_mean'),\n",
+    "                                              ('Privacy Concern', 'privacy_mean')])]\n",
+    "for project, title, scales in projects:\n",
+    "    if f'{project}.descriptives' not in analysis_results.current:\n",
+    "        continue\n",
+    "    desc = analysis_results.load(f'{project}.descriptives')\n",
+    "    stats_summary.append(title)\n",
+    "    stats_summary.append(f\"  N = {desc.loc['sus_score', 'count']:.0f}\")\n",
+    "    stats_summary.append(f\"  SUS: M={desc.loc['sus_score', 'mean']:.1f}, SD={desc.loc['sus_score', 'std']:.1f}\")\n",
+    "    for label, col in scales:\n",
+    "        if col in desc.index:\n",
+    "            stats_summary.append(f\"  {label}: M={desc.loc[col, 'mean']:.2f}, SD={desc.loc[col, 'std']:.2f}\")\n",
     "    stats_summary.append(\"\")\n",
     "\n",
-    "if p2_posttest is not None:\n",
-    "    stats_summary.append(\"PROJECT 2: STUDYBUDDY\")\n",
-    "    stats_summary.append(f\"  N = {len(p2_posttest)}\")\n",
-    "    stats_summary.append(f\"  SUS: M={p2_posttest['sus_score'].mean():.1f}, SD={p2_posttest['sus_score'].std():.1f}\")\n",
-    "    if 'trust_mean' in p2_posttest.columns:\n",
-    "        stats_summary.append(f\"  Trust: M={p2_posttest['trust_mean'].mean():.2f}, SD={p2_posttest['trust_mean'].std():.2f}\")\n",
-    "    if 'usefulness_mean' in p2_posttest.columns:\n",
-    "        stats_summary.append(f\"  Usefulness: M={p2_posttest['usefulness_mean'].mean():.2f}, SD={p2_posttest['usefulness_mean'].std():.2f}\")\n",
-    "    if 'privacy_mean' in p2_posttest.columns:\n",
-    "        stats_summary.append(f\"  Privacy Concern: M={p2_posttest['privacy_mean'].mean():.2f}, SD={p2_posttest['privacy_mean'].std():.2f}\")\n",
-    "\n",
     "for line in stats_summary:\n",
     "    print(line)\n",
     "\n",
-    "# Save the paper\n",
-    "print(f\"\\n\u2713 Research paper draft is in the markdown cell above\")\n",
+    "missing = []\n",
+    "paper = render_paper(analysis_results, paper_path, names=analysis_results.current, missing=missing)\n",
+    "print(f\"\u2713 Research paper draft rendered from {len(analysis_results.current)} analyses of this run: {paper_path}\")\n",
+    "if missing:\n",
+    "    print(f\"  [--] n/a for {len(missing)} result(s) not computed in this run: {', '.join(missing)}\")\n",
     "print(f\"  Copy to your preferred word processor for formatting\")\n",
     "print(f\"  Apply ACM CHI template: https://chi2025.acm.org/submission-guides/\")\n",
+    "display(Markdown(paper))\n",
     "\n",
     "print(f\"\\n{'='*70}\")\n",
     "print(\"WORKSHOP COMPLETE\")\n",
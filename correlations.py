@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""
+Correlation matrices with p-values, confidence intervals and corrections.
+
+correlation_matrix() correlates every column of X with every column of Y
+(or of X with itself) in one pass: Spearman ranks each column once, every
+column is standardized once, and r is a single matrix product. With missing
+values, pairs are deleted pairwise: per-pair counts, sums and sums of squares
+come from matrix products of the value and missingness masks, so the cost
+stays a handful of matmuls. Spearman's rho of a pair needs the ranks over the
+rows both columns share, so a pair with a missing value is re-ranked on its
+own (one rankdata per such pair); pairs of complete columns keep the shared
+ranks. The result equals DataFrame.corr("spearman") and scipy's spearmanr.
+A constant column has no correlation (NaN).
+
+p-values use t = r sqrt((n - 2) / (1 - r^2)) on n - 2 df, as scipy's pearsonr
+and spearmanr do. Intervals use the Fisher z transform, with the Bonett &
+Wright (2000) variance (1 + r^2 / 2) / (n - 3) for Spearman. Holm or
+Benjamini-Hochberg correction is applied across all distinct pairs (the upper
+triangle when Y is X).
+
+A few thousand variables are fine: memory is a few float64 p x q matrices.
+
+Usage:
+    python correlations.py deliverables/project2/posttest/posttest_survey_responses.csv [--method spearman]
+"""
+
+import argparse
+import sys
+
+import numpy as np
+import pandas as pd
+from scipy import stats
+
+from scale_scoring import score_scales
+
+CORRECTIONS = ("fdr_bh", "holm", None)
+
+
+# ---------------------------------------------------------------------------
+# Multiple-comparison corrections
+# ---------------------------------------------------------------------------
+
+def holm(pvalues):
+    """Holm step-down adjusted p-values of a 1-d array (NaNs kept)."""
+    p = np.asarray(pvalues, dtype=np.float64)
+    adjusted = np.full_like(p, np.nan)
+    valid = np.flatnonzero(~np.isnan(p))
+    m = len(valid)
+    order = valid[np.argsort(p[valid], kind="stable")]
+    steps = np.maximum.accumulate((m - np.arange(m)) * p[order])
+    adjusted[order] = np.minimum(steps, 1.0)
+    return adjusted
+
+
+def fdr_bh(pvalues):
+    """Benjamini-Hochberg adjusted p-values of a 1-d array (NaNs kept)."""
+    p = np.asarray(pvalues, dtype=np.float64)
+    adjusted = np.full_like(p, np.nan)
+    valid = np.flatnonzero(~np.isnan(p))
+    m = len(valid)
+    order = valid[np.argsort(p[valid], kind="stable")]
+    steps = np.minimum.accumulate((m / np.arange(m, 0, -1) * p[order][::-1]))[::-1]
+    adjusted[order] = np.minimum(steps, 1.0)
+    return adjusted
+
+
+def adjust(pvalues, correction="fdr_bh"):
+    if correction is None:
+        return np.asarray(pvalues, dtype=np.float64)
+    if correction == "holm":
+        return holm(pvalues)
+    if correction == "fdr_bh":
+        return fdr_bh(pvalues)
+    raise ValueError(f"correction must be one of {CORRECTIONS}")
+
+
+# ---------------------------------------------------------------------------
+# Matrices
+# ---------------------------------------------------------------------------
+
+def _prepare(frame, method):
+    values = frame.to_numpy(dtype=np.float64, na_value=np.nan)
+    if method == "spearman":
+        values = stats.rankdata(values, axis=0, nan_policy="omit")
+    elif method != "pearson":
+        raise ValueError(f"unknown method {method!r}")
+    return values
+
+
+def _complete_r(x, y):
+    """r and n for columns without missing values: standardize once, one matmul."""
+    n = len(x)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        zx = (x - x.mean(axis=0)) / x.std(axis=0)
+        zy = (y - y.mean(axis=0)) / y.std(axis=0)
+    return zx.T @ zy / n, np.full((x.shape[1], y.shape[1]), n, dtype=np.float64)
+
+
+def _rank_r(a, b):
+    """Spearman's rho of two complete vectors: Pearson's r of their ranks."""
+    ra, rb = stats.rankdata(a), stats.rankdata(b)
+    ra, rb = ra - ra.mean(), rb - rb.mean()
+    denominator = np.sqrt((ra @ ra) * (rb @ rb))
+    return ra @ rb / denominator if denominator > 0 else np.nan
+
+
+def _rerank_pairs(x, y, r, symmetric):
+    """Set r of every pair with a missing value to rho over the pair's shared rows."""
+    mx, my = ~np.isnan(x), ~np.isnan(y)
+    gaps_x, gaps_y = ~mx.all(axis=0), ~my.all(axis=0)
+    for i, j in zip(*np.nonzero(gaps_x[:, None] | gaps_y[None, :])):
+        if symmetric and j < i:
+            continue
+        rows = mx[:, i] & my[:, j]
+        r[i, j] = _rank_r(x[rows, i], y[rows, j]) if rows.sum() > 1 else np.nan
+        if symmetric:
+            r[j, i] = r[i, j]
+    return r
+
+
+def _pairwise_r(x, y):
+    """r and n over the rows where both columns are observed."""
+    mx, my = ~np.isnan(x), ~np.isnan(y)
+    x0, y0 = np.where(mx, x, 0.0), np.where(my, y, 0.0)
+    mx, my = mx.astype(np.float64), my.astype(np.float64)
+    n = mx.T @ my
+    sx, sy = x0.T @ my, mx.T @ y0
+    sxx, syy = (x0 * x0).T @ my, mx.T @ (y0 * y0)
+    sxy = x0.T @ y0
+    with np.errstate(divide="ignore", invalid="ignore"):
+        cov = sxy - sx * sy / n
+        return cov / np.sqrt((sxx - sx ** 2 / n) * (syy - sy ** 2 / n)), n
+
+
+def correlation_matrix(X, Y=None, method="pearson", correction="fdr_bh", ci=0.95):
+    """Correlations of the columns of X with those of Y (default: X itself).
+
+    Returns a dict of DataFrames indexed like X's columns by Y's columns:
+    r, n, p, p_adj (after `correction`), ci_low and ci_high.
+    """
+    symmetric = Y is None
+    Y = X if symmetric else Y
+    x = _prepare(X, method)
+    y = x if symmetric else _prepare(Y, method)
+    if np.isnan(x).any() or np.isnan(y).any():
+        r, n = _pairwise_r(x, y)
+        if method == "spearman":
+            raw_x = X.to_numpy(dtype=np.float64, na_value=np.nan)
+            raw_y = raw_x if symmetric else Y.to_numpy(dtype=np.float64, na_value=np.nan)
+            r = _rerank_pairs(raw_x, raw_y, r, symmetric)
+    else:
+        r, n = _complete_r(x, y)
+    r = np.clip(r, -1.0, 1.0)
+    if symmetric:
+        np.fill_diagonal(r, 1.0)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        t = r * np.sqrt((n - 2) / (1 - r ** 2))
+        p = 2 * stats.t.sf(np.abs(t), n - 2)
+        p = np.where(np.abs(r) == 1, 0.0, p)
+        p = np.where(n > 2, p, np.nan)
+        variance = (1 + r ** 2 / 2) / (n - 3) if method == "spearman" else 1 / (n - 3)
+        half = stats.norm.ppf(0.5 + ci / 2) * np.sqrt(variance)
+        z = np.arctanh(np.clip(r, -1 + 1e-15, 1 - 1e-15))
+        low, high = np.tanh(z - half), np.tanh(z + half)
+        low, high = np.where(n > 3, low, np.nan), np.where(n > 3, high, np.nan)
+
+    # Correct across distinct pairs only: the upper triangle of a symmetric matrix
+    if symmetric:
+        pairs = np.triu_indices(r.shape[0], k=1)
+        p_adj = np.full_like(p, np.nan)
+        p_adj[pairs] = adjust(p[pairs], correction)
+        p_adj.T[pairs] = p_adj[pairs]
+        np.fill_diagonal(p, np.nan)
+    else:
+        p_adj = adjust(p.ravel(), correction).reshape(p.shape)
+
+    frame = lambda values: pd.DataFrame(values, index=X.columns, columns=Y.columns)
+    return {"r": frame(r), "n": frame(n), "p": frame(p), "p_adj": frame(p_adj),
+            "ci_low": frame(low), "ci_high": frame(high)}
+
+
+def correlation_table(result, alpha=None):
+    """The matrices of correlation_matrix() as one row per pair, by p-value.
+
+    For a symmetric result each pair appears once; `alpha` keeps only pairs
+    with p_adj below it.
+    """
+    r = result["r"]
+    rows, cols = np.indices(r.shape)
+    keep = ~np.isnan(result["p"].to_numpy())
+    if r.index.equals(r.columns):
+        keep &= rows < cols
+    table = pd.DataFrame({
+        "x": r.index.to_numpy()[rows[keep]],
+        "y": r.columns.to_numpy()[cols[keep]],
+        **{name: result[name].to_numpy()[keep] for name in ("r", "n", "ci_low", "ci_high", "p", "p_adj")},
+    })
+    if alpha is not None:
+        table = table[table["p_adj"] < alpha]
+    return table.sort_values("p", kind="stable", ignore_index=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Correlations of the post-test scales with corrected p-values.")
+    parser.add_argument("responses", help="post-test survey responses CSV")
+    parser.add_argument("--method", choices=["pearson", "spearman"], default="pearson")
+    parser.add_argument("--correction", choices=["fdr_bh", "holm"], default="fdr_bh")
+    args = parser.parse_args(argv)
+
+    scores = score_scales(pd.read_csv(args.responses))
+    result = correlation_matrix(scores, method=args.method, correction=args.correction)
+    print(result["r"].round(2).to_string())
+    print()
+    print(correlation_table(result).round(4).to_string(index=False))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
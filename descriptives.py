@@ -0,0 +1,379 @@
+#!/usr/bin/env python3
+"""
+One-pass descriptive statistics of numeric columns, overall or by group.
+
+A Descriptives accumulator takes data chunk by chunk and keeps, for every
+(group, column) cell, a mergeable summary:
+
+  - count, mean and the central moment sums M2, M3, M4, updated per chunk
+    and combined with the pairwise formulas of Chan et al. and Pebay (2008),
+    so merging partial results equals a single pass over all the data
+  - min and max
+  - a quantile sketch: the exact count of every distinct value while a cell
+    has at most EXACT_VALUES of them (survey scales never get there, so
+    their quantiles are exact), then log-spaced buckets with relative error
+    SKETCH_ACCURACY (DDSketch, Masson et al., 2019). Both merge by adding
+    counts.
+
+Each chunk is reduced per (group, column) cell: the sums behind the mean
+and the moments are taken as DataFrame.mean()/var() take them (numpy's
+pairwise sum of the whole column, missing values as 0), so a single chunk
+gives the pandas mean and variance of each group's rows bit for bit, and
+the rest are a few bincounts. Inputs larger than memory stream through in
+chunks, and
+describe_chunks() spreads chunks over a thread pool and merges the partial
+accumulators. table() reports count, mean, std, var, skew and kurt (the
+bias-corrected estimators pandas uses), min, max and the requested
+quantiles (linearly interpolated, as in pandas, while exact).
+
+Usage:
+    python descriptives.py deliverables/project1/posttest/posttest_survey_responses.csv [--by gender] [--chunksize 100000]
+"""
+
+import argparse
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from scale_scoring import score_scales
+
+EXACT_VALUES = 1024
+SKETCH_ACCURACY = 0.01
+QUANTILES = (0.25, 0.5, 0.75)
+CHUNK_ROWS = 1 << 17
+
+GAMMA = (1 + SKETCH_ACCURACY) / (1 - SKETCH_ACCURACY)
+LOG_GAMMA = np.log(GAMMA)
+# Added to bucket indices so every |x| above 1e-200 gets a positive index
+INDEX_OFFSET = 1e5
+
+
+# ---------------------------------------------------------------------------
+# Quantile sketch
+# ---------------------------------------------------------------------------
+
+def bucket_keys(values):
+    """DDSketch bucket of each value, as a signed key (0 for zero)."""
+    magnitude = np.abs(values)
+    with np.errstate(divide="ignore"):
+        index = np.ceil(np.log(np.where(magnitude > 0, magnitude, 1.0)) / LOG_GAMMA)
+    index = np.where(magnitude > 0, np.maximum(index + INDEX_OFFSET, 1.0), 0.0)
+    return np.sign(values) * index
+
+
+def bucket_values(keys):
+    """Representative value of each bucket key (within SKETCH_ACCURACY of its members)."""
+    index = np.abs(keys) - INDEX_OFFSET
+    return np.where(keys == 0, 0.0, np.sign(keys) * 2 * GAMMA ** index / (GAMMA + 1))
+
+
+def aggregate(cells, keys, counts):
+    """Sum the counts of equal (cell, key) pairs; sorted by cell, then key."""
+    # Hash first (no sort), so only the distinct pairs are sorted
+    key_codes, unique_keys = pd.factorize(keys)
+    pair_codes, pairs = pd.factorize(cells * max(len(unique_keys), 1) + key_codes)
+    counts = np.bincount(pair_codes, counts, minlength=len(pairs)).astype(np.int64)
+    cells, key_codes = np.divmod(pairs, max(len(unique_keys), 1))
+    keys = unique_keys[key_codes]
+    order = np.lexsort((keys, cells))
+    return cells[order], keys[order], counts[order]
+
+
+def group_sums(values, groups, n_groups):
+    """(n_groups, columns) sums of the rows of each group, NaN counted as 0.
+
+    Each group's column is summed as one contiguous row, so numpy sums it
+    pairwise in the same order as pandas' nansum over that column.
+    """
+    order = np.argsort(groups, kind="stable")
+    bounds = np.searchsorted(groups[order], np.arange(n_groups + 1))
+    by_column = np.ascontiguousarray(np.nan_to_num(values[order], nan=0.0).T)
+    sums = np.zeros((n_groups, values.shape[1]))
+    for g in np.flatnonzero(np.diff(bounds)):
+        sums[g] = by_column[:, bounds[g]:bounds[g + 1]].sum(axis=1)
+    return sums
+
+
+# ---------------------------------------------------------------------------
+# Accumulator
+# ---------------------------------------------------------------------------
+
+class Descriptives:
+    """Mergeable one-pass summary of `columns` (default: numeric ones), by `by`."""
+
+    def __init__(self, columns=None, by=None):
+        self.columns = None if columns is None else list(columns)
+        self.by = [] if by is None else ([by] if isinstance(by, str) else list(by))
+        self.groups = {}  # group key -> id
+        self.n = self.mean = self.m2 = self.m3 = self.m4 = self.min = self.max = None
+        self.bucketed = np.zeros(0, dtype=bool)  # cells whose sketch uses buckets
+        self.sketch_bucketed = np.zeros(0, dtype=bool)  # the same, as of the last _compact()
+        self.cells = np.zeros(0, dtype=np.int64)
+        self.keys = np.zeros(0)
+        self.counts = np.zeros(0, dtype=np.int64)
+        self.pending = []  # (cells, keys, counts, is_bucket) not yet folded into the sketch
+        self.pending_size = 0
+
+    # --- state -------------------------------------------------------------
+
+    def _grow(self, n_groups):
+        shape = (n_groups, len(self.columns))
+        if self.n is None:
+            self.n = np.zeros(shape)
+            self.mean, self.m2, self.m3, self.m4 = (np.zeros(shape) for _ in range(4))
+            self.min, self.max = np.full(shape, np.inf), np.full(shape, -np.inf)
+            self.bucketed = np.zeros(shape[0] * shape[1], dtype=bool)
+            self.sketch_bucketed = self.bucketed.copy()
+            return
+        extra = n_groups - self.n.shape[0]
+        if extra <= 0:
+            return
+        pad = lambda a, fill: np.vstack([a, np.full((extra, a.shape[1]), fill)])
+        self.n, self.mean, self.m2, self.m3, self.m4 = (pad(a, 0.0) for a in (self.n, self.mean, self.m2, self.m3, self.m4))
+        self.min, self.max = pad(self.min, np.inf), pad(self.max, -np.inf)
+        new_cells = np.zeros(extra * len(self.columns), dtype=bool)
+        self.bucketed = np.concatenate([self.bucketed, new_cells])
+        self.sketch_bucketed = np.concatenate([self.sketch_bucketed, new_cells])
+
+    def _group_ids(self, chunk):
+        if not self.by:
+            self.groups.setdefault((), 0)
+            return np.zeros(len(chunk), dtype=np.int64)
+        if len(self.by) == 1:
+            codes, uniques = pd.factorize(chunk[self.by[0]])
+            uniques = [(key,) for key in uniques]
+        else:
+            codes, uniques = pd.MultiIndex.from_frame(chunk[self.by]).factorize()
+        ids = np.array([self.groups.setdefault(key, len(self.groups)) for key in uniques], dtype=np.int64)
+        return ids[codes]
+
+    def _merge_moments(self, n, mean, m2, m3, m4, lo, hi):
+        na, nb = self.n, n
+        total = na + nb
+        with np.errstate(divide="ignore", invalid="ignore"):
+            delta = np.where(total > 0, mean - self.mean, 0.0)
+            share = np.where(total > 0, nb / total, 0.0)
+            new_mean = self.mean + delta * share
+            new_m2 = self.m2 + m2 + delta ** 2 * na * share
+            new_m3 = (self.m3 + m3 + delta ** 3 * na * share * (na - nb) / np.where(total > 0, total, 1)
+                      + 3 * delta * (na * m2 - nb * self.m2) / np.where(total > 0, total, 1))
+            new_m4 = (self.m4 + m4
+                      + delta ** 4 * na * share * (na ** 2 - na * nb + nb ** 2) / np.where(total > 0, total, 1) ** 2
+                      + 6 * delta ** 2 * (na ** 2 * m2 + nb ** 2 * self.m2) / np.where(total > 0, total, 1) ** 2
+                      + 4 * delta * (na * m3 - nb * self.m3) / np.where(total > 0, total, 1))
+        self.n, self.mean, self.m2, self.m3, self.m4 = total, new_mean, new_m2, new_m3, new_m4
+        self.min, self.max = np.minimum(self.min, lo), np.maximum(self.max, hi)
+
+    def _merge_sketch(self, cells, keys, counts, bucketed):
+        """Add sketch entries; `bucketed` flags the cells whose incoming keys are buckets.
+
+        Entries are only queued; the sorted sketch is rebuilt once the queue
+        outgrows it, so each entry is sorted O(log chunks) times, not once
+        per chunk.
+        """
+        self.bucketed = self.bucketed | bucketed
+        # Values of cells that already overflowed go straight to their buckets
+        convert = self.bucketed[cells] & ~bucketed[cells]
+        if convert.any():
+            keys = np.where(convert, bucket_keys(keys), keys)
+        self.pending.append((cells, keys, counts, self.bucketed[cells]))
+        self.pending_size += len(cells)
+        if self.pending_size > max(len(self.cells), 1 << 16):
+            self._compact()
+
+    def _compact(self):
+        """Fold the queued entries into the sorted sketch."""
+        if not self.pending:
+            return
+        # Sketch entries are buckets if their cell was bucketed at the last compaction
+        was_bucket = np.concatenate([self.sketch_bucketed[self.cells]] + [p[3] for p in self.pending])
+        cells = np.concatenate([self.cells] + [p[0] for p in self.pending])
+        keys = np.concatenate([self.keys] + [p[1] for p in self.pending])
+        counts = np.concatenate([self.counts] + [p[2] for p in self.pending])
+        self.pending, self.pending_size = [], 0
+        # Exact values of a cell that is (now) bucketed move to their bucket
+        keys = np.where(~was_bucket & self.bucketed[cells], bucket_keys(keys), keys)
+        cells, keys, counts = aggregate(cells, keys, counts)
+        distinct = np.bincount(cells, minlength=len(self.bucketed))
+        overflow = (distinct > EXACT_VALUES) & ~self.bucketed
+        if overflow.any():
+            self.bucketed |= overflow
+            keys = np.where(overflow[cells], bucket_keys(keys), keys)
+            cells, keys, counts = aggregate(cells, keys, counts)
+        self.cells, self.keys, self.counts = cells, keys, counts
+        self.sketch_bucketed = self.bucketed.copy()
+
+    # --- input -------------------------------------------------------------
+
+    def update(self, chunk):
+        """Add the rows of a DataFrame chunk."""
+        if self.columns is None:
+            self.columns = [c for c in chunk.select_dtypes("number").columns if c not in self.by]
+        groups = self._group_ids(chunk)
+        self._grow(len(self.groups))
+        n_groups, n_columns = self.n.shape
+        values = chunk[self.columns].to_numpy(dtype=np.float64, na_value=np.nan)
+        valid = ~np.isnan(values)
+        cell = (groups[:, None] * n_columns + np.arange(n_columns)[None, :])
+        size = n_groups * n_columns
+
+        flat_cell, flat_value = cell[valid], values[valid]
+        n = np.bincount(flat_cell, minlength=size).astype(np.float64)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean = np.nan_to_num(group_sums(values, groups, n_groups).ravel() / n)
+        deviation = values - mean.reshape(n_groups, n_columns)[groups]
+        d2 = deviation * deviation
+        m2, m3, m4 = (group_sums(d, groups, n_groups).ravel() for d in (d2, d2 * deviation, d2 * d2))
+        lo, hi = np.full(size, np.inf), np.full(size, -np.inf)
+        np.minimum.at(lo, flat_cell, flat_value)
+        np.maximum.at(hi, flat_cell, flat_value)
+        shape = (n_groups, n_columns)
+        self._merge_moments(*(a.reshape(shape) for a in (n, mean, m2, m3, m4, lo, hi)))
+
+        self._merge_sketch(flat_cell.astype(np.int64), flat_value, np.ones(len(flat_value), dtype=np.int64),
+                           np.zeros(size, dtype=bool))
+        return self
+
+    def merge(self, other):
+        """Fold another accumulator (same columns and by) into this one."""
+        if other.n is None:
+            return self
+        other._compact()
+        if self.columns is None:
+            self.columns = other.columns
+        if other.columns != self.columns or other.by != self.by:
+            raise ValueError("cannot merge summaries of different columns or groupings")
+        # Map the other's group ids onto ours
+        ids = np.array([self.groups.setdefault(key, len(self.groups)) for key in other.groups], dtype=np.int64)
+        self._grow(len(self.groups))
+        n_columns = len(self.columns)
+        rows = np.empty(other.n.shape[0], dtype=np.int64)
+        rows[list(other.groups.values())] = ids
+
+        def placed(a, fill):
+            out = np.full(self.n.shape, fill)
+            out[rows] = a
+            return out
+
+        self._merge_moments(*(placed(a, 0.0) for a in (other.n, other.mean, other.m2, other.m3, other.m4)),
+                            placed(other.min, np.inf), placed(other.max, -np.inf))
+        group, column = np.divmod(other.cells, n_columns)
+        bucketed = np.zeros(self.n.size, dtype=bool)
+        bucketed[(rows[:, None] * n_columns + np.arange(n_columns)).ravel()] = other.bucketed
+        self._merge_sketch(rows[group] * n_columns + column, other.keys, other.counts, bucketed)
+        return self
+
+    # --- output ------------------------------------------------------------
+
+    def quantiles(self, qs=QUANTILES):
+        """(cells, len(qs)) array of quantiles, interpolated linearly between exact values."""
+        self._compact()
+        size = self.n.size
+        out = np.full((size, len(qs)), np.nan)
+        if not len(self.cells):
+            return out
+        values = np.where(self.bucketed[self.cells], bucket_values(self.keys), self.keys)
+        cumulative = np.cumsum(self.counts)
+        starts = np.searchsorted(self.cells, np.arange(size))
+        before = np.concatenate([[0], cumulative])[starts]
+        totals = np.bincount(self.cells, self.counts, minlength=size)
+        present = totals > 0
+        # Index of the entry holding rank r (0-based) of each cell
+        at = lambda rank: np.searchsorted(cumulative, before + rank, side="right")
+        for j, q in enumerate(qs):
+            position = (totals - 1) * q
+            lower, upper = np.floor(position), np.ceil(position)
+            lo_idx = np.minimum(at(lower), len(values) - 1)
+            hi_idx = np.minimum(at(upper), len(values) - 1)
+            out[present, j] = (values[lo_idx] + (values[hi_idx] - values[lo_idx]) * (position - lower))[present]
+        return out
+
+    def table(self, quantiles=QUANTILES):
+        """One row per (group, column): count, mean, std, var, skew, kurt, min, max and quantiles."""
+        n, m2, m3, m4 = (a.ravel() for a in (self.n, self.m2, self.m3, self.m4))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            var = np.where(n > 1, m2 / (n - 1), np.nan)
+            g1 = np.sqrt(n) * m3 / m2 ** 1.5
+            skew = np.where((n > 2) & (m2 > 0), np.sqrt(n * (n - 1)) / (n - 2) * g1, np.nan)
+            g2 = n * m4 / m2 ** 2 - 3
+            kurt = np.where((n > 3) & (m2 > 0), (n - 1) / ((n - 2) * (n - 3)) * ((n + 1) * g2 + 6), np.nan)
+        columns = {
+            "count": n.astype(np.int64), "mean": np.where(n > 0, self.mean.ravel(), np.nan),
+            "std": np.sqrt(var), "var": var, "skew": skew, "kurt": kurt,
+            "min": np.where(n > 0, self.min.ravel(), np.nan), "max": np.where(n > 0, self.max.ravel(), np.nan),
+        }
+        values = self.quantiles(quantiles)
+        for j, q in enumerate(quantiles):
+            columns["median" if q == 0.5 else f"q{q * 100:g}"] = values[:, j]
+        keys = sorted(self.groups, key=self.groups.get)
+        if self.by:
+            index = pd.MultiIndex.from_tuples([key + (c,) for key in keys for c in self.columns],
+                                              names=self.by + ["column"])
+        else:
+            index = pd.Index(self.columns, name="column")
+        return pd.DataFrame(columns, index=index)
+
+
+# ---------------------------------------------------------------------------
+# Entry points
+# ---------------------------------------------------------------------------
+
+def describe(frame, columns=None, by=None, quantiles=QUANTILES):
+    """table() of one DataFrame."""
+    return Descriptives(columns, by).update(frame).table(quantiles)
+
+
+def describe_chunks(chunks, columns=None, by=None, quantiles=QUANTILES, workers=None):
+    """table() of an iterable of DataFrame chunks, summarized on a thread pool and merged.
+
+    At most `workers` chunks are held in memory at a time.
+    """
+    workers = workers or os.cpu_count()
+    total = Descriptives(columns, by)
+    window = []
+
+    def flush():
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            for part in pool.map(lambda chunk: Descriptives(total.columns or columns, by).update(chunk), window):
+                total.merge(part)
+        window.clear()
+
+    for chunk in chunks:
+        if total.columns is None and columns is None:
+            total.columns = [c for c in chunk.select_dtypes("number").columns if c not in total.by]
+        window.append(chunk)
+        if len(window) == workers:
+            flush()
+    if window:
+        flush()
+    return total.table(quantiles)
+
+
+def describe_csv(path, columns=None, by=None, quantiles=QUANTILES, chunksize=CHUNK_ROWS, workers=None):
+    """describe_chunks() of a CSV read in chunks of `chunksize` rows."""
+    usecols = None if columns is None else list(columns) + ([by] if isinstance(by, str) else list(by or []))
+    return describe_chunks(pd.read_csv(path, usecols=usecols, chunksize=chunksize), columns, by, quantiles, workers)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="One-pass descriptive statistics of the numeric columns of a CSV.")
+    parser.add_argument("csv")
+    parser.add_argument("--by", action="append", help="group-by column (repeatable)")
+    parser.add_argument("--chunksize", type=int, default=CHUNK_ROWS)
+    parser.add_argument("--scales", action="store_true", help="describe the post-test scale scores instead")
+    args = parser.parse_args(argv)
+
+    if args.scales:
+        responses = pd.read_csv(args.csv)
+        table = describe(responses[args.by or []].join(score_scales(responses)), by=args.by)
+    else:
+        table = describe_csv(args.csv, by=args.by, chunksize=args.chunksize)
+    print(table.round(3).to_string())
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+"""
+Error analytics over the errors table of an event store.
+
+Every error row is interned to a signature, (error_type, error_message) shown
+as "type: message" or whichever half is present. The rows are then kept
+grouped by signature in CSR form (offsets into rows sorted by signature, then
+timestamp). That is the inverted index from a signature to the participants
+and times it occurred, and answering a question about one signature only reads
+its own slice.
+
+Each error is also linked to the participant's last event at or before it.
+Its page is the error's own page when the log records one (project 1) and the
+page of that preceding event otherwise (project 2 errors carry no page).
+Sparse signature x page and signature x preceding event_type matrices hold the
+co-occurrence counts, so "which pages trigger 'Timeout loading predictions'"
+is a single matrix row.
+
+open_error_index() drops repeated exports (log_integrity.py) before
+indexing, caches the index as error_index.npz in the store and rebuilds it
+when the store's sources or row counts change.
+
+Usage:
+    python error_index.py interaction_logs.store [SIGNATURE]
+"""
+
+import argparse
+import json
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+from event_store import NAT_MS, load_event_store, read_meta
+from log_integrity import deduplicate
+
+INDEX_VERSION = 1
+INDEX_FILE = "error_index.npz"
+
+# Per-error arrays, stored in index order (by signature, then timestamp)
+ERROR_ARRAYS = ("participant", "timestamp", "page", "error_page", "preceding_event_type",
+                "preceding_page", "seconds_since_event")
+
+
+def signature_labels(error_types, error_messages):
+    """'type: message', or whichever of the two is present."""
+    labels = []
+    for error_type, message in zip(error_types, error_messages):
+        parts = [str(v) for v in (error_type, message) if isinstance(v, str) and v]
+        labels.append(": ".join(parts) if parts else "(unknown)")
+    return labels
+
+
+def preceding_events(errors, events):
+    """For each error row, the row of the participant's last event at or before it (-1 if none)."""
+    left = pd.DataFrame({
+        "participant": errors["participant"].cat.codes.to_numpy(),
+        "timestamp": errors["timestamp"].to_numpy(),
+        "error_row": np.arange(len(errors)),
+    })
+    right = pd.DataFrame({
+        "participant": events["participant"].cat.codes.to_numpy(),
+        "timestamp": events["timestamp"].to_numpy(),
+        "event_row": np.arange(len(events)),
+    })
+    left = left[left["timestamp"] != NAT_MS].sort_values("timestamp", kind="stable")
+    right = right[right["timestamp"] != NAT_MS].sort_values("timestamp", kind="stable")
+    matched = pd.merge_asof(left, right, on="timestamp", by="participant", direction="backward")
+    rows = np.full(len(errors), -1, dtype=np.int64)
+    rows[matched["error_row"].to_numpy()] = matched["event_row"].fillna(-1).to_numpy(dtype=np.int64)
+    return rows
+
+
+class ErrorIndex:
+    """Interned error signatures with inverted indexes and co-occurrence counts."""
+
+    def __init__(self, signatures, offsets, arrays, labels, meta=None):
+        self.signatures = pd.Index(signatures, name="signature")
+        self.offsets = offsets
+        self.arrays = arrays
+        # Dictionaries of the coded arrays: participant, page, event_type
+        self.labels = {name: pd.Index(values) for name, values in labels.items()}
+        self.meta = meta or {}
+        n_pages, n_types = len(self.labels["page"]), len(self.labels["event_type"])
+        sig = np.repeat(np.arange(len(self.signatures)), np.diff(self.offsets))
+        self.page_matrix = self._counts(sig, arrays["page"], n_pages)
+        self.event_type_matrix = self._counts(sig, arrays["preceding_event_type"], n_types)
+
+    def _counts(self, sig, codes, width):
+        known = codes >= 0
+        return sparse.csr_matrix(
+            (np.ones(known.sum(), dtype=np.int64), (sig[known], codes[known])),
+            shape=(len(self.signatures), width),
+        )
+
+    @classmethod
+    def build(cls, tables, meta=None):
+        """Index the errors table, linking errors to the events table."""
+        errors, events = tables["errors"], tables["events"]
+        labels = signature_labels(errors["error_type"].astype(object), errors["error_message"].astype(object))
+        signature_codes, signatures = pd.factorize(pd.Series(labels, dtype=object), sort=True)
+        order = np.lexsort((errors["timestamp"].to_numpy(), signature_codes))
+        offsets = np.concatenate([[0], np.cumsum(np.bincount(signature_codes, minlength=len(signatures)))])
+
+        before = preceding_events(errors, events)
+        has_event = before >= 0
+        event_page = np.where(has_event, events["page"].cat.codes.to_numpy()[before], -1)
+        event_type = np.where(has_event, events["event_type"].cat.codes.to_numpy()[before], -1)
+        timestamps = errors["timestamp"].to_numpy()
+        event_times = np.where(has_event, events["timestamp"].to_numpy()[before], NAT_MS)
+        error_page = errors["page"].cat.codes.to_numpy()
+        # Errors and events share the store's page dictionary, so codes compare directly
+        if not errors["page"].cat.categories.equals(events["page"].cat.categories):
+            raise ValueError("errors and events do not share the store's page dictionary")
+
+        arrays = {
+            "participant": errors["participant"].cat.codes.to_numpy(),
+            "timestamp": timestamps,
+            "page": np.where(error_page >= 0, error_page, event_page),
+            "error_page": error_page,
+            "preceding_event_type": event_type,
+            "preceding_page": event_page,
+            "seconds_since_event": np.where(has_event & (timestamps != NAT_MS),
+                                            (timestamps - event_times) / 1000.0, np.nan),
+        }
+        arrays = {name: np.asarray(values)[order] for name, values in arrays.items()}
+        labels = {
+            "participant": list(errors["participant"].cat.categories),
+            "page": list(events["page"].cat.categories),
+            "event_type": list(events["event_type"].cat.categories),
+        }
+        return cls(list(signatures), offsets, arrays, labels, meta)
+
+    # ---- Persistence ----
+
+    def save(self, path):
+        meta = dict(self.meta, version=INDEX_VERSION, signatures=list(self.signatures),
+                    labels={name: list(values) for name, values in self.labels.items()})
+        tmp_path = path + ".tmp.npz"
+        np.savez(tmp_path, meta=np.array(json.dumps(meta)), offsets=self.offsets, **self.arrays)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            meta = json.loads(str(data["meta"]))
+            if meta.get("version") != INDEX_VERSION:
+                raise ValueError(f"{path}: unsupported error index version {meta.get('version')!r}")
+            arrays = {name: data[name] for name in ERROR_ARRAYS}
+            offsets = data["offsets"]
+        return cls(meta.pop("signatures"), offsets, arrays, meta.pop("labels"), meta)
+
+    # ---- Lookups ----
+
+    def find(self, text):
+        """Signature ids whose label, error type or message equals `text`."""
+        ids = []
+        for i, label in enumerate(self.signatures):
+            if label == text or text in label.split(": "):
+                ids.append(i)
+        if not ids:
+            raise KeyError(f"no error signature matches {text!r}")
+        return np.array(ids)
+
+    def __contains__(self, text):
+        """True when some signature matches `text` (see find())."""
+        try:
+            self.find(text)
+        except KeyError:
+            return False
+        return True
+
+    def _rows(self, ids):
+        return np.concatenate([np.arange(self.offsets[i], self.offsets[i + 1]) for i in ids])
+
+    def occurrences(self, text):
+        """Participant, time, page and preceding event of every error matching `text`."""
+        ids = self.find(text)
+        rows = self._rows(ids)
+        a = {name: values[rows] for name, values in self.arrays.items()}
+        lengths = np.diff(self.offsets)[ids]
+        return pd.DataFrame({
+            "signature": np.repeat(self.signatures[ids].to_numpy(), lengths),
+            "participant_id": self.labels["participant"][a["participant"]],
+            "timestamp": pd.to_datetime(np.where(a["timestamp"] == NAT_MS, np.nan, a["timestamp"]),
+                                        unit="ms", utc=True),
+            "page": pd.Categorical.from_codes(a["page"], categories=self.labels["page"]),
+            "preceding_event_type": pd.Categorical.from_codes(a["preceding_event_type"],
+                                                              categories=self.labels["event_type"]),
+            "seconds_since_event": a["seconds_since_event"],
+        })
+
+    def participants(self, text):
+        """Participants that hit errors matching `text`, with their error counts."""
+        rows = self._rows(self.find(text))
+        codes, counts = np.unique(self.arrays["participant"][rows], return_counts=True)
+        return pd.Series(counts, index=pd.Index(self.labels["participant"][codes], name="participant_id"),
+                         name="errors")
+
+    def _matrix_row(self, matrix, labels, text):
+        counts = np.asarray(matrix[self.find(text)].sum(axis=0)).ravel()
+        present = np.flatnonzero(counts)
+        series = pd.Series(counts[present], index=labels[present], name="errors")
+        return series.sort_values(ascending=False, kind="stable")
+
+    def pages(self, text):
+        """Pages on which errors matching `text` occurred."""
+        return self._matrix_row(self.page_matrix, self.labels["page"], text)
+
+    def preceding_event_types(self, text):
+        """Event types logged just before errors matching `text`."""
+        return self._matrix_row(self.event_type_matrix, self.labels["event_type"], text)
+
+    def summary(self):
+        """One row per signature: count, participants, first/last time, top page."""
+        n = np.diff(self.offsets)
+        sig = np.repeat(np.arange(len(self.signatures)), n)
+        participants = np.zeros(len(self.signatures), dtype=np.int64)
+        pairs = np.unique(np.stack([sig, self.arrays["participant"]]), axis=1)
+        np.add.at(participants, pairs[0], 1)
+        top_page = np.asarray(self.page_matrix.argmax(axis=1)).ravel()
+        has_page = np.asarray(self.page_matrix.sum(axis=1)).ravel() > 0
+        ts = np.where(self.arrays["timestamp"] == NAT_MS, np.nan, self.arrays["timestamp"])
+        nonempty = n > 0
+        first = np.full(len(n), np.nan)
+        last = np.full(len(n), np.nan)
+        first[nonempty] = np.fmin.reduceat(ts, self.offsets[:-1][nonempty])
+        last[nonempty] = np.fmax.reduceat(ts, self.offsets[:-1][nonempty])
+        return pd.DataFrame({
+            "errors": n,
+            "participants": participants,
+            "first": pd.to_datetime(first, unit="ms", utc=True),
+            "last": pd.to_datetime(last, unit="ms", utc=True),
+            "top_page": np.where(has_page, self.labels["page"][top_page], None),
+        }, index=self.signatures).sort_values("errors", ascending=False, kind="stable")
+
+
+def open_error_index(store_dir):
+    """The error index of a store, rebuilt when the store has changed since it was saved."""
+    path = os.path.join(str(store_dir), INDEX_FILE)
+    store_meta = read_meta(store_dir)
+    key = {"sources": store_meta["sources"],
+           "rows": {t: store_meta["tables"][t]["rows"] for t in ("errors", "events")}}
+    if os.path.exists(path):
+        try:
+            index = ErrorIndex.load(path)
+            if index.meta.get("store") == key:
+                return index
+        except (OSError, ValueError, KeyError):
+            pass
+    tables, _ = deduplicate(load_event_store(store_dir, ["participants", "events", "errors"]))
+    index = ErrorIndex.build(tables, meta={"store": key})
+    index.save(path)
+    return index
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Error signatures of an event store and where they occur.")
+    parser.add_argument("store_dir", help="event store directory (see event_store.py)")
+    parser.add_argument("signature", nargs="?", help="show pages, preceding events and participants for this signature")
+    args = parser.parse_args(argv)
+
+    index = open_error_index(args.store_dir)
+    if args.signature is None:
+        print(index.summary().to_string())
+        return 0
+    print(f"Pages for {args.signature!r}:")
+    print(index.pages(args.signature).to_string())
+    print("\nPreceding event types:")
+    print(index.preceding_event_types(args.signature).to_string())
+    print("\nParticipants:")
+    print(index.participants(args.signature).to_string())
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,600 @@
+#!/usr/bin/env python3
+"""
+Columnar event store for interaction logs.
+
+Flattens the nested participant entries of interaction_logs.json into five
+flat tables, each keyed by participant:
+
+  participants  one row per session (start/end, duration, click counters)
+  events        one row per logged event
+  choices       one row per narrative choice (project 1)
+  errors        one row per error encountered
+  features      one row per feature interacted with (project 2)
+
+Events point to their session through the event_start/event_stop offsets of
+its participants row, the other tables through a `session` column holding
+that row's number.
+
+A store is a directory holding meta.json (row counts, column kinds and the
+shared dictionaries) plus one raw little-endian .bin file per column:
+
+  - timestamps are int64 epoch milliseconds (naive timestamps are UTC)
+  - text columns (participant, event_type, page, details, ...) are int32
+    codes into a dictionary shared by every column with the same name
+  - counters, offsets and session numbers are int64, durations float64
+
+Missing values are stored as -1 (codes and counters), NAT_MS (timestamps)
+or NaN (floats). Loaded tables come back as DataFrames with the text columns
+as pandas Categoricals and the counters as nullable Int64 (missing = <NA>),
+so session summaries are vectorized group-bys that skip missing counters.
+
+For random access, EventStoreReader memory-maps the columns: a participant's
+events are located through the event_start/event_stop offsets of their
+session rows, and the events of one page (or event type) through a row index
+sorted by that column (events.page.idx), so only those bytes are read.
+
+Usage:
+    python event_store.py interaction_logs.json interaction_logs.store
+    python event_store.py interaction_logs.store
+    python event_store.py interaction_logs.store --participant P001
+    python event_store.py interaction_logs.store --page dashboard
+"""
+
+import json
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+from log_stream import iter_logs
+
+STORE_VERSION = 2
+META_NAME = "meta.json"
+FLUSH_PARTICIPANTS = 1024
+NAT_MS = np.iinfo(np.int64).min
+
+KIND_DTYPES = {
+    "category": np.dtype("<i4"),
+    "timestamp": np.dtype("<i8"),
+    "int": np.dtype("<i8"),
+    "offset": np.dtype("<i8"),
+    "float": np.dtype("<f8"),
+}
+KIND_MISSING = {"category": -1, "timestamp": NAT_MS, "int": -1, "offset": -1, "float": np.nan}
+
+# (column, kind) per table. Every column except `participant` and the
+# "offset" columns (event offsets and session numbers, set by the writer and
+# never missing) is read from the key of the same name in the log entry.
+SCHEMA = {
+    "participants": [
+        ("participant", "category"),
+        ("session_start", "timestamp"),
+        ("session_end", "timestamp"),
+        ("session_duration_seconds", "int"),
+        ("total_clicks", "int"),
+        ("total_pages_visited", "int"),
+        ("predictions_viewed", "int"),
+        ("recommendations_clicked", "int"),
+        ("event_start", "offset"),
+        ("event_stop", "offset"),
+    ],
+    "events": [
+        ("participant", "category"),
+        ("timestamp", "timestamp"),
+        ("event_type", "category"),
+        ("page", "category"),
+        ("details", "category"),
+        ("time_on_page_seconds", "float"),
+    ],
+    "choices": [
+        ("participant", "category"),
+        ("session", "offset"),
+        ("chapter", "category"),
+        ("choice_id", "category"),
+        ("choice_text", "category"),
+        ("time_to_decide_seconds", "float"),
+    ],
+    "errors": [
+        ("participant", "category"),
+        ("session", "offset"),
+        ("timestamp", "timestamp"),
+        ("error_type", "category"),
+        ("page", "category"),
+        ("error_message", "category"),
+    ],
+    "features": [
+        ("participant", "category"),
+        ("session", "offset"),
+        ("feature", "category"),
+    ],
+}
+TABLES = tuple(SCHEMA)
+
+# Text columns that get a sorted row index, so all rows with one value (e.g.
+# every event on one page) are a single slice of the index file
+INDEXED_COLUMNS = {"events": ("page", "event_type")}
+
+# Log entry key holding the child rows of each table
+CHILD_KEYS = {
+    "events": "events",
+    "choices": "choices_made",
+    "errors": "errors_encountered",
+    "features": "features_interacted",
+}
+
+
+def column_path(store_dir, table, column):
+    return os.path.join(store_dir, f"{table}.{column}.bin")
+
+
+def index_path(store_dir, table, column):
+    return os.path.join(store_dir, f"{table}.{column}.idx")
+
+
+def read_column(store_dir, table, column, kind, rows, mmap=False):
+    """Read one raw column; with `mmap` the file is memory-mapped read-only."""
+    dtype = KIND_DTYPES[kind]
+    path = column_path(store_dir, table, column)
+    if not mmap:
+        return np.fromfile(path, dtype=dtype, count=rows)
+    if rows == 0:
+        return np.empty(0, dtype=dtype)
+    return np.memmap(path, dtype=dtype, mode="r", shape=(rows,))
+
+
+def decode_column(values, kind, categories=()):
+    """Raw column values as loaded: Categoricals for text, nullable Int64 for counters."""
+    if kind == "category":
+        return pd.Categorical.from_codes(values, categories=categories)
+    if kind == "int":
+        values = np.asarray(values)
+        return pd.arrays.IntegerArray(values.copy(), values == KIND_MISSING[kind])
+    return values
+
+
+def build_index(store_dir, table, column, rows, n_values):
+    """Write the row ids of `table` sorted by `column`; return the offsets.
+
+    Rows with code v occupy positions offsets[v]:offsets[v + 1] of the index
+    file; rows with a missing value come first.
+    """
+    codes = read_column(store_dir, table, column, "category", rows, mmap=True)
+    order = np.argsort(codes, kind="stable").astype("<i8")
+    order.tofile(index_path(store_dir, table, column))
+    present = codes[codes >= 0]
+    counts = np.bincount(present, minlength=n_values)
+    offsets = np.concatenate([[0], np.cumsum(counts)]) + (len(codes) - len(present))
+    return offsets.tolist()
+
+
+def read_meta(store_dir):
+    with open(os.path.join(store_dir, META_NAME)) as f:
+        meta = json.load(f)
+    if meta.get("version") != STORE_VERSION:
+        raise ValueError(f"{store_dir}: unsupported event store version {meta.get('version')!r}")
+    return meta
+
+
+def source_signature(path):
+    """Identify a log file by name, size and modification time."""
+    st = os.stat(path)
+    return {"file": os.path.basename(str(path)), "size": st.st_size, "mtime_ns": st.st_mtime_ns}
+
+
+def to_epoch_ms(values):
+    """Parse ISO-8601 strings (naive = UTC) into int64 epoch milliseconds."""
+    if not len(values):
+        return np.empty(0, dtype=KIND_DTYPES["timestamp"])
+    parsed = pd.to_datetime(list(values), utc=True, format="ISO8601")
+    return parsed.as_unit("ms").asi8.astype(KIND_DTYPES["timestamp"], copy=False)
+
+
+# ---------------------------------------------------------------------------
+# Writing
+# ---------------------------------------------------------------------------
+
+class EventStoreWriter:
+    """Incrementally flatten participant log entries into a store directory.
+
+    With `append=True` an existing store is extended: new rows are appended
+    to the column files and new dictionary values get the next free codes.
+    """
+
+    def __init__(self, store_dir, append=False):
+        self.store_dir = str(store_dir)
+        os.makedirs(self.store_dir, exist_ok=True)
+        if append and os.path.exists(os.path.join(self.store_dir, META_NAME)):
+            meta = read_meta(self.store_dir)
+        else:
+            append = False
+            meta = {"sources": [], "tables": {}, "dictionaries": {}}
+        self.sources = meta["sources"]
+        self.rows = {t: meta["tables"].get(t, {}).get("rows", 0) for t in TABLES}
+        self.dictionaries = {name: list(values) for name, values in meta["dictionaries"].items()}
+        self._codes = {name: {v: i for i, v in enumerate(values)}
+                       for name, values in self.dictionaries.items()}
+        self._buffers = {t: {c: [] for c, _ in SCHEMA[t]} for t in TABLES}
+        self._buffered = {t: 0 for t in TABLES}
+        self._pending = 0
+        self._files = {}
+        for t in TABLES:
+            for c, kind in SCHEMA[t]:
+                path = column_path(self.store_dir, t, c)
+                if append and os.path.exists(path):
+                    # Drop bytes past the recorded row count (an interrupted
+                    # append) so new rows line up across columns
+                    fh = open(path, "r+b")
+                    fh.truncate(self.rows[t] * KIND_DTYPES[kind].itemsize)
+                    fh.seek(0, os.SEEK_END)
+                else:
+                    fh = open(path, "wb")
+                self._files[t, c] = fh
+
+    def _code(self, name, value):
+        if value is None:
+            return -1
+        codes = self._codes.setdefault(name, {})
+        value = str(value)
+        code = codes.get(value)
+        if code is None:
+            code = codes[value] = len(codes)
+            self.dictionaries.setdefault(name, []).append(value)
+        return code
+
+    def _append(self, table, participant_code, record):
+        buf = self._buffers[table]
+        for column, kind in SCHEMA[table]:
+            if column == "participant":
+                buf[column].append(participant_code)
+            elif kind == "category":
+                buf[column].append(self._code(column, record.get(column)))
+            else:
+                buf[column].append(record.get(column))
+        self._buffered[table] += 1
+
+    def write(self, participant):
+        """Flatten one participant entry into the tables."""
+        code = self._code("participant", participant.get("participant_id"))
+        session = self.rows["participants"] + self._buffered["participants"]
+        event_start = self.rows["events"] + self._buffered["events"]
+        for table, key in CHILD_KEYS.items():
+            for child in participant.get(key) or ():
+                if not isinstance(child, dict):
+                    child = {"feature": child}
+                self._append(table, code, dict(child, session=session))
+        record = dict(participant, event_start=event_start,
+                      event_stop=self.rows["events"] + self._buffered["events"])
+        self._append("participants", code, record)
+        self._pending += 1
+        if self._pending >= FLUSH_PARTICIPANTS:
+            self.flush()
+
+    def flush(self):
+        """Encode the buffered rows and append them to the column files."""
+        for table in TABLES:
+            if not self._buffered[table]:
+                continue
+            for column, kind in SCHEMA[table]:
+                values = self._buffers[table][column]
+                if kind == "timestamp":
+                    arr = to_epoch_ms(values)
+                else:
+                    missing = KIND_MISSING[kind]
+                    arr = np.array([missing if v is None else v for v in values],
+                                   dtype=KIND_DTYPES[kind])
+                arr.tofile(self._files[table, column])
+                values.clear()
+            self.rows[table] += self._buffered[table]
+            self._buffered[table] = 0
+        self._pending = 0
+
+    def checkpoint(self):
+        """Flush the buffered rows and write meta.json, so they survive a crash.
+
+        The sorted indexes are rebuilt over the whole table, so they are left
+        to close(): a checkpointed store has none until then, and
+        EventStoreReader.rows_where() scans the column instead.
+        """
+        self.flush()
+        for fh in self._files.values():
+            fh.flush()
+        self._write_meta(indexes=False)
+
+    def close(self):
+        if self._files is None:
+            return
+        self.flush()
+        for fh in self._files.values():
+            fh.close()
+        self._files = None
+        self._write_meta()
+
+    def _write_meta(self, indexes=True):
+        meta = {
+            "version": STORE_VERSION,
+            "sources": self.sources,
+            "tables": {
+                t: {"rows": self.rows[t], "columns": dict(SCHEMA[t]), "indexes": {}}
+                for t in TABLES
+            },
+            "dictionaries": self.dictionaries,
+        }
+        for table, columns in INDEXED_COLUMNS.items() if indexes else ():
+            for column in columns:
+                n_values = len(self.dictionaries.get(column, []))
+                meta["tables"][table]["indexes"][column] = build_index(
+                    self.store_dir, table, column, self.rows[table], n_values)
+        tmp_path = os.path.join(self.store_dir, META_NAME + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(meta, f, ensure_ascii=False)
+        os.replace(tmp_path, os.path.join(self.store_dir, META_NAME))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def convert_logs(log_path, store_dir, append=False):
+    """Flatten an interaction log file into `store_dir`; return the row counts."""
+    with EventStoreWriter(store_dir, append=append) as writer:
+        for participant in iter_logs(log_path):
+            writer.write(participant)
+        writer.sources.append(source_signature(log_path))
+    return dict(writer.rows)
+
+
+# ---------------------------------------------------------------------------
+# Reading
+# ---------------------------------------------------------------------------
+
+def load_table(store_dir, table, columns=None, meta=None, mmap=False):
+    """Load one table as a DataFrame (text columns as Categoricals, counters as Int64)."""
+    meta = meta or read_meta(store_dir)
+    info = meta["tables"][table]
+    data = {}
+    for column in columns or info["columns"]:
+        kind = info["columns"][column]
+        values = read_column(store_dir, table, column, kind, info["rows"], mmap=mmap)
+        data[column] = decode_column(values, kind, meta["dictionaries"].get(column, []))
+    return pd.DataFrame(data)
+
+
+def load_event_store(store_dir, tables=None):
+    """Load the given tables (all by default) into {table: DataFrame}."""
+    meta = read_meta(store_dir)
+    return {t: load_table(store_dir, t, meta=meta) for t in (tables or TABLES)}
+
+
+def default_store_dir(log_path):
+    """interaction_logs.json(.gz) -> interaction_logs.store next to it."""
+    base = str(log_path)
+    for suffix in (".gz", ".zst", ".json", ".jsonl"):
+        if base.endswith(suffix):
+            base = base[:-len(suffix)]
+    return base + ".store"
+
+
+def open_event_store(log_path, store_dir=None, tables=None):
+    """Load the event store for `log_path`, (re)building it if it is stale."""
+    if not os.path.exists(log_path):
+        raise FileNotFoundError(log_path)
+    store_dir = store_dir or default_store_dir(log_path)
+    try:
+        fresh = read_meta(store_dir)["sources"] == [source_signature(log_path)]
+    except (OSError, ValueError):
+        fresh = False
+    if not fresh:
+        convert_logs(log_path, store_dir)
+    return load_event_store(store_dir, tables)
+
+
+class EventStoreReader:
+    """Random access to a store through memory-mapped columns.
+
+    Looking up one participant's events only touches that participant's
+    slice of each events column (found through the event_start/event_stop
+    offsets), and rows_where() uses the sorted indexes in INDEXED_COLUMNS,
+    so neither parses nor loads the rest of the store.
+    """
+
+    def __init__(self, store_dir):
+        self.store_dir = str(store_dir)
+        self.meta = read_meta(self.store_dir)
+        self._columns = {}
+        self._categories = {}
+        # participant id -> participants rows (several if sessions were appended)
+        self._sessions = {}
+        names = self.meta["dictionaries"].get("participant", [])
+        for row, code in enumerate(self.column("participants", "participant").tolist()):
+            if code >= 0:
+                self._sessions.setdefault(names[code], []).append(row)
+
+    def column(self, table, column):
+        """Memory-mapped raw values (codes for text columns) of one column."""
+        key = (table, column)
+        if key not in self._columns:
+            info = self.meta["tables"][table]
+            self._columns[key] = read_column(self.store_dir, table, column,
+                                             info["columns"][column], info["rows"], mmap=True)
+        return self._columns[key]
+
+    def categories(self, column):
+        if column not in self._categories:
+            self._categories[column] = pd.Index(self.meta["dictionaries"].get(column, []))
+        return self._categories[column]
+
+    def frame(self, table, rows):
+        """Decode the given rows (a slice or row-id array) of `table`."""
+        data = {}
+        for column, kind in self.meta["tables"][table]["columns"].items():
+            values = np.asarray(self.column(table, column)[rows])
+            data[column] = decode_column(values, kind, self.categories(column))
+        return pd.DataFrame(data)
+
+    def participant_ids(self):
+        return list(self._sessions)
+
+    def sessions(self, participant_id):
+        """The participants-table rows of one participant."""
+        return self.frame("participants", np.array(self._sessions.get(participant_id, []), dtype=np.int64))
+
+    def events(self, participant_id):
+        """All events of one participant, read from their offset ranges only."""
+        start = self.column("participants", "event_start")
+        stop = self.column("participants", "event_stop")
+        ranges = [np.arange(start[row], stop[row]) for row in self._sessions.get(participant_id, [])]
+        rows = np.concatenate(ranges) if ranges else np.empty(0, dtype=np.int64)
+        return self.frame("events", rows)
+
+    def rows_where(self, table, column, value):
+        """Row ids of `table` whose indexed `column` equals `value`."""
+        if column not in INDEXED_COLUMNS.get(table, ()):
+            raise ValueError(f"{table}.{column} is not indexed; indexed: {INDEXED_COLUMNS.get(table, ())}")
+        try:
+            code = self.categories(column).get_loc(value)
+        except KeyError:
+            return np.empty(0, dtype=np.int64)
+        offsets = self.meta["tables"][table]["indexes"].get(column)
+        if offsets is None:
+            # A checkpoint of an interrupted write: the index is not built yet
+            return np.flatnonzero(np.asarray(self.column(table, column)) == code)
+        lo, hi = offsets[code], offsets[code + 1]
+        if lo == hi:
+            return np.empty(0, dtype=np.int64)
+        info = self.meta["tables"][table]
+        index = np.memmap(index_path(self.store_dir, table, column), dtype="<i8",
+                          mode="r", shape=(info["rows"],))
+        return np.asarray(index[lo:hi])
+
+    def events_on_page(self, page):
+        """Every event logged on `page`, across all participants."""
+        return self.frame("events", self.rows_where("events", "page", page))
+
+    def close(self):
+        self._columns.clear()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# ---------------------------------------------------------------------------
+# Session summaries
+# ---------------------------------------------------------------------------
+
+def event_sessions(tables):
+    """Session (participants row) of every event, from the event offsets."""
+    p = tables["participants"]
+    counts = p["event_stop"].to_numpy() - p["event_start"].to_numpy()
+    return np.repeat(np.arange(len(p)), counts)
+
+
+def count_by_session(tables, table):
+    """Number of rows of `table` in each session (participants row)."""
+    p = tables["participants"]
+    if table == "events":
+        return p["event_stop"].to_numpy() - p["event_start"].to_numpy()
+    session = tables[table]["session"].to_numpy()
+    return np.bincount(session[session >= 0], minlength=len(p))[:len(p)]
+
+
+def session_summary(tables):
+    """One row per session (indexed by participant): counters and row counts.
+
+    Every count is taken from the session's own rows, so a participant with
+    several sessions (appended exports) is not counted once per session.
+    Counters a session did not log are <NA>; counters that never occur in
+    the log (e.g. total_pages_visited for project 2) are dropped.
+    """
+    p = tables["participants"]
+    summary = pd.DataFrame(index=pd.Index(p["participant"].astype(str), name="participant_id"))
+    for column, kind in SCHEMA["participants"]:
+        if column == "participant" or kind == "offset":
+            continue
+        values = p[column]
+        missing = values == NAT_MS if kind == "timestamp" else values.isna()
+        if missing.all():
+            continue
+        summary[column] = values.array
+    for table in ("events", "choices", "errors", "features"):
+        summary[f"n_{table}"] = count_by_session(tables, table)
+    pages = tables["events"]["page"].cat.codes.to_numpy()
+    visited = pd.DataFrame({"session": event_sessions(tables), "page": pages})
+    visited = visited[visited["page"] >= 0].drop_duplicates()
+    summary["distinct_pages"] = np.bincount(visited["session"].to_numpy(), minlength=len(p))[:len(p)]
+    return summary
+
+
+# Session counters that add up across a participant's sessions; the others
+# count distinct pages or features and are taken over all sessions at once
+ADDITIVE_COLUMNS = ("session_duration_seconds", "total_clicks", "predictions_viewed",
+                    "recommendations_clicked", "n_events", "n_choices", "n_errors")
+
+
+def distinct_by_participant(table, column, index):
+    """Number of distinct values of `column` per participant id in `index`."""
+    present = table[table[column].cat.codes >= 0]
+    counts = present.groupby("participant", observed=True)[column].nunique()
+    counts.index = counts.index.astype(str)
+    return counts.reindex(index, fill_value=0).to_numpy()
+
+
+def participant_summary(tables):
+    """One row per participant: session_summary() combined over their sessions.
+
+    Additive counters are summed. Distinct counts (distinct_pages,
+    n_features) are recounted over all the participant's rows, and
+    total_pages_visited, which the log only has per session, takes the
+    largest session's value, so sessions that revisit pages or features do
+    not count them twice.
+    """
+    summary = session_summary(tables)
+    grouped = summary.groupby(level=0)
+    result = pd.DataFrame(index=pd.Index(sorted(grouped.groups), name="participant_id"))
+    for column in summary.columns:
+        if column in ADDITIVE_COLUMNS:
+            result[column] = grouped[column].sum(min_count=1)
+        elif column == "total_pages_visited":
+            result[column] = grouped[column].max()
+        elif column == "n_features":
+            result[column] = distinct_by_participant(tables["features"], "feature", result.index)
+        elif column == "distinct_pages":
+            result[column] = distinct_by_participant(tables["events"], "page", result.index)
+    return result
+
+
+# ---------------------------------------------------------------------------
+# Main
+# ---------------------------------------------------------------------------
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if len(argv) == 3 and argv[1] in ("--participant", "--page"):
+        with EventStoreReader(argv[0]) as reader:
+            if argv[1] == "--participant":
+                events = reader.events(argv[2])
+            else:
+                events = reader.events_on_page(argv[2])
+        print(events.to_string())
+        return 0
+    if len(argv) == 2:
+        rows = convert_logs(argv[0], argv[1])
+        print(f"[OK] Event store: {rows['participants']} participants, "
+              f"{rows['events']} events -> {argv[1]}")
+        return 0
+    if len(argv) == 1:
+        tables = load_event_store(argv[0])
+        for name, table in tables.items():
+            print(f"{name:13s} {len(table):>10d} rows")
+        print(session_summary(tables).describe().T.to_string())
+        return 0
+    print(__doc__.strip())
+    return 2
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,534 @@
+#!/usr/bin/env python3
+"""
+Report figures as named panels, rendered on a process pool and cached.
+
+Every figure in FIGURES is a grid of panels. A panel is a drawing function
+draw(ax, table, **style) of a small precomputed summary table (value
+counts, means and SDs, histogram bins, box-plot statistics, a correlation
+matrix) built by the *_tables() functions below, never of the raw data.
+
+render_figures() fingerprints each panel (build_cache.fingerprint) from its
+drawing function's source, its styling, the shared matplotlib STYLE and its
+table, and keeps the fingerprints of the last run in a figures.cache
+manifest next to the figures. Panels whose fingerprint is unchanged (and
+whose tile still exists) are skipped; the rest are drawn as PNG tiles on a
+process pool, and a figure is re-assembled from its tiles only when one of
+them changed. Regenerating the full report with nothing changed therefore
+draws nothing at all, and a change to one scale redraws one panel.
+
+A panel whose table is None (its columns are missing) is left as empty
+axes, as the notebook cells did.
+
+Usage:
+    python figures.py deliverables [--workers 4] [--force]
+"""
+
+import argparse
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+import matplotlib
+import numpy as np
+import pandas as pd
+import seaborn as sns
+from matplotlib import cbook
+from matplotlib import image as mpimg
+from matplotlib.figure import Figure
+
+from build_cache import Manifest, fingerprint
+from correlations import correlation_matrix
+from descriptives import describe
+
+CACHE_DIR_NAME = "figures.cache"
+DPI = 150
+TITLE_INCHES = 0.7
+# The notebook's plot defaults (setup cell)
+STYLE = ["seaborn-v0_8-whitegrid", {"font.size": 11, "axes.titlesize": 13, "axes.labelsize": 11}]
+
+SUS_BENCHMARK = 68
+
+
+# ---------------------------------------------------------------------------
+# Summary tables
+# ---------------------------------------------------------------------------
+
+def histogram_table(values, bins):
+    """Bin edges and counts of the non-missing values (np.histogram, as plt.hist bins)."""
+    values = pd.Series(values, dtype=np.float64).dropna().to_numpy()
+    counts, edges = np.histogram(values, bins=bins)
+    return pd.DataFrame({"left": edges[:-1], "right": edges[1:], "count": counts})
+
+
+def box_table(groups):
+    """matplotlib box-plot statistics of each labelled group, one row each."""
+    labels = list(groups)
+    rows = cbook.boxplot_stats([pd.Series(v, dtype=np.float64).dropna().to_numpy() for v in groups.values()],
+                               labels=labels)
+    for row in rows:
+        row["fliers"] = [float(x) for x in row["fliers"]]
+    return pd.DataFrame(rows)
+
+
+def mean_table(frame, columns):
+    """Mean and SD of each column ({label: column}) present in `frame`, or None."""
+    columns = {label: col for label, col in columns.items() if col in frame.columns}
+    if not columns:
+        return None
+    table = describe(frame, columns=list(columns.values()))[["mean", "std"]]
+    table.index = list(columns)
+    return table
+
+
+def counts_table(frame, column, top=None):
+    if column not in frame.columns:
+        return None
+    counts = frame[column].value_counts()
+    return counts.head(top) if top else counts
+
+
+def labelled_correlations(frame, labels):
+    """Pearson r of the labelled columns present in `frame`, relabelled for display."""
+    columns = [c for c in labels if c in frame.columns]
+    r = correlation_matrix(frame[columns], correction=None)["r"]
+    r.index = r.columns = [labels[c] for c in columns]
+    return r
+
+
+def p1_survey_tables(survey):
+    """Tables of the P1 requirements-survey figure."""
+    importance = [c for c in survey.columns if c.startswith("importance_")]
+    ai = [c for c in survey.columns if c.startswith("ai_")]
+    return {
+        "genre_preferences": counts_table(survey, "preferred_genre"),
+        "art_style_preferences": counts_table(survey, "art_style"),
+        "content_importance": mean_table(survey, {
+            c.replace("importance_", "").replace("_", " ").title(): c for c in importance}),
+        "ai_acceptance": mean_table(survey, {c.replace("ai_", "").replace("_", " ").title(): c for c in ai}),
+        "age_distribution": histogram_table(survey["age"], 15) if "age" in survey.columns else None,
+        "game_length_preferences": counts_table(survey, "game_length"),
+    }
+
+
+def p2_survey_tables(survey):
+    """Tables of the P2 requirements-survey figure."""
+    attitude = [c for c in survey.columns if c.startswith("attitude_")]
+    return {
+        "attitude_ratings": mean_table(survey, {
+            c.replace("attitude_", "").replace("_", " ").title(): c for c in attitude}),
+        "study_methods": counts_table(survey, "study_method"),
+        "dashboard_complexity": counts_table(survey, "dashboard_complexity"),
+        "majors": counts_table(survey, "major", top=8),
+        "gpa_distribution": histogram_table(survey["gpa"], 15) if "gpa" in survey.columns else None,
+        "notification_preferences": counts_table(survey, "notification_pref"),
+    }
+
+
+def _sus_table(posttest):
+    return {"bins": histogram_table(posttest["sus_score"], 12), "mean": float(posttest["sus_score"].mean())}
+
+
+def _session_table(sessions):
+    return None if sessions is None else histogram_table(sessions["session_duration_seconds"] / 60, 10)
+
+
+def p1_evaluation_tables(posttest, sessions=None):
+    """Tables of the P1 evaluation figure (posttest joined with the participant features)."""
+    ues = {"Focused Attention": "ues_fa_mean", "Perceived Usability": "ues_pu_mean",
+           "Aesthetic Appeal": "ues_ae_mean", "Reward Factor": "ues_rw_mean"}
+    ues = {label: posttest[col] for label, col in ues.items() if col in posttest.columns}
+    correlations = None
+    if "nq_mean" in posttest.columns and "ues_overall" in posttest.columns:
+        correlations = labelled_correlations(posttest, {
+            "sus_score": "SUS", "nq_mean": "Narrative", "ai_mean": "AI Percep.",
+            "immersion_mean": "Immersion", "ues_overall": "Engagement"})
+    by_condition = None
+    if "condition" in posttest.columns:
+        by_condition = box_table({name.replace("_", "\n"): group
+                                  for name, group in posttest.groupby("condition")["sus_score"]})
+    return {
+        "sus_distribution": _sus_table(posttest),
+        "ues_subscales": box_table(ues) if ues else None,
+        "custom_scales": mean_table(posttest, {"Narrative\nQuality": "nq_mean", "AI\nPerception": "ai_mean",
+                                               "Immersion": "immersion_mean"}),
+        "correlations": correlations,
+        "session_durations": _session_table(sessions),
+        "sus_by_condition": by_condition,
+    }
+
+
+def p2_evaluation_tables(posttest, sessions=None):
+    """Tables of the P2 evaluation figure (posttest joined with the participant features)."""
+    labels = {"sus_score": "SUS", "trust_mean": "Trust", "usefulness_mean": "Useful", "ease_mean": "Ease"}
+    correlations = None
+    if sum(c in posttest.columns for c in labels) >= 2:
+        correlations = labelled_correlations(posttest, labels)
+    by_explanation = None
+    if "explanation_level" in posttest.columns:
+        by_explanation = box_table(dict(iter(posttest.groupby("explanation_level")["trust_mean"])))
+    privacy_trust = None
+    if "privacy_mean" in posttest.columns and "trust_mean" in posttest.columns:
+        points = posttest[["privacy_mean", "trust_mean"]].rename(columns={"privacy_mean": "x", "trust_mean": "y"})
+        privacy_trust = {"points": points.reset_index(drop=True),
+                         "fit": np.polyfit(points["x"], points["y"], 1).tolist()}
+    return {
+        "sus_distribution": _sus_table(posttest),
+        "scale_ratings": mean_table(posttest, {"Trust": "trust_mean", "Usefulness": "usefulness_mean",
+                                               "Ease of Use": "ease_mean", "Accuracy": "accuracy_mean",
+                                               "Privacy": "privacy_mean"}),
+        "correlations": correlations,
+        "trust_by_explanation": by_explanation,
+        "session_durations": _session_table(sessions),
+        "privacy_vs_trust": privacy_trust,
+    }
+
+
+# ---------------------------------------------------------------------------
+# Panels
+# ---------------------------------------------------------------------------
+
+def counts_barh(ax, counts, title, palette):
+    counts.sort_values().plot.barh(ax=ax, color=sns.color_palette(palette, len(counts)))
+    ax.set_title(title)
+    ax.set_xlabel("Count")
+
+
+def counts_bar(ax, counts, title, color, xlabel=None):
+    counts.plot.bar(ax=ax, color=color, edgecolor="white")
+    ax.set_title(title)
+    if xlabel:
+        ax.set_xlabel(xlabel)
+    ax.set_ylabel("Count")
+    ax.tick_params(axis="x", rotation=45)
+
+
+def pie_chart(ax, counts, title, palette):
+    ax.pie(counts, labels=counts.index, autopct="%1.0f%%", colors=sns.color_palette(palette), startangle=90)
+    ax.set_title(title)
+
+
+def mean_bars(ax, table, title, ylabel, palette=None, colors=None, error_bars=False, capsize=4, alpha=None,
+              ylim=None, midpoint=None, rotation=None):
+    color = colors[:len(table)] if colors else sns.color_palette(palette, len(table))
+    ax.bar(list(table.index), table["mean"], yerr=table["std"] if error_bars else None, capsize=capsize,
+           color=color, alpha=alpha)
+    ax.set_title(title)
+    ax.set_ylabel(ylabel)
+    if ylim:
+        ax.set_ylim(*ylim)
+    if midpoint is not None:
+        ax.axhline(y=midpoint, color="gray", linestyle="--", alpha=0.5)
+    if rotation:
+        ax.tick_params(axis="x", rotation=rotation)
+
+
+def histogram(ax, bins, title, xlabel, color, ylabel=None, alpha=None):
+    edges = np.append(bins["left"].to_numpy(), bins["right"].iloc[-1])
+    ax.hist(bins["left"], bins=edges, weights=bins["count"], color=color, alpha=alpha, edgecolor="white")
+    ax.set_title(title)
+    ax.set_xlabel(xlabel)
+    if ylabel:
+        ax.set_ylabel(ylabel)
+
+
+def sus_distribution(ax, table, color, ylabel=None):
+    bins = table["bins"]
+    edges = np.append(bins["left"].to_numpy(), bins["right"].iloc[-1])
+    ax.hist(bins["left"], bins=edges, weights=bins["count"], color=color, alpha=0.7, edgecolor="white")
+    ax.axvline(x=SUS_BENCHMARK, color="red", linestyle="--", label=f"Benchmark ({SUS_BENCHMARK})")
+    ax.axvline(x=table["mean"], color="green", linestyle="-", label=f"Mean ({table['mean']:.1f})")
+    ax.set_title("SUS Score Distribution")
+    ax.set_xlabel("SUS Score")
+    if ylabel:
+        ax.set_ylabel(ylabel)
+    ax.legend(fontsize=9)
+
+
+def box_groups(ax, table, title, ylabel, colors, reference=None):
+    boxes = ax.bxp(table.to_dict("records"), patch_artist=True)["boxes"]
+    for patch, color in zip(boxes, colors):
+        patch.set_facecolor(color)
+        patch.set_alpha(0.7)
+    ax.set_title(title)
+    ax.set_ylabel(ylabel)
+    if reference is not None:
+        ax.axhline(y=reference, color="gray", linestyle="--", alpha=0.5)
+
+
+def correlation_heatmap(ax, r):
+    sns.heatmap(r, annot=True, fmt=".2f", cmap="RdYlBu_r", center=0, ax=ax, vmin=-1, vmax=1, square=True)
+    ax.set_title("Correlation Matrix")
+
+
+def scatter_fit(ax, table, title, xlabel, ylabel):
+    points = table["points"]
+    ax.scatter(points["x"], points["y"], alpha=0.6, color="#5C6BC0", s=50)
+    x_line = np.linspace(points["x"].min(), points["x"].max(), 100)
+    ax.plot(x_line, np.polyval(table["fit"], x_line), "r--", alpha=0.8)
+    ax.set_title(title)
+    ax.set_xlabel(xlabel)
+    ax.set_ylabel(ylabel)
+
+
+# ---------------------------------------------------------------------------
+# Figures: title, grid and panels (name, drawing function, styling) in grid order
+# ---------------------------------------------------------------------------
+
+BOX_COLORS = ["#42A5F5", "#66BB6A", "#FFA726", "#EF5350"]
+SCALE_COLORS = ["#42A5F5", "#66BB6A", "#FFA726", "#AB47BC", "#EF5350"]
+
+FIGURES = {
+    "p1_survey_results": {
+        "title": "Project 1: Gemini Quest — Requirements Survey Results",
+        "title_style": {"fontsize": 16},
+        "grid": (2, 3), "figsize": (18, 10),
+        "panels": [
+            ("genre_preferences", counts_barh, {"title": "Preferred Genre", "palette": "viridis"}),
+            ("art_style_preferences", counts_barh, {"title": "Preferred Art Style", "palette": "magma"}),
+            ("content_importance", mean_bars, {"title": "Content Importance Ratings", "ylabel": "Mean Rating",
+                                               "palette": "coolwarm", "error_bars": True, "rotation": 45}),
+            ("ai_acceptance", mean_bars, {"title": "AI Acceptance Ratings", "ylabel": "Mean Rating",
+                                          "palette": "Set2", "rotation": 45}),
+            ("age_distribution", histogram, {"title": "Age Distribution", "xlabel": "Age",
+                                             "ylabel": "Frequency", "color": "steelblue"}),
+            ("game_length_preferences", counts_bar, {"title": "Preferred Game Length", "color": "coral",
+                                                     "xlabel": "Length"}),
+        ],
+    },
+    "p2_survey_results": {
+        "title": "Project 2: StudyBuddy — Requirements Survey Results",
+        "title_style": {"fontsize": 16},
+        "grid": (2, 3), "figsize": (18, 10),
+        "panels": [
+            ("attitude_ratings", mean_bars, {"title": "AI & Technology Attitude Ratings", "ylabel": "Mean Rating",
+                                             "palette": "Blues_d", "rotation": 45}),
+            ("study_methods", pie_chart, {"title": "Primary Study Method", "palette": "pastel"}),
+            ("dashboard_complexity", counts_bar, {"title": "Dashboard Complexity Preference",
+                                                  "color": "mediumpurple"}),
+            ("majors", counts_barh, {"title": "Major Distribution (Top 8)", "palette": "Spectral"}),
+            ("gpa_distribution", histogram, {"title": "GPA Distribution", "xlabel": "GPA",
+                                             "ylabel": "Frequency", "color": "teal"}),
+            ("notification_preferences", counts_bar, {"title": "Notification Preference", "color": "salmon"}),
+        ],
+    },
+    "p1_evaluation_results": {
+        "title": "Project 1: Gemini Quest — Evaluation Results (N=40)",
+        "title_style": {"fontsize": 16, "fontweight": "bold"},
+        "grid": (2, 3), "figsize": (18, 11),
+        "panels": [
+            ("sus_distribution", sus_distribution, {"color": "#5C6BC0", "ylabel": "Frequency"}),
+            ("ues_subscales", box_groups, {"title": "UES-SF Subscales", "ylabel": "Score (1-5)",
+                                           "colors": BOX_COLORS}),
+            ("custom_scales", mean_bars, {"title": "Custom Scale Ratings", "ylabel": "Mean (1-7)",
+                                          "colors": ["#AB47BC", "#26A69A", "#EC407A"], "error_bars": True,
+                                          "capsize": 5, "alpha": 0.8, "ylim": (1, 7), "midpoint": 4}),
+            ("correlations", correlation_heatmap, {}),
+            ("session_durations", histogram, {"title": "Session Duration Distribution",
+                                              "xlabel": "Duration (minutes)", "ylabel": "Frequency",
+                                              "color": "#78909C", "alpha": 0.7}),
+            ("sus_by_condition", box_groups, {"title": "SUS Score by Condition", "ylabel": "SUS Score",
+                                              "colors": ["#66BB6A", "#EF5350"], "reference": SUS_BENCHMARK}),
+        ],
+    },
+    "p2_evaluation_results": {
+        "title": "Project 2: StudyBuddy — Evaluation Results (N=40)",
+        "title_style": {"fontsize": 16, "fontweight": "bold"},
+        "grid": (2, 3), "figsize": (18, 11),
+        "panels": [
+            ("sus_distribution", sus_distribution, {"color": "#26A69A"}),
+            ("scale_ratings", mean_bars, {"title": "Scale Ratings", "ylabel": "Mean (1-7)", "colors": SCALE_COLORS,
+                                          "error_bars": True, "capsize": 5, "alpha": 0.8, "ylim": (1, 7),
+                                          "midpoint": 4, "rotation": 15}),
+            ("correlations", correlation_heatmap, {}),
+            ("trust_by_explanation", box_groups, {"title": "Trust by Explanation Level",
+                                                  "ylabel": "Trust Score (1-7)",
+                                                  "colors": ["#EF5350", "#FFA726", "#66BB6A"]}),
+            ("session_durations", histogram, {"title": "Session Duration", "xlabel": "Duration (minutes)",
+                                              "color": "#78909C", "alpha": 0.7}),
+            ("privacy_vs_trust", scatter_fit, {"title": "Privacy Concern vs. Trust",
+                                               "xlabel": "Privacy Concern (1-7)", "ylabel": "Trust in AI (1-7)"}),
+        ],
+    },
+}
+
+
+# ---------------------------------------------------------------------------
+# Rendering
+# ---------------------------------------------------------------------------
+
+def _jsonable(value):
+    """Tables as plain JSON for fingerprinting (repr would truncate large frames).
+
+    Floats keep 10 significant digits: far below anything a figure shows, and
+    insensitive to the last-bit noise of a CSV round trip.
+    """
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        return json.loads(value.to_json(orient="split", double_precision=10))
+    if isinstance(value, dict):
+        return {str(k): _jsonable(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple, np.ndarray)):
+        return [_jsonable(v) for v in value]
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, float):
+        return float(f"{value:.10g}")
+    return value
+
+
+def _tile_size(spec):
+    rows, cols = spec["grid"]
+    return spec["figsize"][0] / cols, spec["figsize"][1] / rows
+
+
+def panel_digest(spec, panel, table):
+    _, draw, style = panel
+    return fingerprint(draw, style, STYLE, DPI, _tile_size(spec), _jsonable(table))
+
+
+def render_panel(figure, index, table, path):
+    """Draw one panel of FIGURES[figure] as a PNG tile (runs in a worker process)."""
+    spec = FIGURES[figure]
+    _, draw, style = spec["panels"][index]
+    with matplotlib.style.context(STYLE):
+        fig = Figure(figsize=_tile_size(spec), dpi=DPI, layout="tight")
+        ax = fig.subplots()
+        if table is not None:
+            draw(ax, table, **style)
+        fig.savefig(path + ".tmp.png", dpi=DPI)
+    os.replace(path + ".tmp.png", path)
+    return path
+
+
+def compose(spec, tiles, path):
+    """Assemble a figure from its tiles (grid order) under the figure title."""
+    rows, cols = spec["grid"]
+    images = [mpimg.imread(tile) for tile in tiles]
+    grid = np.concatenate([np.concatenate(images[r * cols:(r + 1) * cols], axis=1) for r in range(rows)], axis=0)
+    height, width = grid.shape[:2]
+    title_height = int(TITLE_INCHES * DPI)
+    fig = Figure(figsize=(width / DPI, (height + title_height) / DPI), dpi=DPI)
+    fig.figimage(grid, xo=0, yo=0)
+    fig.text(0.5, 1 - title_height / 2 / (height + title_height), spec["title"],
+             ha="center", va="center", **spec["title_style"])
+    fig.savefig(path + ".tmp.png", dpi=DPI, facecolor="white")
+    os.replace(path + ".tmp.png", path)
+    return path
+
+
+def render_figures(tables, output_dir, workers=None, force=False):
+    """Render the figures of `tables` ({figure: {panel: table}}) into output_dir.
+
+    Only panels whose fingerprint changed are drawn, on a process pool of
+    `workers` (default: all cores); `force` redraws everything. Returns a
+    DataFrame with one row per panel: figure, panel, status ("drawn" or
+    "cached") and the figure's path.
+    """
+    output_dir = str(output_dir)
+    cache_dir = os.path.join(output_dir, CACHE_DIR_NAME)
+    manifest = Manifest(cache_dir)
+    jobs, rows, figures = [], [], {}
+    for figure, figure_tables in tables.items():
+        spec = FIGURES[figure]
+        os.makedirs(os.path.join(cache_dir, figure), exist_ok=True)
+        digests, tiles = [], []
+        for index, panel in enumerate(spec["panels"]):
+            name = panel[0]
+            table = figure_tables.get(name)
+            digest = panel_digest(spec, panel, table)
+            tile = os.path.join(cache_dir, figure, name + ".png")
+            stale = force or not manifest.is_fresh(f"{figure}/{name}", digest, tile)
+            if stale:
+                jobs.append((figure, index, table, tile, digest))
+            rows.append({"figure": figure, "panel": name, "status": "drawn" if stale else "cached"})
+            digests.append(digest)
+            tiles.append(tile)
+        path = os.path.join(output_dir, figure + ".png")
+        figures[figure] = (spec, tiles, path, fingerprint(spec["title"], spec["title_style"], TITLE_INCHES, digests))
+
+    if len(jobs) > 1 and workers != 1:
+        with ProcessPoolExecutor(max_workers=min(len(jobs), workers or os.cpu_count())) as pool:
+            list(pool.map(render_panel, *zip(*(job[:4] for job in jobs))))
+    else:
+        for job in jobs:
+            render_panel(*job[:4])
+    for figure, index, _, tile, digest in jobs:
+        manifest.record(f"{figure}/{FIGURES[figure]['panels'][index][0]}", digest, tile)
+
+    for figure, (spec, tiles, path, digest) in figures.items():
+        if force or not manifest.is_fresh(figure, digest, path):
+            compose(spec, tiles, path)
+            manifest.record(figure, digest, path)
+    report = pd.DataFrame(rows, columns=["figure", "panel", "status"])
+    report["path"] = report["figure"].map(lambda figure: figures[figure][2])
+    return report
+
+
+def format_report(report):
+    """One line per figure: how many of its panels were drawn."""
+    lines = []
+    for figure, panels in report.groupby("figure", sort=False):
+        drawn = int((panels["status"] == "drawn").sum())
+        tag = "[OK]" if drawn else "[--]"
+        lines.append(f"{tag} {figure}: {drawn} of {len(panels)} panels drawn -> {panels['path'].iloc[0]}")
+    return lines
+
+
+# ---------------------------------------------------------------------------
+# Full report
+# ---------------------------------------------------------------------------
+
+# The notebook's H1 tests split the post-test respondents into simulated
+# conditions, seeded as in its cells: project -> (column, seed, levels)
+SIMULATED_CONDITIONS = {
+    "project1": ("condition", 42, ["preferences_integrated", "generic"]),
+    "project2": ("explanation_level", 43, ["none", "simple", "detailed"]),
+}
+
+
+def simulated_conditions(n, seed, levels):
+    """The notebook's np.random.seed(seed); np.random.choice(levels, n) split."""
+    return np.random.RandomState(seed).choice(levels, size=n)
+
+
+def report_tables(deliverables):
+    """Tables of every figure, from the data files below `deliverables`."""
+    from event_store import open_event_store, session_summary
+    from log_integrity import deduplicate
+    from participant_features import LOGS_FILE, POSTTEST_FILE, load_project_features
+
+    survey_file = os.path.join("survey", "requirements_survey_responses.csv")
+    tables = {}
+    for project, survey_tables, evaluation_tables in (("project1", p1_survey_tables, p1_evaluation_tables),
+                                                      ("project2", p2_survey_tables, p2_evaluation_tables)):
+        project_dir = os.path.join(deliverables, project)
+        prefix = "p" + project[-1]
+        if os.path.exists(os.path.join(project_dir, survey_file)):
+            tables[f"{prefix}_survey_results"] = survey_tables(pd.read_csv(os.path.join(project_dir, survey_file)))
+        if os.path.exists(os.path.join(project_dir, POSTTEST_FILE)):
+            posttest = pd.read_csv(os.path.join(project_dir, POSTTEST_FILE))
+            posttest = posttest.join(load_project_features(project_dir), on="participant_id")
+            column, seed, levels = SIMULATED_CONDITIONS[project]
+            posttest[column] = simulated_conditions(len(posttest), seed, levels)
+            sessions = None
+            if os.path.exists(os.path.join(project_dir, LOGS_FILE)):
+                sessions = session_summary(deduplicate(open_event_store(os.path.join(project_dir, LOGS_FILE)))[0])
+            tables[f"{prefix}_evaluation_results"] = evaluation_tables(posttest, sessions)
+    return tables
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render the report figures, redrawing only changed panels.")
+    parser.add_argument("deliverables", help="deliverables folder (project1/, project2/, report/)")
+    parser.add_argument("--workers", type=int, help="worker processes (default: all cores)")
+    parser.add_argument("--force", action="store_true", help="redraw every panel")
+    args = parser.parse_args(argv)
+
+    report = render_figures(report_tables(args.deliverables), os.path.join(args.deliverables, "report"),
+                            workers=args.workers, force=args.force)
+    print("\n".join(format_report(report)))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
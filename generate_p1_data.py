@@ -2,39 +2,73 @@
 """
 Generate all dummy data for Project 1: Gemini Quest - AI-Generated Interactive Narrative Videogame.
 
-Produces:
-  1. Requirements survey CSV (120 responses)
-  2. Post-test survey CSV (40 responses)
-  3. Interaction logs JSON (40 participants)
-  4. Coded qualitative data CSV
-
-Uses numpy seed 42 for reproducibility.
+Produces, below the output root (deliverables/project1 by default):
+  survey       survey/requirements_survey_responses.csv   (120 responses)
+  posttest     posttest/posttest_survey_responses.csv     (40 responses)
+  logs         logs/interaction_logs.json                 (40 participants)
+  qualitative  posttest/coded_qualitative_data.csv
+
+Cohort sizes, event mixes, error rates and coder agreement come from a
+scenario profile (profiles/default.json unless --profile is given). All
+artifacts are drawn from one random stream seeded with the profile seed (42 by
+default), in the order survey -> posttest -> logs -> qualitative. A subset is
+generated by replaying the artifacts drawn before it in memory, so it comes
+out identical to the same files of a full run.
+
+Reruns are incremental: an artifact is only rebuilt when its parameters, its
+code or an artifact drawn before it changed since the last build recorded in
+the output root's generation_manifest.json.
+
+Usage:
+    python generate_p1_data.py [--profile NAME|PATH] [--output-root DIR]
+                               [--only survey posttest logs qualitative] [--force]
+
+Importable API (nothing is written unless output_root is given):
+    from generate_p1_data import generate
+    frames = generate(["posttest", "qualitative"], profile="small")
 """
 
+import argparse
 import csv
-import json
 import os
 import random
+from collections import deque
 from datetime import datetime, timedelta
 
 import numpy as np
+import pandas as pd
 
-# ---------------------------------------------------------------------------
-# Reproducibility
-# ---------------------------------------------------------------------------
-np.random.seed(42)
-random.seed(42)
+from build_cache import Manifest, fingerprint
+from log_stream import WRITER_CODE, write_logs
+from scenario_profiles import DEFAULT_PROFILE, load_profile
 
 # ---------------------------------------------------------------------------
-# Output paths
+# Artifacts and output paths
 # ---------------------------------------------------------------------------
-SURVEY_PATH = "/home/user/empty3/deliverables/project1/survey/requirements_survey_responses.csv"
-POSTTEST_PATH = "/home/user/empty3/deliverables/project1/posttest/posttest_survey_responses.csv"
-LOGS_PATH = "/home/user/empty3/deliverables/project1/logs/interaction_logs.json"
-CODED_PATH = "/home/user/empty3/deliverables/project1/posttest/coded_qualitative_data.csv"
+DEFAULT_OUTPUT_ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "deliverables", "project1")
+
+ARTIFACTS = ("survey", "posttest", "logs", "qualitative")
+ARTIFACT_FILES = {
+    "survey": os.path.join("survey", "requirements_survey_responses.csv"),
+    "posttest": os.path.join("posttest", "posttest_survey_responses.csv"),
+    "logs": os.path.join("logs", "interaction_logs.json"),
+    "qualitative": os.path.join("posttest", "coded_qualitative_data.csv"),
+}
+ARTIFACT_LABELS = {
+    "survey": "Requirements survey",
+    "posttest": "Post-test survey",
+    "logs": "Interaction logs",
+    "qualitative": "Coded qualitative data",
+}
+
+QUALITATIVE_FIELDS = [
+    "participant_id", "response_type", "original_text",
+    "code", "theme", "coder",
+]
+
 
-for p in [SURVEY_PATH, POSTTEST_PATH, LOGS_PATH, CODED_PATH]:
-    os.makedirs(os.path.dirname(p), exist_ok=True)
+def artifact_path(output_root, artifact):
+    return os.path.join(output_root, ARTIFACT_FILES[artifact])
 
 # ---------------------------------------------------------------------------
 # Helper utilities
@@ -187,8 +221,8 @@ ACCESSIBILITY_DETAILS = [
 # 1. Requirements Survey (120 responses)
 # ---------------------------------------------------------------------------
 
-def generate_requirements_survey():
-    n = 120
+def generate_requirements_survey(cfg):
+    n = cfg["n_survey"]
     rows = []
 
     ages = np.clip(np.round(np.random.normal(25, 7, n)).astype(int), 18, 65)
@@ -279,12 +313,6 @@ def generate_requirements_survey():
             "open_feedback": open_fb,
         })
 
-    with open(SURVEY_PATH, "w", newline="") as f:
-        writer = csv.DictWriter(f, fieldnames=list(rows[0].keys()))
-        writer.writeheader()
-        writer.writerows(rows)
-
-    print(f"[OK] Requirements survey: {len(rows)} rows -> {SURVEY_PATH}")
     return rows
 
 
@@ -292,8 +320,8 @@ def generate_requirements_survey():
 # 2. Post-test Survey (40 responses)
 # ---------------------------------------------------------------------------
 
-def generate_posttest_survey(req_rows):
-    n = 40
+def generate_posttest_survey(req_rows, cfg):
+    n = cfg["n_posttest"]
     rows = []
 
     for i in range(n):
@@ -365,12 +393,6 @@ def generate_posttest_survey(req_rows):
         row["open_suggestions"] = sug_text
         rows.append(row)
 
-    with open(POSTTEST_PATH, "w", newline="") as f:
-        writer = csv.DictWriter(f, fieldnames=list(rows[0].keys()))
-        writer.writeheader()
-        writer.writerows(rows)
-
-    print(f"[OK] Post-test survey: {len(rows)} rows -> {POSTTEST_PATH}")
     return rows
 
 
@@ -437,27 +459,29 @@ DETAIL_TEMPLATES = {
 }
 
 
-def generate_interaction_logs():
-    n = 40
+def iter_interaction_logs(cfg):
+    """Yield one interaction-log entry per participant."""
+    n = cfg["n_logs"]
+    min_events, max_events = cfg["events_per_session"]
+    min_minutes, max_minutes = cfg["session_minutes"]
     base_time = datetime(2026, 1, 15, 9, 0, 0)
-    all_logs = []
 
     for i in range(n):
         pid = f"P{i+1:03d}"
         session_offset = timedelta(hours=random.randint(0, 72), minutes=random.randint(0, 59))
         session_start = base_time + session_offset
-        duration_minutes = random.randint(15, 60)
+        duration_minutes = random.randint(min_minutes, max_minutes)
         session_end = session_start + timedelta(minutes=duration_minutes)
         duration_seconds = duration_minutes * 60
 
-        num_events = random.randint(15, 50)
+        num_events = random.randint(min_events, max_events)
         events = []
         current_time = session_start + timedelta(seconds=random.randint(1, 10))
         page_idx = 0
 
         for e in range(num_events):
             # Progress through pages
-            if e > 0 and random.random() < 0.15 and page_idx < len(PAGES) - 1:
+            if e > 0 and random.random() < cfg["page_advance_prob"] and page_idx < len(PAGES) - 1:
                 page_idx += 1
             page = PAGES[min(page_idx, len(PAGES) - 1)]
 
@@ -465,8 +489,7 @@ def generate_interaction_logs():
             if page_idx == 0 and e == 0:
                 etype = "page_view"
             else:
-                etype_weights = [0.15, 0.25, 0.10, 0.30, 0.08, 0.12]
-                etype = random.choices(EVENT_TYPES, weights=etype_weights, k=1)[0]
+                etype = random.choices(EVENT_TYPES, weights=cfg["etype_weights"], k=1)[0]
 
             detail = random.choice(DETAIL_TEMPLATES.get(etype, ["Interaction on {page}"])).format(page=page)
             time_on_page = random.randint(3, 90)
@@ -494,8 +517,9 @@ def generate_interaction_logs():
                 "time_to_decide_seconds": round(random.uniform(3.0, 45.0), 1),
             })
 
-        # Errors (0-3 per participant)
-        num_errors = int(np.random.choice([0, 1, 2, 3], p=[0.45, 0.30, 0.18, 0.07]))
+        # Errors (0-3 per participant by default)
+        error_weights = cfg["error_count_weights"]
+        num_errors = int(np.random.choice(len(error_weights), p=error_weights))
         errors = []
         for _ in range(num_errors):
             err_time = session_start + timedelta(seconds=random.randint(60, max(61, duration_seconds - 10)))
@@ -508,7 +532,7 @@ def generate_interaction_logs():
         total_clicks = sum(1 for ev in events if ev["event_type"] == "button_click")
         total_pages = len(set(ev["page"] for ev in events))
 
-        all_logs.append({
+        yield {
             "participant_id": pid,
             "session_start": session_start.isoformat(),
             "session_end": session_end.isoformat(),
@@ -518,13 +542,7 @@ def generate_interaction_logs():
             "events": events,
             "choices_made": choices_made,
             "errors_encountered": errors,
-        })
-
-    with open(LOGS_PATH, "w") as f:
-        json.dump(all_logs, f, indent=2)
-
-    print(f"[OK] Interaction logs: {len(all_logs)} participants -> {LOGS_PATH}")
-    return all_logs
+        }
 
 
 # ---------------------------------------------------------------------------
@@ -557,7 +575,7 @@ CODE_MAP = {
 }
 
 
-def generate_coded_qualitative(posttest_rows):
+def generate_coded_qualitative(posttest_rows, cfg):
     rows = []
     coders = ["LLM_coder_1", "LLM_coder_2"]
 
@@ -583,9 +601,9 @@ def generate_coded_qualitative(posttest_rows):
                 "coder": primary_coder,
             })
 
-            # Second coder with ~85% agreement
+            # Second coder agrees with probability agreement_rate (~85%)
             secondary_coder = coders[0] if primary_coder == coders[1] else coders[1]
-            if random.random() < 0.85:
+            if random.random() < cfg["agreement_rate"]:
                 # Agreement
                 rows.append({
                     "participant_id": pid,
@@ -608,30 +626,184 @@ def generate_coded_qualitative(posttest_rows):
                     "coder": secondary_coder,
                 })
 
-    with open(CODED_PATH, "w", newline="") as f:
-        writer = csv.DictWriter(f, fieldnames=[
-            "participant_id", "response_type", "original_text",
-            "code", "theme", "coder",
-        ])
+    return rows
+
+
+# ---------------------------------------------------------------------------
+# Generation
+# ---------------------------------------------------------------------------
+
+def seed_stream(cfg):
+    """Seed numpy and random once; the artifacts are then drawn in ARTIFACTS order."""
+    np.random.seed(cfg["seed"])
+    random.seed(cfg["seed"])
+
+
+def build_artifact(artifact, cfg, inputs, keep=True):
+    """Build one artifact's rows from the rows of the artifacts drawn before it.
+
+    Nothing drawn later reads the logs, so without `keep` they are only drawn
+    to move the random stream on, one participant at a time, and None is
+    returned.
+    """
+    if artifact == "survey":
+        return generate_requirements_survey(cfg)
+    if artifact == "posttest":
+        return generate_posttest_survey(inputs["survey"], cfg)
+    if artifact == "logs":
+        if not keep:
+            deque(iter_interaction_logs(cfg), maxlen=0)
+            return None
+        return list(iter_interaction_logs(cfg))
+    return generate_coded_qualitative(inputs["posttest"], cfg)
+
+
+def write_csv(path, rows, fieldnames=None):
+    with open(path, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=fieldnames or list(rows[0].keys()))
         writer.writeheader()
         writer.writerows(rows)
 
-    print(f"[OK] Coded qualitative data: {len(rows)} rows -> {CODED_PATH}")
+
+def stream_prefix(artifacts):
+    """Return ARTIFACTS up to the last of `artifacts`.
+
+    Everything drawn before an artifact moves the random stream it is drawn
+    from; besides, post-test participants come from the survey cohort and the
+    coded qualitative data codes the post-test open-ended answers.
+    """
+    last = max((ARTIFACTS.index(a) for a in artifacts), default=-1)
+    return ARTIFACTS[:last + 1]
+
+
+# Everything that shapes an artifact's bytes: the profile parameters and the
+# code/constants it is built from. Together with the digest of the artifact
+# drawn before it these form the artifact's fingerprint (see build_cache.py).
+ARTIFACT_PARAMS = {
+    "survey": ("seed", "n_survey"),
+    "posttest": ("seed", "n_posttest"),
+    "logs": ("seed", "n_logs", "session_minutes", "events_per_session",
+             "page_advance_prob", "etype_weights", "error_count_weights"),
+    "qualitative": ("seed", "agreement_rate"),
+}
+ARTIFACT_CODE = {
+    "survey": (generate_requirements_survey, likert, weighted_choice, write_csv,
+               OPEN_FEEDBACK_POSITIVE, OPEN_FEEDBACK_SKEPTICAL, OPEN_FEEDBACK_MIXED,
+               ACCESSIBILITY_DETAILS),
+    "posttest": (generate_posttest_survey, write_csv, POSITIVE_FEEDBACK_POSTTEST,
+                 NEGATIVE_FEEDBACK_POSTTEST, SUGGESTIONS_POSTTEST),
+    "logs": (iter_interaction_logs, *WRITER_CODE, PAGES, EVENT_TYPES, CHOICE_TEXTS,
+             ERROR_TYPES, DETAIL_TEMPLATES),
+    "qualitative": (generate_coded_qualitative, write_csv, CODE_MAP, QUALITATIVE_FIELDS),
+}
+
+
+def artifact_digests(cfg, artifacts):
+    """Fingerprint `artifacts` and those drawn before them; return {artifact: digest}."""
+    digests, previous = {}, None
+    for index, artifact in enumerate(stream_prefix(artifacts)):
+        digests[artifact] = previous = fingerprint(
+            artifact,
+            index,
+            {key: cfg[key] for key in ARTIFACT_PARAMS[artifact]},
+            seed_stream,
+            *ARTIFACT_CODE[artifact],
+            previous,
+        )
+    return digests
+
+
+def generate(artifacts=None, profile=DEFAULT_PROFILE, output_root=None, force=False, log=None):
+    """Generate the selected artifacts and return {artifact: data}.
+
+    Tables are returned as DataFrames and logs as a list of participant
+    entries. Artifacts drawn before a selected one (e.g. the survey rows
+    behind the post-test) are built in memory but only returned or written
+    when selected. When
+    `output_root` is given the selected artifacts are also written below it;
+    logs are then streamed to disk and returned as a participant count.
+
+    Writing is incremental: artifacts whose fingerprint matches the manifest
+    in `output_root` are skipped (and left out of the result) unless `force`
+    is set. `profile` is a profile name, path or an already-loaded profile
+    dict.
+    """
+    artifacts = ARTIFACTS if artifacts is None else tuple(artifacts)
+    unknown = set(artifacts) - set(ARTIFACTS)
+    if unknown:
+        raise ValueError(f"Unknown artifacts {sorted(unknown)}. Available: {', '.join(ARTIFACTS)}")
+    if not isinstance(profile, dict):
+        profile = load_profile(profile)
+    cfg = profile["project1"]
+
+    manifest = digests = None
+    if output_root is not None:
+        manifest = Manifest(output_root)
+        digests = artifact_digests(cfg, artifacts)
+        stale = []
+        for artifact in artifacts:
+            path = artifact_path(output_root, artifact)
+            if force or not manifest.is_fresh(artifact, digests[artifact], path):
+                stale.append(artifact)
+            elif log:
+                log(f"[--] {ARTIFACT_LABELS[artifact]}: up to date -> {path}")
+        artifacts = tuple(stale)
+
+    rows, results = {}, {}
+    seed_stream(cfg)
+    for artifact in stream_prefix(artifacts):
+        selected = artifact in artifacts
+        if artifact == "logs" and selected and output_root is not None:
+            # Participants are streamed straight to disk instead of being
+            # collected into one list and dumped at the end.
+            path = artifact_path(output_root, artifact)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            results[artifact] = write_logs(path, iter_interaction_logs(cfg))
+            manifest.record(artifact, digests[artifact], path)
+            if log:
+                log(f"[OK] {ARTIFACT_LABELS[artifact]}: {results[artifact]} participants -> {path}")
+            continue
+
+        rows[artifact] = build_artifact(artifact, cfg, rows, keep=selected)
+        if not selected:
+            continue
+        if artifact == "logs":
+            results[artifact] = rows[artifact]
+            continue
+        results[artifact] = pd.DataFrame(rows[artifact])
+        if output_root is not None:
+            path = artifact_path(output_root, artifact)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            fieldnames = QUALITATIVE_FIELDS if artifact == "qualitative" else None
+            write_csv(path, rows[artifact], fieldnames)
+            manifest.record(artifact, digests[artifact], path)
+            if log:
+                log(f"[OK] {ARTIFACT_LABELS[artifact]}: {len(rows[artifact])} rows -> {path}")
+    return results
 
 
 # ---------------------------------------------------------------------------
 # Main
 # ---------------------------------------------------------------------------
 
-def main():
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate Project 1 (Gemini Quest) dummy data.")
+    parser.add_argument("--profile", default=DEFAULT_PROFILE,
+                        help="scenario profile name in profiles/ or path to a profile JSON")
+    parser.add_argument("--output-root", default=DEFAULT_OUTPUT_ROOT,
+                        help="directory the artifacts are written below (default: deliverables/project1)")
+    parser.add_argument("--only", nargs="+", choices=ARTIFACTS, metavar="ARTIFACT",
+                        help=f"generate only these artifacts ({', '.join(ARTIFACTS)})")
+    parser.add_argument("--force", action="store_true",
+                        help="rebuild the selected artifacts even if they are up to date")
+    args = parser.parse_args(argv)
+
     print("=" * 70)
-    print("Generating Project 1 (Gemini Quest) dummy data ...")
+    print(f"Generating Project 1 (Gemini Quest) dummy data [profile: {args.profile}] ...")
     print("=" * 70)
 
-    req_rows = generate_requirements_survey()
-    posttest_rows = generate_posttest_survey(req_rows)
-    generate_interaction_logs()
-    generate_coded_qualitative(posttest_rows)
+    generate(args.only, profile=args.profile, output_root=args.output_root,
+             force=args.force, log=print)
 
     print("=" * 70)
     print("All data generated successfully.")
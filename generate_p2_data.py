@@ -1,26 +1,63 @@
 #!/usr/bin/env python3
 """
 Generate all dummy data for Project 2 (StudyBuddy).
-Uses numpy seed 43 for reproducibility.
+
+Produces, below the output root (deliverables/project2 by default):
+  survey       survey/requirements_survey_responses.csv   (120 rows)
+  dataset      dataset/student_performance_dataset.csv    (500 rows)
+  posttest     posttest/posttest_survey_responses.csv     (40 rows)
+  logs         logs/interaction_logs.json                 (40 entries)
+  qualitative  posttest/coded_qualitative_data.csv
+
+Cohort sizes, event mixes, error rates and coder agreement come from a
+scenario profile (profiles/default.json unless --profile is given). All
+artifacts are drawn from one random stream seeded with the profile seed (43 by
+default), in ARTIFACTS order. A subset is generated by replaying the artifacts
+drawn before it in memory, so it comes out identical to the same files of a
+full run.
+
+Reruns are incremental: an artifact is only rebuilt when its parameters, its
+code or an artifact drawn before it changed since the last build recorded in
+the output root's generation_manifest.json.
+
+Usage:
+    python generate_p2_data.py [--profile NAME|PATH] [--output-root DIR]
+                               [--only survey dataset posttest logs qualitative] [--force]
+
+Importable API (nothing is written unless output_root is given):
+    from generate_p2_data import generate
+    frames = generate(["posttest", "logs"], profile="small")
 """
 
+import argparse
 import numpy as np
 import pandas as pd
-import json
 import os
+from collections import deque
 from datetime import datetime, timedelta
 
-np.random.seed(43)
+from build_cache import Manifest, fingerprint
+from log_stream import WRITER_CODE, write_logs
+from scenario_profiles import DEFAULT_PROFILE, load_profile
 
 # ============================================================
-# Paths
+# Artifacts and output paths
 # ============================================================
-BASE = "/home/user/empty3/deliverables/project2"
-SURVEY_PATH = os.path.join(BASE, "survey", "requirements_survey_responses.csv")
-DATASET_PATH = os.path.join(BASE, "dataset", "student_performance_dataset.csv")
-POSTTEST_PATH = os.path.join(BASE, "posttest", "posttest_survey_responses.csv")
-LOGS_PATH = os.path.join(BASE, "logs", "interaction_logs.json")
-QUALITATIVE_PATH = os.path.join(BASE, "posttest", "coded_qualitative_data.csv")
+DEFAULT_OUTPUT_ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "deliverables", "project2")
+
+ARTIFACTS = ("survey", "dataset", "posttest", "logs", "qualitative")
+ARTIFACT_FILES = {
+    "survey": os.path.join("survey", "requirements_survey_responses.csv"),
+    "dataset": os.path.join("dataset", "student_performance_dataset.csv"),
+    "posttest": os.path.join("posttest", "posttest_survey_responses.csv"),
+    "logs": os.path.join("logs", "interaction_logs.json"),
+    "qualitative": os.path.join("posttest", "coded_qualitative_data.csv"),
+}
+
+
+def artifact_path(output_root, artifact):
+    return os.path.join(output_root, ARTIFACT_FILES[artifact])
+
 
 # ============================================================
 # Helper functions
@@ -35,6 +72,14 @@ def clamp_int(arr, lo, hi):
 def pick(options, n, p=None):
     return np.random.choice(options, size=n, p=p).tolist()
 
+def sample_pool(pool, n):
+    """Spread a text pool over n rows as a dictionary-encoded column.
+
+    Each row holds an int code into `pool` (a pandas Categorical); the
+    strings themselves are only materialized when the frame is exported.
+    """
+    return pd.Categorical.from_codes(np.random.permutation(n) % len(pool), categories=pool)
+
 # ============================================================
 # Text pools
 # ============================================================
@@ -116,191 +161,186 @@ open_suggestions_pool = [
 # ============================================================
 # FILE 1: Requirements Survey Responses (120 rows)
 # ============================================================
-print("Generating FILE 1: requirements_survey_responses.csv ...")
-
-n1 = 120
-participant_ids_1 = [f"P{i+1:03d}" for i in range(n1)]
-
-ages = clamp_int(np.random.normal(22, 3, n1), 18, 45)
-genders = pick(["Male", "Female", "Non-binary", "Prefer not to say"], n1, p=[0.45, 0.45, 0.06, 0.04])
-education_levels = pick(
-    ["Freshman", "Sophomore", "Junior", "Senior", "Graduate"], n1,
-    p=[0.2, 0.2, 0.2, 0.2, 0.2]
-)
-major_categories = pick(
-    ["STEM", "Humanities", "Social Sciences", "Business", "Arts"], n1,
-    p=[0.35, 0.15, 0.2, 0.2, 0.1]
-)
-current_gpa = np.round(clamp(np.random.normal(3.2, 0.4, n1), 2.0, 4.0), 2)
-study_hours_weekly = clamp_int(np.random.exponential(12, n1) + 1, 1, 40)
-preferred_study_method = pick(["Visual", "Auditory", "Reading-Writing", "Kinesthetic"], n1, p=[0.35, 0.15, 0.35, 0.15])
-tech_comfort = clamp_int(np.random.normal(5.0, 1.2, n1), 1, 7)
-ai_trust_level = clamp_int(np.random.normal(3.8, 1.3, n1), 1, 7)
-data_sharing_comfort = clamp_int(np.random.normal(3.5, 1.4, n1), 1, 7)
-prediction_usefulness = clamp_int(np.random.normal(5.0, 1.1, n1), 1, 7)
-recommendation_preference = pick(["Detailed", "Summary", "Visual", "Notification"], n1, p=[0.3, 0.3, 0.25, 0.15])
-dashboard_complexity = pick(["Simple", "Moderate", "Detailed"], n1, p=[0.25, 0.5, 0.25])
-notification_frequency = pick(["Never", "Daily", "Weekly", "Before_Exams"], n1, p=[0.1, 0.25, 0.35, 0.3])
-
-feat_perf_track = clamp_int(np.random.normal(3.8, 1.0, n1), 1, 5)
-feat_study_rec = clamp_int(np.random.normal(4.0, 0.9, n1), 1, 5)
-feat_peer_comp = clamp_int(np.random.normal(2.8, 1.2, n1), 1, 5)
-feat_goal_set = clamp_int(np.random.normal(3.9, 1.0, n1), 1, 5)
-feat_prog_vis = clamp_int(np.random.normal(4.1, 0.9, n1), 1, 5)
-privacy_concern_level = clamp_int(np.random.normal(4.5, 1.3, n1), 1, 7)
-
-open_feedback = [open_feedback_pool[i % len(open_feedback_pool)] for i in np.random.permutation(n1)]
-
-df1 = pd.DataFrame({
-    "participant_id": participant_ids_1,
-    "age": ages,
-    "gender": genders,
-    "education_level": education_levels,
-    "major_category": major_categories,
-    "current_gpa": current_gpa,
-    "study_hours_weekly": study_hours_weekly,
-    "preferred_study_method": preferred_study_method,
-    "tech_comfort": tech_comfort,
-    "ai_trust_level": ai_trust_level,
-    "data_sharing_comfort": data_sharing_comfort,
-    "prediction_usefulness": prediction_usefulness,
-    "recommendation_preference": recommendation_preference,
-    "dashboard_complexity": dashboard_complexity,
-    "notification_frequency": notification_frequency,
-    "feature_priority_performance_tracking": feat_perf_track,
-    "feature_priority_study_recommendations": feat_study_rec,
-    "feature_priority_peer_comparison": feat_peer_comp,
-    "feature_priority_goal_setting": feat_goal_set,
-    "feature_priority_progress_visualization": feat_prog_vis,
-    "privacy_concern_level": privacy_concern_level,
-    "open_feedback": open_feedback,
-})
-
-df1.to_csv(SURVEY_PATH, index=False)
-print(f"  -> Saved {len(df1)} rows to {SURVEY_PATH}")
+
+def generate_requirements_survey(cfg):
+    n1 = cfg["n_survey"]
+    participant_ids_1 = [f"P{i+1:03d}" for i in range(n1)]
+
+    ages = clamp_int(np.random.normal(22, 3, n1), 18, 45)
+    genders = pick(["Male", "Female", "Non-binary", "Prefer not to say"], n1, p=[0.45, 0.45, 0.06, 0.04])
+    education_levels = pick(
+        ["Freshman", "Sophomore", "Junior", "Senior", "Graduate"], n1,
+        p=[0.2, 0.2, 0.2, 0.2, 0.2]
+    )
+    major_categories = pick(
+        ["STEM", "Humanities", "Social Sciences", "Business", "Arts"], n1,
+        p=[0.35, 0.15, 0.2, 0.2, 0.1]
+    )
+    current_gpa = np.round(clamp(np.random.normal(3.2, 0.4, n1), 2.0, 4.0), 2)
+    study_hours_weekly = clamp_int(np.random.exponential(12, n1) + 1, 1, 40)
+    preferred_study_method = pick(["Visual", "Auditory", "Reading-Writing", "Kinesthetic"], n1, p=[0.35, 0.15, 0.35, 0.15])
+    tech_comfort = clamp_int(np.random.normal(5.0, 1.2, n1), 1, 7)
+    ai_trust_level = clamp_int(np.random.normal(3.8, 1.3, n1), 1, 7)
+    data_sharing_comfort = clamp_int(np.random.normal(3.5, 1.4, n1), 1, 7)
+    prediction_usefulness = clamp_int(np.random.normal(5.0, 1.1, n1), 1, 7)
+    recommendation_preference = pick(["Detailed", "Summary", "Visual", "Notification"], n1, p=[0.3, 0.3, 0.25, 0.15])
+    dashboard_complexity = pick(["Simple", "Moderate", "Detailed"], n1, p=[0.25, 0.5, 0.25])
+    notification_frequency = pick(["Never", "Daily", "Weekly", "Before_Exams"], n1, p=[0.1, 0.25, 0.35, 0.3])
+
+    feat_perf_track = clamp_int(np.random.normal(3.8, 1.0, n1), 1, 5)
+    feat_study_rec = clamp_int(np.random.normal(4.0, 0.9, n1), 1, 5)
+    feat_peer_comp = clamp_int(np.random.normal(2.8, 1.2, n1), 1, 5)
+    feat_goal_set = clamp_int(np.random.normal(3.9, 1.0, n1), 1, 5)
+    feat_prog_vis = clamp_int(np.random.normal(4.1, 0.9, n1), 1, 5)
+    privacy_concern_level = clamp_int(np.random.normal(4.5, 1.3, n1), 1, 7)
+
+    open_feedback = sample_pool(open_feedback_pool, n1)
+
+    df1 = pd.DataFrame({
+        "participant_id": participant_ids_1,
+        "age": ages,
+        "gender": genders,
+        "education_level": education_levels,
+        "major_category": major_categories,
+        "current_gpa": current_gpa,
+        "study_hours_weekly": study_hours_weekly,
+        "preferred_study_method": preferred_study_method,
+        "tech_comfort": tech_comfort,
+        "ai_trust_level": ai_trust_level,
+        "data_sharing_comfort": data_sharing_comfort,
+        "prediction_usefulness": prediction_usefulness,
+        "recommendation_preference": recommendation_preference,
+        "dashboard_complexity": dashboard_complexity,
+        "notification_frequency": notification_frequency,
+        "feature_priority_performance_tracking": feat_perf_track,
+        "feature_priority_study_recommendations": feat_study_rec,
+        "feature_priority_peer_comparison": feat_peer_comp,
+        "feature_priority_goal_setting": feat_goal_set,
+        "feature_priority_progress_visualization": feat_prog_vis,
+        "privacy_concern_level": privacy_concern_level,
+        "open_feedback": open_feedback,
+    })
+
+    return df1
 
 
 # ============================================================
 # FILE 2: Student Performance Dataset (500 rows)
 # ============================================================
-print("Generating FILE 2: student_performance_dataset.csv ...")
-
-n2 = 500
-student_ids = [f"STU{i+1:04d}" for i in range(n2)]
-
-study_hours = np.round(clamp(np.random.normal(15, 8, n2), 1, 40), 1)
-attendance_rate = np.round(clamp(np.random.beta(6, 2, n2), 0.5, 1.0), 3)
-previous_gpa = np.round(clamp(np.random.normal(3.0, 0.5, n2), 2.0, 4.0), 2)
-assignment_completion = np.round(clamp(np.random.beta(5, 2, n2), 0.3, 1.0), 3)
-class_participation = clamp_int(np.random.normal(6, 2, n2), 1, 10)
-sleep_hours = np.round(clamp(np.random.normal(7, 1.2, n2), 4, 10), 1)
-extracurricular_hours = np.round(clamp(np.random.exponential(5, n2), 0, 20), 1)
-stress_level = clamp_int(np.random.normal(5.5, 2, n2), 1, 10)
-study_method = pick(["Visual", "Auditory", "Reading-Writing", "Kinesthetic"], n2, p=[0.35, 0.15, 0.35, 0.15])
-resource_usage = clamp_int(np.random.normal(6, 2, n2), 1, 10)
-
-# Quiz score: correlated with study_hours, attendance, gpa, sleep
-quiz_base = (
-    0.25 * (study_hours / 40.0) +
-    0.25 * ((attendance_rate - 0.5) / 0.5) +
-    0.20 * ((previous_gpa - 2.0) / 2.0) +
-    0.15 * ((sleep_hours - 4.0) / 6.0) +
-    0.10 * ((assignment_completion - 0.3) / 0.7) +
-    0.05 * (class_participation / 10.0)
-)
-quiz_score = np.round(clamp(quiz_base * 80 + 20 + np.random.normal(0, 8, n2), 0, 100), 1)
-
-df2 = pd.DataFrame({
-    "student_id": student_ids,
-    "study_hours_per_week": study_hours,
-    "attendance_rate": attendance_rate,
-    "previous_gpa": previous_gpa,
-    "assignment_completion_rate": assignment_completion,
-    "class_participation_score": class_participation,
-    "sleep_hours_avg": sleep_hours,
-    "extracurricular_hours": extracurricular_hours,
-    "stress_level": stress_level,
-    "study_method": study_method,
-    "resource_usage_score": resource_usage,
-    "quiz_score": quiz_score,
-})
-
-df2.to_csv(DATASET_PATH, index=False)
-print(f"  -> Saved {len(df2)} rows to {DATASET_PATH}")
+
+def generate_student_dataset(cfg):
+    n2 = cfg["n_dataset"]
+    student_ids = [f"STU{i+1:04d}" for i in range(n2)]
+
+    study_hours = np.round(clamp(np.random.normal(15, 8, n2), 1, 40), 1)
+    attendance_rate = np.round(clamp(np.random.beta(6, 2, n2), 0.5, 1.0), 3)
+    previous_gpa = np.round(clamp(np.random.normal(3.0, 0.5, n2), 2.0, 4.0), 2)
+    assignment_completion = np.round(clamp(np.random.beta(5, 2, n2), 0.3, 1.0), 3)
+    class_participation = clamp_int(np.random.normal(6, 2, n2), 1, 10)
+    sleep_hours = np.round(clamp(np.random.normal(7, 1.2, n2), 4, 10), 1)
+    extracurricular_hours = np.round(clamp(np.random.exponential(5, n2), 0, 20), 1)
+    stress_level = clamp_int(np.random.normal(5.5, 2, n2), 1, 10)
+    study_method = pick(["Visual", "Auditory", "Reading-Writing", "Kinesthetic"], n2, p=[0.35, 0.15, 0.35, 0.15])
+    resource_usage = clamp_int(np.random.normal(6, 2, n2), 1, 10)
+
+    # Quiz score: correlated with study_hours, attendance, gpa, sleep
+    quiz_base = (
+        0.25 * (study_hours / 40.0) +
+        0.25 * ((attendance_rate - 0.5) / 0.5) +
+        0.20 * ((previous_gpa - 2.0) / 2.0) +
+        0.15 * ((sleep_hours - 4.0) / 6.0) +
+        0.10 * ((assignment_completion - 0.3) / 0.7) +
+        0.05 * (class_participation / 10.0)
+    )
+    quiz_score = np.round(clamp(quiz_base * 80 + 20 + np.random.normal(0, 8, n2), 0, 100), 1)
+
+    df2 = pd.DataFrame({
+        "student_id": student_ids,
+        "study_hours_per_week": study_hours,
+        "attendance_rate": attendance_rate,
+        "previous_gpa": previous_gpa,
+        "assignment_completion_rate": assignment_completion,
+        "class_participation_score": class_participation,
+        "sleep_hours_avg": sleep_hours,
+        "extracurricular_hours": extracurricular_hours,
+        "stress_level": stress_level,
+        "study_method": study_method,
+        "resource_usage_score": resource_usage,
+        "quiz_score": quiz_score,
+    })
+
+    return df2
 
 
 # ============================================================
 # FILE 3: Post-test Survey Responses (40 rows)
 # ============================================================
-print("Generating FILE 3: posttest_survey_responses.csv ...")
-
-n3 = 40
-participant_ids_3 = [f"P{i+1:03d}" for i in range(n3)]
-ages_3 = clamp_int(np.random.normal(22, 3, n3), 18, 45)
-genders_3 = pick(["Male", "Female", "Non-binary", "Prefer not to say"], n3, p=[0.45, 0.45, 0.06, 0.04])
-
-# SUS: 10 questions, odd items positive (target high), even items negative (target low)
-# targeting SUS ~ 68
-# For odd items (q1,q3,q5,q7,q9): contribution = item - 1; mean item ~ 3.7 -> contrib ~2.7
-# For even items (q2,q4,q6,q8,q10): contribution = 5 - item; mean item ~ 2.3 -> contrib ~2.7
-# SUS = sum_of_contributions * 2.5; 10 items * 2.7 * 2.5 = 67.5 ~ 68
-sus_data = {}
-for q in range(1, 11):
-    if q % 2 == 1:  # odd = positive
-        sus_data[f"sus_q{q}"] = clamp_int(np.random.normal(3.7, 0.8, n3), 1, 5)
-    else:  # even = negative
-        sus_data[f"sus_q{q}"] = clamp_int(np.random.normal(2.3, 0.8, n3), 1, 5)
-
-trust_data = {}
-for q in range(1, 6):
-    trust_data[f"trust_q{q}"] = clamp_int(np.random.normal(4.5, 1.2, n3), 1, 7)
-
-usefulness_data = {}
-for q in range(1, 6):
-    usefulness_data[f"usefulness_q{q}"] = clamp_int(np.random.normal(5.0, 1.1, n3), 1, 7)
-
-ease_data = {}
-for q in range(1, 6):
-    ease_data[f"ease_q{q}"] = clamp_int(np.random.normal(5.2, 1.0, n3), 1, 7)
-
-accuracy_data = {}
-for q in range(1, 4):
-    accuracy_data[f"accuracy_perception_q{q}"] = clamp_int(np.random.normal(4.3, 1.3, n3), 1, 7)
-
-privacy_data = {}
-for q in range(1, 4):
-    privacy_data[f"privacy_concern_q{q}"] = clamp_int(np.random.normal(4.5, 1.4, n3), 1, 7)
-
-open_pos = [open_positive_pool[i % len(open_positive_pool)] for i in np.random.permutation(n3)]
-open_neg = [open_negative_pool[i % len(open_negative_pool)] for i in np.random.permutation(n3)]
-open_sug = [open_suggestions_pool[i % len(open_suggestions_pool)] for i in np.random.permutation(n3)]
-
-df3_dict = {
-    "participant_id": participant_ids_3,
-    "age": ages_3,
-    "gender": genders_3,
-}
-df3_dict.update(sus_data)
-df3_dict.update(trust_data)
-df3_dict.update(usefulness_data)
-df3_dict.update(ease_data)
-df3_dict.update(accuracy_data)
-df3_dict.update(privacy_data)
-df3_dict["open_positive"] = open_pos
-df3_dict["open_negative"] = open_neg
-df3_dict["open_suggestions"] = open_sug
 
-df3 = pd.DataFrame(df3_dict)
-df3.to_csv(POSTTEST_PATH, index=False)
-print(f"  -> Saved {len(df3)} rows to {POSTTEST_PATH}")
+def generate_posttest_survey(cfg):
+    n3 = cfg["n_posttest"]
+    participant_ids_3 = [f"P{i+1:03d}" for i in range(n3)]
+    ages_3 = clamp_int(np.random.normal(22, 3, n3), 18, 45)
+    genders_3 = pick(["Male", "Female", "Non-binary", "Prefer not to say"], n3, p=[0.45, 0.45, 0.06, 0.04])
+
+    # SUS: 10 questions, odd items positive (target high), even items negative (target low)
+    # targeting SUS ~ 68
+    # For odd items (q1,q3,q5,q7,q9): contribution = item - 1; mean item ~ 3.7 -> contrib ~2.7
+    # For even items (q2,q4,q6,q8,q10): contribution = 5 - item; mean item ~ 2.3 -> contrib ~2.7
+    # SUS = sum_of_contributions * 2.5; 10 items * 2.7 * 2.5 = 67.5 ~ 68
+    sus_data = {}
+    for q in range(1, 11):
+        if q % 2 == 1:  # odd = positive
+            sus_data[f"sus_q{q}"] = clamp_int(np.random.normal(3.7, 0.8, n3), 1, 5)
+        else:  # even = negative
+            sus_data[f"sus_q{q}"] = clamp_int(np.random.normal(2.3, 0.8, n3), 1, 5)
+
+    trust_data = {}
+    for q in range(1, 6):
+        trust_data[f"trust_q{q}"] = clamp_int(np.random.normal(4.5, 1.2, n3), 1, 7)
+
+    usefulness_data = {}
+    for q in range(1, 6):
+        usefulness_data[f"usefulness_q{q}"] = clamp_int(np.random.normal(5.0, 1.1, n3), 1, 7)
+
+    ease_data = {}
+    for q in range(1, 6):
+        ease_data[f"ease_q{q}"] = clamp_int(np.random.normal(5.2, 1.0, n3), 1, 7)
+
+    accuracy_data = {}
+    for q in range(1, 4):
+        accuracy_data[f"accuracy_perception_q{q}"] = clamp_int(np.random.normal(4.3, 1.3, n3), 1, 7)
+
+    privacy_data = {}
+    for q in range(1, 4):
+        privacy_data[f"privacy_concern_q{q}"] = clamp_int(np.random.normal(4.5, 1.4, n3), 1, 7)
+
+    open_pos = sample_pool(open_positive_pool, n3)
+    open_neg = sample_pool(open_negative_pool, n3)
+    open_sug = sample_pool(open_suggestions_pool, n3)
+
+    df3_dict = {
+        "participant_id": participant_ids_3,
+        "age": ages_3,
+        "gender": genders_3,
+    }
+    df3_dict.update(sus_data)
+    df3_dict.update(trust_data)
+    df3_dict.update(usefulness_data)
+    df3_dict.update(ease_data)
+    df3_dict.update(accuracy_data)
+    df3_dict.update(privacy_data)
+    df3_dict["open_positive"] = open_pos
+    df3_dict["open_negative"] = open_neg
+    df3_dict["open_suggestions"] = open_sug
+
+    df3 = pd.DataFrame(df3_dict)
+    return df3
 
 
 # ============================================================
 # FILE 4: Interaction Logs (40 entries, JSON)
 # ============================================================
-print("Generating FILE 4: interaction_logs.json ...")
 
-n4 = 40
 event_types = [
     "page_view", "button_click", "prediction_view", "recommendation_click",
     "filter_change", "dashboard_scroll", "settings_change", "tooltip_hover",
@@ -326,86 +366,88 @@ error_messages = [
 
 base_date = datetime(2026, 1, 15, 8, 0, 0)
 
-logs = []
-for i in range(n4):
-    pid = f"P{i+1:03d}"
-    # Random session start within a 2-week window
-    offset_hours = int(np.random.uniform(0, 14 * 24))
-    session_start = base_date + timedelta(hours=offset_hours, minutes=int(np.random.randint(0, 60)))
-    duration = int(np.random.uniform(600, 2700))
-    session_end = session_start + timedelta(seconds=duration)
-
-    num_events = int(np.random.randint(10, 36))
-    events = []
-    pred_viewed = 0
-    rec_clicked = 0
-    current_time = session_start + timedelta(seconds=int(np.random.uniform(2, 15)))
-
-    for e in range(num_events):
-        etype = np.random.choice(event_types)
-        page = np.random.choice(pages)
-        time_on_page = round(float(np.random.uniform(5, 120)), 1)
-
-        detail_options = [
-            f"Viewed {page} section",
-            f"Clicked on {np.random.choice(['chart', 'table', 'card', 'link', 'button'])}",
-            f"Filtered by {np.random.choice(['date', 'course', 'metric', 'category'])}",
-            f"Scrolled to {np.random.choice(['top', 'bottom', 'middle'])} of page",
-            f"Hovered over {np.random.choice(['grade prediction', 'study tip', 'progress bar', 'metric card'])}",
-            f"Toggled {np.random.choice(['dark mode', 'notifications', 'detailed view', 'compact mode'])}",
-        ]
-        detail = str(np.random.choice(detail_options))
-
-        if etype == "prediction_view":
-            pred_viewed += 1
-        if etype == "recommendation_click":
-            rec_clicked += 1
-
-        events.append({
-            "timestamp": current_time.isoformat(),
-            "event_type": etype,
-            "page": page,
-            "details": detail,
-            "time_on_page_seconds": time_on_page,
-        })
-        current_time += timedelta(seconds=int(np.random.uniform(5, max(6, duration // num_events * 2))))
-        if current_time > session_end:
-            current_time = session_end - timedelta(seconds=1)
-
-    total_clicks = int(np.random.randint(max(15, num_events), num_events * 3 + 1))
-    feats = list(np.random.choice(features_all, size=int(np.random.randint(2, 7)), replace=False))
-
-    num_errors = int(np.random.choice([0, 0, 0, 0, 0, 1, 1, 2], p=[0.4, 0.1, 0.1, 0.05, 0.05, 0.15, 0.1, 0.05]))
-    errors = []
-    for _ in range(num_errors):
-        err_time = session_start + timedelta(seconds=int(np.random.uniform(30, duration - 30)))
-        errors.append({
-            "timestamp": err_time.isoformat(),
-            "error_message": str(np.random.choice(error_messages)),
-        })
-
-    logs.append({
-        "participant_id": pid,
-        "session_start": session_start.isoformat(),
-        "session_end": session_end.isoformat(),
-        "session_duration_seconds": duration,
-        "total_clicks": total_clicks,
-        "events": events,
-        "predictions_viewed": pred_viewed,
-        "recommendations_clicked": rec_clicked,
-        "features_interacted": feats,
-        "errors_encountered": errors,
-    })
 
-with open(LOGS_PATH, "w") as f:
-    json.dump(logs, f, indent=2)
-print(f"  -> Saved {len(logs)} entries to {LOGS_PATH}")
+def iter_interaction_logs(cfg):
+    """Yield one interaction-log entry per participant."""
+    n4 = cfg["n_logs"]
+    min_events, max_events = cfg["events_per_session"]
+    min_seconds, max_seconds = cfg["session_seconds"]
+
+    for i in range(n4):
+        pid = f"P{i+1:03d}"
+        # Random session start within a 2-week window
+        offset_hours = int(np.random.uniform(0, 14 * 24))
+        session_start = base_date + timedelta(hours=offset_hours, minutes=int(np.random.randint(0, 60)))
+        duration = int(np.random.uniform(min_seconds, max_seconds))
+        session_end = session_start + timedelta(seconds=duration)
+
+        num_events = int(np.random.randint(min_events, max_events + 1))
+        events = []
+        pred_viewed = 0
+        rec_clicked = 0
+        current_time = session_start + timedelta(seconds=int(np.random.uniform(2, 15)))
+
+        for e in range(num_events):
+            etype = np.random.choice(event_types, p=cfg["etype_weights"])
+            page = np.random.choice(pages)
+            time_on_page = round(float(np.random.uniform(5, 120)), 1)
+
+            detail_options = [
+                f"Viewed {page} section",
+                f"Clicked on {np.random.choice(['chart', 'table', 'card', 'link', 'button'])}",
+                f"Filtered by {np.random.choice(['date', 'course', 'metric', 'category'])}",
+                f"Scrolled to {np.random.choice(['top', 'bottom', 'middle'])} of page",
+                f"Hovered over {np.random.choice(['grade prediction', 'study tip', 'progress bar', 'metric card'])}",
+                f"Toggled {np.random.choice(['dark mode', 'notifications', 'detailed view', 'compact mode'])}",
+            ]
+            detail = str(np.random.choice(detail_options))
+
+            if etype == "prediction_view":
+                pred_viewed += 1
+            if etype == "recommendation_click":
+                rec_clicked += 1
+
+            events.append({
+                "timestamp": current_time.isoformat(),
+                "event_type": etype,
+                "page": page,
+                "details": detail,
+                "time_on_page_seconds": time_on_page,
+            })
+            current_time += timedelta(seconds=int(np.random.uniform(5, max(6, duration // num_events * 2))))
+            if current_time > session_end:
+                current_time = session_end - timedelta(seconds=1)
+
+        total_clicks = int(np.random.randint(max(15, num_events), num_events * 3 + 1))
+        feats = list(np.random.choice(features_all, size=int(np.random.randint(2, 7)), replace=False))
+
+        error_weights = cfg["error_count_weights"]
+        num_errors = int(np.random.choice(len(error_weights), p=error_weights))
+        errors = []
+        for _ in range(num_errors):
+            err_time = session_start + timedelta(seconds=int(np.random.uniform(30, duration - 30)))
+            errors.append({
+                "timestamp": err_time.isoformat(),
+                "error_message": str(np.random.choice(error_messages)),
+            })
+
+        yield {
+            "participant_id": pid,
+            "session_start": session_start.isoformat(),
+            "session_end": session_end.isoformat(),
+            "session_duration_seconds": duration,
+            "total_clicks": total_clicks,
+            "events": events,
+            "predictions_viewed": pred_viewed,
+            "recommendations_clicked": rec_clicked,
+            "features_interacted": feats,
+            "errors_encountered": errors,
+        }
 
 
 # ============================================================
 # FILE 5: Coded Qualitative Data
 # ============================================================
-print("Generating FILE 5: coded_qualitative_data.csv ...")
 
 themes = ["Trust & Transparency", "Usability", "AI Accuracy", "Privacy", "Engagement & Motivation"]
 
@@ -466,107 +508,279 @@ suggestion_codes = [
 ]
 
 coders = ["LLM_coder_1", "LLM_coder_2"]
-# ~82% agreement -> 18% disagreement
-agreement_rate = 0.82
-
-qual_rows = []
-for i in range(n4):
-    pid = f"P{i+1:03d}"
-
-    # Positive response
-    pos_text = open_positive_pool[i % len(open_positive_pool)]
-    pos_code = np.random.choice(positive_codes)
-    pos_theme = code_theme_map[pos_code]
-    coder1 = "LLM_coder_1"
-    # For agreement simulation, both coders code same row; we record one row per coder
-    # But simpler: record one row per response with the coder, and sometimes they disagree
-    # We'll generate 2 rows per response (one per coder)
-    if np.random.random() < agreement_rate:
-        pos_code2 = pos_code
-    else:
-        pos_code2 = np.random.choice([c for c in positive_codes if c != pos_code])
-    pos_theme2 = code_theme_map[pos_code2]
-
-    qual_rows.append({
-        "participant_id": pid, "response_type": "positive",
-        "original_text": pos_text, "code": pos_code,
-        "theme": pos_theme, "coder": "LLM_coder_1",
-    })
-    qual_rows.append({
-        "participant_id": pid, "response_type": "positive",
-        "original_text": pos_text, "code": pos_code2,
-        "theme": pos_theme2, "coder": "LLM_coder_2",
-    })
 
-    # Negative response
-    neg_text = open_negative_pool[i % len(open_negative_pool)]
-    neg_code = np.random.choice(negative_codes)
-    neg_theme = code_theme_map[neg_code]
-    if np.random.random() < agreement_rate:
-        neg_code2 = neg_code
-    else:
-        neg_code2 = np.random.choice([c for c in negative_codes if c != neg_code])
-    neg_theme2 = code_theme_map[neg_code2]
-
-    qual_rows.append({
-        "participant_id": pid, "response_type": "negative",
-        "original_text": neg_text, "code": neg_code,
-        "theme": neg_theme, "coder": "LLM_coder_1",
-    })
-    qual_rows.append({
-        "participant_id": pid, "response_type": "negative",
-        "original_text": neg_text, "code": neg_code2,
-        "theme": neg_theme2, "coder": "LLM_coder_2",
-    })
+# Coded rows store the original text as a code into the post-test text banks;
+# the strings are only materialized when df5 is exported.
+qualitative_text_bank = open_positive_pool + open_negative_pool + open_suggestions_pool
+negative_offset = len(open_positive_pool)
+suggestion_offset = negative_offset + len(open_negative_pool)
+
+
+def generate_coded_qualitative(cfg):
+    n3 = cfg["n_posttest"]
+    # ~82% agreement -> 18% disagreement by default
+    agreement_rate = cfg["agreement_rate"]
+
+    qual_rows = []
+    for i in range(n3):
+        pid = f"P{i+1:03d}"
+
+        # Positive response
+        pos_text = i % len(open_positive_pool)
+        pos_code = np.random.choice(positive_codes)
+        pos_theme = code_theme_map[pos_code]
+        coder1 = "LLM_coder_1"
+        # For agreement simulation, both coders code same row; we record one row per coder
+        # But simpler: record one row per response with the coder, and sometimes they disagree
+        # We'll generate 2 rows per response (one per coder)
+        if np.random.random() < agreement_rate:
+            pos_code2 = pos_code
+        else:
+            pos_code2 = np.random.choice([c for c in positive_codes if c != pos_code])
+        pos_theme2 = code_theme_map[pos_code2]
+
+        qual_rows.append({
+            "participant_id": pid, "response_type": "positive",
+            "original_text": pos_text, "code": pos_code,
+            "theme": pos_theme, "coder": "LLM_coder_1",
+        })
+        qual_rows.append({
+            "participant_id": pid, "response_type": "positive",
+            "original_text": pos_text, "code": pos_code2,
+            "theme": pos_theme2, "coder": "LLM_coder_2",
+        })
+
+        # Negative response
+        neg_text = negative_offset + i % len(open_negative_pool)
+        neg_code = np.random.choice(negative_codes)
+        neg_theme = code_theme_map[neg_code]
+        if np.random.random() < agreement_rate:
+            neg_code2 = neg_code
+        else:
+            neg_code2 = np.random.choice([c for c in negative_codes if c != neg_code])
+        neg_theme2 = code_theme_map[neg_code2]
+
+        qual_rows.append({
+            "participant_id": pid, "response_type": "negative",
+            "original_text": neg_text, "code": neg_code,
+            "theme": neg_theme, "coder": "LLM_coder_1",
+        })
+        qual_rows.append({
+            "participant_id": pid, "response_type": "negative",
+            "original_text": neg_text, "code": neg_code2,
+            "theme": neg_theme2, "coder": "LLM_coder_2",
+        })
+
+        # Suggestion response
+        sug_text = suggestion_offset + i % len(open_suggestions_pool)
+        sug_code = np.random.choice(suggestion_codes)
+        sug_theme = code_theme_map[sug_code]
+        if np.random.random() < agreement_rate:
+            sug_code2 = sug_code
+        else:
+            sug_code2 = np.random.choice([c for c in suggestion_codes if c != sug_code])
+        sug_theme2 = code_theme_map[sug_code2]
+
+        qual_rows.append({
+            "participant_id": pid, "response_type": "suggestion",
+            "original_text": sug_text, "code": sug_code,
+            "theme": sug_theme, "coder": "LLM_coder_1",
+        })
+        qual_rows.append({
+            "participant_id": pid, "response_type": "suggestion",
+            "original_text": sug_text, "code": sug_code2,
+            "theme": sug_theme2, "coder": "LLM_coder_2",
+        })
+
+    df5 = pd.DataFrame(qual_rows)
+    df5["original_text"] = pd.Categorical.from_codes(df5["original_text"], categories=qualitative_text_bank)
+    return df5
+
+
+# ============================================================
+# Generation
+# ============================================================
+
+GENERATORS = {
+    "survey": generate_requirements_survey,
+    "dataset": generate_student_dataset,
+    "posttest": generate_posttest_survey,
+    "logs": lambda cfg: list(iter_interaction_logs(cfg)),
+    "qualitative": generate_coded_qualitative,
+}
+
+
+# Everything that shapes an artifact's bytes: the profile parameters and the
+# code/constants it is built from. Together with the digest of the artifact
+# drawn before it these form the artifact's fingerprint (see build_cache.py).
+ARTIFACT_PARAMS = {
+    "survey": ("seed", "n_survey"),
+    "dataset": ("seed", "n_dataset"),
+    "posttest": ("seed", "n_posttest"),
+    "logs": ("seed", "n_logs", "session_seconds", "events_per_session",
+             "etype_weights", "error_count_weights"),
+    "qualitative": ("seed", "n_posttest", "agreement_rate"),
+}
+ARTIFACT_CODE = {
+    "survey": (generate_requirements_survey, clamp, clamp_int, pick, sample_pool,
+               open_feedback_pool),
+    "dataset": (generate_student_dataset, clamp, clamp_int, pick),
+    "posttest": (generate_posttest_survey, clamp_int, pick, sample_pool, open_positive_pool,
+                 open_negative_pool, open_suggestions_pool),
+    "logs": (iter_interaction_logs, *WRITER_CODE, event_types, pages, features_all,
+             error_messages, base_date),
+    "qualitative": (generate_coded_qualitative, code_theme_map, positive_codes,
+                    negative_codes, suggestion_codes, qualitative_text_bank),
+}
 
-    # Suggestion response
-    sug_text = open_suggestions_pool[i % len(open_suggestions_pool)]
-    sug_code = np.random.choice(suggestion_codes)
-    sug_theme = code_theme_map[sug_code]
-    if np.random.random() < agreement_rate:
-        sug_code2 = sug_code
-    else:
-        sug_code2 = np.random.choice([c for c in suggestion_codes if c != sug_code])
-    sug_theme2 = code_theme_map[sug_code2]
-
-    qual_rows.append({
-        "participant_id": pid, "response_type": "suggestion",
-        "original_text": sug_text, "code": sug_code,
-        "theme": sug_theme, "coder": "LLM_coder_1",
-    })
-    qual_rows.append({
-        "participant_id": pid, "response_type": "suggestion",
-        "original_text": sug_text, "code": sug_code2,
-        "theme": sug_theme2, "coder": "LLM_coder_2",
-    })
 
-df5 = pd.DataFrame(qual_rows)
-df5.to_csv(QUALITATIVE_PATH, index=False)
-print(f"  -> Saved {len(df5)} rows to {QUALITATIVE_PATH}")
+def seed_stream(cfg):
+    """Seed numpy once; the artifacts are then drawn in ARTIFACTS order."""
+    np.random.seed(cfg["seed"])
+
+
+def artifact_digests(cfg):
+    """Fingerprint every artifact; each digest covers the artifacts drawn before it."""
+    digests, previous = {}, None
+    for index, artifact in enumerate(ARTIFACTS):
+        digests[artifact] = previous = fingerprint(
+            artifact,
+            index,
+            {key: cfg[key] for key in ARTIFACT_PARAMS[artifact]},
+            seed_stream,
+            *ARTIFACT_CODE[artifact],
+            previous,
+        )
+    return digests
+
+
+def generate(artifacts=None, profile=DEFAULT_PROFILE, output_root=None, force=False, log=None):
+    """Generate the selected artifacts and return {artifact: data}.
+
+    Tables are returned as DataFrames and logs as a list of participant
+    entries. Artifacts drawn before a selected one are replayed in memory so
+    the random stream reaches it in the same state as in a full run. When
+    `output_root` is given the artifacts are also written below it; logs are
+    then streamed to disk and returned as a participant count.
+
+    Writing is incremental: artifacts whose fingerprint matches the manifest
+    in `output_root` are skipped (and left out of the result) unless `force`
+    is set. `profile` is a profile name, path or an already-loaded profile
+    dict.
+    """
+    artifacts = ARTIFACTS if artifacts is None else tuple(artifacts)
+    unknown = set(artifacts) - set(ARTIFACTS)
+    if unknown:
+        raise ValueError(f"Unknown artifacts {sorted(unknown)}. Available: {', '.join(ARTIFACTS)}")
+    if not isinstance(profile, dict):
+        profile = load_profile(profile)
+    cfg = profile["project2"]
+    manifest = Manifest(output_root) if output_root is not None else None
+
+    if manifest is not None:
+        digests = artifact_digests(cfg)
+        stale = []
+        for artifact in artifacts:
+            path = artifact_path(output_root, artifact)
+            if force or not manifest.is_fresh(artifact, digests[artifact], path):
+                stale.append(artifact)
+            elif log:
+                log(f"Skipping {ARTIFACT_FILES[artifact]}: up to date")
+        artifacts = tuple(stale)
+
+    results = {}
+    seed_stream(cfg)
+    last = max((ARTIFACTS.index(a) for a in artifacts), default=-1)
+    for artifact in ARTIFACTS[:last + 1]:
+        if artifact not in artifacts:
+            # Only drawn to move the stream on to the next artifact; logs are
+            # drawn one participant at a time and dropped, never collected
+            if artifact == "logs":
+                deque(iter_interaction_logs(cfg), maxlen=0)
+            else:
+                GENERATORS[artifact](cfg)
+            continue
+        if manifest is None:
+            results[artifact] = GENERATORS[artifact](cfg)
+            continue
+
+        path = artifact_path(output_root, artifact)
+        if log:
+            log(f"Generating {ARTIFACT_FILES[artifact]} ...")
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        if artifact == "logs":
+            results[artifact] = write_logs(path, iter_interaction_logs(cfg))
+            count = f"{results[artifact]} entries"
+        else:
+            results[artifact] = GENERATORS[artifact](cfg)
+            results[artifact].to_csv(path, index=False)
+            count = f"{len(results[artifact])} rows"
+        manifest.record(artifact, digests[artifact], path)
+        if log:
+            log(f"  -> Saved {count} to {path}")
+    return results
 
 
 # ============================================================
 # Verification summary
 # ============================================================
-print("\n=== Generation Complete ===")
-print(f"FILE 1: {SURVEY_PATH}")
-print(f"  Rows: {len(df1)}, Columns: {list(df1.columns)}")
-print(f"FILE 2: {DATASET_PATH}")
-print(f"  Rows: {len(df2)}, Columns: {list(df2.columns)}")
-corr = df2[["study_hours_per_week", "attendance_rate", "previous_gpa", "sleep_hours_avg", "quiz_score"]].corr()
-print(f"  Quiz score correlations:\n{corr['quiz_score'].to_string()}")
-print(f"FILE 3: {POSTTEST_PATH}")
-print(f"  Rows: {len(df3)}, Columns: {list(df3.columns)}")
-# Calculate SUS scores
-sus_cols_odd = [f"sus_q{q}" for q in [1,3,5,7,9]]
-sus_cols_even = [f"sus_q{q}" for q in [2,4,6,8,10]]
-sus_score = (df3[sus_cols_odd].sum(axis=1) - 5 + 25 - df3[sus_cols_even].sum(axis=1)) * 2.5
-print(f"  Mean SUS score: {sus_score.mean():.1f} (target ~68)")
-print(f"FILE 4: {LOGS_PATH}")
-print(f"  Entries: {len(logs)}")
-print(f"FILE 5: {QUALITATIVE_PATH}")
-print(f"  Rows: {len(df5)}")
-agreements = sum(1 for i in range(0, len(qual_rows), 2) if qual_rows[i]["code"] == qual_rows[i+1]["code"])
-total_pairs = len(qual_rows) // 2
-print(f"  Coder agreement: {agreements}/{total_pairs} = {agreements/total_pairs:.1%}")
-print("\nAll files generated successfully!")
+
+def print_summary(results, output_root):
+    print("\n=== Generation Complete ===")
+    if "survey" in results:
+        df1 = results["survey"]
+        print(f"FILE 1: {artifact_path(output_root, 'survey')}")
+        print(f"  Rows: {len(df1)}, Columns: {list(df1.columns)}")
+    if "dataset" in results:
+        df2 = results["dataset"]
+        print(f"FILE 2: {artifact_path(output_root, 'dataset')}")
+        print(f"  Rows: {len(df2)}, Columns: {list(df2.columns)}")
+        corr = df2[["study_hours_per_week", "attendance_rate", "previous_gpa", "sleep_hours_avg", "quiz_score"]].corr()
+        print(f"  Quiz score correlations:\n{corr['quiz_score'].to_string()}")
+    if "posttest" in results:
+        df3 = results["posttest"]
+        print(f"FILE 3: {artifact_path(output_root, 'posttest')}")
+        print(f"  Rows: {len(df3)}, Columns: {list(df3.columns)}")
+        # Calculate SUS scores
+        sus_cols_odd = [f"sus_q{q}" for q in [1,3,5,7,9]]
+        sus_cols_even = [f"sus_q{q}" for q in [2,4,6,8,10]]
+        sus_score = (df3[sus_cols_odd].sum(axis=1) - 5 + 25 - df3[sus_cols_even].sum(axis=1)) * 2.5
+        print(f"  Mean SUS score: {sus_score.mean():.1f} (target ~68)")
+    if "logs" in results:
+        print(f"FILE 4: {artifact_path(output_root, 'logs')}")
+        print(f"  Entries: {results['logs']}")
+    if "qualitative" in results:
+        df5 = results["qualitative"]
+        print(f"FILE 5: {artifact_path(output_root, 'qualitative')}")
+        print(f"  Rows: {len(df5)}")
+        # Rows alternate coder 1 / coder 2 for the same response
+        codes = df5["code"].tolist()
+        agreements = sum(1 for i in range(0, len(codes), 2) if codes[i] == codes[i+1])
+        total_pairs = len(codes) // 2
+        print(f"  Coder agreement: {agreements}/{total_pairs} = {agreements/total_pairs:.1%}")
+    print("\nAll files generated successfully!")
+
+
+# ============================================================
+# Main
+# ============================================================
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate Project 2 (StudyBuddy) dummy data.")
+    parser.add_argument("--profile", default=DEFAULT_PROFILE,
+                        help="scenario profile name in profiles/ or path to a profile JSON")
+    parser.add_argument("--output-root", default=DEFAULT_OUTPUT_ROOT,
+                        help="directory the artifacts are written below (default: deliverables/project2)")
+    parser.add_argument("--only", nargs="+", choices=ARTIFACTS, metavar="ARTIFACT",
+                        help=f"generate only these artifacts ({', '.join(ARTIFACTS)})")
+    parser.add_argument("--force", action="store_true",
+                        help="rebuild the selected artifacts even if they are up to date")
+    args = parser.parse_args(argv)
+
+    results = generate(args.only, profile=args.profile, output_root=args.output_root,
+                       force=args.force, log=print)
+    print_summary(results, args.output_root)
+
+
+if __name__ == "__main__":
+    main()
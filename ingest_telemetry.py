@@ -0,0 +1,291 @@
+#!/usr/bin/env python3
+"""
+Ingest participant telemetry files exported by the prototype webapps.
+
+Both webapps buffer their events in `window.telemetryLog` (compressed batches,
+posted to telemetry_server.py when it runs) and export them as a JSON file per
+participant:
+
+  project 1  gemini-quest-{pid}-{ts}.json
+             {participantId, exportedAt, player, events}
+  project 2  studybuddy_telemetry_{pid}_{ts}.json
+             {participant_id, exported_at, total_events, events}
+
+Each export in the drop directory is normalized to the participant-entry
+schema written by generate_p1_data.py / generate_p2_data.py (session
+start/end/duration, click counters, events, choices, errors, features) and
+appended to an event store (see event_store.py). The normalized entries are
+also appended to ingested_logs.jsonl in the store, which --export-logs turns
+into an interaction_logs.json for the notebook.
+
+ingest_manifest.json in the store records every processed file (size,
+modification time, SHA-256), so a rerun only opens files it has not seen;
+a re-downloaded copy of an export already ingested is recognized by its hash
+and skipped. The store rows and the manifest are saved after every file, so
+an interrupted run resumes after the last file it finished; the store's
+sorted indexes are rebuilt once, when the run ends, so a run costs O(new
+files) plus one index sort. A malformed export is recorded as skipped and
+does not stop the others. After each ingest the minute/hour/day rollups of
+the store (see rollups.py) are extended with the new events.
+
+Usage:
+    python ingest_telemetry.py DROP_DIR STORE_DIR [--watch SECONDS]
+                               [--export-logs interaction_logs.json]
+"""
+
+import argparse
+import fnmatch
+import json
+import os
+import re
+import sys
+import time
+from datetime import datetime
+
+from build_cache import file_sha256
+from event_store import EventStoreWriter, source_signature
+from log_stream import LogWriter, iter_logs, open_log_file, write_logs
+from rollups import update_rollups
+
+EXPORT_PATTERNS = ("*.json", "*.json.gz", "*.json.zst")
+MANIFEST_NAME = "ingest_manifest.json"
+INGESTED_LOGS_NAME = "ingested_logs.jsonl"
+
+# Webapp scene/page ids -> page names used in the generated logs
+PAGE_ALIASES = {"title_screen": "intro"}
+
+# Project 2 pages -> the feature names used in features_interacted
+P2_PAGE_FEATURES = {
+    "dashboard": "performance_dashboard",
+    "predictions": "grade_prediction",
+    "recommendations": "study_recommendations",
+    "history": "progress_visualization",
+    "settings": "notification_settings",
+}
+
+
+# ---------------------------------------------------------------------------
+# Normalization
+# ---------------------------------------------------------------------------
+
+def normalize_page(page):
+    """'chapter1' -> 'chapter_1', 'character-creation' -> 'character_creation'."""
+    page = re.sub(r"^chapter(\d+)$", r"chapter_\1", str(page).strip().lower().replace("-", "_"))
+    return PAGE_ALIASES.get(page, page)
+
+
+def details_text(details):
+    """The log schema stores event details as text; keep dicts as compact JSON."""
+    if isinstance(details, str):
+        return details
+    if not details:
+        return ""
+    return json.dumps(details, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+
+
+def normalize_events(raw_events):
+    events = []
+    # A null timestamp sorts first instead of failing the comparison
+    for e in sorted(raw_events, key=lambda e: e.get("timestamp") or ""):
+        events.append({
+            "timestamp": e.get("timestamp"),
+            "event_type": e.get("event_type"),
+            "page": normalize_page(e.get("page", "")),
+            "details": details_text(e.get("details")),
+            "time_on_page_seconds": e.get("time_on_page_seconds"),
+            "_details": e.get("details") if isinstance(e.get("details"), dict) else {},
+        })
+    return events
+
+
+def session_fields(participant_id, events, exported_at):
+    """Common participant fields: id, session start/end/duration, clicks, errors."""
+    start = events[0]["timestamp"] if events else exported_at
+    end = events[-1]["timestamp"] if events else exported_at
+    duration = 0
+    if start and end:
+        duration = int(round((datetime.fromisoformat(end) - datetime.fromisoformat(start)).total_seconds()))
+    errors = [
+        {
+            "timestamp": e["timestamp"],
+            "error_type": e["_details"].get("type") or e["_details"].get("name"),
+            "error_message": e["_details"].get("message") or e["details"],
+            "page": e["page"],
+        }
+        for e in events if e["event_type"] == "error"
+    ]
+    return {
+        "participant_id": str(participant_id),
+        "session_start": start,
+        "session_end": end,
+        "session_duration_seconds": duration,
+        "total_clicks": sum(1 for e in events if e["event_type"] == "button_click"),
+    }, errors
+
+
+def strip_private(events):
+    for e in events:
+        e.pop("_details", None)
+    return events
+
+
+def normalize_p1_export(export):
+    """Gemini Quest export -> generate_p1_data.py participant entry."""
+    events = normalize_events(export.get("events", []))
+    entry, errors = session_fields(export["participantId"], events, export.get("exportedAt"))
+    entry["total_pages_visited"] = len({e["page"] for e in events if e["event_type"] == "page_view"} - {"global"})
+    entry["events"] = events
+    entry["choices_made"] = [
+        {
+            "chapter": f"chapter_{e['_details'].get('chapter')}",
+            "choice_id": None,
+            "choice_text": e["_details"].get("choice"),
+            "time_to_decide_seconds": e["time_on_page_seconds"],
+        }
+        for e in events if e["event_type"] == "choice_made"
+    ]
+    entry["errors_encountered"] = errors
+    strip_private(events)
+    return entry
+
+
+def normalize_p2_export(export):
+    """StudyBuddy export -> generate_p2_data.py participant entry."""
+    events = normalize_events(export.get("events", []))
+    entry, errors = session_fields(export["participant_id"], events, export.get("exported_at"))
+    entry["events"] = events
+    entry["predictions_viewed"] = sum(
+        1 for e in events
+        if e["event_type"] == "prediction_request" and e["_details"].get("method") != "pending"
+    )
+    entry["recommendations_clicked"] = sum(1 for e in events if e["event_type"] == "recommendation_interaction")
+    used_pages = {e["page"] for e in events if e["event_type"] != "page_view"}
+    entry["features_interacted"] = sorted(P2_PAGE_FEATURES[p] for p in used_pages if p in P2_PAGE_FEATURES)
+    entry["errors_encountered"] = errors
+    strip_private(events)
+    return entry
+
+
+def normalize_export(export):
+    """Dispatch on the export's key style (camelCase = project 1)."""
+    if "participantId" in export:
+        return normalize_p1_export(export)
+    if "participant_id" in export:
+        return normalize_p2_export(export)
+    raise ValueError("not a webapp telemetry export (no participantId/participant_id)")
+
+
+# ---------------------------------------------------------------------------
+# Manifest
+# ---------------------------------------------------------------------------
+
+def load_manifest(store_dir):
+    path = os.path.join(store_dir, MANIFEST_NAME)
+    if not os.path.isfile(path):
+        return {"files": {}}
+    with open(path) as f:
+        return json.load(f)
+
+
+def save_manifest(store_dir, manifest):
+    path = os.path.join(store_dir, MANIFEST_NAME)
+    with open(path + ".tmp", "w") as f:
+        json.dump(manifest, f, indent=1, sort_keys=True)
+        f.write("\n")
+    os.replace(path + ".tmp", path)
+
+
+def new_exports(drop_dir, manifest):
+    """Yield (name, path, signature) for export files not yet in the manifest."""
+    for name in sorted(os.listdir(drop_dir)):
+        if not any(fnmatch.fnmatch(name, pattern) for pattern in EXPORT_PATTERNS):
+            continue
+        path = os.path.join(drop_dir, name)
+        signature = source_signature(path)
+        seen = manifest["files"].get(name)
+        if seen and seen["size"] == signature["size"] and seen["mtime_ns"] == signature["mtime_ns"]:
+            continue
+        yield name, path, signature
+
+
+# ---------------------------------------------------------------------------
+# Ingestion
+# ---------------------------------------------------------------------------
+
+def ingest(drop_dir, store_dir, log=None):
+    """Normalize and append every new export in `drop_dir`; return the count."""
+    os.makedirs(store_dir, exist_ok=True)
+    manifest = load_manifest(store_dir)
+    known_hashes = {entry["sha256"] for entry in manifest["files"].values()}
+    pending = list(new_exports(drop_dir, manifest))
+    if not pending:
+        return 0
+
+    ingested = 0
+    with EventStoreWriter(store_dir, append=True) as store, \
+            LogWriter(os.path.join(store_dir, INGESTED_LOGS_NAME), layout="jsonl", append=True) as jsonl:
+        for name, path, signature in pending:
+            record = dict(signature, sha256=file_sha256(path))
+            if record["sha256"] in known_hashes:
+                record["status"] = "duplicate"
+            else:
+                try:
+                    with open_log_file(path, "r") as f:
+                        entry = normalize_export(json.load(f))
+                except (ValueError, KeyError, TypeError) as exc:
+                    record["status"] = f"skipped: {exc}"
+                else:
+                    store.write(entry)
+                    jsonl.write(entry)
+                    store.sources.append(signature)
+                    store.checkpoint()
+                    jsonl.flush()
+                    known_hashes.add(record["sha256"])
+                    record.update(status="ingested", participant_id=entry["participant_id"],
+                                  events=len(entry["events"]))
+                    ingested += 1
+            manifest["files"][name] = record
+            save_manifest(store_dir, manifest)
+            if log:
+                log(f"[{'OK' if record['status'] == 'ingested' else '--'}] {name}: {record['status']}")
+    if ingested:
+        update_rollups(store_dir)
+    return ingested
+
+
+def export_logs(store_dir, logs_path):
+    """Write every ingested entry to `logs_path` in the interaction-log layout."""
+    return write_logs(logs_path, iter_logs(os.path.join(store_dir, INGESTED_LOGS_NAME)))
+
+
+# ---------------------------------------------------------------------------
+# Main
+# ---------------------------------------------------------------------------
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Ingest webapp telemetry exports into an event store.")
+    parser.add_argument("drop_dir", help="directory the exported JSON files are dropped into")
+    parser.add_argument("store_dir", help="event store to append to (created if missing)")
+    parser.add_argument("--watch", type=float, metavar="SECONDS",
+                        help="keep polling the drop directory every SECONDS")
+    parser.add_argument("--export-logs", metavar="PATH",
+                        help="also write all ingested entries as an interaction_logs.json")
+    args = parser.parse_args(argv)
+
+    jsonl_path = os.path.join(args.store_dir, INGESTED_LOGS_NAME)
+    try:
+        while True:
+            count = ingest(args.drop_dir, args.store_dir, log=print)
+            if args.export_logs and os.path.exists(jsonl_path) and (count or not os.path.exists(args.export_logs)):
+                total = export_logs(args.store_dir, args.export_logs)
+                print(f"[OK] Interaction logs: {total} participants -> {args.export_logs}")
+            if args.watch is None:
+                break
+            time.sleep(args.watch)
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
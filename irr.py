@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+"""
+Inter-rater reliability of the qualitative coding (any number of coders).
+
+Coded segments are turned once into an integer coders x units matrix
+(category codes, -1 where a coder did not code a unit). Every statistic is
+a function of how often each distinct unit pattern (the column of codes a
+unit received) occurs, so the units are reduced to their distinct patterns
+and a weight per pattern:
+
+  - Cohen's kappa per coder pair, from the pair's confusion matrix; with more
+    than two coders the mean over pairs (Light's kappa) is reported
+  - Fleiss' kappa, from the units x categories count matrix (units with
+    fewer ratings weigh their agreement over their own rater pairs)
+  - Krippendorff's alpha (nominal, ordinal or interval), from the
+    coincidence matrix sum_u (n_uc n_uk - [c = k] n_uc) / (m_u - 1)
+
+Confusion and coincidence matrices of all patterns are one matrix product
+with the pattern weights. A bootstrap over units is a multinomial draw of
+pattern weights, so a block of replicates is a (replicates x patterns)
+matrix and its statistics are a few products, whatever the number of
+units. Blocks run on a thread pool with their own random streams, so the
+intervals do not depend on the number of workers.
+
+Usage:
+    python irr.py deliverables/project1/posttest/coded_qualitative_data.csv [--value theme] [--boot 10000]
+"""
+
+import argparse
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from itertools import combinations
+
+import numpy as np
+import pandas as pd
+
+UNIT_COLUMNS = ("participant_id", "response_type")
+LEVELS = ("nominal", "ordinal", "interval")
+BLOCK_REPLICATES = 2000
+BLOCK_CELLS = 1 << 24  # replicates x patterns per block
+
+
+# ---------------------------------------------------------------------------
+# Data
+# ---------------------------------------------------------------------------
+
+def rating_matrix(coded, value="theme", units=UNIT_COLUMNS, coder="coder", categories=None):
+    """Coders x units matrix of category codes (-1 where missing).
+
+    Returns (ratings, categories, coders, unit_index). Categories are sorted
+    unless given; a coder's last code of a unit wins.
+    """
+    coded = coded.dropna(subset=[value])
+    unit_codes, unit_index = pd.MultiIndex.from_frame(coded[list(units)]).factorize()
+    coder_codes, coders = pd.factorize(coded[coder], sort=True)
+    if categories is None:
+        value_codes, categories = pd.factorize(coded[value], sort=True)
+    else:
+        categories = pd.Index(categories)
+        value_codes = categories.get_indexer(coded[value])
+        if (value_codes < 0).any():
+            raise ValueError(f"values outside the given categories in {value!r}")
+    ratings = np.full((len(coders), len(unit_index)), -1, dtype=np.int32)
+    ratings[coder_codes, unit_codes] = value_codes
+    return ratings, list(categories), list(coders), unit_index
+
+
+def unit_patterns(ratings):
+    """Distinct unit columns of `ratings` (patterns x coders) and how many units have each."""
+    base = int(ratings.max(initial=-1)) + 2
+    coders = ratings.shape[0]
+    if coders * np.log2(base) >= 62:
+        patterns, frequency = np.unique(ratings.T, axis=0, return_counts=True)
+        return patterns, frequency.astype(np.float64)
+    # Each unit's codes as the digits of one integer key: a 1-d unique is far
+    # faster than np.unique(axis=0)
+    powers = base ** np.arange(coders - 1, -1, -1, dtype=np.int64)
+    keys, frequency = np.unique(powers @ (ratings.astype(np.int64) + 1), return_counts=True)
+    patterns = (keys[:, None] // powers[None, :]) % base - 1
+    return patterns.astype(ratings.dtype), frequency.astype(np.float64)
+
+
+def category_counts(patterns, n_categories):
+    """How many coders gave each category, patterns x categories."""
+    rows = np.repeat(np.arange(len(patterns)), patterns.shape[1])
+    values = patterns.ravel()
+    valid = values >= 0
+    flat = np.bincount(rows[valid] * n_categories + values[valid], minlength=len(patterns) * n_categories)
+    return flat.reshape(len(patterns), n_categories).astype(np.float64)
+
+
+# ---------------------------------------------------------------------------
+# Statistics from pattern weights (weights: (..., patterns))
+# ---------------------------------------------------------------------------
+
+def cohen_kappa(confusion):
+    """Cohen's kappa of (..., q, q) confusion matrices."""
+    n = confusion.sum(axis=(-2, -1))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        observed = np.trace(confusion, axis1=-2, axis2=-1) / n
+        expected = (confusion.sum(axis=-1) * confusion.sum(axis=-2)).sum(axis=-1) / n ** 2
+        return (observed - expected) / (1 - expected)
+
+
+def pair_cells(patterns, n_categories):
+    """For every coder pair, each pattern's confusion cell (-1 if either code is missing)."""
+    cells = {}
+    for i, j in combinations(range(patterns.shape[1]), 2):
+        a, b = patterns[:, i], patterns[:, j]
+        cells[(i, j)] = np.where((a >= 0) & (b >= 0), a * n_categories + b, -1)
+    return cells
+
+
+def pairwise_kappas(weights, cells, n_categories):
+    """Cohen's kappa of every coder pair, {pair: (...)}."""
+    kappas = {}
+    for pair, cell in cells.items():
+        onehot = np.zeros((len(cell), n_categories * n_categories))
+        valid = cell >= 0
+        onehot[np.flatnonzero(valid), cell[valid]] = 1.0
+        confusion = (weights @ onehot).reshape(weights.shape[:-1] + (n_categories, n_categories))
+        kappas[pair] = cohen_kappa(confusion)
+    return kappas
+
+
+def fleiss_kappa(weights, counts):
+    """Fleiss' kappa, generalized to units with different numbers of ratings."""
+    m = counts.sum(axis=1)
+    rated = m >= 2
+    with np.errstate(divide="ignore", invalid="ignore"):
+        unit_agreement = np.where(rated, (counts * (counts - 1)).sum(axis=1) / (m * (m - 1)), 0.0)
+    w = weights * rated
+    totals = w @ counts
+    with np.errstate(divide="ignore", invalid="ignore"):
+        observed = (w @ unit_agreement) / w.sum(axis=-1)
+        shares = totals / totals.sum(axis=-1, keepdims=True)
+        expected = (shares ** 2).sum(axis=-1)
+        return (observed - expected) / (1 - expected)
+
+
+def coincidences(counts):
+    """Each pattern's contribution to the coincidence matrix, patterns x (q * q)."""
+    m = counts.sum(axis=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        scale = np.where(m >= 2, 1 / (m - 1), 0.0)
+    q = counts.shape[1]
+    pairs = counts[:, :, None] * counts[:, None, :] - counts[:, :, None] * np.eye(q)
+    return (pairs * scale[:, None, None]).reshape(len(counts), q * q)
+
+
+def distance_matrix(n_categories, level="nominal", values=None, marginals=None):
+    """Squared difference function of Krippendorff's alpha, q x q.
+
+    Interval distances use `values` (default 0..q-1); ordinal distances use
+    the category order and the marginal totals of each coincidence matrix,
+    so for "ordinal" `marginals` (..., q) gives one matrix per row.
+    """
+    if level == "nominal":
+        return 1.0 - np.eye(n_categories)
+    if level == "interval":
+        values = np.arange(n_categories, dtype=np.float64) if values is None else np.asarray(values, dtype=np.float64)
+        return (values[:, None] - values[None, :]) ** 2
+    if level == "ordinal":
+        cumulative = np.cumsum(marginals, axis=-1)
+        between = cumulative[..., None, :] - cumulative[..., :, None] + marginals[..., :, None]
+        between = np.where(np.arange(n_categories)[None, :] >= np.arange(n_categories)[:, None], between, between.swapaxes(-2, -1))
+        return (between - (marginals[..., :, None] + marginals[..., None, :]) / 2) ** 2
+    raise ValueError(f"level must be one of {LEVELS}")
+
+
+def krippendorff_alpha(weights, coincidence, n_categories, level="nominal", values=None):
+    """Krippendorff's alpha from pattern weights and coincidences()."""
+    o = (weights @ coincidence).reshape(weights.shape[:-1] + (n_categories, n_categories))
+    marginals = o.sum(axis=-1)
+    n = marginals.sum(axis=-1)
+    delta = distance_matrix(n_categories, level, values, marginals)
+    disagreement = (o * delta).sum(axis=(-2, -1))
+    expected = (marginals[..., :, None] * marginals[..., None, :] * delta).sum(axis=(-2, -1))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return 1 - (n - 1) * disagreement / expected
+
+
+def percent_agreement(weights, counts):
+    """Share of units with two or more ratings on which all coders agree."""
+    m = counts.sum(axis=1)
+    rated = m >= 2
+    unanimous = (counts.max(axis=1) == m) & rated
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return (weights @ unanimous.astype(np.float64)) / (weights @ rated.astype(np.float64))
+
+
+def statistics(weights, patterns, n_categories, level="nominal", values=None, parts=None):
+    """All agreement statistics for pattern weights (..., patterns)."""
+    parts = parts or pattern_parts(patterns, n_categories)
+    kappas = pairwise_kappas(weights, parts["cells"], n_categories)
+    return {
+        "percent_agreement": percent_agreement(weights, parts["counts"]),
+        "cohen_kappa": np.mean(list(kappas.values()), axis=0),
+        "fleiss_kappa": fleiss_kappa(weights, parts["counts"]),
+        "krippendorff_alpha": krippendorff_alpha(weights, parts["coincidence"], n_categories, level, values),
+    }
+
+
+def pattern_parts(patterns, n_categories):
+    counts = category_counts(patterns, n_categories)
+    return {"counts": counts, "coincidence": coincidences(counts), "cells": pair_cells(patterns, n_categories)}
+
+
+# ---------------------------------------------------------------------------
+# Bootstrap and tables
+# ---------------------------------------------------------------------------
+
+def bootstrap(patterns, frequency, n_categories, n_boot, level="nominal", values=None, seed=0, workers=None,
+              block=BLOCK_REPLICATES):
+    """Statistics of n_boot resamples of the units, {statistic: array}."""
+    block = max(1, min(block, BLOCK_CELLS // max(len(patterns), 1)))
+    sizes = [min(block, n_boot - lo) for lo in range(0, n_boot, block)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    parts = pattern_parts(patterns, n_categories)
+    n_units, shares = int(frequency.sum()), frequency / frequency.sum()
+
+    def run(size, block_seed):
+        weights = np.random.default_rng(block_seed).multinomial(n_units, shares, size=size).astype(np.float64)
+        return statistics(weights, patterns, n_categories, level, values, parts)
+
+    with ThreadPoolExecutor(max_workers=workers or os.cpu_count()) as pool:
+        blocks = list(pool.map(run, sizes, seeds))
+    return {name: np.concatenate([b[name] for b in blocks]) for name in blocks[0]}
+
+
+def agreement(ratings, n_categories, level="nominal", values=None, n_boot=0, ci=0.95, seed=0, workers=None):
+    """Agreement statistics of a coders x units matrix, with bootstrap intervals if n_boot > 0.
+
+    Returns a table indexed by statistic with estimate (and lo, hi).
+    """
+    if ratings.shape[0] < 2:
+        raise ValueError("need at least two coders")
+    patterns, frequency = unit_patterns(ratings)
+    estimates = statistics(frequency, patterns, n_categories, level, values)
+    table = pd.DataFrame({"estimate": {name: float(v) for name, v in estimates.items()}})
+    table.index.name = "statistic"
+    if n_boot:
+        replicates = bootstrap(patterns, frequency, n_categories, n_boot, level, values, seed, workers)
+        tail = (1 - ci) / 2 * 100
+        bounds = np.array([np.nanpercentile(replicates[name], [tail, 100 - tail]) for name in table.index])
+        table["lo"], table["hi"] = bounds[:, 0], bounds[:, 1]
+    units = (ratings >= 0).sum(axis=0) >= 2
+    table.attrs.update(coders=ratings.shape[0], units=int(units.sum()))
+    return table
+
+
+def coding_agreement(coded, value="theme", units=UNIT_COLUMNS, coder="coder", n_boot=0, ci=0.95, seed=0,
+                     workers=None):
+    """agreement() of one column of the coded segments (nominal categories)."""
+    ratings, categories, _, _ = rating_matrix(coded, value, units, coder)
+    return agreement(ratings, len(categories), n_boot=n_boot, ci=ci, seed=seed, workers=workers)
+
+
+def kappa_quality(kappa):
+    """Landis & Koch (1977) label of a kappa or alpha value."""
+    if kappa > 0.8:
+        return "Almost Perfect"
+    if kappa > 0.6:
+        return "Substantial"
+    if kappa > 0.4:
+        return "Moderate"
+    return "Fair" if kappa > 0.2 else "Slight"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Inter-rater reliability of coded qualitative segments.")
+    parser.add_argument("coded", help="coded segments CSV (one row per coder and unit)")
+    parser.add_argument("--value", action="append", help="coded column(s) (default: theme and code)")
+    parser.add_argument("--boot", type=int, default=10000, help="bootstrap replicates (default 10000, 0 for none)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    coded = pd.read_csv(args.coded)
+    for value in args.value or ["theme", "code"]:
+        table = coding_agreement(coded, value, n_boot=args.boot, seed=args.seed)
+        print(f"[OK] {value}: {table.attrs['coders']} coders, {table.attrs['units']} units")
+        print(table.round(3).to_string())
+        print()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
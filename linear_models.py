@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+"""
+Covariate-adjusted and repeated-measures comparisons of conditions.
+
+fit_linear_model() fits
+
+    y = X b + Z u + e,   u ~ N(0, tau2 I),   e ~ N(0, sigma2 I)
+
+where X holds an intercept, treatment-coded dummies of the factors and the
+centered covariates, and Z is the one-hot matrix of an optional grouping
+column (random intercepts: respondents for repeated measures, sites for a
+multi-site deployment). Without groups it is ordinary least squares, which
+makes the one-way ANOVA (F) and the independent t-test (t = sqrt(F)) the
+special cases of a single factor without covariates.
+
+X and Z are scipy.sparse matrices, and the model is fitted from a handful
+of sparse cross products (X'X, Z'X, Z'y, ...) computed once. Within each
+group, (I + gamma J)^-1 = I - gamma / (1 + n_g gamma) J with
+gamma = tau2 / sigma2, so every quantity of the profiled (RE)ML likelihood
+is those cross products reweighted per group; the one-dimensional
+optimization over gamma never touches the respondents again. 100k
+respondents in thousands of groups fit in well under a second.
+
+Terms are tested with Wald F tests. Denominator df follow the
+between-within rule: N - G - (columns varying within groups) for
+within-group terms, G - (columns constant within groups) for terms that
+only vary between groups, N - p without groups.
+
+Usage:
+    python linear_models.py DATA.csv OUTCOME --factor condition [--covariate age] [--groups participant_id]
+"""
+
+import argparse
+import sys
+
+import numpy as np
+import pandas as pd
+from scipy import linalg, optimize, sparse, stats
+
+METHODS = ("reml", "ml")
+LOG_GAMMA_BOUNDS = (-20.0, 12.0)
+LOG_GAMMA_TOLERANCE = 1e-8
+
+
+# ---------------------------------------------------------------------------
+# Design
+# ---------------------------------------------------------------------------
+
+def one_hot(codes, n_levels):
+    """Sparse n x n_levels indicator matrix of integer codes."""
+    rows = np.arange(len(codes))
+    return sparse.csr_matrix((np.ones(len(codes)), (rows, codes)), shape=(len(codes), n_levels))
+
+
+def design(frame, factors=(), covariates=()):
+    """Sparse fixed-effects design matrix.
+
+    Returns a dict: X (csr), columns (names), terms ({term: column indices}),
+    levels ({factor: levels, the first being the reference}) and
+    covariate_means.
+    """
+    blocks = [sparse.csr_matrix(np.ones((len(frame), 1)))]
+    columns, terms, levels = ["Intercept"], {}, {}
+    for factor in factors:
+        codes, uniques = pd.factorize(frame[factor], sort=True)
+        if (codes < 0).any():
+            raise ValueError(f"missing values in factor {factor!r}")
+        levels[factor] = list(uniques)
+        # Treatment coding: the first (sorted) level is the reference
+        blocks.append(one_hot(codes, len(uniques))[:, 1:])
+        terms[factor] = list(range(len(columns), len(columns) + len(uniques) - 1))
+        columns += [f"{factor}[{level}]" for level in uniques[1:]]
+    covariate_means = {}
+    for covariate in covariates:
+        values = frame[covariate].to_numpy(dtype=np.float64)
+        covariate_means[covariate] = values.mean()
+        blocks.append(sparse.csr_matrix((values - values.mean())[:, None]))
+        terms[covariate] = [len(columns)]
+        columns.append(covariate)
+    X = sparse.hstack(blocks, format="csr")
+    return {"X": X, "columns": columns, "terms": terms, "levels": levels, "covariate_means": covariate_means}
+
+
+def cross_products(X, y, group_codes=None):
+    """Sufficient statistics of the model: X'X, X'y, y'y and the per-group sums."""
+    stats_ = {"XtX": (X.T @ X).toarray(), "Xty": X.T @ y, "yty": float(y @ y), "n": len(y)}
+    if group_codes is not None:
+        Z = one_hot(group_codes, group_codes.max() + 1)
+        stats_["ZtX"] = sparse.csr_matrix(Z.T @ X)
+        stats_["Zty"] = Z.T @ y
+        stats_["group_sizes"] = np.asarray(Z.sum(axis=0)).ravel()
+        # Columns that vary within groups (for the between-within df)
+        within_ss = np.asarray(X.multiply(X).sum(axis=0)).ravel() - np.asarray(
+            stats_["ZtX"].multiply(stats_["ZtX"]).multiply(1 / stats_["group_sizes"][:, None]).sum(axis=0)).ravel()
+        stats_["varies_within"] = within_ss > 1e-9 * np.maximum(np.diag(stats_["XtX"]), 1.0)
+    return stats_
+
+
+# ---------------------------------------------------------------------------
+# Fitting
+# ---------------------------------------------------------------------------
+
+def _profile(gamma, cp):
+    """Generalized least squares at variance ratio gamma, from the cross products."""
+    A, b, c = cp["XtX"], cp["Xty"], cp["yty"]
+    log_det_h = 0.0
+    if gamma > 0:
+        w = gamma / (1 + cp["group_sizes"] * gamma)
+        weighted = cp["ZtX"].multiply(w[:, None]).tocsr()
+        A = A - (cp["ZtX"].T @ weighted).toarray()
+        b = b - weighted.T @ cp["Zty"]
+        c = c - float((w * cp["Zty"] ** 2).sum())
+        log_det_h = float(np.log1p(cp["group_sizes"] * gamma).sum())
+    factor = linalg.cho_factor(A)
+    beta = linalg.cho_solve(factor, b)
+    residual = c - float(b @ beta)
+    log_det_a = 2 * float(np.log(np.diag(factor[0])).sum())
+    return {"beta": beta, "residual": residual, "factor": factor, "log_det_h": log_det_h, "log_det_a": log_det_a}
+
+
+def _deviance(gamma, cp, method):
+    """-2 log likelihood (up to a constant), with sigma2 profiled out."""
+    fit = _profile(gamma, cp)
+    n, p = cp["n"], len(fit["beta"])
+    if method == "reml":
+        return (n - p) * np.log(fit["residual"] / (n - p)) + fit["log_det_h"] + fit["log_det_a"]
+    return n * np.log(fit["residual"] / n) + fit["log_det_h"]
+
+
+def fit_linear_model(frame, outcome, factors=(), covariates=(), groups=None, method="reml"):
+    """Fit the model and test its terms.
+
+    Returns a dict: coefficients and terms (DataFrames), adjusted_means
+    ({factor: DataFrame} at the covariate means, other factors at their
+    observed proportions), sigma2, tau2, icc, n, n_groups, method, and the
+    design (for contrasts).
+    """
+    if method not in METHODS:
+        raise ValueError(f"method must be one of {METHODS}")
+    factors, covariates = list(factors), list(covariates)
+    columns = [outcome] + factors + covariates + ([groups] if groups else [])
+    frame = frame.dropna(subset=columns)
+    spec = design(frame, factors, covariates)
+    y = frame[outcome].to_numpy(dtype=np.float64)
+    group_codes = pd.factorize(frame[groups])[0] if groups else None
+    cp = cross_products(spec["X"], y, group_codes)
+    n, p = len(y), spec["X"].shape[1]
+
+    gamma = 0.0
+    if groups:
+        result = optimize.minimize_scalar(lambda log_gamma: _deviance(np.exp(log_gamma), cp, method),
+                                          bounds=LOG_GAMMA_BOUNDS, method="bounded",
+                                          options={"xatol": LOG_GAMMA_TOLERANCE})
+        # A variance component at the boundary is zero
+        gamma = np.exp(result.x) if _deviance(np.exp(result.x), cp, method) < _deviance(0.0, cp, method) else 0.0
+    fit = _profile(gamma, cp)
+    sigma2 = fit["residual"] / (n - p if method == "reml" else n)
+    covariance = sigma2 * linalg.cho_solve(fit["factor"], np.eye(p))
+    beta = fit["beta"]
+
+    n_groups = int(group_codes.max() + 1) if groups else 0
+    if groups:
+        within = cp["varies_within"]
+        df_within = n - n_groups - int(within.sum())
+        df_between = n_groups - int((~within).sum())
+        column_df = np.where(within, df_within, df_between)
+    else:
+        column_df = np.full(p, n - p)
+
+    se = np.sqrt(np.diag(covariance))
+    t = beta / se
+    coefficients = pd.DataFrame({"estimate": beta, "se": se, "t": t, "df": column_df,
+                                 "p": 2 * stats.t.sf(np.abs(t), column_df)}, index=spec["columns"])
+
+    rows = []
+    for term, idx in spec["terms"].items():
+        if not idx:
+            continue
+        b, V = beta[idx], covariance[np.ix_(idx, idx)]
+        q = len(idx)
+        f = float(b @ np.linalg.solve(V, b)) / q
+        df2 = int(column_df[idx].min())
+        rows.append({"term": term, "df1": q, "df2": df2, "F": f, "p": float(stats.f.sf(f, q, df2)),
+                     "partial_eta_sq": f * q / (f * q + df2)})
+    terms = pd.DataFrame(rows, columns=["term", "df1", "df2", "F", "p", "partial_eta_sq"]).set_index("term")
+
+    tau2 = gamma * sigma2
+    fitted = {"coefficients": coefficients, "terms": terms, "sigma2": sigma2, "tau2": tau2,
+              "icc": tau2 / (tau2 + sigma2) if groups else np.nan, "n": n, "n_groups": n_groups,
+              "method": method if groups else "ols", "design": spec, "covariance": covariance}
+    fitted["adjusted_means"] = {factor: adjusted_means(fitted, factor, frame) for factor in factors}
+    return fitted
+
+
+def adjusted_means(fit, factor, frame):
+    """Model means of each level of `factor` (estimated marginal means)."""
+    spec = fit["design"]
+    beta, covariance = fit["coefficients"]["estimate"].to_numpy(), fit["covariance"]
+    base = np.zeros(len(beta))
+    base[0] = 1.0
+    # Other factors at their observed proportions; centered covariates at 0
+    for other, idx in spec["terms"].items():
+        if other in spec["levels"] and other != factor:
+            codes = pd.Categorical(frame[other], categories=spec["levels"][other]).codes
+            base[idx] = np.bincount(codes, minlength=len(idx) + 1)[1:] / len(codes)
+    rows = []
+    for i, level in enumerate(spec["levels"][factor]):
+        L = base.copy()
+        if i:
+            L[spec["terms"][factor][i - 1]] = 1.0
+        rows.append({"level": level, "mean": float(L @ beta), "se": float(np.sqrt(L @ covariance @ L))})
+    return pd.DataFrame(rows).set_index("level")
+
+
+# ---------------------------------------------------------------------------
+# Common designs
+# ---------------------------------------------------------------------------
+
+def ancova(frame, outcome, factor, covariates=()):
+    """One-way ANCOVA (one-way ANOVA without covariates)."""
+    return fit_linear_model(frame, outcome, [factor], covariates)
+
+
+def repeated_measures(frame, outcome, within, subject, covariates=(), method="reml"):
+    """Repeated-measures comparison in long format: random intercept per subject."""
+    return fit_linear_model(frame, outcome, [within], covariates, groups=subject, method=method)
+
+
+def format_term(fit, term):
+    row = fit["terms"].loc[term]
+    return (f"F({row['df1']:.0f}, {row['df2']:.0f}) = {row['F']:.3f}, p = {row['p']:.4f}, "
+            f"partial η² = {row['partial_eta_sq']:.3f}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="ANCOVA / random-intercept model of an outcome by condition.")
+    parser.add_argument("data", help="CSV with one row per observation")
+    parser.add_argument("outcome")
+    parser.add_argument("--factor", action="append", default=[], help="categorical predictor (repeatable)")
+    parser.add_argument("--covariate", action="append", default=[], help="numeric covariate (repeatable)")
+    parser.add_argument("--groups", help="grouping column for random intercepts (subject or site)")
+    parser.add_argument("--method", choices=METHODS, default="reml")
+    args = parser.parse_args(argv)
+
+    fit = fit_linear_model(pd.read_csv(args.data), args.outcome, args.factor, args.covariate, args.groups, args.method)
+    print(f"[OK] {fit['method'].upper()} fit: n = {fit['n']}, sigma2 = {fit['sigma2']:.4f}"
+          + (f", tau2 = {fit['tau2']:.4f}, ICC = {fit['icc']:.3f} ({fit['n_groups']} groups)" if args.groups else ""))
+    print(fit["terms"].round(4).to_string())
+    print()
+    print(fit["coefficients"].round(4).to_string())
+    for factor, means in fit["adjusted_means"].items():
+        print()
+        print(means.round(3).to_string())
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
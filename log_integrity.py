@@ -0,0 +1,610 @@
+#!/usr/bin/env python3
+"""
+Duplicate and clock-skew checks for the interaction logs in an event store.
+
+Clicking Export more than once in a webapp yields several exports of one
+participant that repeat the same events, and ingest_telemetry.py appends each
+of them as a session of its own. Before anything is aggregated, every row is
+given a 64-bit key hashed from the columns that identify it (for events:
+participant, timestamp, event_type, page, details) and from its occurrence
+number among the rows of its session with the same columns. Only a row
+whose key was seen in an earlier session is a duplicate and is dropped, so
+the first copy wins however the timestamps are ordered, while rows that
+repeat within one session (two same-second clicks on a page) are all kept.
+A session whose events are all duplicates is dropped too, and sessions of
+one participant that share events (an export followed by a longer
+re-export) are merged into one session, so their counters are not counted
+twice. Choices, errors and features are deduplicated only within such a
+group of merged sessions: a replayed game (restartGame starts a new
+session) that picks the same options keeps its choices.
+
+Text columns are dictionary-encoded, so each distinct string is hashed only
+once and rows pick up its hash through their code. Rows are scanned in chunks
+of (memory-mapped) columns. Seen keys live either in a KeySet (exact, 8 bytes
+per distinct key) or, with --bloom, in a fixed-size BloomFilter sized from the
+table's row count and an error rate. A false positive in the Bloom filter
+drops a unique row.
+
+The same pass reports clock skew: events that are out of order within a
+session, and events stamped before session_start or after session_end.
+
+Usage:
+    python log_integrity.py interaction_logs.store [--bloom] [--error-rate P]
+    python log_integrity.py --self-check
+"""
+
+import argparse
+import math
+import os
+import sys
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from event_store import NAT_MS, EventStoreReader, EventStoreWriter, load_event_store, participant_summary
+from log_stream import iter_logs
+
+CHUNK_ROWS = 1 << 20
+BLOOM_ERROR_RATE = 1e-3
+P1_LOGS = os.path.join("deliverables", "project1", "logs", "interaction_logs.json")
+
+# Columns that identify a row of each table; the participants table has no
+# key of its own (its sessions are judged by their events)
+KEY_COLUMNS = {
+    "events": ("participant", "timestamp", "event_type", "page", "details"),
+    "choices": ("participant", "chapter", "choice_id", "choice_text"),
+    "errors": ("participant", "timestamp", "error_type", "page", "error_message"),
+    "features": ("participant", "feature"),
+}
+
+GOLDEN = np.uint64(0x9E3779B97F4A7C15)
+MISSING_HASH = GOLDEN
+
+
+# ---------------------------------------------------------------------------
+# Row keys
+# ---------------------------------------------------------------------------
+
+def splitmix64(x):
+    """Avalanche a uint64 array (the splitmix64 finalizer)."""
+    x = x ^ (x >> np.uint64(30))
+    x = x * np.uint64(0xBF58476D1CE4E5B9)
+    x = x ^ (x >> np.uint64(27))
+    x = x * np.uint64(0x94D049BB133111EB)
+    return x ^ (x >> np.uint64(31))
+
+
+def dictionary_hashes(categories):
+    """Hash of every dictionary entry, with MISSING_HASH last for code -1."""
+    values = np.asarray(categories, dtype=object)
+    hashes = pd.util.hash_array(values) if len(values) else np.empty(0, dtype=np.uint64)
+    return np.append(hashes, MISSING_HASH)
+
+
+def combine(h, x):
+    """Mix the uint64 hashes `x` into the running hashes `h`."""
+    return splitmix64(h ^ (x + GOLDEN + (h << np.uint64(6)) + (h >> np.uint64(2))))
+
+
+def int_hashes(values):
+    return splitmix64(np.asarray(values).astype(np.int64).view(np.uint64))
+
+
+def row_keys(columns, hashes, key_columns, start, stop):
+    """64-bit keys of rows start:stop from their identifying columns."""
+    h = np.full(stop - start, GOLDEN, dtype=np.uint64)
+    for column in key_columns:
+        values = np.asarray(columns[column][start:stop])
+        h = combine(h, hashes[column][values] if column in hashes else int_hashes(values))
+    return h
+
+
+def occurrence_keys(keys, session):
+    """`keys` numbered by occurrence: the n-th row of a session with a key gets key+n.
+
+    Rows that repeat within a session get distinct keys, so only copies in
+    another session are duplicates. `session` must hold whole sessions.
+    """
+    order = np.lexsort((keys, session))
+    k, s = keys[order], session[order]
+    position = np.arange(len(k))
+    run_start = np.maximum.accumulate(np.where(np.r_[True, (k[1:] != k[:-1]) | (s[1:] != s[:-1])], position, 0))
+    occurrence = np.empty(len(k), dtype=np.int64)
+    occurrence[order] = position - run_start
+    return combine(keys, int_hashes(occurrence))
+
+
+class KeySet:
+    """Exact set of uint64 keys, kept as a few sorted runs.
+
+    New keys form a run of their own; runs are merged whenever the newer one
+    grows to half the size of the one before it, so there are only
+    O(log n) runs to search.
+    """
+
+    def __init__(self):
+        self._runs = []
+
+    def _contains(self, keys):
+        found = np.zeros(len(keys), dtype=bool)
+        for run in self._runs:
+            pos = np.searchsorted(run, keys)
+            found |= run[np.minimum(pos, len(run) - 1)] == keys
+        return found
+
+    def add_new(self, keys):
+        """Add `keys`; True for each key not seen before (first copy within `keys`)."""
+        unique, first = np.unique(keys, return_index=True)
+        fresh = ~self._contains(unique)
+        new = np.zeros(len(keys), dtype=bool)
+        new[first[fresh]] = True
+        if fresh.any():
+            self._runs.append(unique[fresh])
+            while len(self._runs) > 1 and 2 * len(self._runs[-1]) >= len(self._runs[-2]):
+                newer = self._runs.pop()
+                self._runs[-1] = np.sort(np.concatenate([self._runs[-1], newer]))
+        return new
+
+    @property
+    def nbytes(self):
+        return sum(run.nbytes for run in self._runs)
+
+
+class BloomFilter:
+    """Fixed-size probabilistic key set for `capacity` keys at about `error_rate`.
+
+    Register-blocked: all bits of one key fall into a single 64-bit word, so
+    adding or testing a key touches one word. Blocking costs accuracy, which a
+    2.5x bit budget makes up for: about 4.5 bytes per row at the default 1e-3,
+    fixed up front, where the exact KeySet needs 8 bytes per distinct key plus
+    room to merge its runs.
+    """
+
+    def __init__(self, capacity, error_rate=BLOOM_ERROR_RATE):
+        capacity = max(int(capacity), 1)
+        bits_per_key = -math.log(error_rate) / math.log(2) ** 2
+        self.n_hashes = min(max(int(round(bits_per_key * math.log(2))), 1), 8)
+        self.n_words = max(int(math.ceil(2.5 * bits_per_key * capacity / 64)), 1)
+        self.error_rate = error_rate
+        self.words = np.zeros(self.n_words, dtype=np.uint64)
+
+    def _slots(self, keys):
+        """(word index, bit mask) of each key; the bits come from 6-bit slices of a second hash."""
+        h = splitmix64(keys ^ GOLDEN)
+        masks = np.zeros(len(keys), dtype=np.uint64)
+        for i in range(self.n_hashes):
+            masks |= np.uint64(1) << ((h >> np.uint64(6 * i)) & np.uint64(63))
+        return keys % np.uint64(self.n_words), masks
+
+    def add_new(self, keys):
+        """Add `keys`; True for each key (probably) not seen before."""
+        unique, first = np.unique(keys, return_index=True)
+        words, masks = self._slots(unique)
+        fresh = (self.words[words] & masks) != masks
+        np.bitwise_or.at(self.words, words[fresh], masks[fresh])
+        new = np.zeros(len(keys), dtype=bool)
+        new[first[fresh]] = True
+        return new
+
+    @property
+    def nbytes(self):
+        return self.words.nbytes
+
+
+# ---------------------------------------------------------------------------
+# Scanning
+# ---------------------------------------------------------------------------
+
+def frame_columns(table):
+    """(raw columns, dictionary hashes) of a loaded table."""
+    columns, hashes = {}, {}
+    for name in table.columns:
+        values = table[name]
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            columns[name] = values.cat.codes.to_numpy()
+            hashes[name] = dictionary_hashes(values.cat.categories)
+        else:
+            columns[name] = values.to_numpy()
+    return columns, hashes
+
+
+def reader_columns(reader, table):
+    """(memory-mapped raw columns, dictionary hashes) of a store table."""
+    kinds = reader.meta["tables"][table]["columns"]
+    columns = {c: reader.column(table, c) for c in kinds}
+    hashes = {c: dictionary_hashes(reader.categories(c)) for c, kind in kinds.items() if kind == "category"}
+    return columns, hashes
+
+
+def new_key_set(rows, bloom=False, error_rate=BLOOM_ERROR_RATE):
+    return BloomFilter(rows, error_rate) if bloom else KeySet()
+
+
+def session_chunks(session_stop, rows, chunk_rows):
+    """(start, stop) chunks of about `chunk_rows` rows that end at a session boundary.
+
+    `session_stop(row)` is the end of the session holding `row`.
+    """
+    start = 0
+    while start < rows:
+        stop = int(session_stop(min(start + chunk_rows, rows) - 1))
+        yield start, stop
+        start = stop
+
+
+def scan_table(columns, hashes, table, rows, seen, target, chunk_rows=CHUNK_ROWS):
+    """Keep mask of a table: True for the first copy of every key within a merged session group.
+
+    `target` is the session each session is merged into (-1 when dropped);
+    rows are stored session by session, as their `session` column says.
+    """
+    keep = np.empty(rows, dtype=bool)
+    session_column = columns["session"]
+
+    def session_stop(row):
+        return np.searchsorted(session_column, session_column[row], side="right")
+
+    for start, stop in session_chunks(session_stop, rows, chunk_rows):
+        session = np.asarray(session_column[start:stop])
+        group = target[session]
+        keys = occurrence_keys(row_keys(columns, hashes, KEY_COLUMNS[table], start, stop), session)
+        keep[start:stop] = seen.add_new(combine(keys, int_hashes(group))) & (group >= 0)
+    return keep
+
+
+def scan_events(columns, hashes, sessions, seen, chunk_rows=CHUNK_ROWS):
+    """Keep mask of the events table plus per-session duplicates and clock skew.
+
+    `sessions` holds the raw participants columns. Events are stored session
+    by session, so the session of row r is the first one whose event_stop
+    exceeds r.
+    """
+    event_stop = np.asarray(sessions["event_stop"])
+    session_start = np.asarray(sessions["session_start"])
+    session_end = np.asarray(sessions["session_end"])
+    rows = int(event_stop[-1]) if len(event_stop) else 0
+    keep = np.empty(rows, dtype=bool)
+    session_duplicates = np.zeros(len(event_stop), dtype=np.int64)
+    skew = {"out_of_order": 0, "max_backward_ms": 0, "before_session_start": 0, "after_session_end": 0,
+            "max_skew_ms": 0, "missing_timestamps": 0}
+    prev_ts, prev_session = NAT_MS, -1
+
+    def session_stop(row):
+        return event_stop[np.searchsorted(event_stop, row, side="right")]
+
+    for start, stop in session_chunks(session_stop, rows, chunk_rows):
+        session = np.searchsorted(event_stop, np.arange(start, stop), side="right")
+        new = seen.add_new(occurrence_keys(row_keys(columns, hashes, KEY_COLUMNS["events"], start, stop), session))
+        keep[start:stop] = new
+        session_duplicates += np.bincount(session[~new], minlength=len(event_stop))
+
+        ts = np.asarray(columns["timestamp"][start:stop])
+        valid = ts != NAT_MS
+        prev = np.r_[prev_ts, ts[:-1]]
+        pair = valid & (prev != NAT_MS) & (np.r_[prev_session, session[:-1]] == session)
+        backward = np.where(pair, prev - ts, 0)
+        skew["out_of_order"] += int((backward > 0).sum())
+        skew["max_backward_ms"] = max(skew["max_backward_ms"], int(backward.max(initial=0)))
+
+        first, last = session_start[session], session_end[session]
+        early = np.where(valid & (first != NAT_MS), first - ts, 0)
+        late = np.where(valid & (last != NAT_MS), ts - last, 0)
+        skew["before_session_start"] += int((early > 0).sum())
+        skew["after_session_end"] += int((late > 0).sum())
+        skew["max_skew_ms"] = max(skew["max_skew_ms"], int(early.max(initial=0)), int(late.max(initial=0)))
+        skew["missing_timestamps"] += int((~valid).sum())
+        prev_ts, prev_session = ts[-1], session[-1]
+
+    return keep, session_duplicates, skew
+
+
+def check_tables(sources, participant_names, bloom=False, error_rate=BLOOM_ERROR_RATE, chunk_rows=CHUNK_ROWS):
+    """Scan every keyed table; return ({table: keep mask}, merge targets, report).
+
+    `sources` maps each table to its (columns, hashes, rows). The merge
+    target of a session is the session it is merged into (-1 when it is
+    dropped, see merge_targets); without the events table every session
+    stands alone.
+    """
+    session_columns, _, n_sessions = sources["participants"]
+    keep, report = {}, {"rows": {}, "duplicates": {}, "key_set": "bloom" if bloom else "exact", "key_set_bytes": 0}
+    target = np.arange(n_sessions)
+
+    for table in KEY_COLUMNS:
+        if table not in sources:
+            continue
+        columns, hashes, rows = sources[table]
+        seen = new_key_set(rows, bloom, error_rate)
+        if table == "events":
+            keep[table], session_duplicates, skew = scan_events(columns, hashes, session_columns, seen, chunk_rows)
+            event_stop = np.asarray(session_columns["event_stop"])
+            n_events = np.diff(np.r_[0, event_stop])
+            drop_sessions = (n_events > 0) & (session_duplicates == n_events)
+            overlapping = (session_duplicates > 0) & ~drop_sessions
+            owner = np.asarray(session_columns["participant"])
+            target = merge_targets(columns, hashes, event_stop, owner, drop_sessions, overlapping)
+        else:
+            keep[table] = scan_table(columns, hashes, table, rows, seen, target, chunk_rows)
+        report["rows"][table] = rows
+        report["duplicates"][table] = int(rows - keep[table].sum())
+        report["key_set_bytes"] = max(report["key_set_bytes"], seen.nbytes)
+
+    if "events" in keep:
+        report["duplicate_sessions"] = int(drop_sessions.sum())
+        report["overlapping_sessions"] = int(overlapping.sum())
+        report["merged_sessions"] = int(((target >= 0) & (target != np.arange(n_sessions))).sum())
+        codes = np.asarray(session_columns["participant"])
+        per_participant = np.bincount(codes[codes >= 0], weights=session_duplicates[codes >= 0],
+                                      minlength=len(participant_names)).astype(np.int64)
+        report["duplicates_by_participant"] = {
+            participant_names[code]: int(per_participant[code]) for code in np.flatnonzero(per_participant)
+        }
+        report.update({
+            "out_of_order": skew["out_of_order"],
+            "max_backward_seconds": skew["max_backward_ms"] / 1000.0,
+            "before_session_start": skew["before_session_start"],
+            "after_session_end": skew["after_session_end"],
+            "max_skew_seconds": skew["max_skew_ms"] / 1000.0,
+            "missing_timestamps": skew["missing_timestamps"],
+        })
+    return keep, target, report
+
+
+# ---------------------------------------------------------------------------
+# Deduplication of loaded tables
+# ---------------------------------------------------------------------------
+
+def merge_targets(columns, hashes, event_stop, owner, dropped, overlapping):
+    """Session each session is merged into (-1 for dropped sessions).
+
+    `columns`/`hashes` are the raw events columns, `event_stop` the end
+    offset of every session's events and `owner` the participant code of
+    every session. Sessions of one participant that share an event are
+    merged into the earliest of them: a re-export that extends an earlier
+    export (or overlaps it) becomes one session with the events of both.
+    """
+    target = np.where(dropped, -1, np.arange(len(dropped)))
+    if not overlapping.any():
+        return target
+    # Repeated events share the participant, so only the sessions of
+    # participants with an overlapping session need their keys compared
+    involved = np.isin(owner, owner[overlapping]) & ~dropped
+    sessions = np.flatnonzero(involved)
+    starts = np.r_[0, event_stop[:-1]][sessions]
+    lengths = event_stop[sessions] - starts
+    row_session = np.repeat(sessions, lengths)
+    rows = np.repeat(starts - np.r_[0, np.cumsum(lengths)[:-1]], lengths) + np.arange(lengths.sum())
+    sub = {c: np.asarray(columns[c])[rows] for c in KEY_COLUMNS["events"]}
+    keys = occurrence_keys(row_keys(sub, hashes, KEY_COLUMNS["events"], 0, len(rows)), row_session)
+    # Events are stored session by session, so a key's first row is in the
+    # earliest session holding it
+    _, first, inverse = np.unique(keys, return_index=True, return_inverse=True)
+    first_session = row_session[first][inverse]
+
+    parent = {}
+
+    def find(s):
+        while parent.get(s, s) != s:
+            s = parent[s]
+        return s
+
+    linked = first_session != row_session
+    for a, b in set(zip(first_session[linked].tolist(), row_session[linked].tolist())):
+        ra, rb = find(a), find(b)
+        if ra != rb:
+            parent[max(ra, rb)] = min(ra, rb)
+    for s in np.flatnonzero(involved).tolist():
+        target[s] = find(s)
+    return target
+
+
+def merge_sessions(p, target):
+    """Participants rows combined per merge target, in target order.
+
+    The earliest start and latest end are kept. Counters take the largest
+    value of the merged sessions, as a re-export's counters already include
+    those of the export it extends.
+    """
+    rows = p[target >= 0]
+    group = target[target >= 0]
+    merged = rows.groupby(group, sort=True)
+    result = merged[[c for c in p.columns if c != "participant"]].max()
+    result["participant"] = merged["participant"].first()
+    starts = rows["session_start"].to_numpy().copy()
+    starts[starts == NAT_MS] = np.iinfo(np.int64).max
+    first = pd.Series(starts).groupby(group).min().to_numpy()
+    result["session_start"] = np.where(first == np.iinfo(np.int64).max, NAT_MS, first)
+    return result[p.columns].reset_index(drop=True)
+
+
+def deduplicate(tables, bloom=False, error_rate=BLOOM_ERROR_RATE, chunk_rows=CHUNK_ROWS):
+    """Drop duplicate rows and merge repeated sessions; return (tables, report).
+
+    Takes and returns {table: DataFrame} as loaded by event_store. A session
+    whose events all repeat earlier ones is dropped; sessions of one
+    participant that share some events (a re-export of a longer session)
+    are merged into one, so their counters are not added up twice. The
+    event_start/event_stop offsets and the session numbers of the other
+    tables are recomputed.
+    """
+    sources = {}
+    for table, frame in tables.items():
+        columns, hashes = frame_columns(frame)
+        sources[table] = (columns, hashes, len(frame))
+    names = list(tables["participants"]["participant"].cat.categories)
+    keep, target, report = check_tables(sources, names, bloom, error_rate, chunk_rows)
+
+    clean = dict(tables)
+    for table, mask in keep.items():
+        if not mask.all():
+            clean[table] = tables[table][mask].reset_index(drop=True)
+    if "events" in keep:
+        p = tables["participants"]
+        counts = np.diff(np.r_[0, p["event_stop"].to_numpy()])
+        session = np.repeat(np.arange(len(p)), counts)
+        # Number the surviving sessions in order and point every session at its new number
+        survivors = target == np.arange(len(p))
+        renumber = np.where(target >= 0, (np.cumsum(survivors) - 1)[np.maximum(target, 0)], -1)
+
+        p = merge_sessions(p, target)
+        new_session = renumber[session[keep["events"]]]
+        order = np.argsort(new_session, kind="stable")
+        if (order != np.arange(len(order))).any():
+            clean["events"] = clean["events"].iloc[order].reset_index(drop=True)
+        stop = np.cumsum(np.bincount(new_session, minlength=len(p)))
+        p["event_start"] = np.r_[0, stop[:-1]]
+        p["event_stop"] = stop
+        clean["participants"] = p
+        # Renumber the sessions the other tables point to; rows of a dropped
+        # session go with it
+        for table in KEY_COLUMNS:
+            if table != "events" and table in clean and "session" in clean[table]:
+                frame = clean[table].assign(session=renumber[clean[table]["session"].to_numpy()])
+                clean[table] = frame[frame["session"] >= 0].reset_index(drop=True)
+    return clean, report
+
+
+def check_store(store_dir, bloom=False, error_rate=BLOOM_ERROR_RATE, chunk_rows=CHUNK_ROWS):
+    """Integrity report of a store, scanned chunk by chunk from memory-mapped columns."""
+    with EventStoreReader(store_dir) as reader:
+        sources = {}
+        for table, info in reader.meta["tables"].items():
+            columns, hashes = reader_columns(reader, table)
+            sources[table] = (columns, hashes, info["rows"])
+        names = list(reader.categories("participant"))
+        _, _, report = check_tables(sources, names, bloom, error_rate, chunk_rows)
+    return report
+
+
+def format_report(report):
+    """Short human-readable summary lines of an integrity report."""
+    lines = []
+    for table, rows in report["rows"].items():
+        lines.append(f"  {table}: {report['duplicates'][table]} duplicate(s) in {rows} rows")
+    if "duplicate_sessions" in report:
+        lines.append(f"  sessions: {report['duplicate_sessions']} repeated export(s) dropped, "
+                     f"{report['overlapping_sessions']} with some repeated events, {report['merged_sessions']} merged")
+        lines.append(f"  clock: {report['out_of_order']} event(s) out of order "
+                     f"(max {report['max_backward_seconds']:.0f}s back), "
+                     f"{report['before_session_start'] + report['after_session_end']} outside their session "
+                     f"(max {report['max_skew_seconds']:.0f}s), {report['missing_timestamps']} without timestamp")
+    lines.append(f"  key set: {report['key_set']}, {report['key_set_bytes'] / 2**20:.1f} MiB")
+    return lines
+
+
+# ---------------------------------------------------------------------------
+# Self-check
+# ---------------------------------------------------------------------------
+
+def superset_entries():
+    """A 3-event export of P901 followed by a 5-event re-export of the same session."""
+    events = [
+        {"timestamp": f"2026-01-01T10:0{i}:00", "event_type": event_type, "page": page, "details": ""}
+        for i, (event_type, page) in enumerate([("page_view", "chapter_1"), ("button_click", "chapter_1"),
+                                                ("choice_made", "chapter_1"), ("page_view", "chapter_2"),
+                                                ("button_click", "chapter_2")])
+    ]
+    choice = {"chapter": "chapter_1", "choice_id": "c1_a", "choice_text": "a", "time_to_decide_seconds": 5.0}
+    return [
+        {"participant_id": "P901", "session_start": events[0]["timestamp"], "session_end": events[2]["timestamp"],
+         "session_duration_seconds": 120, "total_clicks": 1, "total_pages_visited": 1,
+         "events": events[:3], "choices_made": [choice]},
+        {"participant_id": "P901", "session_start": events[0]["timestamp"], "session_end": events[4]["timestamp"],
+         "session_duration_seconds": 240, "total_clicks": 2, "total_pages_visited": 2,
+         "events": events, "choices_made": [choice]},
+    ]
+
+
+def replay_entries():
+    """Two games of P902 (restartGame) picking the same option, one with a repeated same-second click."""
+    choice = {"chapter": "chapter_1", "choice_id": "c1_a", "choice_text": "a", "time_to_decide_seconds": 5.0}
+    entries = []
+    for game, minute in enumerate((0, 5)):
+        events = [{"timestamp": f"2026-01-01T10:0{minute}:00", "event_type": "page_view", "page": "chapter_1",
+                   "details": ""}]
+        events += [{"timestamp": f"2026-01-01T10:0{minute + 1}:00", "event_type": "button_click",
+                    "page": "chapter_1", "details": "", "time_on_page_seconds": seconds}
+                   for seconds in ((41.0, 79.0) if game == 0 else (30.0,))]
+        entries.append({"participant_id": "P902", "session_start": events[0]["timestamp"],
+                        "session_end": events[-1]["timestamp"], "session_duration_seconds": 60,
+                        "total_clicks": len(events) - 1, "total_pages_visited": 1,
+                        "events": events, "choices_made": [choice]})
+    return entries
+
+
+def dedup_entries(entries):
+    """deduplicate() of the tables of `entries`, plus the tables as loaded."""
+    with tempfile.TemporaryDirectory() as store_dir:
+        with EventStoreWriter(store_dir) as writer:
+            for entry in entries:
+                writer.write(entry)
+        tables = load_event_store(store_dir)
+    return deduplicate(tables) + (tables,)
+
+
+def check_counts(label, summary, participant, expected):
+    ok = True
+    for column, value in expected.items():
+        got = summary.loc[participant, column]
+        ok = ok and got == value
+        print(f"  {column}: {got} (expected {value})")
+    print(f"[{'OK' if ok else '--'}] {label}")
+    return ok
+
+
+def self_check():
+    """Deduplicate known cases; True when nothing is counted twice and no genuine row is dropped.
+
+    The cases are a superset re-export, a replayed game with a repeated
+    same-second click, and the committed project 1 logs, which hold no
+    repeated export, so every row of them must be kept.
+    """
+    tables, report, _ = dedup_entries(superset_entries())
+    ok = check_counts("Superset re-export merged into one session", participant_summary(tables), "P901", {
+        "session_duration_seconds": 240, "total_clicks": 2, "total_pages_visited": 2,
+        "n_events": 5, "n_choices": 1, "distinct_pages": 2})
+    ok = ok and len(tables["participants"]) == 1 and report["merged_sessions"] == 1
+
+    tables, report, _ = dedup_entries(replay_entries())
+    ok = check_counts("Replayed game and repeated click kept", participant_summary(tables), "P902", {
+        "n_events": 5, "n_choices": 2}) and ok
+    ok = ok and len(tables["participants"]) == 2 and report["merged_sessions"] == 0
+
+    log_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), P1_LOGS)
+    tables, report, loaded = dedup_entries(iter_logs(log_path))
+    kept = all(len(tables[table]) == len(loaded[table]) for table in KEY_COLUMNS)
+    for table in KEY_COLUMNS:
+        print(f"  {table}: {len(tables[table])} of {len(loaded[table])} rows kept")
+    print(f"[{'OK' if kept else '--'}] Project 1 logs unchanged by deduplication")
+    return ok and kept
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Report duplicate rows and clock skew in an event store.")
+    parser.add_argument("store_dir", nargs="?", help="event store directory (see event_store.py)")
+    parser.add_argument("--self-check", action="store_true",
+                        help="check that repeated exports are counted once and genuine rows kept, then exit")
+    parser.add_argument("--bloom", action="store_true",
+                        help="track seen keys in a fixed-size Bloom filter instead of an exact set")
+    parser.add_argument("--error-rate", type=float, default=BLOOM_ERROR_RATE,
+                        help=f"Bloom filter false-positive rate (default {BLOOM_ERROR_RATE})")
+    parser.add_argument("--chunk-rows", type=int, default=CHUNK_ROWS,
+                        help=f"rows hashed per chunk (default {CHUNK_ROWS})")
+    args = parser.parse_args(argv)
+    if args.self_check:
+        return 0 if self_check() else 1
+    if args.store_dir is None:
+        parser.error("store_dir is required")
+
+    report = check_store(args.store_dir, args.bloom, args.error_rate, args.chunk_rows)
+    print(f"Integrity of {args.store_dir}:")
+    print("\n".join(format_report(report)))
+    top = sorted(report.get("duplicates_by_participant", {}).items(), key=lambda item: -item[1])[:10]
+    for participant, count in top:
+        print(f"    {participant}: {count} duplicate event(s)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""
+Streaming reader/writer for interaction logs.
+
+Participants are written one at a time, so a generator never has to hold the
+whole corpus in memory before serializing it. Two layouts are supported:
+
+  - compact JSON array (default): one participant per line inside "[...]",
+    still loadable with a plain json.load()
+  - JSON Lines (".jsonl"): one participant object per line
+
+Either layout can be gzip (".gz") or zstd (".zst") compressed; the codec is
+picked from the file suffix. zstd requires the optional `zstandard` package.
+
+Usage:
+    python log_stream.py interaction_logs.json interaction_logs.jsonl.gz
+"""
+
+import gzip
+import io
+import json
+import os
+import sys
+
+COMPACT_SEPARATORS = (",", ":")
+READ_CHUNK_SIZE = 1 << 16
+
+
+# ---------------------------------------------------------------------------
+# File handling
+# ---------------------------------------------------------------------------
+
+def _split_suffixes(path):
+    """Return (layout, codec) for a log path such as 'logs.jsonl.gz'."""
+    name = os.path.basename(str(path)).lower()
+    codec = None
+    if name.endswith(".gz"):
+        codec, name = "gzip", name[:-3]
+    elif name.endswith(".zst"):
+        codec, name = "zstd", name[:-4]
+    layout = "jsonl" if name.endswith(".jsonl") else "array"
+    return layout, codec
+
+
+def _zstandard():
+    try:
+        import zstandard
+    except ImportError:
+        raise ImportError(
+            "zstd-compressed logs need the zstandard package. "
+            "Install with: pip install zstandard"
+        )
+    return zstandard
+
+
+def open_log_file(path, mode="r"):
+    """Open a log file in text mode, transparently handling gzip/zstd."""
+    _, codec = _split_suffixes(path)
+    binary_mode = mode[0] + "b"
+    if codec == "gzip":
+        return gzip.open(path, mode[0] + "t", encoding="utf-8")
+    if codec == "zstd":
+        zstd = _zstandard()
+        raw = open(path, binary_mode)
+        if mode[0] in "wa":
+            stream = zstd.ZstdCompressor().stream_writer(raw, closefd=True)
+        else:
+            stream = zstd.ZstdDecompressor().stream_reader(raw, closefd=True)
+        return io.TextIOWrapper(stream, encoding="utf-8")
+    return open(path, mode[0], encoding="utf-8", newline="\n")
+
+
+# ---------------------------------------------------------------------------
+# Writing
+# ---------------------------------------------------------------------------
+
+class LogWriter:
+    """Incrementally write participant log entries to `path`.
+
+    The layout (JSON array or JSON Lines) and compression are inferred from
+    the file suffix unless `layout` is given explicitly. JSON Lines files can
+    be opened with `append=True` to add entries to an existing file.
+    """
+
+    def __init__(self, path, layout=None, append=False):
+        self.path = str(path)
+        self.layout = layout or _split_suffixes(self.path)[0]
+        if self.layout not in ("array", "jsonl"):
+            raise ValueError(f"Unknown log layout: {self.layout!r}")
+        if append and self.layout != "jsonl":
+            raise ValueError("Only JSON Lines logs can be appended to")
+        self.count = 0
+        self._fh = open_log_file(self.path, "a" if append else "w")
+        if self.layout == "array":
+            self._fh.write("[")
+
+    def write(self, participant):
+        line = json.dumps(participant, separators=COMPACT_SEPARATORS, ensure_ascii=False)
+        if self.layout == "array":
+            self._fh.write(("\n" if self.count == 0 else ",\n") + line)
+        else:
+            self._fh.write(line + "\n")
+        self.count += 1
+
+    def flush(self):
+        self._fh.flush()
+
+    def close(self):
+        if self._fh is None:
+            return
+        if self.layout == "array":
+            self._fh.write("\n]\n" if self.count else "]\n")
+        self._fh.close()
+        self._fh = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def write_logs(path, participants, layout=None):
+    """Stream an iterable of participant entries to `path`; return the count."""
+    with LogWriter(path, layout=layout) as writer:
+        for participant in participants:
+            writer.write(participant)
+    return writer.count
+
+
+# The code that shapes the bytes of a written log, fingerprinted by the data
+# generators (see build_cache.py); changes to the readers do not affect it
+WRITER_CODE = (_split_suffixes, open_log_file, LogWriter, write_logs, COMPACT_SEPARATORS)
+
+
+# ---------------------------------------------------------------------------
+# Reading
+# ---------------------------------------------------------------------------
+
+def _iter_jsonl(fh):
+    for line in fh:
+        line = line.strip()
+        if line:
+            yield json.loads(line)
+
+
+def _iter_array(fh):
+    """Yield the elements of a top-level JSON array without loading it whole.
+
+    Works for both the compact layout written by LogWriter and indented
+    files produced by json.dump(..., indent=2).
+    """
+    decoder = json.JSONDecoder()
+    buf, pos, eof = "", 0, False
+    started = False
+
+    while True:
+        # Skip whitespace and the commas between elements
+        while pos < len(buf) and buf[pos] in " \t\r\n,":
+            pos += 1
+        if pos == len(buf):
+            if eof:
+                raise ValueError("Unterminated JSON array in interaction log")
+            buf, pos = fh.read(READ_CHUNK_SIZE), 0
+            eof = not buf
+            continue
+
+        if not started:
+            if buf[pos] != "[":
+                raise ValueError("Interaction log must be a JSON array or JSON Lines")
+            started = True
+            pos += 1
+            continue
+        if buf[pos] == "]":
+            return
+
+        try:
+            obj, end = decoder.raw_decode(buf, pos)
+        except json.JSONDecodeError:
+            if eof:
+                raise
+            # Element straddles the chunk boundary: read more and retry
+            chunk = fh.read(READ_CHUNK_SIZE)
+            eof = not chunk
+            buf, pos = buf[pos:] + chunk, 0
+            continue
+        yield obj
+        pos = end
+
+
+def iter_logs(path, layout=None):
+    """Yield participant entries from `path` one at a time."""
+    layout = layout or _split_suffixes(path)[0]
+    with open_log_file(path, "r") as fh:
+        if layout == "jsonl":
+            yield from _iter_jsonl(fh)
+        else:
+            yield from _iter_array(fh)
+
+
+def read_logs(path, layout=None):
+    """Read every participant entry from `path` into a list."""
+    return list(iter_logs(path, layout=layout))
+
+
+# ---------------------------------------------------------------------------
+# Main
+# ---------------------------------------------------------------------------
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if len(argv) != 2:
+        print(__doc__.strip())
+        return 2
+    src, dst = argv
+    count = write_logs(dst, iter_logs(src))
+    print(f"[OK] Interaction logs: {count} participants -> {dst}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
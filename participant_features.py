@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+Per-participant feature table joining surveys, interaction logs and coding.
+
+One row per post-test respondent (indexed by participant_id) with:
+
+  - sus_score and the scale means the notebook analyses use, scored by
+    scale_scoring.py (UES-SF subscales, ues_overall, nq_mean, ai_mean,
+    immersion_mean for project 1; trust_mean, usefulness_mean, ease_mean,
+    accuracy_mean, privacy_mean for project 2)
+  - log aggregates from the event store (session counters, n_events,
+    n_choices, ..., combined over a participant's sessions by
+    event_store.participant_summary) and page-visit dwell totals from
+    sessions.py, after repeated exports are dropped by log_integrity.py
+  - qualitative code counts of the primary coder (code_<name>, n_segments)
+
+The table is built once and cached as CSV in a features.cache directory next
+to the posttest/ folder, with its column dtypes alongside (the event-store
+counters are nullable Int64, which CSV does not record), so a cached table
+reads back with the dtypes it was built with. The cache is keyed (via
+build_cache.Manifest) by the SHA-256 of every input file and the source of
+the code that builds it, so it is rebuilt only when an input or the feature
+code changes.
+
+Usage:
+    python participant_features.py deliverables/project2
+    python participant_features.py --self-check [PROJECT_DIR ...]
+"""
+
+import json
+import os
+import sys
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+import event_store
+import log_integrity
+import scale_scoring
+import sessions
+from build_cache import Manifest, file_sha256, fingerprint
+
+CACHE_DIR_NAME = "features.cache"
+CACHE_FILE_NAME = "participant_features.csv"
+DTYPES_FILE_NAME = "participant_features.dtypes.json"
+
+POSTTEST_FILE = os.path.join("posttest", "posttest_survey_responses.csv")
+LOGS_FILE = os.path.join("logs", "interaction_logs.json")
+QUALITATIVE_FILE = os.path.join("posttest", "coded_qualitative_data.csv")
+
+# Dwell totals taken over from sessions.participant_dwell()
+DWELL_COLUMNS = ["n_visits", "active_seconds", "idle_seconds", "idle_gaps", "mean_visit_seconds"]
+
+
+# ---------------------------------------------------------------------------
+# Feature blocks
+# ---------------------------------------------------------------------------
+
+def survey_features(posttest):
+    """Every registry scale the survey has items for, indexed by participant_id.
+
+    Scales whose items are not in the survey are skipped, so one table covers
+    both projects.
+    """
+    scores = scale_scoring.score_scales(posttest)
+    scores.index = pd.Index(posttest["participant_id"].astype(str), name="participant_id")
+    return scores
+
+
+def log_features(logs_path):
+    """Session counters, table row counts and dwell totals per participant."""
+    tables, _ = log_integrity.deduplicate(event_store.open_event_store(logs_path))
+    summary = event_store.participant_summary(tables)
+    dwell = sessions.participant_dwell(sessions.build_visits(tables))
+    return summary.join(dwell[DWELL_COLUMNS])
+
+
+def qualitative_features(coded, coder=None):
+    """Code counts per participant for one coder (the first by name by default)."""
+    if coder is None:
+        coder = sorted(coded["coder"].dropna().unique())[0]
+    coded = coded[coded["coder"] == coder]
+    counts = pd.crosstab(coded["participant_id"].astype(str), coded["code"])
+    counts.columns = [f"code_{code}" for code in counts.columns]
+    counts.insert(0, "n_segments", counts.sum(axis=1))
+    counts.index.name = "participant_id"
+    return counts
+
+
+def build_features(posttest_path, logs_path=None, qualitative_path=None):
+    """Join the feature blocks on the post-test respondents."""
+    features = survey_features(pd.read_csv(posttest_path))
+    if logs_path and os.path.exists(logs_path):
+        features = features.join(log_features(logs_path))
+    if qualitative_path and os.path.exists(qualitative_path):
+        counts = qualitative_features(pd.read_csv(qualitative_path))
+        features = features.join(counts)
+        features[counts.columns] = features[counts.columns].fillna(0).astype(np.int64)
+    return features
+
+
+# ---------------------------------------------------------------------------
+# Cache
+# ---------------------------------------------------------------------------
+
+BUILD_CODE = (survey_features, log_features, qualitative_features, build_features, DWELL_COLUMNS,
+              scale_scoring, sessions, log_integrity, event_store.session_summary,
+              event_store.count_by_session, event_store.event_sessions, event_store.participant_summary,
+              event_store.distinct_by_participant, event_store.ADDITIVE_COLUMNS)
+
+
+def inputs_digest(posttest_path, logs_path=None, qualitative_path=None):
+    """Fingerprint of the input file contents and the feature code."""
+    hashes = {}
+    for name, path in (("posttest", posttest_path), ("logs", logs_path), ("qualitative", qualitative_path)):
+        hashes[name] = file_sha256(path) if path and os.path.exists(path) else None
+    return fingerprint(hashes, *BUILD_CODE)
+
+
+def load_participant_features(posttest_path, logs_path=None, qualitative_path=None, cache_dir=None, log=None):
+    """The feature table for these inputs, from the cache when it is fresh.
+
+    `cache_dir` defaults to features.cache next to the posttest/ folder.
+    """
+    posttest_path = str(posttest_path)
+    logs_path = str(logs_path) if logs_path else None
+    qualitative_path = str(qualitative_path) if qualitative_path else None
+    if cache_dir is None:
+        cache_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(posttest_path))), CACHE_DIR_NAME)
+    cache_path = os.path.join(cache_dir, CACHE_FILE_NAME)
+    dtypes_path = os.path.join(cache_dir, DTYPES_FILE_NAME)
+
+    manifest = Manifest(cache_dir)
+    digest = inputs_digest(posttest_path, logs_path, qualitative_path)
+    if manifest.is_fresh("participant_features", digest, cache_path) and os.path.exists(dtypes_path):
+        if log:
+            log(f"[--] Participant features: up to date -> {cache_path}")
+        with open(dtypes_path) as f:
+            dtypes = json.load(f)
+        # round_trip: the cached table reads back bit-identical to the built one
+        return pd.read_csv(cache_path, index_col="participant_id", dtype=dtypes, float_precision="round_trip")
+
+    features = build_features(posttest_path, logs_path, qualitative_path)
+    os.makedirs(cache_dir, exist_ok=True)
+    with open(dtypes_path + ".tmp", "w") as f:
+        json.dump({column: str(dtype) for column, dtype in features.dtypes.items()}, f, indent=1)
+    os.replace(dtypes_path + ".tmp", dtypes_path)
+    features.to_csv(cache_path + ".tmp")
+    os.replace(cache_path + ".tmp", cache_path)
+    manifest.record("participant_features", digest, cache_path)
+    if log:
+        log(f"[OK] Participant features: {features.shape[0]} participants, {features.shape[1]} columns -> {cache_path}")
+    return features
+
+
+def load_project_features(project_dir, cache_dir=None, log=None):
+    """load_participant_features() for the standard layout of a project folder."""
+    return load_participant_features(
+        os.path.join(project_dir, POSTTEST_FILE),
+        os.path.join(project_dir, LOGS_FILE),
+        os.path.join(project_dir, QUALITATIVE_FILE),
+        cache_dir=cache_dir,
+        log=log,
+    )
+
+
+def self_check(project_dirs):
+    """Build each project's table in a fresh cache, then read it back; True when both are equal."""
+    ok = True
+    for project_dir in project_dirs:
+        with tempfile.TemporaryDirectory() as cache_dir:
+            cold = load_project_features(project_dir, cache_dir=cache_dir)
+            warm = load_project_features(project_dir, cache_dir=cache_dir)
+        same = cold.dtypes.equals(warm.dtypes) and cold.equals(warm)
+        ok = ok and same
+        print(f"[{'OK' if same else '--'}] {project_dir}: cached table reads back with the built dtypes and values")
+    return ok
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if argv[:1] == ["--self-check"]:
+        project_dirs = argv[1:] or [os.path.join(os.path.dirname(os.path.abspath(__file__)), "deliverables", p)
+                                    for p in ("project1", "project2")]
+        return 0 if self_check(project_dirs) else 1
+    if len(argv) != 1:
+        print(__doc__.strip())
+        return 2
+    features = load_project_features(argv[0], log=print)
+    print(features.describe().T.round(2).to_string())
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
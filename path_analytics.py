@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+"""
+Funnel and path analytics for Gemini Quest (project 1) sessions.
+
+Every session's page path (the visit table from sessions.py) is encoded as
+integers, position in PAGES first and pages outside it after, and kept as
+CSR-style (offsets, codes) arrays; all counts come from sparse matrices or
+integer keys over those arrays, so there is no per-session Python loop:
+
+  - chapter_funnel(): sessions reaching each stage of PAGES, step conversion
+    and drop-off (the furthest stage a session reached is where it stopped)
+  - transition_ngrams(): counts of n consecutive page visits within a session
+  - choice_frequencies() / branch_paths(): how often each CHOICE_TEXTS option
+    was picked per chapter, and how often each full choice path occurs
+
+Usage:
+    python path_analytics.py interaction_logs.store [--ngram N]
+"""
+
+import argparse
+import sys
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+from event_store import load_event_store
+from generate_p1_data import CHOICE_TEXTS, PAGES
+from sessions import build_visits
+
+FUNNEL_STAGES = tuple(PAGES)
+CHAPTERS = tuple(CHOICE_TEXTS)
+CHOICE_IDS = {text: cid for options in CHOICE_TEXTS.values() for cid, text in options}
+
+
+# ---------------------------------------------------------------------------
+# Integer-encoded paths
+# ---------------------------------------------------------------------------
+
+def page_sequences(visits, stages=FUNNEL_STAGES):
+    """Integer-encoded page path of every session in a visit table.
+
+    Returns (sessions, offsets, codes, labels): the path of sessions[i] is
+    codes[offsets[i]:offsets[i + 1]], and codes index into labels, which lists
+    `stages` first and any other page seen after them.
+    """
+    categories = list(visits["page"].cat.categories)
+    labels = list(stages) + [page for page in categories if page not in stages]
+    lookup = np.append(pd.Index(labels).get_indexer(categories), -1)
+    codes = lookup[visits["page"].cat.codes.to_numpy()]
+
+    session = visits["session"].to_numpy()
+    starts = np.flatnonzero(np.diff(session, prepend=-1))
+    offsets = np.append(starts, len(session))
+    return session[starts], offsets, codes, labels
+
+
+def path_rows(offsets):
+    """Row (session position) of every element of the encoded paths."""
+    return np.repeat(np.arange(len(offsets) - 1), np.diff(offsets))
+
+
+def stage_counts(offsets, codes, n_stages):
+    """Sparse sessions x pages matrix of visit counts (columns >= n_stages dropped)."""
+    keep = (codes >= 0) & (codes < n_stages)
+    counts = sparse.csr_matrix(
+        (np.ones(keep.sum(), dtype=np.int32), (path_rows(offsets)[keep], codes[keep])),
+        shape=(len(offsets) - 1, n_stages),
+    )
+    counts.sum_duplicates()
+    counts.sort_indices()
+    return counts
+
+
+# ---------------------------------------------------------------------------
+# Funnel
+# ---------------------------------------------------------------------------
+
+def chapter_funnel(visits, stages=FUNNEL_STAGES):
+    """Sessions reaching, visiting and stopping at each stage of the funnel.
+
+    A session reaches a stage when its furthest visited stage is at or after
+    it, so skipped pages still count as passed through. `stopped_here` are the
+    sessions whose furthest stage it is; at the final stage those completed.
+    """
+    _, offsets, codes, _ = page_sequences(visits, stages)
+    counts = stage_counts(offsets, codes, len(stages))
+
+    # Columns are sorted within each row, so a row's last entry is its furthest stage
+    nonempty = np.diff(counts.indptr) > 0
+    furthest = counts.indices[counts.indptr[1:][nonempty] - 1]
+    stopped = np.bincount(furthest, minlength=len(stages))
+    reached = stopped[::-1].cumsum()[::-1]
+    visited = np.bincount(counts.indices, minlength=len(stages))
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        previous = np.r_[reached[0], reached[:-1]]
+        funnel = pd.DataFrame({
+            "stage": list(stages),
+            "reached": reached,
+            "visited": visited,
+            "pct_of_start": reached / reached[0] * 100 if reached[0] else np.nan,
+            "step_conversion": reached / previous,
+            "stopped_here": stopped,
+            "drop_off_rate": np.append(stopped[:-1] / reached[:-1], np.nan),
+        })
+    return funnel
+
+
+# ---------------------------------------------------------------------------
+# Page transitions
+# ---------------------------------------------------------------------------
+
+def transition_matrix(visits, stages=FUNNEL_STAGES):
+    """Sparse from-page x to-page counts of consecutive visits; returns (matrix, labels)."""
+    _, offsets, codes, labels = page_sequences(visits, stages)
+    rows = path_rows(offsets)
+    same = rows[1:] == rows[:-1]
+    matrix = sparse.csr_matrix(
+        (np.ones(same.sum(), dtype=np.int64), (codes[:-1][same], codes[1:][same])),
+        shape=(len(labels), len(labels)),
+    )
+    matrix.sum_duplicates()
+    return matrix, labels
+
+
+def transition_ngrams(visits, n=2, stages=FUNNEL_STAGES):
+    """Counts of every run of `n` consecutive page visits within one session.
+
+    Each n-gram is packed into one int64 key (base = number of pages), counted
+    with np.unique and unpacked into step_1 ... step_n columns.
+    """
+    if n < 1:
+        raise ValueError("n must be at least 1")
+    _, offsets, codes, labels = page_sequences(visits, stages)
+    base = len(labels)
+    steps = [f"step_{i + 1}" for i in range(n)]
+    windows = len(codes) - n + 1
+    if windows <= 0 or base == 0:
+        return pd.DataFrame({**{s: pd.Categorical([], categories=labels) for s in steps}, "count": []})
+    if base ** n >= 2 ** 63:
+        raise ValueError(f"{n}-grams over {base} pages do not fit an int64 key")
+
+    rows = path_rows(offsets)
+    within = rows[:windows] == rows[n - 1:]
+    keys = np.zeros(windows, dtype=np.int64)
+    for i in range(n):
+        keys = keys * base + codes[i:i + windows]
+    keys, counts = np.unique(keys[within], return_counts=True)
+
+    digits = keys[:, None] // base ** np.arange(n - 1, -1, -1, dtype=np.int64) % base
+    ngrams = pd.DataFrame({s: pd.Categorical.from_codes(digits[:, i], categories=labels) for i, s in enumerate(steps)})
+    ngrams["count"] = counts
+    return ngrams.sort_values("count", ascending=False, kind="stable", ignore_index=True)
+
+
+# ---------------------------------------------------------------------------
+# Narrative choices
+# ---------------------------------------------------------------------------
+
+def choice_frequencies(choices):
+    """Times each choice was picked per chapter, with its share of the chapter."""
+    chapter = choices["chapter"].cat.codes.to_numpy()
+    choice = choices["choice_text"].cat.codes.to_numpy()
+    keep = (chapter >= 0) & (choice >= 0)
+    counts = sparse.coo_matrix(
+        (np.ones(keep.sum(), dtype=np.int64), (chapter[keep], choice[keep])),
+        shape=(len(choices["chapter"].cat.categories), len(choices["choice_text"].cat.categories)),
+    ).tocsr()
+    counts.sum_duplicates()
+    counts = counts.tocoo()
+    chapter_totals = np.asarray(counts.sum(axis=1)).ravel()
+
+    texts = choices["choice_text"].cat.categories
+    frequencies = pd.DataFrame({
+        "chapter": pd.Categorical.from_codes(counts.row, categories=choices["chapter"].cat.categories),
+        "choice_id": [CHOICE_IDS.get(text) for text in texts[counts.col]],
+        "choice_text": texts[counts.col],
+        "count": counts.data,
+        "share": counts.data / chapter_totals[counts.row],
+    })
+    return frequencies.sort_values(["chapter", "count"], ascending=[True, False], ignore_index=True)
+
+
+def branch_paths(choices, chapters=CHAPTERS):
+    """How often each full path of choices (one per chapter) was taken.
+
+    Participants are rows of a participants x chapters grid of choice codes
+    (-1 where a chapter has no choice); each row is packed into one int64 key
+    like the page n-grams, so identical keys are one branch path.
+    """
+    participant = choices["participant"].cat.codes.to_numpy()
+    chapter = pd.Index(chapters).get_indexer(choices["chapter"].cat.categories)
+    chapter = np.append(chapter, -1)[choices["chapter"].cat.codes.to_numpy()]
+    choice = choices["choice_text"].cat.codes.to_numpy()
+    keep = (participant >= 0) & (chapter >= 0)
+
+    grid = np.full((len(choices["participant"].cat.categories), len(chapters)), -1, dtype=np.int64)
+    grid[participant[keep], chapter[keep]] = choice[keep]
+    grid = grid[(grid >= 0).any(axis=1)]
+
+    base = len(choices["choice_text"].cat.categories) + 1
+    if base ** len(chapters) >= 2 ** 63:
+        raise ValueError(f"choice paths over {len(chapters)} chapters do not fit an int64 key")
+    keys = np.zeros(len(grid), dtype=np.int64)
+    for i in range(len(chapters)):
+        keys = keys * base + grid[:, i] + 1
+    keys, counts = np.unique(keys, return_counts=True)
+    paths = keys[:, None] // base ** np.arange(len(chapters) - 1, -1, -1, dtype=np.int64) % base - 1
+
+    # Label choices by their CHOICE_TEXTS id; free-text choices keep their text
+    labels = [CHOICE_IDS.get(text, text) for text in choices["choice_text"].cat.categories]
+    branches = pd.DataFrame({
+        ch: pd.Categorical.from_codes(paths[:, i], categories=labels) for i, ch in enumerate(chapters)
+    })
+    branches["count"] = counts
+    branches["share"] = counts / max(len(grid), 1)
+    return branches.sort_values("count", ascending=False, kind="stable", ignore_index=True)
+
+
+# ---------------------------------------------------------------------------
+# Main
+# ---------------------------------------------------------------------------
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Funnel, transition and choice-path analytics for project 1 logs.")
+    parser.add_argument("store_dir", help="event store directory (see event_store.py)")
+    parser.add_argument("--ngram", type=int, default=3, help="length of the page n-grams to count (default 3)")
+    args = parser.parse_args(argv)
+
+    tables = load_event_store(args.store_dir, ["participants", "events", "choices"])
+    visits = build_visits(tables)
+    print("Chapter funnel:")
+    print(chapter_funnel(visits).round(3).to_string(index=False))
+    print(f"\nTop page {args.ngram}-grams:")
+    print(transition_ngrams(visits, args.ngram).head(10).to_string(index=False))
+    print("\nChoices per chapter:")
+    print(choice_frequencies(tables["choices"]).round(3).to_string(index=False))
+    print("\nTop choice paths:")
+    print(branch_paths(tables["choices"]).head(10).round(3).to_string(index=False))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
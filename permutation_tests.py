@@ -0,0 +1,270 @@
+#!/usr/bin/env python3
+"""
+Permutation tests for the notebook's hypothesis tests.
+
+Each test rebuilds the null distribution of its statistic by reassigning the
+observations: group labels for the two-group and k-group tests, the pairing
+of x with y for correlations. Reassignments are drawn as batched index
+matrices (one row per permutation), and the statistic of a whole batch is a
+matrix product:
+
+  two_group_test()    Student t (or Welch t / mean difference): group sums
+                      are label-indicator matrix @ x
+  k_group_test()      one-way ANOVA F: group sums are one-hot(labels) @ x
+  correlation_test()  Pearson or Spearman r: standardized y[perm] @ x
+
+Batches run on a thread pool, each with its own random stream spawned from
+`seed`, so results are reproducible and do not depend on the number of
+workers. When the number of distinct reassignments is at most `max_exact`,
+all of them are enumerated instead and the p-value is exact; otherwise it is
+the Monte-Carlo estimate (hits + 1) / (permutations + 1). Blocks hold at most
+BLOCK_PERMUTATIONS reassignments and BLOCK_CELLS reassignments x
+observations, so memory per block stays bounded however large the sample.
+
+Two-sided p-values count the reassignments with |T| >= |T_obs|. This
+differs from scipy.stats.permutation_test, which doubles the smaller
+one-sided p-value, whenever the null distribution is not symmetric about 0
+(the t statistic of unequal groups, correlations), so the two p-values
+differ slightly.
+
+Each test returns a dict: statistic, pvalue, permutations, exact.
+
+Usage:
+    python permutation_tests.py deliverables/project2/posttest/posttest_survey_responses.csv X Y
+"""
+
+import argparse
+import math
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from itertools import combinations, permutations as all_orders
+
+import numpy as np
+import pandas as pd
+from scipy.stats import rankdata
+
+from scale_scoring import score_scales
+
+PERMUTATIONS = 100_000
+BLOCK_PERMUTATIONS = 10_000
+BLOCK_CELLS = 1 << 24  # reassignments x observations per block
+MAX_EXACT = 100_000
+ALTERNATIVES = ("two-sided", "greater", "less")
+
+
+# ---------------------------------------------------------------------------
+# Engine
+# ---------------------------------------------------------------------------
+
+def random_orders(rng, size, n):
+    """`size` random permutations of range(n), one per row."""
+    return rng.permuted(np.tile(np.arange(n, dtype=np.int32), (size, 1)), axis=1)
+
+
+def label_arrangements(sizes):
+    """Every distinct assignment of sum(sizes) positions to groups of these sizes (codes, one row each)."""
+    rows = [np.full(sum(sizes), len(sizes) - 1, dtype=np.int8)]
+    for group, size in enumerate(sizes[:-1]):
+        expanded = []
+        for row in rows:
+            free = np.flatnonzero(row == len(sizes) - 1)
+            for chosen in combinations(free, size):
+                new = row.copy()
+                new[list(chosen)] = group
+                expanded.append(new)
+        rows = expanded
+    return np.array(rows)
+
+
+def arrangement_count(sizes):
+    return math.factorial(sum(sizes)) // math.prod(math.factorial(s) for s in sizes)
+
+
+def null_distribution(batch_statistic, draw, permutations, seed=0, workers=None, block=BLOCK_PERMUTATIONS):
+    """Statistic of `permutations` random reassignments, computed in parallel blocks.
+
+    draw(rng, size) returns a batch of reassignments; batch_statistic maps it
+    to one statistic per row.
+    """
+    sizes = [min(block, permutations - lo) for lo in range(0, permutations, block)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+
+    def run(size, block_seed):
+        return batch_statistic(draw(np.random.default_rng(block_seed), size))
+
+    with ThreadPoolExecutor(max_workers=workers or os.cpu_count()) as pool:
+        return np.concatenate(list(pool.map(run, sizes, seeds)))
+
+
+def enumerated_distribution(batch_statistic, arrangements, block=BLOCK_PERMUTATIONS):
+    """Statistic of every row of `arrangements`."""
+    return np.concatenate([batch_statistic(arrangements[lo:lo + block])
+                           for lo in range(0, len(arrangements), block)])
+
+
+def p_value(observed, distribution, alternative="two-sided", exact=False):
+    """Share of the null distribution at least as extreme as `observed`.
+
+    Two-sided tests count |T| >= |observed| (not twice the smaller tail).
+    """
+    if alternative not in ALTERNATIVES:
+        raise ValueError(f"alternative must be one of {ALTERNATIVES}")
+    # Tolerance so that reassignments tying the observed value count as extreme
+    eps = 1e-12 * max(1.0, abs(observed))
+    if alternative == "two-sided":
+        hits = (np.abs(distribution) >= abs(observed) - eps).sum()
+    elif alternative == "greater":
+        hits = (distribution >= observed - eps).sum()
+    else:
+        hits = (distribution <= observed + eps).sum()
+    valid = np.isfinite(distribution).sum()
+    return hits / valid if exact else (hits + 1) / (valid + 1)
+
+
+def block_size(n):
+    """Reassignments per block for `n` observations."""
+    return max(1, min(BLOCK_PERMUTATIONS, BLOCK_CELLS // max(n, 1)))
+
+
+def run_test(batch_statistic, observed, sizes_or_n, alternative, permutations, seed, workers, max_exact, groups=True):
+    """Exact or Monte-Carlo p-value of `observed` under reassignment."""
+    if groups:
+        labels = np.repeat(np.arange(len(sizes_or_n), dtype=np.int8), sizes_or_n)
+        block = block_size(len(labels))
+        count = arrangement_count(sizes_or_n)
+        exact = count <= max_exact
+        if exact:
+            distribution = enumerated_distribution(batch_statistic, label_arrangements(list(sizes_or_n)), block)
+        else:
+            draw = lambda rng, size: labels[random_orders(rng, size, len(labels))]
+            distribution = null_distribution(batch_statistic, draw, permutations, seed, workers, block)
+    else:
+        n = sizes_or_n
+        block = block_size(n)
+        exact = math.factorial(n) <= max_exact
+        if exact:
+            distribution = enumerated_distribution(batch_statistic, np.array(list(all_orders(range(n))), dtype=np.int32),
+                                                   block)
+        else:
+            draw = lambda rng, size: random_orders(rng, size, n)
+            distribution = null_distribution(batch_statistic, draw, permutations, seed, workers, block)
+    return {
+        "statistic": float(observed),
+        "pvalue": float(p_value(observed, distribution, alternative, exact)),
+        "permutations": len(distribution),
+        "exact": exact,
+    }
+
+
+# ---------------------------------------------------------------------------
+# Tests
+# ---------------------------------------------------------------------------
+
+def _values(x):
+    values = np.asarray(x, dtype=np.float64)
+    return values[~np.isnan(values)]
+
+
+def two_group_test(a, b, statistic="t", alternative="two-sided", permutations=PERMUTATIONS,
+                   seed=0, workers=None, max_exact=MAX_EXACT):
+    """Permutation test of a difference between two groups.
+
+    `statistic` is "t" (Student), "welch" or "mean_diff"; with equal group
+    sizes fixed, Student t and the mean difference give the same p-value.
+    """
+    a, b = _values(a), _values(b)
+    x = np.concatenate([a, b])
+    n_a, n_b = len(a), len(b)
+    total, total_sq = x.sum(), (x * x).sum()
+    squares = x * x
+
+    def batch_statistic(labels):
+        in_a = (labels == 0).astype(np.float64)
+        sum_a = in_a @ x
+        mean_a, mean_b = sum_a / n_a, (total - sum_a) / n_b
+        diff = mean_a - mean_b
+        if statistic == "mean_diff":
+            return diff
+        sq_a = in_a @ squares
+        ss_a = sq_a - sum_a ** 2 / n_a
+        ss_b = (total_sq - sq_a) - (total - sum_a) ** 2 / n_b
+        with np.errstate(divide="ignore", invalid="ignore"):
+            if statistic == "welch":
+                return diff / np.sqrt(ss_a / (n_a - 1) / n_a + ss_b / (n_b - 1) / n_b)
+            pooled = (ss_a + ss_b) / (n_a + n_b - 2)
+            return diff / np.sqrt(pooled * (1 / n_a + 1 / n_b))
+
+    if statistic not in ("t", "welch", "mean_diff"):
+        raise ValueError(f"unknown statistic {statistic!r}")
+    observed = batch_statistic(np.repeat(np.array([0, 1], dtype=np.int8), [n_a, n_b])[None, :])[0]
+    return run_test(batch_statistic, observed, (n_a, n_b), alternative, permutations, seed, workers, max_exact)
+
+
+def k_group_test(groups, permutations=PERMUTATIONS, seed=0, workers=None, max_exact=MAX_EXACT):
+    """Permutation test of the one-way ANOVA F statistic (upper tail)."""
+    groups = [_values(g) for g in groups]
+    sizes = np.array([len(g) for g in groups])
+    x = np.concatenate(groups)
+    n, k = len(x), len(groups)
+    correction = x.sum() ** 2 / n
+    ss_total = (x * x).sum() - correction
+
+    def batch_statistic(labels):
+        sums = np.stack([(labels == g).astype(np.float64) @ x for g in range(k)], axis=1)
+        ss_between = (sums ** 2 / sizes).sum(axis=1) - correction
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return (ss_between / (k - 1)) / ((ss_total - ss_between) / (n - k))
+
+    observed = batch_statistic(np.repeat(np.arange(k, dtype=np.int8), sizes)[None, :])[0]
+    return run_test(batch_statistic, observed, tuple(sizes), "greater", permutations, seed, workers, max_exact)
+
+
+def correlation_test(x, y, method="pearson", alternative="two-sided", permutations=PERMUTATIONS,
+                     seed=0, workers=None, max_exact=MAX_EXACT):
+    """Permutation test of a Pearson or Spearman correlation (pairs with a NaN are dropped)."""
+    x, y = np.asarray(x, dtype=np.float64), np.asarray(y, dtype=np.float64)
+    keep = ~(np.isnan(x) | np.isnan(y))
+    x, y = x[keep], y[keep]
+    if method == "spearman":
+        x, y = rankdata(x), rankdata(y)
+    elif method != "pearson":
+        raise ValueError(f"unknown method {method!r}")
+    # Centered, unit-length vectors: r is their dot product, whatever the order of y
+    x, y = x - x.mean(), y - y.mean()
+    with np.errstate(divide="ignore", invalid="ignore"):
+        x, y = x / np.sqrt((x * x).sum()), y / np.sqrt((y * y).sum())
+
+    def batch_statistic(orders):
+        return y[orders] @ x
+
+    observed = float(y @ x)
+    return run_test(batch_statistic, observed, len(x), alternative, permutations, seed, workers, max_exact, groups=False)
+
+
+def format_result(result):
+    kind = "exact" if result["exact"] else f"{result['permutations']:,} permutations"
+    return f"permutation p = {result['pvalue']:.4f} ({kind})"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Permutation test of the correlation of two columns or scales of a survey CSV.")
+    parser.add_argument("csv", help="table with the two columns")
+    parser.add_argument("x")
+    parser.add_argument("y")
+    parser.add_argument("--method", choices=["pearson", "spearman"], default="pearson")
+    parser.add_argument("--permutations", type=int, default=PERMUTATIONS)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    table = pd.read_csv(args.csv)
+    # Scale scores (trust_mean, sus_score, ...) can be named like any column
+    table = table.join(score_scales(table))
+    result = correlation_test(table[args.x], table[args.y], args.method,
+                              permutations=args.permutations, seed=args.seed)
+    print(f"{args.method} r = {result['statistic']:.3f}, {format_result(result)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
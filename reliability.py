@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+"""
+Internal consistency of the post-test scales, with bootstrap intervals.
+
+All items of the requested scales (scale_scoring.SCALE_REGISTRY, reverse-keyed
+items recoded to low + high - x) form one respondents x items matrix, and
+every statistic is read off its covariance matrix:
+
+  - Cronbach's alpha: k / (k - 1) * (1 - sum of item variances / scale variance)
+  - McDonald's omega (total): (sum of loadings)^2 / scale variance, with the
+    loadings of a one-factor principal-axis solution on the scale's item
+    covariances
+  - corrected item-total correlations and alpha if the item is deleted
+
+Bootstrap replicates never copy the data: a replicate is a row of resampling
+counts w (how often each respondent was drawn), so its item sums and cross
+products are w @ X and w @ (X x X). A block of replicates is one matrix
+product against those precomputed arrays, giving a covariance matrix per
+replicate, and all statistics are then computed for the whole block at once.
+Blocks run on a thread pool (numpy releases the GIL), each with its own
+random stream, so the intervals do not depend on the number of workers.
+Intervals are percentile intervals.
+
+Respondents with a missing item on any of the scales are left out.
+
+Usage:
+    python reliability.py deliverables/project1/posttest/posttest_survey_responses.csv [--boot 10000]
+"""
+
+import argparse
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from scale_scoring import SCALE_REGISTRY, available_scales, item_matrix, scale_spec
+
+BLOCK_REPLICATES = 2500
+BLOCK_CELLS = 1 << 24  # replicates x respondents per block
+FACTOR_ITERATIONS = 300
+FACTOR_TOLERANCE = 1e-5
+
+
+def scale_items(frame, names=None, registry=None):
+    """Recoded item matrix of the scales and each scale's item positions in it.
+
+    Returns (X, item_columns, members) with X float64 (complete rows only) and
+    members[name] the column indices of that scale's items.
+    """
+    registry = SCALE_REGISTRY if registry is None else registry
+    names = available_scales(frame.columns, registry) if names is None else list(names)
+    specs = {name: scale_spec(registry[name]) for name in names}
+    item_columns = list(dict.fromkeys(item for spec in specs.values() for item in spec["items"]))
+    X = item_matrix(frame, item_columns).astype(np.float64)
+    X = X[(X >= 0).all(axis=1)]
+    # Recode reverse-keyed items once; an item is reverse-keyed in every scale that uses it
+    for spec in specs.values():
+        for item in spec["reverse"]:
+            j = item_columns.index(item)
+            X[:, j] = spec["low"] + spec["high"] - X[:, j]
+    position = {item: j for j, item in enumerate(item_columns)}
+    members = {name: np.array([position[item] for item in spec["items"]]) for name, spec in specs.items()}
+    return X, item_columns, members
+
+
+# ---------------------------------------------------------------------------
+# Statistics from covariance matrices (any leading batch dimensions)
+# ---------------------------------------------------------------------------
+
+def cronbach_alpha(cov):
+    """Alpha of the items of a (..., k, k) covariance matrix."""
+    k = cov.shape[-1]
+    total = cov.sum(axis=(-2, -1))
+    item_vars = np.trace(cov, axis1=-2, axis2=-1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(total > 0, k / (k - 1) * (1 - item_vars / total), np.nan)
+
+
+def one_factor_loadings(cov, iterations=FACTOR_ITERATIONS, tolerance=FACTOR_TOLERANCE):
+    """Loadings of a one-factor principal-axis solution, (..., k, k) -> (..., k).
+
+    Communalities start at each item's variance times its largest squared
+    correlation. Each iteration takes one power step towards the first
+    eigenvector of the reduced matrix (covariances with the communalities on
+    the diagonal) and refits the communalities from it, which converges to the
+    principal-axis solution without a full eigendecomposition per step. A
+    matrix drops out once no communality moves by more than `tolerance` x its
+    variance, so only the slow ones keep iterating.
+    """
+    shape, k = cov.shape[:-2], cov.shape[-1]
+    cov = cov.reshape(-1, k, k)
+    eye = np.eye(k, dtype=bool)
+    variances = np.diagonal(cov, axis1=-2, axis2=-1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        scale = 1 / np.sqrt(variances)
+        corr = np.nan_to_num(cov * scale[:, :, None] * scale[:, None, :])
+    communality = variances * np.where(eye, 0.0, corr ** 2).max(axis=-1)
+    _, vectors = np.linalg.eigh(np.where(eye, communality[:, None, :], cov))
+    vector = vectors[:, :, -1]
+    loadings = np.zeros_like(vector)
+
+    active = np.arange(len(cov))
+    off_diagonal = np.where(eye, 0.0, cov)
+    for _ in range(iterations):
+        v, h, var = vector[active], communality[active], variances[active]
+        product = (off_diagonal[active] @ v[:, :, None])[:, :, 0] + h * v
+        eigenvalue = (v * product).sum(axis=-1)
+        norm = np.sqrt((product * product).sum(axis=-1, keepdims=True))
+        v = product / np.where(norm > 0, norm, 1.0)
+        fit = v * np.sqrt(np.clip(eigenvalue, 0, None))[:, None]
+        new = np.minimum(fit ** 2, var)
+        vector[active], communality[active], loadings[active] = v, new, fit
+        active = active[(np.abs(new - h) > tolerance * var).any(axis=-1)]
+        if not len(active):
+            break
+    # Sign of a factor is arbitrary; make its loadings mostly positive
+    loadings *= np.where(loadings.sum(axis=-1) < 0, -1.0, 1.0)[:, None]
+    return loadings.reshape(shape + (k,))
+
+
+def mcdonald_omega(cov, iterations=FACTOR_ITERATIONS, tolerance=FACTOR_TOLERANCE):
+    """Omega total of the items of a (..., k, k) covariance matrix."""
+    total = cov.sum(axis=(-2, -1))
+    loadings = one_factor_loadings(cov, iterations, tolerance)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(total > 0, loadings.sum(axis=-1) ** 2 / total, np.nan)
+
+
+def item_total(cov):
+    """Corrected item-total correlations and alpha if deleted, (..., k, k) -> 2 x (..., k)."""
+    k = cov.shape[-1]
+    variances = np.diagonal(cov, axis1=-2, axis2=-1)
+    total = cov.sum(axis=(-2, -1))[..., None]
+    with_rest = cov.sum(axis=-1) - variances
+    rest_var = total - 2 * cov.sum(axis=-1) + variances
+    with np.errstate(divide="ignore", invalid="ignore"):
+        r = with_rest / np.sqrt(variances * rest_var)
+        item_vars = np.trace(cov, axis1=-2, axis2=-1)[..., None] - variances
+        deleted = (k - 1) / (k - 2) * (1 - item_vars / rest_var) if k > 2 else np.full_like(r, np.nan)
+    return r, deleted
+
+
+def covariance(X):
+    return np.cov(X, rowvar=False).reshape(X.shape[1], X.shape[1])
+
+
+# ---------------------------------------------------------------------------
+# Bootstrap
+# ---------------------------------------------------------------------------
+
+def cross_products(X):
+    """Per-respondent item cross products, n x (p * p)."""
+    return (X[:, :, None] * X[:, None, :]).reshape(len(X), -1)
+
+
+def bootstrap_covariances(X, products, counts):
+    """Covariance matrix of each replicate, given its resampling counts (B x n)."""
+    n, p = X.shape
+    sums = counts @ X
+    second = (counts @ products).reshape(-1, p, p)
+    return (second - sums[:, :, None] * sums[:, None, :] / n) / (n - 1)
+
+
+def bootstrap_block(X, products, members, replicates, seed):
+    """Alpha and omega of every scale for one block of replicates."""
+    rng = np.random.default_rng(seed)
+    n = len(X)
+    draws = rng.integers(0, n, size=(replicates, n)) + np.arange(replicates)[:, None] * n
+    counts = np.bincount(draws.ravel(), minlength=replicates * n).reshape(replicates, n).astype(np.float64)
+    cov = bootstrap_covariances(X, products, counts)
+    out = {}
+    for name, idx in members.items():
+        sub = cov[:, idx[:, None], idx[None, :]]
+        out[name] = (cronbach_alpha(sub), mcdonald_omega(sub))
+    return out
+
+
+def bootstrap(X, members, n_boot, seed=0, workers=None, block=BLOCK_REPLICATES):
+    """Bootstrap alpha and omega, {scale: (alphas, omegas)} with n_boot values each."""
+    block = max(1, min(block, BLOCK_CELLS // max(len(X), 1)))
+    sizes = [min(block, n_boot - lo) for lo in range(0, n_boot, block)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    products = cross_products(X)
+    with ThreadPoolExecutor(max_workers=workers or os.cpu_count()) as pool:
+        blocks = list(pool.map(lambda args: bootstrap_block(X, products, members, *args), zip(sizes, seeds)))
+    return {
+        name: tuple(np.concatenate([b[name][i] for b in blocks]) for i in range(2))
+        for name in members
+    }
+
+
+# ---------------------------------------------------------------------------
+# Tables
+# ---------------------------------------------------------------------------
+
+def reliability(frame, names=None, n_boot=0, ci=0.95, seed=0, workers=None, registry=None):
+    """Alpha and omega per scale, with percentile bootstrap intervals if n_boot > 0."""
+    registry = SCALE_REGISTRY if registry is None else registry
+    X, _, members = scale_items(frame, names, registry)
+    cov = covariance(X)
+    rows = []
+    for name, idx in members.items():
+        sub = cov[np.ix_(idx, idx)]
+        r, _ = item_total(sub)
+        rows.append({"scale": name, "label": registry[name]["label"], "n": len(X), "n_items": len(idx),
+                     "alpha": float(cronbach_alpha(sub)), "omega": float(mcdonald_omega(sub)),
+                     "min_item_total_r": float(np.nanmin(r))})
+    table = pd.DataFrame(rows).set_index("scale")
+    if n_boot:
+        replicates = bootstrap(X, members, n_boot, seed, workers)
+        tail = (1 - ci) / 2 * 100
+        for stat, i in (("alpha", 0), ("omega", 1)):
+            bounds = np.array([np.nanpercentile(replicates[name][i], [tail, 100 - tail]) for name in table.index])
+            table.insert(table.columns.get_loc(stat) + 1, f"{stat}_lo", bounds[:, 0])
+            table.insert(table.columns.get_loc(stat) + 2, f"{stat}_hi", bounds[:, 1])
+    return table
+
+
+def item_statistics(frame, names=None, registry=None):
+    """Corrected item-total correlation and alpha if deleted, one row per (scale, item)."""
+    X, item_columns, members = scale_items(frame, names, registry)
+    cov = covariance(X)
+    frames = []
+    for name, idx in members.items():
+        r, deleted = item_total(cov[np.ix_(idx, idx)])
+        frames.append(pd.DataFrame({"scale": name, "item": [item_columns[j] for j in idx],
+                                    "item_total_r": r, "alpha_if_deleted": deleted}))
+    return pd.concat(frames, ignore_index=True)
+
+
+def alpha_quality(alpha):
+    """Conventional label of an alpha value (George & Mallery, 2003)."""
+    if alpha >= 0.9:
+        return "Excellent"
+    if alpha >= 0.8:
+        return "Good"
+    if alpha >= 0.7:
+        return "Acceptable"
+    return "Questionable" if alpha >= 0.6 else "Poor"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Cronbach's alpha and McDonald's omega of the post-test scales.")
+    parser.add_argument("responses", help="post-test survey responses CSV")
+    parser.add_argument("--boot", type=int, default=10000, help="bootstrap replicates (default 10000, 0 for none)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    responses = pd.read_csv(args.responses)
+    print(reliability(responses, n_boot=args.boot, seed=args.seed).round(3).to_string())
+    print()
+    print(item_statistics(responses).round(3).to_string(index=False))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,353 @@
+#!/usr/bin/env python3
+"""
+Persisted store of computed statistics, keyed by analysis and input hash.
+
+Each analysis cell of the notebook writes its results under a dotted name
+("p1.descriptives", "p2.h1", "p1.irr.theme") together with the digest of
+the data it was computed from. Results are typed: numbers, booleans,
+strings, dicts of those, and tables (DataFrames, with their attrs), so a
+value read back is the value that was written.
+
+ResultsStore.analysis() runs an analysis only when its inputs changed: the
+digest covers the data passed to it (hashed with pd.util.hash_pandas_object,
+not its repr), every other argument, and the source of the module that
+defines the analysis function together with every project module it uses,
+directly or through another one (reliability.py -> scale_scoring.py, so a
+change to SCALE_REGISTRY recomputes the reliabilities). The expensive
+bootstrap and permutation analyses are therefore computed once per dataset,
+not on every run.
+
+The paper draft is rendered from the store, never from the data:
+paper_template.md holds the text with {{name.key:format}} placeholders,
+e.g. {{p1.descriptives.sus_score.mean:.1f}} (row sus_score, column mean of
+the "p1.descriptives" table) or {{p1.h2.p:p}} (an APA p-value,
+"p = .418" / "p < .001"); a boolean takes "yes-text|no-text" as its format.
+
+Entries are kept across runs (they are the cache of analysis()), so a
+store may hold results of an analysis that was skipped this run. The
+store tracks the analyses recorded or confirmed fresh since it was opened
+(ResultsStore.current); the notebook renders from those only, and a
+placeholder with no current result renders as a visible "n/a".
+
+Usage:
+    python results_store.py deliverables/report/analysis_results.json
+    python results_store.py deliverables/report/analysis_results.json --render -o paper.md
+"""
+
+import argparse
+import hashlib
+import inspect
+import json
+import os
+import re
+import sys
+
+import numpy as np
+import pandas as pd
+
+from build_cache import fingerprint
+
+STORE_NAME = "analysis_results.json"
+PROJECT_DIR = os.path.dirname(os.path.abspath(__file__))
+PAPER_TEMPLATE = os.path.join(PROJECT_DIR, "paper_template.md")
+_MISSING = object()
+NOT_AVAILABLE = "n/a"
+PLACEHOLDER = re.compile(r"\{\{\s*([^{}:]+?)\s*(?::([^{}]*))?\}\}")
+
+
+# ---------------------------------------------------------------------------
+# Input digests
+# ---------------------------------------------------------------------------
+
+def _project_module(obj):
+    """The module of this project that `obj` is or was defined in, else None."""
+    module = obj if inspect.ismodule(obj) else inspect.getmodule(obj)
+    path = getattr(module, "__file__", None)
+    if path and path.endswith(".py") and os.path.dirname(os.path.abspath(path)) == PROJECT_DIR:
+        return module
+    return None
+
+
+def _project_modules(objects, found=None):
+    """{name: module} of the project modules `objects` come from, and of every one they import."""
+    found = {} if found is None else found
+    for obj in objects:
+        module = _project_module(obj)
+        if module is not None and module.__name__ not in found:
+            found[module.__name__] = module
+            _project_modules(list(vars(module).values()), found)
+    return found
+
+
+def _source(func):
+    """Sources `func` depends on: its module and the project modules that imports.
+
+    A notebook-defined function contributes its own source and the project
+    modules of the globals it names.
+    """
+    module = _project_module(func)
+    if module is not None:
+        own, used = None, [module]
+    else:
+        try:
+            own = inspect.getsource(func)
+        except (TypeError, OSError):
+            own = func.__qualname__ + func.__code__.co_code.hex()
+        names = func.__code__.co_names
+        used = [func.__globals__[name] for name in names if name in func.__globals__]
+    modules = _project_modules(used)
+    return {"function": own,
+            "modules": {name: hashlib.sha256(inspect.getsource(m).encode("utf-8")).hexdigest()
+                        for name, m in sorted(modules.items())}}
+
+
+def _digestible(value):
+    """`value` as JSON-able parts for fingerprint(); data is reduced to a content hash."""
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        h = hashlib.sha256(pd.util.hash_pandas_object(value, index=True).to_numpy().tobytes())
+        columns = value.columns if isinstance(value, pd.DataFrame) else [value.name]
+        dtypes = value.dtypes if isinstance(value, pd.DataFrame) else [value.dtype]
+        return {"columns": [str(c) for c in columns], "dtypes": [str(d) for d in dtypes], "hash": h.hexdigest()}
+    if isinstance(value, np.ndarray):
+        return {"dtype": value.dtype.str, "shape": value.shape, "hash": hashlib.sha256(value.tobytes()).hexdigest()}
+    if callable(value) and hasattr(value, "__code__"):
+        return _source(value)
+    if isinstance(value, dict):
+        return {str(k): _digestible(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_digestible(v) for v in value]
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+
+def inputs_digest(*parts, **named):
+    """One hex digest of the data, parameters and code an analysis depends on."""
+    return fingerprint(*(_digestible(p) for p in parts), _digestible(dict(sorted(named.items()))))
+
+
+# ---------------------------------------------------------------------------
+# Typed encoding
+# ---------------------------------------------------------------------------
+
+def _plain(value):
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, (list, tuple)):
+        return [_plain(v) for v in value]
+    if isinstance(value, dict):
+        return {str(k): _plain(v) for k, v in value.items()}
+    return value
+
+
+def encode(value):
+    """A result as {"type": ..., "value": ...} JSON."""
+    if isinstance(value, pd.DataFrame):
+        split = value.to_dict(orient="split")
+        return {"type": "table", "value": {
+            "index": _plain(split["index"]), "index_names": list(value.index.names),
+            "columns": [str(c) for c in split["columns"]], "data": _plain(split["data"]),
+            "dtypes": [str(d) for d in value.dtypes], "attrs": _plain(value.attrs)}}
+    if isinstance(value, dict):
+        return {"type": "dict", "value": {str(k): encode(v) for k, v in value.items()}}
+    if isinstance(value, (bool, np.bool_)):
+        return {"type": "bool", "value": bool(value)}
+    if isinstance(value, (int, np.integer)):
+        return {"type": "int", "value": int(value)}
+    if isinstance(value, (float, np.floating)):
+        return {"type": "float", "value": float(value)}
+    if isinstance(value, str):
+        return {"type": "str", "value": value}
+    if value is None:
+        return {"type": "none", "value": None}
+    raise TypeError(f"cannot store a {type(value).__name__} result")
+
+
+def decode(encoded):
+    kind, value = encoded["type"], encoded["value"]
+    if kind == "table":
+        if len(value["index_names"]) > 1:
+            index = pd.MultiIndex.from_tuples([tuple(i) for i in value["index"]], names=value["index_names"])
+        else:
+            index = pd.Index(value["index"], name=value["index_names"][0])
+        frame = pd.DataFrame(value["data"], index=index, columns=value["columns"])
+        frame = frame.astype(dict(zip(value["columns"], value["dtypes"])))
+        frame.attrs.update(value["attrs"])
+        return frame
+    if kind == "dict":
+        return {k: decode(v) for k, v in value.items()}
+    return {"bool": bool, "int": int, "float": float, "str": str, "none": lambda v: None}[kind](value)
+
+
+# ---------------------------------------------------------------------------
+# Store
+# ---------------------------------------------------------------------------
+
+class ResultsStore:
+    """Analysis results in the JSON file `path`, each with the digest of its inputs."""
+
+    def __init__(self, path):
+        self.path = path
+        self.entries = {}
+        self.current = set()
+        self._decoded = {}
+        if os.path.isfile(path):
+            try:
+                with open(path) as f:
+                    self.entries = json.load(f)
+            except ValueError:
+                # A corrupt store just means every analysis is recomputed
+                self.entries = {}
+
+    def is_fresh(self, name, inputs):
+        """True when `name` was last stored from the inputs with digest `inputs`."""
+        entry = self.entries.get(name)
+        return bool(entry) and entry["inputs"] == inputs
+
+    def record(self, name, inputs, results):
+        """Store `results` of analysis `name` computed from `inputs` (a digest); returns them as stored."""
+        self.entries[name] = {"inputs": inputs, "results": encode(results)}
+        self.current.add(name)
+        self._decoded.pop(name, None)
+        self.save()
+        return self.load(name)
+
+    def load(self, name):
+        if name not in self._decoded:
+            self._decoded[name] = decode(self.entries[name]["results"])
+        return self._decoded[name]
+
+    def analysis(self, name, compute, *args, **kwargs):
+        """compute(*args, **kwargs), unless it is stored from the same code and inputs."""
+        inputs = inputs_digest(compute, *args, **kwargs)
+        if self.is_fresh(name, inputs):
+            self.current.add(name)
+            return self.load(name)
+        return self.record(name, inputs, compute(*args, **kwargs))
+
+    def save(self):
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self.entries, f, indent=1)
+            f.write("\n")
+        os.replace(tmp_path, self.path)
+
+    def get(self, key, names=None):
+        """The value at a dotted key: analysis name, then dict keys, then table row and column.
+
+        `names` restricts the lookup to those analyses (default: every stored one).
+        """
+        parts = key.split(".")
+        for i in range(len(parts), 0, -1):
+            name = ".".join(parts[:i])
+            if name in self.entries and (names is None or name in names):
+                value = _lookup(self.load(name), parts[i:])
+                if value is not _MISSING:
+                    return value
+        raise KeyError(key)
+
+    def values(self):
+        """Every stored scalar as a table: key, type, value, inputs digest."""
+        rows = []
+        for name in sorted(self.entries):
+            for key, value in _flatten(name, self.load(name)):
+                rows.append({"key": key, "type": type(value).__name__, "value": value,
+                             "inputs": self.entries[name]["inputs"][:12]})
+        return pd.DataFrame(rows, columns=["key", "type", "value", "inputs"])
+
+    def render(self, template, names=None, missing=None):
+        """`template` with every {{key:format}} placeholder filled in from the store.
+
+        Only the analyses in `names` are used (default: all stored). A placeholder
+        without a result renders as "n/a" and its key is appended to `missing`.
+        """
+        def fill(match):
+            key, spec = match.group(1), match.group(2) or ""
+            try:
+                return format_value(self.get(key, names), spec)
+            except KeyError:
+                if missing is not None and key not in missing:
+                    missing.append(key)
+                return NOT_AVAILABLE
+
+        return PLACEHOLDER.sub(fill, template)
+
+
+def _lookup(value, path):
+    if not path:
+        return value
+    if isinstance(value, dict):
+        for i in range(len(path), 0, -1):
+            key = ".".join(path[:i])
+            if key in value:
+                return _lookup(value[key], path[i:])
+    elif isinstance(value, pd.DataFrame) and len(path) >= 2:
+        row, column = ".".join(path[:-1]), path[-1]
+        if row in value.index and column in value.columns:
+            return _plain(value.loc[row, column])
+    return _MISSING
+
+
+def _flatten(prefix, value):
+    if isinstance(value, dict):
+        for key, item in value.items():
+            yield from _flatten(f"{prefix}.{key}", item)
+    elif isinstance(value, pd.DataFrame):
+        for row, series in value.iterrows():
+            for column, item in series.items():
+                yield f"{prefix}.{row}.{column}", _plain(item)
+    else:
+        yield prefix, value
+
+
+def format_value(value, spec):
+    """Format one stored value; "p" is an APA p-value and "a|b" picks by a boolean."""
+    if "|" in spec:
+        if_true, if_false = spec.split("|", 1)
+        return if_true if value else if_false
+    if spec == "p":
+        return "p < .001" if value < 0.001 else "p = " + f"{value:.3f}".lstrip("0")
+    return format(value, spec)
+
+
+def render_paper(store, output_path, template_path=PAPER_TEMPLATE, names=None, missing=None):
+    """Write the paper draft rendered from `store` (see ResultsStore.render); returns its text."""
+    with open(template_path, encoding="utf-8") as f:
+        text = store.render(f.read(), names, missing)
+    os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+    with open(output_path, "w", encoding="utf-8") as f:
+        f.write(text)
+    return text
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="List the stored analysis results or render the paper draft from them.")
+    parser.add_argument("store", help=f"results store ({STORE_NAME})")
+    parser.add_argument("--render", nargs="?", const=PAPER_TEMPLATE, metavar="TEMPLATE",
+                        help="render a template (default: paper_template.md)")
+    parser.add_argument("-o", "--output", help="rendered paper path (default: stdout)")
+    args = parser.parse_args(argv)
+
+    store = ResultsStore(args.store)
+    if not store.entries:
+        print(f"[--] No results in {args.store}")
+        return 1
+    if args.render:
+        missing = []
+        if args.output:
+            render_paper(store, args.output, args.render, missing=missing)
+            print(f"[OK] {args.output}")
+        else:
+            with open(args.render, encoding="utf-8") as f:
+                print(store.render(f.read(), missing=missing))
+        if missing:
+            print(f"[--] {NOT_AVAILABLE} for {len(missing)} placeholder(s) with no stored result: {', '.join(missing)}")
+        return 0
+    with pd.option_context("display.max_rows", None, "display.width", 200):
+        print(store.values().to_string(index=False))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Incremental minute / hour / day rollups of event volume in an event store.
+
+For each granularity the rollup holds one count per (bucket, event_type,
+page), sorted by bucket, where a bucket is the event timestamp floored to the
+minute, hour or day (UTC). update() only reads the event rows appended to the
+store since the previous update (ingest_telemetry.py calls it after every
+ingest), so keeping a dashboard current never re-scans the log. Counts are
+bucketed by event time, not arrival time: a late export simply adds to older
+buckets when the new counts are merged in.
+
+query() binary-searches the sorted buckets for the requested time range, so
+it only touches the buckets inside it.
+
+If the store was rebuilt rather than appended to (its sources no longer start
+with the ones already rolled up), the rollup starts over from the first row.
+Repeated exports are counted as stored; log_integrity.py reports them.
+
+Usage:
+    python rollups.py interaction_logs.store [--granularity minute|hour|day]
+                      [--since ISO] [--until ISO] [--event-type T] [--page P]
+                      [--by event_type|page]
+"""
+
+import argparse
+import json
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+from event_store import NAT_MS, EventStoreReader, read_meta, to_epoch_ms
+
+ROLLUP_VERSION = 1
+ROLLUP_FILE = "rollups.npz"
+CHUNK_ROWS = 1 << 22
+
+# Bucket width in milliseconds
+GRANULARITIES = {"minute": 60_000, "hour": 3_600_000, "day": 86_400_000}
+ROLLUP_COLUMNS = {"bucket": np.int64, "event_type": np.int32, "page": np.int32, "count": np.int64}
+
+
+def aggregate(bucket, event_type, page, count):
+    """Sum `count` per (bucket, event_type, page), sorted by that key."""
+    order = np.lexsort((page, event_type, bucket))
+    bucket, event_type, page, count = bucket[order], event_type[order], page[order], count[order]
+    first = np.ones(len(bucket), dtype=bool)
+    first[1:] = (bucket[1:] != bucket[:-1]) | (event_type[1:] != event_type[:-1]) | (page[1:] != page[:-1])
+    starts = np.flatnonzero(first)
+    return {
+        "bucket": bucket[starts],
+        "event_type": event_type[starts],
+        "page": page[starts],
+        "count": np.add.reduceat(count, starts) if len(starts) else count[:0],
+    }
+
+
+def empty_rollup():
+    return {name: np.empty(0, dtype=dtype) for name, dtype in ROLLUP_COLUMNS.items()}
+
+
+class RollupStore:
+    """Bucketed event counts kept next to an event store (rollups.npz in it)."""
+
+    def __init__(self, store_dir, path=None):
+        self.store_dir = str(store_dir)
+        self.path = path or os.path.join(self.store_dir, ROLLUP_FILE)
+        self._reset()
+        if os.path.exists(self.path):
+            with np.load(self.path) as data:
+                meta = json.loads(str(data["meta"]))
+                if meta.get("version") == ROLLUP_VERSION:
+                    self.meta = meta
+                    self.tables = {
+                        g: {c: data[f"{g}.{c}"] for c in ROLLUP_COLUMNS} for g in GRANULARITIES
+                    }
+
+    def _reset(self):
+        self.meta = {"version": ROLLUP_VERSION, "sources": [], "events_rolled": 0,
+                     "missing_timestamps": 0, "labels": {"event_type": [], "page": []}}
+        self.tables = {g: empty_rollup() for g in GRANULARITIES}
+
+    def update(self, chunk_rows=CHUNK_ROWS):
+        """Roll up the events appended since the last update; return how many."""
+        store_meta = read_meta(self.store_dir)
+        rows = store_meta["tables"]["events"]["rows"]
+        done = self.meta["sources"]
+        if store_meta["sources"][:len(done)] != done or rows < self.meta["events_rolled"]:
+            self._reset()
+        start = self.meta["events_rolled"]
+
+        with EventStoreReader(self.store_dir) as reader:
+            timestamps = reader.column("events", "timestamp")
+            event_types = reader.column("events", "event_type")
+            pages = reader.column("events", "page")
+            for lo in range(start, rows, chunk_rows):
+                hi = min(lo + chunk_rows, rows)
+                ts = np.asarray(timestamps[lo:hi])
+                valid = ts != NAT_MS
+                self.meta["missing_timestamps"] += int((~valid).sum())
+                ts = ts[valid]
+                event_type = np.asarray(event_types[lo:hi])[valid]
+                page = np.asarray(pages[lo:hi])[valid]
+                for granularity, width in GRANULARITIES.items():
+                    old = self.tables[granularity]
+                    self.tables[granularity] = aggregate(
+                        np.concatenate([old["bucket"], ts // width * width]),
+                        np.concatenate([old["event_type"], event_type]),
+                        np.concatenate([old["page"], page]),
+                        np.concatenate([old["count"], np.ones(len(ts), dtype=np.int64)]),
+                    )
+
+        self.meta["sources"] = store_meta["sources"]
+        self.meta["events_rolled"] = rows
+        self.meta["labels"] = {c: store_meta["dictionaries"].get(c, []) for c in ("event_type", "page")}
+        self.save()
+        return rows - start
+
+    def save(self):
+        """Write all granularities and the meta in one atomic replace."""
+        arrays = {f"{g}.{c}": values for g, table in self.tables.items() for c, values in table.items()}
+        tmp_path = self.path + ".tmp.npz"
+        np.savez(tmp_path, meta=np.array(json.dumps(self.meta)), **arrays)
+        os.replace(tmp_path, self.path)
+
+    def _code(self, column, label):
+        try:
+            return self.meta["labels"][column].index(label)
+        except ValueError:
+            return None
+
+    def query(self, granularity="minute", start=None, end=None, event_type=None, page=None, by=None):
+        """Event counts per bucket in [start, end), optionally for one event_type / page.
+
+        Returns a Series indexed by bucket start (UTC), or with `by` set to
+        "event_type" or "page" a DataFrame with one column per value.
+        """
+        table = self.tables[granularity]
+        bucket = table["bucket"]
+        lo = 0 if start is None else np.searchsorted(bucket, to_epoch_ms([start])[0], side="left")
+        hi = len(bucket) if end is None else np.searchsorted(bucket, to_epoch_ms([end])[0], side="left")
+        rows = {c: values[lo:hi] for c, values in table.items()}
+
+        keep = np.ones(hi - lo, dtype=bool)
+        for column, label in (("event_type", event_type), ("page", page)):
+            if label is not None:
+                keep &= rows[column] == self._code(column, label)
+        frame = pd.DataFrame({c: values[keep] for c, values in rows.items()})
+        frame["bucket"] = pd.to_datetime(frame["bucket"], unit="ms", utc=True)
+
+        if by is None:
+            return frame.groupby("bucket")["count"].sum()
+        frame[by] = pd.Categorical.from_codes(frame[by], categories=self.meta["labels"][by])
+        return frame.pivot_table(index="bucket", columns=by, values="count", aggfunc="sum",
+                                 fill_value=0, observed=True)
+
+
+def update_rollups(store_dir):
+    """Bring the rollups of `store_dir` up to date; return the new event count."""
+    return RollupStore(store_dir).update()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Update and query event-volume rollups of an event store.")
+    parser.add_argument("store_dir", help="event store directory (see event_store.py)")
+    parser.add_argument("--granularity", choices=list(GRANULARITIES), default="minute")
+    parser.add_argument("--since", help="first bucket to show (ISO-8601, UTC)")
+    parser.add_argument("--until", help="show buckets before this time (ISO-8601, UTC)")
+    parser.add_argument("--event-type", help="only count this event_type")
+    parser.add_argument("--page", help="only count events on this page")
+    parser.add_argument("--by", choices=["event_type", "page"], help="one column per event_type or page")
+    args = parser.parse_args(argv)
+
+    rollups = RollupStore(args.store_dir)
+    added = rollups.update()
+    print(f"[OK] Rollups: {added} new events, {rollups.meta['events_rolled']} total")
+    result = rollups.query(args.granularity, args.since, args.until, args.event_type, args.page, args.by)
+    print(result.to_string())
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Scoring of the post-test questionnaire scales from a declarative registry.
+
+SCALE_REGISTRY lists every scale the two post-test surveys use: its items,
+the reverse-keyed ones, the response range and how the score is formed:
+
+  "mean"  mean of the items, reverse-keyed items recoded to low + high - x
+  "sus"   SUS (Brooke, 1996): items recoded to 0..high-low (x - low, reversed
+          high - x), summed and rescaled to 0-100 (x 2.5 for ten 1-5 items)
+
+Both are an integer linear map of the items followed by one division, so all
+scales are scored at once: responses become an int8 respondents x items matrix
+(-1 where missing), one matrix product with the int8 item weights gives every
+recoded scale sum, and each column is divided by its scale's divisor. The sums
+are exact integers, so the scores equal the row-wise pandas means and SUS
+formula. Like DataFrame.mean(axis=1), a "mean" scale is scored over the items
+a respondent answered (NaN only when none is answered); a SUS score needs all
+ten items and is NaN when any is missing, as in Brooke's formula.
+Respondents are scored in chunks, so millions of rows need no more than one
+chunk of float32 working memory.
+
+Usage:
+    python scale_scoring.py deliverables/project1/posttest/posttest_survey_responses.csv
+"""
+
+import sys
+
+import numpy as np
+import pandas as pd
+
+CHUNK_ROWS = 1 << 16
+
+
+def items(prefix, n):
+    return tuple(f"{prefix}{i}" for i in range(1, n + 1))
+
+
+SUS_ITEMS = items("sus_q", 10)
+UES_SUBSCALES = {
+    "ues_fa_mean": items("engagement_fa", 5),
+    "ues_pu_mean": items("engagement_pu", 3),
+    "ues_ae_mean": items("engagement_ae", 4),
+    "ues_rw_mean": items("engagement_rw", 3),
+}
+
+# Score column -> scale definition (items 1-5 Likert unless stated)
+SCALE_REGISTRY = {
+    "sus_score": {"label": "SUS", "items": SUS_ITEMS, "reverse": SUS_ITEMS[1::2], "score": "sus"},
+    "ues_fa_mean": {"label": "UES-SF Focused Attention", "items": UES_SUBSCALES["ues_fa_mean"]},
+    "ues_pu_mean": {"label": "UES-SF Perceived Usability", "items": UES_SUBSCALES["ues_pu_mean"]},
+    "ues_ae_mean": {"label": "UES-SF Aesthetic Appeal", "items": UES_SUBSCALES["ues_ae_mean"]},
+    "ues_rw_mean": {"label": "UES-SF Reward", "items": UES_SUBSCALES["ues_rw_mean"]},
+    "ues_overall": {"label": "UES-SF", "items": sum(UES_SUBSCALES.values(), ())},
+    "nq_mean": {"label": "Narrative Quality", "items": items("narrative_quality_q", 5), "high": 7},
+    "ai_mean": {"label": "AI Perception", "items": items("ai_perception_q", 5), "high": 7},
+    "immersion_mean": {"label": "Immersion", "items": items("immersion_q", 3), "high": 7},
+    "trust_mean": {"label": "Trust in AI", "items": items("trust_q", 5), "high": 7},
+    "usefulness_mean": {"label": "TAM Perceived Usefulness", "items": items("usefulness_q", 5), "high": 7},
+    "ease_mean": {"label": "TAM Perceived Ease of Use", "items": items("ease_q", 5), "high": 7},
+    "accuracy_mean": {"label": "Accuracy Perception", "items": items("accuracy_perception_q", 3), "high": 7},
+    "privacy_mean": {"label": "Privacy Concern", "items": items("privacy_concern_q", 3), "high": 7},
+}
+
+
+def scale_spec(scale):
+    """Registry entry with defaults filled in."""
+    return {"reverse": (), "low": 1, "high": 5, "score": "mean", **scale}
+
+
+def available_scales(columns, registry=None):
+    """Names of the registry scales whose items are all among `columns`."""
+    registry = SCALE_REGISTRY if registry is None else registry
+    columns = set(columns)
+    return [name for name, scale in registry.items() if columns.issuperset(scale["items"])]
+
+
+# ---------------------------------------------------------------------------
+# Matrix form
+# ---------------------------------------------------------------------------
+
+def scoring_matrix(scales, item_columns):
+    """Integer weights and offsets of the recoded items, and per-scale divisors.
+
+    Returns (weights, offsets, divisors, complete). With X the item matrix
+    (missing items 0) and A its answered (0/1) matrix, the recoded sum of
+    scale j is X @ weights[:, j] + A @ offsets[:, j]. A scale with
+    complete[j] (SUS) is that sum / divisors[j], NaN unless every item is
+    answered; any other scale is the sum / (divisors[j] x its answered items).
+    """
+    position = {item: i for i, item in enumerate(item_columns)}
+    weights = np.zeros((len(item_columns), len(scales)), dtype=np.int8)
+    offsets = np.zeros((len(item_columns), len(scales)), dtype=np.int8)
+    divisors = np.ones(len(scales), dtype=np.float64)
+    complete = np.zeros(len(scales), dtype=bool)
+    for j, scale in enumerate(scales):
+        scale = scale_spec(scale)
+        low, high, k = scale["low"], scale["high"], len(scale["items"])
+        for item in scale["items"]:
+            reverse = item in scale["reverse"]
+            weights[position[item], j] = -1 if reverse else 1
+            if scale["score"] == "sus":
+                offsets[position[item], j] = high if reverse else -low
+            elif reverse:
+                offsets[position[item], j] = low + high
+        if scale["score"] == "sus":
+            divisors[j] = k * (high - low) / 100
+            complete[j] = True
+        elif scale["score"] != "mean":
+            raise ValueError(f"unknown score type {scale['score']!r}")
+    return weights, offsets, divisors, complete
+
+
+def item_matrix(frame, item_columns):
+    """Responses as an int8 matrix, -1 where missing."""
+    values = frame[list(item_columns)].to_numpy(dtype=np.float64, na_value=np.nan)
+    answered = values[~np.isnan(values)]
+    # Negative responses would be read back as the -1 missing value
+    if (answered != np.round(answered)).any() or (answered < 0).any() or (answered > 127).any():
+        raise ValueError("item responses must be integers between 0 and 127")
+    return np.where(np.isnan(values), -1, values).astype(np.int8)
+
+
+def score_matrix(matrix, weights, offsets, divisors, complete, chunk_rows=CHUNK_ROWS):
+    """Scores of every scale (columns) for every respondent (rows) of an item matrix."""
+    scores = np.empty((len(matrix), weights.shape[1]), dtype=np.float64)
+    w = weights.astype(np.float32)
+    o = offsets.astype(np.float32)
+    uses = (weights != 0).astype(np.float32)
+    n_items = uses.sum(axis=0)
+    for lo in range(0, len(matrix), chunk_rows):
+        chunk = matrix[lo:lo + chunk_rows]
+        answered = (chunk >= 0).astype(np.float32)
+        # float32 products of small integers are exact
+        sums = (np.maximum(chunk, 0).astype(np.float32) @ w + answered @ o).astype(np.int64)
+        n_answered = answered @ uses
+        divisor = np.where(complete, divisors, divisors * n_answered)
+        valid = np.where(complete, n_answered == n_items, n_answered > 0)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            scores[lo:lo + chunk_rows] = np.where(valid, sums / divisor, np.nan)
+    return scores
+
+
+def score_scales(frame, names=None, registry=None, chunk_rows=CHUNK_ROWS):
+    """Score `names` (default: every registry scale the frame has items for).
+
+    Returns a DataFrame with one column per scale, on the frame's index.
+    """
+    registry = SCALE_REGISTRY if registry is None else registry
+    names = available_scales(frame.columns, registry) if names is None else list(names)
+    scales = [registry[name] for name in names]
+    item_columns = list(dict.fromkeys(item for scale in scales for item in scale["items"]))
+    weights, offsets, divisors, complete = scoring_matrix(scales, item_columns)
+    scores = score_matrix(item_matrix(frame, item_columns), weights, offsets, divisors, complete, chunk_rows)
+    return pd.DataFrame(scores, index=frame.index, columns=names)
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if len(argv) != 1:
+        print(__doc__.strip())
+        return 2
+    responses = pd.read_csv(argv[0])
+    scores = score_scales(responses)
+    labels = {name: SCALE_REGISTRY[name]["label"] for name in scores.columns}
+    print(scores.describe().T.rename(index=labels).round(2).to_string())
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Scenario profiles for the dummy-data generators.
+
+A profile is a JSON file in profiles/ (or any path) with a "project1" and/or
+"project2" section. Every profile is layered over profiles/default.json, so a
+profile only needs to list the parameters it changes:
+
+    {"project1": {"n_logs": 400}, "project2": {"n_logs": 400}}
+
+Usage:
+    python scenario_profiles.py            # list available profiles
+    python scenario_profiles.py huge       # print the resolved profile
+"""
+
+import copy
+import json
+import os
+import sys
+
+PROFILE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "profiles")
+DEFAULT_PROFILE = "default"
+
+
+def profile_path(name_or_path):
+    """Resolve a profile name ('huge') or file path to a JSON file path."""
+    if os.path.isfile(name_or_path):
+        return name_or_path
+    path = os.path.join(PROFILE_DIR, f"{name_or_path}.json")
+    if not os.path.isfile(path):
+        raise ValueError(
+            f"Unknown profile {name_or_path!r}. Available: {', '.join(list_profiles())}"
+        )
+    return path
+
+
+def list_profiles():
+    """Return the names of the profiles shipped in profiles/."""
+    return sorted(f[:-5] for f in os.listdir(PROFILE_DIR) if f.endswith(".json"))
+
+
+def _read(path):
+    with open(path) as f:
+        return json.load(f)
+
+
+def load_profile(name_or_path=DEFAULT_PROFILE):
+    """Load a profile, layered over the default profile, and validate it."""
+    profile = _read(profile_path(DEFAULT_PROFILE))
+    resolved = profile_path(name_or_path)
+    overrides = _read(resolved)
+
+    for section, values in overrides.items():
+        if section == "description":
+            profile["description"] = values
+            continue
+        if section not in profile:
+            raise ValueError(f"{resolved}: unknown section {section!r}")
+        unknown = set(values) - set(profile[section])
+        if unknown:
+            raise ValueError(f"{resolved}: unknown {section} parameters {sorted(unknown)}")
+        profile[section].update(copy.deepcopy(values))
+
+    profile["name"] = os.path.splitext(os.path.basename(resolved))[0]
+    _validate(profile)
+    return profile
+
+
+def _validate(profile):
+    p1, p2 = profile["project1"], profile["project2"]
+
+    # Post-test participants are drawn from the requirements-survey cohort
+    if p1["n_posttest"] > p1["n_survey"]:
+        raise ValueError("project1.n_posttest cannot exceed project1.n_survey")
+
+    for section, n_etypes in (("project1", 6), ("project2", 12)):
+        weights = profile[section]["etype_weights"]
+        if weights is not None and len(weights) != n_etypes:
+            raise ValueError(f"{section}.etype_weights needs {n_etypes} weights")
+
+    for section in ("project1", "project2"):
+        lo, hi = profile[section]["events_per_session"]
+        if not 1 <= lo <= hi:
+            raise ValueError(f"{section}.events_per_session must be an increasing [min, max] pair")
+        if not 0.0 <= profile[section]["agreement_rate"] <= 1.0:
+            raise ValueError(f"{section}.agreement_rate must be within [0, 1]")
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv:
+        for name in list_profiles():
+            print(f"{name:15s} {_read(profile_path(name)).get('description', '')}")
+        return 0
+    print(json.dumps(load_profile(argv[0]), indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Session reconstruction and dwell time for interaction logs.
+
+Works on the tables of an event store (see event_store.py) in one sorted,
+vectorized pass over all events:
+
+  - dwell time of an event is the time until the participant's next event
+    (for the last event: until session_end), not the browser-reported
+    time_on_page_seconds
+  - gaps longer than the idle threshold are split into active time (capped at
+    the threshold) and idle time
+  - consecutive events on the same page form one page visit; each visit
+    records the page it was reached from, so transitions fall out directly
+
+build_visits() returns the visit table (one row per page visit), and
+participant_dwell() rolls it up to one row per participant_id, ready to be
+merged with the post-test survey.
+
+Usage:
+    python sessions.py interaction_logs.store [--idle SECONDS]
+"""
+
+import argparse
+import sys
+
+import numpy as np
+import pandas as pd
+
+from event_store import NAT_MS, load_event_store
+
+IDLE_THRESHOLD_SECONDS = 300
+
+
+def _as_ms(values):
+    """int64 epoch ms -> float64 with NaN for missing timestamps."""
+    values = np.asarray(values)
+    return np.where(values == NAT_MS, np.nan, values.astype(np.float64))
+
+
+def event_dwell(tables, idle_threshold=IDLE_THRESHOLD_SECONDS):
+    """Events sorted by (session, timestamp) with dwell/active/idle seconds.
+
+    `session` is the participants-table row of the event, so repeated
+    sessions of one participant (appended exports) stay separate.
+    """
+    p, e = tables["participants"], tables["events"]
+    counts = p["event_stop"].to_numpy() - p["event_start"].to_numpy()
+    if counts.sum() != len(e):
+        raise ValueError("event ranges in the participants table do not cover the events table")
+    session = np.repeat(np.arange(len(p)), counts)
+
+    ts = e["timestamp"].to_numpy()
+    order = np.lexsort((ts, session))
+    session = session[order]
+    t = _as_ms(ts[order])
+
+    # Time until the next event of the same session; the last event of a
+    # session runs until session_end
+    last = np.ones(len(order), dtype=bool)
+    last[:-1] = session[1:] != session[:-1]
+    next_t = np.empty_like(t)
+    next_t[:-1] = t[1:]
+    next_t[last] = _as_ms(p["session_end"].to_numpy())[session[last]]
+    gap = np.clip((next_t - t) / 1000.0, 0, None)
+
+    active = np.minimum(gap, idle_threshold)
+    out = e.iloc[order].reset_index(drop=True)
+    out.insert(0, "session", session)
+    out.insert(0, "participant_id", p["participant"].to_numpy()[session])
+    out["dwell_seconds"] = gap
+    out["active_seconds"] = active
+    out["idle_seconds"] = gap - active
+    out["is_idle"] = gap > idle_threshold
+    return out
+
+
+def build_visits(tables, idle_threshold=IDLE_THRESHOLD_SECONDS):
+    """One row per page visit: a run of consecutive events on one page."""
+    ev = event_dwell(tables, idle_threshold)
+    session = ev["session"].to_numpy()
+    page = ev["page"].cat.codes.to_numpy()
+    n = len(ev)
+
+    new_visit = np.ones(n, dtype=bool)
+    new_visit[1:] = (session[1:] != session[:-1]) | (page[1:] != page[:-1])
+    first = np.flatnonzero(new_visit)
+    last = np.r_[first[1:], n][:len(first)] - 1
+
+    def visit_sum(column):
+        values = np.nan_to_num(ev[column].to_numpy(dtype=np.float64))
+        return np.add.reduceat(values, first) if n else values
+
+    visit_session = session[first]
+    session_first = np.ones(len(first), dtype=bool)
+    session_first[1:] = visit_session[1:] != visit_session[:-1]
+    ordinal = np.arange(len(first)) - np.maximum.accumulate(np.where(session_first, np.arange(len(first)), 0))
+
+    from_codes = np.full(len(first), -1, dtype=page.dtype)
+    from_codes[1:] = page[first[:-1]]
+    from_codes[session_first] = -1
+    categories = ev["page"].cat.categories
+
+    t = _as_ms(ev["timestamp"].to_numpy())
+    dwell = ev["dwell_seconds"].to_numpy()
+    return pd.DataFrame({
+        "participant_id": ev["participant_id"].to_numpy()[first],
+        "session": visit_session,
+        "visit": ordinal,
+        "page": pd.Categorical.from_codes(page[first], categories=categories),
+        "from_page": pd.Categorical.from_codes(from_codes, categories=categories),
+        "start_ms": t[first],
+        "end_ms": t[last] + np.nan_to_num(dwell[last]) * 1000.0,
+        "n_events": last - first + 1,
+        "dwell_seconds": visit_sum("dwell_seconds"),
+        "active_seconds": visit_sum("active_seconds"),
+        "idle_seconds": visit_sum("idle_seconds"),
+        "idle_gaps": visit_sum("is_idle").astype(np.int64),
+    })
+
+
+def page_transitions(visits):
+    """Counts of from_page -> page transitions across all visits."""
+    moves = visits[visits["from_page"].notna()]
+    counts = moves.groupby(["from_page", "page"], observed=True).size()
+    return counts.rename("transitions").reset_index().sort_values("transitions", ascending=False, ignore_index=True)
+
+
+def participant_dwell(visits):
+    """Per-participant visit and dwell totals, indexed by participant_id."""
+    grouped = visits.groupby(visits["participant_id"].astype(str))
+    summary = grouped.agg(
+        n_visits=("page", "size"),
+        distinct_pages=("page", "nunique"),
+        dwell_seconds=("dwell_seconds", "sum"),
+        active_seconds=("active_seconds", "sum"),
+        idle_seconds=("idle_seconds", "sum"),
+        idle_gaps=("idle_gaps", "sum"),
+        mean_visit_seconds=("dwell_seconds", "mean"),
+    )
+    summary.index.name = "participant_id"
+    return summary
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Reconstruct page visits and dwell time from an event store.")
+    parser.add_argument("store_dir", help="event store directory (see event_store.py)")
+    parser.add_argument("--idle", type=float, default=IDLE_THRESHOLD_SECONDS,
+                        help=f"gap in seconds after which time counts as idle (default {IDLE_THRESHOLD_SECONDS})")
+    args = parser.parse_args(argv)
+
+    visits = build_visits(load_event_store(args.store_dir, ["participants", "events"]), args.idle)
+    print(f"{len(visits)} page visits, {visits['participant_id'].nunique()} participants\n")
+    per_page = visits.groupby("page", observed=True).agg(
+        visits=("visit", "size"),
+        mean_dwell=("dwell_seconds", "mean"),
+        mean_active=("active_seconds", "mean"),
+        idle_gaps=("idle_gaps", "sum"),
+    )
+    print(per_page.round(1).to_string())
+    print("\nTop transitions:")
+    print(page_transitions(visits).head(10).to_string(index=False))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""
+Local ingestion endpoint for the batched telemetry of the prototype webapps.
+
+Both index.html files buffer events in window.telemetryLog and POST them to
+http://localhost:5002/telemetry in batches of up to 200 events, each batch a
+(usually gzip-compressed) JSON object:
+
+  {v, app, session, seq, t0, dict: {event_type: [...], page: [...]},
+   dt, event_type, page, time_on_page, details[, export]}
+
+Events are stored column-wise: dt are millisecond offsets from the previous
+event (the first from t0), event_type and page are codes into the batch's own
+dictionaries, and details are 0 when empty. Every batch decodes on its own,
+so a lost or repeated batch never garbles another one.
+
+Decoded batches are kept per session under DROP_DIR/sessions/. The batch sent
+by Export Logs carries the export header; once all batches up to it have
+arrived, the session is written to DROP_DIR as the same export file the
+browser downloads (gemini-quest-{pid}-{ts}.json, studybuddy_telemetry_{pid}_
+{ts}.json), so ingest_telemetry.py handles it like any other export. A
+repeated Export of the same session writes only the batches that arrived
+since the previous one, so no event reaches the drop directory twice; the
+header's event count (HEADER_COUNTS) is then set to the events written. With
+--store the new export is ingested right away.
+
+Bodies are limited to MAX_BATCH_BYTES both as posted and once decompressed;
+gzip bodies are inflated incrementally and rejected as soon as they exceed it.
+
+Usage:
+    python telemetry_server.py DROP_DIR [--store STORE_DIR] [--port 5002]
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+import zlib
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+from ingest_telemetry import ingest
+
+BATCH_VERSION = 1
+DEFAULT_PORT = 5002
+MAX_BATCH_BYTES = 16 << 20
+SESSIONS_DIR_NAME = "sessions"
+# Export-header fields that count the export's events
+HEADER_COUNTS = ("total_events",)
+
+# Export file name per webapp, as in its exportLogs()
+EXPORT_NAMES = {
+    "gemini-quest": "gemini-quest-{pid}-{ts}.json",
+    "studybuddy": "studybuddy_telemetry_{pid}_{ts}.json",
+}
+SESSION_ID = re.compile(r"^[A-Za-z0-9_-]{1,64}$")
+
+
+def gunzip_capped(body, limit=MAX_BATCH_BYTES):
+    """Decompress a gzip body, refusing to inflate it past `limit` bytes."""
+    inflater = zlib.decompressobj(wbits=16 + zlib.MAX_WBITS)
+    try:
+        data = inflater.decompress(body, limit + 1)
+    except zlib.error as exc:
+        raise ValueError(f"corrupt gzip body: {exc}") from None
+    if len(data) > limit or inflater.unconsumed_tail:
+        raise ValueError(f"batch exceeds {limit} bytes once decompressed")
+    if not inflater.eof:
+        raise ValueError("truncated gzip body")
+    return data
+
+
+def decode_batch(body):
+    """Parse a posted batch (gzip or plain JSON) and check its shape."""
+    if body[:2] == b"\x1f\x8b":
+        body = gunzip_capped(body)
+    batch = json.loads(body)
+    if batch.get("v") != BATCH_VERSION:
+        raise ValueError(f"unsupported batch version {batch.get('v')!r}")
+    if batch.get("app") not in EXPORT_NAMES:
+        raise ValueError(f"unknown app {batch.get('app')!r}")
+    if not SESSION_ID.match(str(batch.get("session", ""))):
+        raise ValueError("invalid session id")
+    if not isinstance(batch.get("seq"), int) or batch["seq"] < 0:
+        raise ValueError("invalid batch sequence number")
+    n = len(batch["dt"])
+    if any(len(batch[column]) != n for column in ("event_type", "page", "time_on_page", "details")):
+        raise ValueError("batch columns differ in length")
+    return batch
+
+
+def iso_ms(ms):
+    """Epoch milliseconds as JavaScript's Date.toISOString() writes them."""
+    ms = int(ms)
+    moment = datetime.fromtimestamp(ms // 1000, tz=timezone.utc)
+    return moment.strftime("%Y-%m-%dT%H:%M:%S") + f".{ms % 1000:03d}Z"
+
+
+def batch_events(batch):
+    """The batch's events in the webapps' export format."""
+    event_types, pages = batch["dict"]["event_type"], batch["dict"]["page"]
+    events = []
+    t = batch["t0"]
+    for dt, event_type, page, time_on_page, details in zip(
+            batch["dt"], batch["event_type"], batch["page"], batch["time_on_page"], batch["details"]):
+        t += dt
+        events.append({
+            "timestamp": iso_ms(t),
+            "event_type": event_types[event_type],
+            "page": pages[page],
+            "details": details or {},
+            "time_on_page_seconds": time_on_page,
+        })
+    return events
+
+
+def write_json(path, data):
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(data, f)
+    os.replace(tmp_path, path)
+
+
+class BatchCollector:
+    """Reassembles the batches of each session into export files in `drop_dir`."""
+
+    def __init__(self, drop_dir):
+        self.drop_dir = str(drop_dir)
+        self.sessions_dir = os.path.join(self.drop_dir, SESSIONS_DIR_NAME)
+
+    def add(self, batch):
+        """Store one decoded batch; return the export path if it completed one."""
+        session_dir = os.path.join(self.sessions_dir, f"{batch['app']}_{batch['session']}")
+        os.makedirs(session_dir, exist_ok=True)
+        # A retried batch overwrites its earlier copy
+        write_json(os.path.join(session_dir, f"{batch['seq']:06d}.json"), batch_events(batch))
+        if "export" in batch:
+            write_json(os.path.join(session_dir, "export.json"), {"seq": batch["seq"], "header": batch["export"]})
+        return self.complete(batch["app"], session_dir)
+
+    def complete(self, app, session_dir):
+        """Write the session out if its export batch and every batch before it are here.
+
+        Only the batches after the previous export of the session are
+        written, so repeated exports do not repeat its events.
+        """
+        export_path = os.path.join(session_dir, "export.json")
+        if not os.path.exists(export_path):
+            return None
+        with open(export_path) as f:
+            export = json.load(f)
+        exported_path = os.path.join(session_dir, "exported.json")
+        first = 0
+        if os.path.exists(exported_path):
+            with open(exported_path) as f:
+                first = json.load(f)["seq"] + 1
+        names = [f"{seq:06d}.json" for seq in range(first, export["seq"] + 1)]
+        if not all(os.path.exists(os.path.join(session_dir, name)) for name in names):
+            return None
+
+        events = []
+        for name in names:
+            with open(os.path.join(session_dir, name)) as f:
+                events.extend(json.load(f))
+        write_json(exported_path, {"seq": export["seq"]})
+        if not events:
+            os.remove(export_path)
+            return None
+        # The browser counted every event of the session; this file holds only the new ones
+        header = dict(export["header"], **{key: len(events) for key in HEADER_COUNTS if key in export["header"]})
+        pid = header.get("participantId") or header.get("participant_id") or "unknown"
+        pid = re.sub(r"[^A-Za-z0-9_-]", "_", str(pid))
+        path = os.path.join(self.drop_dir, EXPORT_NAMES[app].format(pid=pid, ts=int(datetime.now().timestamp() * 1000)))
+        write_json(path, dict(header, events=events))
+        os.remove(export_path)
+        return path
+
+
+def make_handler(collector, store_dir=None):
+    class TelemetryHandler(BaseHTTPRequestHandler):
+        def _reply(self, status, message=None):
+            self.send_response(status)
+            self.send_header("Access-Control-Allow-Origin", "*")
+            self.send_header("Access-Control-Allow-Methods", "POST, OPTIONS")
+            self.send_header("Access-Control-Allow-Headers", "Content-Type")
+            body = (message + "\n").encode() if message else b""
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_OPTIONS(self):
+            self._reply(204)
+
+        def do_POST(self):
+            if self.path.split("?")[0] != "/telemetry":
+                return self._reply(404, "not found")
+            length = int(self.headers.get("Content-Length", 0))
+            if length > MAX_BATCH_BYTES:
+                return self._reply(413, "batch too large")
+            try:
+                batch = decode_batch(self.rfile.read(length))
+                exported = collector.add(batch)
+            except (ValueError, KeyError, TypeError, IndexError, OSError) as exc:
+                return self._reply(400, f"bad batch: {exc}")
+            if exported:
+                print(f"[OK] Session {batch['session']}: -> {exported}")
+                if store_dir:
+                    ingest(collector.drop_dir, store_dir, log=print)
+            self._reply(204)
+
+        def log_message(self, format, *args):
+            pass
+
+    return TelemetryHandler
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Receive batched webapp telemetry and write it out as export files.")
+    parser.add_argument("drop_dir", help="directory the export files are written to")
+    parser.add_argument("--store", help="event store to ingest each new export into (see ingest_telemetry.py)")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help=f"port to listen on (default {DEFAULT_PORT})")
+    args = parser.parse_args(argv)
+
+    os.makedirs(args.drop_dir, exist_ok=True)
+    server = HTTPServer(("localhost", args.port), make_handler(BatchCollector(args.drop_dir), args.store))
+    print(f"[OK] Listening on http://localhost:{args.port}/telemetry -> {args.drop_dir}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())